@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+"""
+Org-wide Apex symbol index and call graph.
+
+ApexValidator only sees SOQL/DML that sits on a loop's own lines. The common
+production failure is a loop that calls ``Service.doThing()``, which runs a
+query a few frames down. This module indexes a directory tree of .cls and
+.trigger files once, records per file:
+
+- classes and methods,
+- call sites (``Class.method(...)``, ``var.method(...)`` where ``var`` is
+  declared with a known class type, and unqualified same-class calls),
+- SOQL sites (``[SELECT ...]``, ``Database.query(...)``) and DML sites,
+- collection growth sites (``.add(``, ``.addAll(``, ``.put(``, ``.putAll(``),
+
+each tagged with its enclosing method, outermost loop and loop nesting depth,
+and answers "is SOQL/DML
+transitively reachable from inside this loop?" for every loop in the org.
+
+The index is persisted as JSON keyed by file SHA-256, so re-running over an
+unchanged tree re-parses nothing and an edited file re-parses only itself.
+By default it lives under CACHE_DIR (in the temp dir, like the hooks'
+caches), one file per indexed root, never in the source tree.
+
+Usage:
+    python apex_index.py <dir> [<dir> ...] [--index PATH] [--json]
+
+Exit codes:
+    0 — no transitive SOQL/DML-in-loop findings
+    1 — findings reported, or bad arguments
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+INDEX_VERSION = 3
+CACHE_DIR = Path(tempfile.gettempdir()) / "sf_apex_index"
+
+APEX_SUFFIXES = (".cls", ".trigger")
+SITE_KINDS = ("soql", "dml")
+
+# Words that look like calls (`if (`, `for (`) or declarations but never are.
+_NOT_CALLS = frozenset(
+    {
+        "if", "for", "while", "do", "catch", "switch", "when", "return", "new",
+        "super", "this", "throw", "else", "try", "finally", "on", "class",
+        "trigger", "instanceof", "insert", "update", "delete", "upsert",
+        "undelete", "merge",
+    }
+)
+
+_CLASS_HEADER_RE = re.compile(r"\b(?:class|interface|enum)\s+(\w+)", re.IGNORECASE)
+_TRIGGER_HEADER_RE = re.compile(
+    r"^\s*trigger\s+(\w+)\s+on\s+(\w+)\s*\(([^)]*)\)", re.IGNORECASE
+)
+_EXTENDS_RE = re.compile(r"\bextends\s+([\w.]+)", re.IGNORECASE)
+_NEW_CLASS_RE = re.compile(r"\bnew\s+([A-Za-z_][\w.]*)\s*\(", re.IGNORECASE)
+# A method/constructor header ends with a balanced parameter list.
+_METHOD_HEADER_RE = re.compile(r"(\w+)\s*\([^()]*(?:\([^()]*\)[^()]*)*\)\s*$")
+_LOOP_HEADER_RE = re.compile(r"^\s*(?:else\s+)?(?:(for|while)\s*\(|do\s*$)", re.IGNORECASE)
+_BRACELESS_LOOP_RE = re.compile(r"^\s*(?:else\s+)?(?:for|while)\s*\(", re.IGNORECASE)
+
+_SOQL_RE = re.compile(
+    r"\[\s*SELECT\b|\bDatabase\s*\.\s*(?:query|queryWithBinds|countQuery|getQueryLocator)\s*\(",
+    re.IGNORECASE,
+)
+_DML_RE = re.compile(
+    r"(?<![\w.])(?:insert|update|delete|upsert|undelete|merge)\s+(?![=;.)])(?=[\w\[(])"
+    r"|\bDatabase\s*\.\s*(?:insert|update|delete|upsert|undelete|merge)\w*\s*\(",
+    re.IGNORECASE,
+)
+_COLLECTION_GROWTH_RE = re.compile(r"\.\s*(?:add|addAll|put|putAll)\s*\(", re.IGNORECASE)
+_QUALIFIED_CALL_RE = re.compile(r"\b([A-Za-z_]\w*)\s*\.\s*([A-Za-z_]\w*)\s*\(")
+_UNQUALIFIED_CALL_RE = re.compile(r"(?<![\w.])([A-Za-z_]\w*)\s*\(")
+_NEW_BEFORE_RE = re.compile(r"\bnew\s+$", re.IGNORECASE)
+# `Type name =|;|,|)` — enough to resolve `svc.doThing()` to `Type.doThing`.
+_VAR_DECL_RE = re.compile(r"\b([A-Za-z_]\w*)\s+([A-Za-z_]\w*)\s*(?=[=;,)])")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Source preprocessing
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def strip_comments_and_strings(text: str) -> str:
+    """Blank out comments and string-literal contents, preserving offsets.
+
+    Newlines are kept so line numbers computed on the result match the
+    original source. String literals keep their quotes (``'   '``).
+    """
+    out = list(text)
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == "/" and i + 1 < n and text[i + 1] == "/":
+            while i < n and text[i] != "\n":
+                out[i] = " "
+                i += 1
+        elif c == "/" and i + 1 < n and text[i + 1] == "*":
+            end = text.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+            for j in range(i, end):
+                if text[j] != "\n":
+                    out[j] = " "
+            i = end
+        elif c == "'":
+            i += 1
+            while i < n and text[i] != "'" and text[i] != "\n":
+                if text[i] == "\\" and i + 1 < n:
+                    out[i] = " "
+                    i += 1
+                out[i] = " "
+                i += 1
+            i += 1
+        else:
+            i += 1
+    return "".join(out)
+
+
+def _matching_paren(text: str, open_idx: int) -> int:
+    """Index of the ``)`` matching ``text[open_idx] == '('``, or -1."""
+    depth = 0
+    for j in range(open_idx, len(text)):
+        if text[j] == "(":
+            depth += 1
+        elif text[j] == ")":
+            depth -= 1
+            if depth == 0:
+                return j
+    return -1
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Per-file symbol extraction
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def parse_apex_symbols(source: str) -> dict[str, Any]:
+    """Extract the symbol table for one Apex class or trigger.
+
+    Returns a JSON-serialisable dict::
+
+        {
+          "kind": "class" | "trigger",
+          "sobject": "Account",                 # triggers only
+          "events": ["before insert"],          # triggers only
+          "classes": ["AccountService", "AccountService.Wrapper"],
+          "extends": {"AccountService.Wrapper": "BaseWrapper"},
+          "instantiates": [{"method": ..., "class": "AccountService", "line": 4}],
+          "methods": [{"key": "AccountService.run", "line": 4}],
+          "var_types": {"svc": "AccountService"},
+          "calls": [{"caller": ..., "qualifier": ..., "method": ...,
+                     "line": ..., "loop_line": ..., "loop_depth": ...}],
+          "soql": [{"method": ..., "line": ..., "loop_line": ..., "loop_depth": ...}],
+          "dml":  [{"method": ..., "line": ..., "loop_line": ..., "loop_depth": ...}],
+          "collections": [{"method": ..., "line": ..., "loop_line": ..., "loop_depth": ...}],
+        }
+
+    ``loop_line`` is the header line of the outermost enclosing loop within
+    the same method, or 0 when the site is not inside a loop; ``loop_depth``
+    is how many loops of that method enclose the site.
+    """
+    clean = strip_comments_and_strings(source)
+    line_starts = [0] + [m.end() for m in re.finditer("\n", clean)]
+
+    def line_of(offset: int) -> int:
+        return bisect.bisect_right(line_starts, offset)
+
+    kind = "class"
+    sobject = ""
+    events: list[str] = []
+    classes: list[str] = []
+    extends: dict[str, str] = {}
+    methods: list[dict[str, Any]] = []
+    # (start_offset, end_offset, key) for method bodies; (start, end, line) for loops
+    method_spans: list[tuple[int, int, str]] = []
+    loop_spans: list[tuple[int, int, int]] = []
+
+    # Scope stack entries: [kind, name, start_offset, line]
+    scopes: list[list[Any]] = []
+    stmt_start = 0
+    paren_depth = 0
+
+    def current_class() -> str:
+        for scope in reversed(scopes):
+            if scope[0] == "class":
+                return scope[1]
+        return ""
+
+    for i, c in enumerate(clean):
+        if c == "(":
+            paren_depth += 1
+        elif c == ")":
+            paren_depth = max(0, paren_depth - 1)
+        elif c == "{" and paren_depth > 0:
+            # Collection initializer inside a call or for header, e.g.
+            # `process(new Map<String, Object>{ ... })` — an expression, not a scope
+            scopes.append(["expr", "", i, 0])
+        elif c == "}" and scopes and scopes[-1][0] == "expr":
+            scopes.pop()
+        elif c == "{":
+            header = clean[stmt_start:i]
+            header_stripped = header.strip()
+            header_line = line_of(stmt_start + len(header) - len(header.lstrip()))
+            top = scopes[-1][0] if scopes else ""
+            trig = _TRIGGER_HEADER_RE.match(header) if not scopes else None
+            cls = _CLASS_HEADER_RE.search(header_stripped) if top in ("", "class") else None
+            meth = _METHOD_HEADER_RE.search(header_stripped) if top == "class" else None
+            if trig:
+                kind, sobject = "trigger", trig.group(2)
+                events = [" ".join(e.lower().split()) for e in trig.group(3).split(",") if e.strip()]
+                classes.append(trig.group(1))
+                key = f"{trig.group(1)}.trigger"
+                methods.append({"key": key, "line": header_line})
+                scopes.append(["method", key, i, header_line])
+            elif cls and "(" not in header_stripped[: cls.start()]:
+                outer = current_class()
+                name = f"{outer}.{cls.group(1)}" if outer else cls.group(1)
+                classes.append(name)
+                parent = _EXTENDS_RE.search(header_stripped)
+                if parent:
+                    extends[name] = parent.group(1)
+                scopes.append(["class", name, i, header_line])
+            elif meth and meth.group(1).lower() not in _NOT_CALLS and "=" not in header_stripped:
+                key = f"{current_class()}.{meth.group(1)}"
+                methods.append({"key": key, "line": header_line})
+                scopes.append(["method", key, i, header_line])
+            elif _LOOP_HEADER_RE.match(header):
+                scopes.append(["loop", "", i, header_line])
+            else:
+                scopes.append(["block", "", i, header_line])
+            stmt_start = i + 1
+            paren_depth = 0
+        elif c == "}":
+            if scopes:
+                scope_kind, name, start, line = scopes.pop()
+                if scope_kind == "method":
+                    method_spans.append((start, i, name))
+                elif scope_kind == "loop":
+                    loop_spans.append((start, i, line))
+            stmt_start = i + 1
+            paren_depth = 0
+        elif c == ";" and paren_depth == 0:
+            # Braceless loop body: `for (...) stmt;` — the statement after the
+            # header's closing paren runs once per iteration.
+            stmt = clean[stmt_start:i]
+            m = _BRACELESS_LOOP_RE.match(stmt)
+            if m:
+                close = _matching_paren(stmt, m.end() - 1)
+                if close != -1 and stmt[close + 1 :].strip():
+                    header_line = line_of(stmt_start + len(stmt) - len(stmt.lstrip()))
+                    loop_spans.append((stmt_start + close + 1, i, header_line))
+            stmt_start = i + 1
+
+    method_spans.sort()
+    span_starts = [s for s, _, _ in method_spans]
+
+    def enclosing(offset: int) -> tuple[str, int, int]:
+        """(method key, outermost loop line, loop depth) for a site offset."""
+        idx = bisect.bisect_right(span_starts, offset) - 1
+        if idx < 0 or offset > method_spans[idx][1]:
+            return "", 0, 0
+        m_start, m_end, key = method_spans[idx]
+        loop_line, loop_start, depth = 0, None, 0
+        for l_start, l_end, l_line in loop_spans:
+            if m_start <= l_start <= offset <= l_end:
+                depth += 1
+                if loop_start is None or l_start < loop_start:
+                    loop_start, loop_line = l_start, l_line
+        return key, loop_line, depth
+
+    def sites(pattern: re.Pattern) -> list[dict[str, Any]]:
+        found = []
+        for m in pattern.finditer(clean):
+            key, loop_line, depth = enclosing(m.start())
+            if key:
+                found.append(
+                    {"method": key, "line": line_of(m.start()), "loop_line": loop_line, "loop_depth": depth}
+                )
+        return found
+
+    soql = sites(_SOQL_RE)
+    soql_offsets = {m.start() for m in _SOQL_RE.finditer(clean)}
+
+    calls: list[dict[str, Any]] = []
+    qualified_name_offsets: set[int] = set()
+    for m in _QUALIFIED_CALL_RE.finditer(clean):
+        qualified_name_offsets.add(m.start(2))
+        if m.start() in soql_offsets or m.group(1).lower() == "database":
+            continue
+        key, loop_line, depth = enclosing(m.start())
+        if key:
+            calls.append(
+                {
+                    "caller": key,
+                    "qualifier": m.group(1),
+                    "method": m.group(2),
+                    "line": line_of(m.start()),
+                    "loop_line": loop_line,
+                    "loop_depth": depth,
+                }
+            )
+    for m in _UNQUALIFIED_CALL_RE.finditer(clean):
+        name = m.group(1)
+        if (
+            m.start(1) in qualified_name_offsets
+            or name.lower() in _NOT_CALLS
+            or _NEW_BEFORE_RE.search(clean, max(0, m.start() - 8), m.start())
+        ):
+            continue
+        key, loop_line, depth = enclosing(m.start())
+        if key:
+            calls.append(
+                {
+                    "caller": key,
+                    "qualifier": "",
+                    "method": name,
+                    "line": line_of(m.start()),
+                    "loop_line": loop_line,
+                    "loop_depth": depth,
+                }
+            )
+    calls.sort(key=lambda call: call["line"])
+
+    var_types = {
+        m.group(2): m.group(1)
+        for m in _VAR_DECL_RE.finditer(clean)
+        if m.group(1)[0].isupper() and m.group(1).lower() not in _NOT_CALLS
+    }
+
+    instantiates = []
+    for m in _NEW_CLASS_RE.finditer(clean):
+        key, _, _ = enclosing(m.start())
+        if key:
+            instantiates.append({"method": key, "class": m.group(1), "line": line_of(m.start())})
+
+    symbols: dict[str, Any] = {
+        "kind": kind,
+        "classes": classes,
+        "extends": extends,
+        "instantiates": instantiates,
+        "methods": methods,
+        "var_types": var_types,
+        "calls": calls,
+        "soql": soql,
+        "dml": sites(_DML_RE),
+        "collections": sites(_COLLECTION_GROWTH_RE),
+    }
+    if kind == "trigger":
+        symbols["sobject"] = sobject
+        symbols["events"] = events
+    return symbols
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Index
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class ApexSymbolIndex:
+    """Symbol table and call graph over a set of Apex files.
+
+    Usage:
+        index = ApexSymbolIndex.load("apex_index.json")
+        index.update(["force-app/main/default/classes"])
+        index.save()
+        for finding in index.loop_findings():
+            ...
+    """
+
+    def __init__(self, index_path: str | os.PathLike | None = None):
+        self.index_path = Path(index_path) if index_path else None
+        # rel/abs path → {"sha256": ..., "symbols": {...}}
+        self.files: dict[str, dict[str, Any]] = {}
+        self.parsed_count = 0
+        self._graph: dict[str, Any] | None = None
+
+    # ── persistence ─────────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, index_path: str | os.PathLike) -> "ApexSymbolIndex":
+        """Load a persisted index, or start empty if missing or stale."""
+        index = cls(index_path)
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                index.files = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+        return index
+
+    def save(self) -> None:
+        """Write the index atomically (temp file + rename)."""
+        if self.index_path is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(self.index_path.name + f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files}, f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    # ── building ────────────────────────────────────────────────────────
+
+    def update(self, roots: list[str | os.PathLike]) -> None:
+        """Index every .cls/.trigger under *roots*, re-parsing only changed files.
+
+        Entries for files that no longer exist under the roots are dropped.
+        """
+        seen: set[str] = set()
+        for root in roots:
+            root = Path(root)
+            paths = [root] if root.is_file() else sorted(
+                p for p in root.rglob("*") if p.suffix in APEX_SUFFIXES and p.is_file()
+            )
+            for path in paths:
+                key = str(path)
+                seen.add(key)
+                try:
+                    raw = path.read_bytes()
+                except OSError:
+                    continue
+                digest = hashlib.sha256(raw).hexdigest()
+                cached = self.files.get(key)
+                if cached and cached.get("sha256") == digest:
+                    continue
+                symbols = parse_apex_symbols(raw.decode("utf-8", errors="replace"))
+                self.files[key] = {"sha256": digest, "symbols": symbols}
+                self.parsed_count += 1
+        for stale in set(self.files) - seen:
+            del self.files[stale]
+        self._graph = None
+
+    def add_source(self, path: str, source: str) -> None:
+        """Index in-memory source under *path* (replaces any existing entry)."""
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        cached = self.files.get(path)
+        if not cached or cached.get("sha256") != digest:
+            self.files[path] = {"sha256": digest, "symbols": parse_apex_symbols(source)}
+            self.parsed_count += 1
+        self._graph = None
+
+    # ── call graph ──────────────────────────────────────────────────────
+
+    def _build_graph(self) -> dict[str, Any]:
+        """Resolve call sites to method keys and compute reachability.
+
+        Method keys are ``Class.method`` (lower-cased for lookup — Apex is
+        case-insensitive). Overloads collapse into one node.
+        """
+        display: dict[str, str] = {}
+        method_file: dict[str, tuple[str, int]] = {}
+        class_names: dict[str, str] = {}  # lower simple/qualified name → display
+        for path, entry in self.files.items():
+            symbols = entry["symbols"]
+            for name in symbols["classes"]:
+                class_names.setdefault(name.lower(), name)
+                class_names.setdefault(name.rsplit(".", 1)[-1].lower(), name)
+            for meth in symbols["methods"]:
+                lk = meth["key"].lower()
+                display.setdefault(lk, meth["key"])
+                method_file.setdefault(lk, (path, meth["line"]))
+
+        edges: dict[str, set[str]] = {}
+        resolved_calls: list[tuple[str, dict[str, Any], str]] = []  # (path, call, target)
+        direct: dict[str, dict[str, tuple[str, int]]] = {k: {} for k in SITE_KINDS}
+
+        for path, entry in self.files.items():
+            symbols = entry["symbols"]
+            var_types = {k.lower(): v for k, v in symbols.get("var_types", {}).items()}
+            top_class = symbols["classes"][0] if symbols["classes"] else ""
+            for call in symbols["calls"]:
+                caller = call["caller"]
+                caller_class = caller.rsplit(".", 1)[0]
+                target = None
+                qualifier = call["qualifier"]
+                if not qualifier or qualifier.lower() == "this":
+                    for owner in (caller_class, top_class):
+                        candidate = f"{owner}.{call['method']}".lower()
+                        if candidate in display:
+                            target = candidate
+                            break
+                else:
+                    owner = class_names.get(qualifier.lower())
+                    if owner is None:
+                        owner = class_names.get(var_types.get(qualifier.lower(), "").lower())
+                    if owner is not None:
+                        candidate = f"{owner}.{call['method']}".lower()
+                        if candidate in display:
+                            target = candidate
+                if target is None or target == caller.lower():
+                    continue
+                edges.setdefault(caller.lower(), set()).add(target)
+                resolved_calls.append((path, call, target))
+            for site_kind in SITE_KINDS:
+                for site in symbols[site_kind]:
+                    direct[site_kind].setdefault(site["method"].lower(), (path, site["line"]))
+
+        # Reverse BFS from every method with a direct site: O(V + E) per kind,
+        # cycle-safe, and next_hop reconstructs a shortest witness path.
+        reverse: dict[str, set[str]] = {}
+        for src, targets in edges.items():
+            for dst in targets:
+                reverse.setdefault(dst, set()).add(src)
+        next_hop: dict[str, dict[str, str | None]] = {}
+        for site_kind in SITE_KINDS:
+            hops: dict[str, str | None] = dict.fromkeys(direct[site_kind])
+            queue = deque(direct[site_kind])
+            while queue:
+                node = queue.popleft()
+                for caller in sorted(reverse.get(node, ())):
+                    if caller not in hops:
+                        hops[caller] = node
+                        queue.append(caller)
+            next_hop[site_kind] = hops
+
+        return {
+            "display": display,
+            "method_file": method_file,
+            "edges": edges,
+            "resolved_calls": resolved_calls,
+            "direct": direct,
+            "next_hop": next_hop,
+        }
+
+    @property
+    def graph(self) -> dict[str, Any]:
+        if self._graph is None:
+            self._graph = self._build_graph()
+        return self._graph
+
+    def reaches(self, method: str, kind: str) -> list[str] | None:
+        """Call chain from *method* to a method that issues *kind* ("soql"/"dml").
+
+        Returns the chain of display names, starting with *method* and ending
+        with the method that contains the site, or None if unreachable.
+        """
+        graph = self.graph
+        hops = graph["next_hop"][kind]
+        node = method.lower()
+        if node not in hops:
+            return None
+        chain = []
+        while node is not None:
+            chain.append(graph["display"].get(node, node))
+            node = hops[node]
+        return chain
+
+    def callees(self, method: str) -> list[str]:
+        """Resolved direct callees of *method* (display names)."""
+        graph = self.graph
+        return sorted(graph["display"][t] for t in graph["edges"].get(method.lower(), ()))
+
+    def loop_findings(self) -> list[dict[str, Any]]:
+        """Calls made inside a loop that transitively reach SOQL or DML.
+
+        Direct SOQL/DML on the loop's own lines is ApexValidator's job and is
+        not repeated here.
+        """
+        graph = self.graph
+        findings = []
+        for path, call, target in graph["resolved_calls"]:
+            if not call["loop_line"]:
+                continue
+            for site_kind in SITE_KINDS:
+                chain = self.reaches(target, site_kind)
+                if chain is None:
+                    continue
+                site_path, site_line = graph["direct"][site_kind][chain[-1].lower()]
+                label = "SOQL" if site_kind == "soql" else "DML"
+                findings.append(
+                    {
+                        "severity": "CRITICAL",
+                        "category": "bulkification",
+                        "kind": site_kind,
+                        "file": path,
+                        "line": call["line"],
+                        "loop_line": call["loop_line"],
+                        "caller": call["caller"],
+                        "chain": chain,
+                        "site": {"file": site_path, "line": site_line},
+                        "message": (
+                            f"{label} reachable inside loop (loop started line "
+                            f"{call['loop_line']}) via {' → '.join(chain)} "
+                            f"({os.path.basename(site_path)}:{site_line})"
+                        ),
+                        "fix": "Bulkify the callee to accept a collection and call it once after the loop",
+                    }
+                )
+        findings.sort(key=lambda f: (f["file"], f["line"], f["kind"]))
+        return findings
+
+
+def default_index_path(root: str | os.PathLike) -> Path:
+    """Index file for *root* under CACHE_DIR, keyed by its absolute path."""
+    root = Path(root)
+    base = root if root.is_dir() else root.parent
+    key = hashlib.sha256(str(base.resolve()).encode("utf-8")).hexdigest()[:24]
+    return CACHE_DIR / f"{key}.json"
+
+
+def build_index(
+    roots: list[str | os.PathLike], index_path: str | os.PathLike | None = None
+) -> ApexSymbolIndex:
+    """Load (if *index_path* exists), refresh over *roots*, and save."""
+    index = ApexSymbolIndex.load(index_path) if index_path else ApexSymbolIndex()
+    index.update(roots)
+    index.save()
+    return index
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Index Apex files and report SOQL/DML reachable from inside loops"
+    )
+    parser.add_argument("roots", nargs="+", help="Directories or files to index")
+    parser.add_argument(
+        "--index",
+        help=f"Index file (default: one per first root under {CACHE_DIR})",
+    )
+    parser.add_argument("--json", action="store_true", help="Print findings as JSON")
+    args = parser.parse_args()
+
+    index_path = args.index or default_index_path(args.roots[0])
+    index = build_index(args.roots, index_path)
+    findings = index.loop_findings()
+
+    if args.json:
+        print(json.dumps(findings, indent=2))
+    else:
+        print(
+            f"Indexed {len(index.files)} files ({index.parsed_count} parsed, "
+            f"{len(index.files) - index.parsed_count} from cache)"
+        )
+        for f in findings:
+            print(f"  🔴 {f['file']}:{f['line']}: {f['message']}")
+        if not findings:
+            print("✅ No SOQL/DML reachable from inside loops")
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Static governor-limit cost model for Apex methods.
+
+Built on the org-wide symbol index (apex_index.py): every SOQL, DML and
+collection-growth site carries the number of loops enclosing it in its
+method. Assuming each loop iterates over the input collection (size N), a
+site at loop depth d runs N^d times, and a call at depth d costs N^d times
+the callee's own cost. Summing per method gives a cost polynomial in N, e.g.
+
+    AccountService.sync   SOQL: N² + 2   DML: N + 1   heap: 2N
+
+and from it the smallest N at which the synchronous limits — 100 SOQL
+queries, 150 DML statements — are exceeded. Ranking methods by that N
+orders an org by predicted limit exposure instead of raw issue count.
+
+Heap is modelled as elements added to collections in the method's own body
+(locals of a callee are released when it returns), so it is not transitive.
+Methods that call each other recursively share one cost — the sum of their
+bodies, multiplied by N^d for the deepest loop a call inside the cycle sits
+in, i.e. one round of the recursion — and are flagged ``recursive`` because
+their real cost depends on the recursion depth.
+
+Usage:
+    python governor_cost.py <dir> [<dir> ...] [--index PATH] [--top K] [--json]
+
+Exit codes:
+    0 — no method exceeds a limit within one trigger batch (N <= 200)
+    1 — at least one does, or bad arguments
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from apex_index import CACHE_DIR, build_index, default_index_path  # noqa: E402
+
+# Synchronous per-transaction limits
+LIMITS = {"soql": 100, "dml": 150}
+
+# Records per trigger invocation; a breach at or below this N fails on a
+# single bulk insert/update.
+BATCH_SIZE = 200
+
+# Polynomials are coefficient lists indexed by degree; deeper nesting is
+# folded into the top degree so pathological call chains stay bounded.
+MAX_DEGREE = 6
+
+_SUPERSCRIPTS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Polynomials in N
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def poly_add(a: list[int], b: list[int], shift: int = 0) -> list[int]:
+    """``a + N^shift * b``."""
+    out = list(a)
+    for degree, coeff in enumerate(b):
+        target = min(degree + shift, MAX_DEGREE)
+        out.extend([0] * (target + 1 - len(out)))
+        out[target] += coeff
+    return out
+
+
+def evaluate(poly: list[int], n: int) -> int:
+    total = 0
+    for coeff in reversed(poly):
+        total = total * n + coeff
+    return total
+
+
+def degree(poly: list[int]) -> int:
+    """Highest degree with a non-zero coefficient (-1 for the zero polynomial)."""
+    for d in range(len(poly) - 1, -1, -1):
+        if poly[d]:
+            return d
+    return -1
+
+
+def format_poly(poly: list[int]) -> str:
+    """Human-readable form, highest degree first (``"2N² + N + 3"``)."""
+    terms = []
+    for d in range(len(poly) - 1, -1, -1):
+        coeff = poly[d]
+        if not coeff:
+            continue
+        if d == 0:
+            terms.append(str(coeff))
+            continue
+        power = "N" if d == 1 else "N" + str(d).translate(_SUPERSCRIPTS)
+        terms.append(power if coeff == 1 else f"{coeff}{power}")
+    return " + ".join(terms) or "0"
+
+
+def breach_n(poly: list[int], limit: int) -> int | None:
+    """Smallest N >= 1 with ``poly(N) > limit``, or None if it never exceeds it.
+
+    Coefficients are non-negative, so the polynomial is non-decreasing in N
+    and a doubling search followed by bisection finds the boundary.
+    """
+    if evaluate(poly, 1) > limit:
+        return 1
+    if degree(poly) < 1:
+        return None
+    hi = 2
+    while evaluate(poly, hi) <= limit:
+        hi *= 2
+    lo = hi // 2  # poly(lo) <= limit < poly(hi)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if evaluate(poly, mid) > limit:
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Per-method costs
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def method_costs(index) -> dict[str, dict[str, Any]]:
+    """Cost polynomials for every method in an ApexSymbolIndex.
+
+    Returns ``{lower-case method key: {"method", "file", "line", "soql",
+    "dml", "heap", "recursive"}}`` where the cost entries are coefficient
+    lists (index = power of N).
+    """
+    graph = index.graph
+    direct: dict[str, dict[str, list[int]]] = {}
+    for entry in index.files.values():
+        symbols = entry["symbols"]
+        for kind, sites in (
+            ("soql", symbols["soql"]),
+            ("dml", symbols["dml"]),
+            ("heap", symbols.get("collections", [])),
+        ):
+            for site in sites:
+                costs = direct.setdefault(site["method"].lower(), {"soql": [], "dml": [], "heap": []})
+                costs[kind] = poly_add(costs[kind], [1], site.get("loop_depth", 0))
+
+    calls: dict[str, list[tuple[str, int]]] = {}
+    for _path, call, target in graph["resolved_calls"]:
+        calls.setdefault(call["caller"].lower(), []).append((target, call.get("loop_depth", 0)))
+
+    totals: dict[str, dict[str, Any]] = {}
+    for component in _strongly_connected(sorted(graph["display"]), calls):
+        members = set(component)
+        soql: list[int] = []
+        dml: list[int] = []
+        recursive = len(component) > 1
+        cycle_depth = 0
+        for key in component:
+            own = direct.get(key, {})
+            soql = poly_add(soql, own.get("soql", []))
+            dml = poly_add(dml, own.get("dml", []))
+            for target, depth in calls.get(key, []):
+                if target in members:
+                    cycle_depth = max(cycle_depth, depth)
+                    continue
+                callee = totals[target]
+                soql = poly_add(soql, callee["soql"], depth)
+                dml = poly_add(dml, callee["dml"], depth)
+                recursive = recursive or callee["recursive"]
+        if cycle_depth:
+            soql, dml = poly_add([], soql, cycle_depth), poly_add([], dml, cycle_depth)
+        for key in component:
+            path, line = graph["method_file"].get(key, ("", 0))
+            totals[key] = {
+                "method": graph["display"].get(key, key),
+                "file": path,
+                "line": line,
+                "soql": soql,
+                "dml": dml,
+                "heap": list(direct.get(key, {}).get("heap", [])),
+                "recursive": recursive,
+            }
+    return totals
+
+
+def _strongly_connected(nodes: list[str], calls: dict[str, list[tuple[str, int]]]) -> list[list[str]]:
+    """Tarjan's SCCs, iteratively, callees before callers.
+
+    Methods in one component call each other recursively and share one cost.
+    """
+    order: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[list[str]] = []
+    for root in nodes:
+        if root in order:
+            continue
+        work = [(root, iter(calls.get(root, [])))]
+        order[root] = low[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, edges = work[-1]
+            for target, _depth in edges:
+                if target not in order:
+                    order[target] = low[target] = len(order)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(calls.get(target, []))))
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], order[target])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def rank_methods(costs: dict[str, dict[str, Any]], top: int | None = None) -> list[dict[str, Any]]:
+    """Methods ordered by predicted limit exposure (worst first).
+
+    Each row adds ``breach`` ({"soql": N | None, "dml": N | None}) and the
+    formatted polynomials. Methods with no SOQL, DML or collection growth
+    are omitted. Ordering: smallest breach N, then highest degree, then
+    largest value at N = BATCH_SIZE.
+    """
+    rows = []
+    for cost in costs.values():
+        if degree(cost["soql"]) < 0 and degree(cost["dml"]) < 0 and degree(cost["heap"]) < 0:
+            continue
+        breach = {kind: breach_n(cost[kind], limit) for kind, limit in LIMITS.items()}
+        rows.append(
+            {
+                **cost,
+                "breach": breach,
+                "formatted": {kind: format_poly(cost[kind]) for kind in ("soql", "dml", "heap")},
+            }
+        )
+
+    def exposure(row: dict[str, Any]):
+        first = min((n for n in row["breach"].values() if n is not None), default=sys.maxsize)
+        worst_degree = max(degree(row["soql"]), degree(row["dml"]))
+        at_batch = max(
+            evaluate(row["soql"], BATCH_SIZE) / LIMITS["soql"],
+            evaluate(row["dml"], BATCH_SIZE) / LIMITS["dml"],
+        )
+        return (first, -worst_degree, -at_batch, row["method"])
+
+    rows.sort(key=exposure)
+    return rows[:top] if top else rows
+
+
+def exposure_message(row: dict[str, Any]) -> str | None:
+    """One-line finding for a method that breaches a limit within BATCH_SIZE."""
+    parts = []
+    for kind, label in (("soql", "SOQL"), ("dml", "DML")):
+        n = row["breach"][kind]
+        if n is not None and n <= BATCH_SIZE:
+            parts.append(
+                f"{label} {row['formatted'][kind]} exceeds {LIMITS[kind]} at N={n}"
+            )
+    if not parts:
+        return None
+    return f"Governor exposure in {row['method']}: " + "; ".join(parts)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Rank Apex methods by predicted SOQL/DML governor-limit exposure"
+    )
+    parser.add_argument("roots", nargs="+", help="Directories or files to index")
+    parser.add_argument(
+        "--index",
+        help=f"Index file (default: one per first root under {CACHE_DIR})",
+    )
+    parser.add_argument("--top", type=int, default=20, help="Methods to show (0 = all)")
+    parser.add_argument("--json", action="store_true", help="Print ranked rows as JSON")
+    args = parser.parse_args()
+
+    index_path = args.index or default_index_path(args.roots[0])
+    rows = rank_methods(method_costs(build_index(args.roots, index_path)))
+    exposed = [row for row in rows if exposure_message(row)]
+    shown = rows[: args.top] if args.top else rows
+
+    if args.json:
+        print(json.dumps(shown, indent=2))
+    else:
+        print(f"{len(rows)} methods with SOQL, DML or collection growth; {len(exposed)} exceed a limit at N <= {BATCH_SIZE}")
+        for row in shown:
+            breach = ", ".join(
+                f"{kind.upper()} @ N={n}" for kind, n in row["breach"].items() if n is not None
+            ) or "no breach"
+            flag = "🔴" if exposure_message(row) else "🟢"
+            recursive = " (recursive)" if row["recursive"] else ""
+            print(
+                f"  {flag} {row['method']}{recursive} — SOQL: {row['formatted']['soql']}, "
+                f"DML: {row['formatted']['dml']}, heap: {row['formatted']['heap']} [{breach}]"
+            )
+            print(f"       {row['file']}:{row['line']}")
+    return 1 if exposed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
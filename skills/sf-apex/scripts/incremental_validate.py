@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Incremental Apex re-validation for the post-tool hook.
+
+Re-running ApexValidator and LLMPatternValidator over a whole 3,000-line class
+after every Edit costs far more than the edit itself. This module keeps the
+previous version of each file, split into regions (class header, then one
+region per member at class depth, or per statement in a trigger body), with
+the rule results and score deductions of every region. After an edit only the
+regions around the changed lines are re-lexed and re-checked; every other
+region's results are reused, shifted by the line delta, and merged back into
+the file-level score.
+
+A full pass is taken when there is no cache entry, when the API version,
+the object-describe or org statistics snapshot or the LLM rule packs change,
+or when the edit changes a file-wide fact the per-line rules depend on
+(class names, @isTest position, escapeSingleQuotes). A blank or unreadable
+file is handed to the full validators uncached. The merged result matches
+ApexValidator.validate() plus LLMPatternValidator.validate().
+
+Cache: one JSON file per source path under CACHE_DIR, keyed by the absolute
+path and checked against the content hash.
+
+Usage:
+    from incremental_validate import validate_incremental
+
+    results = validate_incremental("AccountService.cls", tool_input)
+    results["score"], results["issues"], results["llm_issues"]
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from llm_pattern_validator import LLMPatternValidator  # noqa: E402
+from validate_apex import ApexValidator  # noqa: E402
+
+CACHE_DIR = Path(tempfile.gettempdir()) / "sf_apex_incremental"
+CACHE_VERSION = 3
+
+# How far rule results reach across lines. SOQL field coverage reads the 20
+# lines after a query, so an edit can change the finding on a query up to 20
+# lines above it; Map.get() null checks (6) and ApexDoc lookup (4) read lines
+# above, so an edit can change findings up to 6 lines below it.
+CONTEXT_BEFORE = 20
+CONTEXT_AFTER = 6
+
+# Messages that embed a line number; rewritten when a region shifts.
+_LINE_REF_RE = re.compile(r"(loop started line |SOQL on line |read on line )(\d+)")
+
+# Same string/comment stripping as ApexValidator's loop map
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_LINE_COMMENT_RE = re.compile(r"//.*$")
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Regions
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def segment_regions(lines: list[str], start: int = 1, depth: int = 0):
+    """
+    Split ``lines`` from ``start`` on into regions that begin outside any loop.
+
+    A region ends on a line that closes back to class depth (brace depth <= 1)
+    with ``{``, ``}`` or ``;``: the class header, each field or method
+    (together with the comments and annotations above it) and, in a trigger,
+    each top-level statement. ``depth`` is the brace depth before ``start``.
+
+    Yields:
+        (start_line, end_line, depth_before, depth_after) tuples
+    """
+    region_start, region_depth = start, depth
+    for i in range(start, len(lines) + 1):
+        line = lines[i - 1]
+        stripped = line.strip()
+        if stripped.startswith("//") or stripped.startswith("*") or stripped.startswith("/*"):
+            continue
+        code = _STRING_RE.sub("''", line)
+        code = _LINE_COMMENT_RE.sub("", code)
+        code = _BLOCK_COMMENT_RE.sub("", code).rstrip()
+        depth += code.count("{") - code.count("}")
+        if depth <= 1 and code.endswith(("{", "}", ";")):
+            yield region_start, i, region_depth, depth
+            region_start, region_depth = i + 1, depth
+    if region_start <= len(lines):
+        yield region_start, len(lines), region_depth, depth
+
+
+def _check_region(apex, llm, start: int, end: int, depth: int) -> dict:
+    custom = apex.check_lines(start, end)
+    return {
+        "start": start,
+        "end": end,
+        "depth": depth,
+        "issues": custom["issues"],
+        "deductions": custom["deductions"],
+        "llm_issues": llm.check_lines(start, end)["issues"] if llm is not None else [],
+    }
+
+
+def _shift_issue(issue: dict, delta: int) -> dict:
+    shifted = dict(issue)
+    shifted["line"] = issue["line"] + delta
+    shifted["message"] = _LINE_REF_RE.sub(
+        lambda m: f"{m.group(1)}{int(m.group(2)) + delta}", issue["message"]
+    )
+    return shifted
+
+
+def _shift_region(region: dict, delta: int) -> dict:
+    if not delta:
+        return region
+    return {
+        **region,
+        "start": region["start"] + delta,
+        "end": region["end"] + delta,
+        "issues": [_shift_issue(i, delta) for i in region["issues"]],
+        "llm_issues": [_shift_issue(i, delta) for i in region["llm_issues"]],
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Change detection
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def changed_lines(old_lines: list[str], new_lines: list[str], tool_input: dict | None = None):
+    """
+    Locate the edited lines.
+
+    Uses the Edit tool's ``old_string``/``new_string`` when they identify a
+    single replacement that turns the old text into the new one; otherwise
+    falls back to a common prefix/suffix comparison of the two line lists.
+
+    Returns:
+        (first, old_last, new_last): the edit replaced old lines
+        first..old_last with new lines first..new_last (1-based, inclusive;
+        a pure insertion or deletion has last == first - 1 on one side).
+    """
+    edit = tool_input or {}
+    old_string, new_string = edit.get("old_string"), edit.get("new_string")
+    if old_string and new_string is not None and not edit.get("replace_all"):
+        old_text = "\n".join(old_lines)
+        if old_text.count(old_string) == 1:
+            idx = old_text.find(old_string)
+            if old_text[:idx] + new_string + old_text[idx + len(old_string) :] == "\n".join(
+                new_lines
+            ):
+                first = old_text.count("\n", 0, idx) + 1
+                return (
+                    first,
+                    first + old_string.count("\n"),
+                    first + new_string.count("\n"),
+                )
+
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and old_lines[len(old_lines) - 1 - suffix] == new_lines[len(new_lines) - 1 - suffix]
+    ):
+        suffix += 1
+    return prefix + 1, len(old_lines) - suffix, len(new_lines) - suffix
+
+
+def _same_test_boundary(old: int, new: int, first: int, old_last: int, delta: int) -> bool:
+    """Whether every unchanged line stays on the same side of the first @isTest."""
+    if old == new and (old == 0 or old < first):
+        return True
+    return old > old_last and new == old + delta
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Cache
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def _cache_path(file_path: str) -> Path:
+    key = hashlib.sha256(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:24]
+    return CACHE_DIR / f"{key}.json"
+
+
+def _load_entry(file_path: str) -> dict | None:
+    try:
+        entry = json.loads(_cache_path(file_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if entry.get("version") != CACHE_VERSION or entry.get("path") != os.path.abspath(file_path):
+        return None
+    return entry
+
+
+def _save_entry(file_path: str, entry: dict):
+    path = _cache_path(file_path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # The cache is an optimisation; never fail validation over it
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Validation
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def _rules_key(llm) -> str:
+    """Identity of the describe and statistics snapshots and rule packs the LLM checks use."""
+    if llm is None:
+        return json.dumps(None)
+    describe = llm.describe.fingerprint if llm.describe is not None else None
+    stats = llm.stats.fingerprint if llm.stats is not None else None
+    return json.dumps([describe, stats, llm.rules.fingerprint])
+
+
+def _full_entry(file_path, text, lines, apex, llm, api_version) -> dict:
+    regions = [
+        _check_region(apex, llm, start, end, depth)
+        for start, end, depth, _after in segment_regions(lines)
+    ]
+    return {
+        "version": CACHE_VERSION,
+        "path": os.path.abspath(file_path),
+        "hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "api_version": api_version,
+        "rules": _rules_key(llm),
+        "lines": lines,
+        "facts": apex.file_facts(),
+        "regions": regions,
+        "rechecked_lines": len(lines),
+    }
+
+
+def _incremental_entry(entry, text, lines, apex, llm, tool_input) -> dict | None:
+    """Re-check only the regions an edit can affect; None when a full pass is needed."""
+    old_lines, regions = entry["lines"], entry["regions"]
+    if not regions:
+        return None
+    first, old_last, new_last = changed_lines(old_lines, lines, tool_input)
+    delta = new_last - old_last
+
+    facts = apex.file_facts()
+    old_facts = entry["facts"]
+    if facts["has_escape"] != old_facts["has_escape"]:
+        return None
+    if facts["class_names"] != old_facts["class_names"]:
+        return None
+    if not _same_test_boundary(
+        old_facts["first_is_test_line"], facts["first_is_test_line"], first, old_last, delta
+    ):
+        return None
+
+    # Old regions whose findings the edit can change
+    lo, hi = first - CONTEXT_BEFORE, max(old_last, first) + CONTEXT_AFTER
+    dirty = [k for k, r in enumerate(regions) if r["end"] >= lo and r["start"] <= hi]
+    if not dirty:
+        return None
+    first_dirty, last_dirty = dirty[0], dirty[-1]
+    new_hi = regions[last_dirty]["end"] + delta
+    old_region_at_end = {r["end"]: k for k, r in enumerate(regions)}
+
+    # Re-segment from the first dirty region until a boundary lines up with an
+    # old boundary again (same line after the shift, same brace depth).
+    fresh = []
+    resume = len(regions)
+    start_region = regions[first_dirty]
+    for start, end, depth, after in segment_regions(lines, start_region["start"], start_region["depth"]):
+        fresh.append(_check_region(apex, llm, start, end, depth))
+        if end < new_hi:
+            continue
+        k = old_region_at_end.get(end - delta)
+        if k is not None and k >= last_dirty and (
+            k + 1 == len(regions) or regions[k + 1]["depth"] == after
+        ):
+            resume = k + 1
+            break
+
+    return {
+        **entry,
+        "hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "lines": lines,
+        "facts": facts,
+        "regions": regions[:first_dirty]
+        + fresh
+        + [_shift_region(r, delta) for r in regions[resume:]],
+        "rechecked_lines": sum(r["end"] - r["start"] + 1 for r in fresh),
+    }
+
+
+def _results(file_path: str, file_level: dict, entry: dict, mode: str, warnings: list) -> dict:
+    deductions = dict(file_level["deductions"])
+    issues = list(file_level["issues"])
+    llm_issues = []
+    for region in entry["regions"]:
+        for cat, points in region["deductions"].items():
+            deductions[cat] = deductions.get(cat, 0) + points
+        issues.extend(region["issues"])
+        llm_issues.extend(region["llm_issues"])
+
+    scores = {cat: cap - deductions.get(cat, 0) for cat, cap in ApexValidator.CATEGORY_MAX.items()}
+    total_score = sum(scores.values())
+    return {
+        "file": os.path.basename(file_path),
+        "score": total_score,
+        "max_score": 150,
+        "rating": ApexValidator.rating_for(total_score),
+        "scores": scores,
+        "issues": sorted(issues, key=lambda i: i.get("line", 0)),
+        "llm_issues": sorted(llm_issues, key=lambda i: i.get("line", 0)),
+        "incremental": {"mode": mode, "rechecked_lines": entry["rechecked_lines"]},
+        "warnings": warnings,
+    }
+
+
+def _uncached(apex: ApexValidator, llm, warnings: list) -> dict:
+    """Plain full validation, for a file with nothing to cache (unreadable or blank)."""
+    results = apex.validate()
+    results["llm_issues"] = llm.validate()["issues"] if llm is not None else []
+    results["incremental"] = {"mode": "full", "rechecked_lines": 0}
+    results["warnings"] = warnings
+    return results
+
+
+def validate_incremental(
+    file_path: str, tool_input: dict | None = None, api_version: float | None = None
+) -> dict:
+    """
+    Validate an Apex file, re-checking only what changed since the last call.
+
+    Args:
+        file_path: Path to .cls or .trigger file (already written to disk)
+        tool_input: The Edit/Write tool input; ``old_string``/``new_string``
+            are used to locate the edit when present
+        api_version: Deploy ApiVersion, as for ApexValidator
+
+    Returns:
+        ApexValidator.validate()-style dict with ``llm_issues`` (the
+        LLMPatternValidator findings), ``incremental``:
+        {"mode": "full"|"incremental"|"cached", "rechecked_lines": int},
+        and ``warnings`` — e.g. when a describe, statistics or rule-pack
+        file cannot be loaded, the LLM checks are skipped and the 150-point
+        score is still returned
+    """
+    try:
+        with open(file_path, encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return _uncached(ApexValidator(file_path, api_version=api_version), None, [])
+
+    name = os.path.basename(file_path)
+    lines = text.split("\n")
+    apex = ApexValidator.from_source(text, name, api_version=api_version)
+    warnings = []
+    try:
+        llm = LLMPatternValidator.from_source(text, name)
+    except Exception as e:  # a bad $SF_DESCRIBE_CACHE / $SF_APEX_RULE_PACKS / $SF_ORG_STATS file
+        llm = None
+        warnings.append(f"LLM pattern checks skipped: {e}")
+    if not text.strip():
+        return _uncached(apex, llm, warnings)
+    file_level = apex.check_file_level()
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    entry = _load_entry(file_path)
+    if entry is not None and (
+        entry.get("api_version") != api_version or entry.get("rules") != _rules_key(llm)
+    ):
+        entry = None
+
+    if entry is not None and entry["hash"] == text_hash:
+        return _results(file_path, file_level, {**entry, "rechecked_lines": 0}, "cached", warnings)
+
+    mode = "incremental"
+    new_entry = _incremental_entry(entry, text, lines, apex, llm, tool_input) if entry else None
+    if new_entry is None:
+        mode = "full"
+        new_entry = _full_entry(file_path, text, lines, apex, llm, api_version)
+    _save_entry(file_path, new_entry)
+    return _results(file_path, file_level, new_entry, mode, warnings)
@@ -6,15 +6,165 @@ Detects common mistakes that LLMs make when generating Salesforce Apex code:
 1. Java types (ArrayList, HashMap, StringBuilder, etc.)
 2. Hallucinated methods (addMilliseconds, stream(), etc.)
 3. Unsafe Map access (Map.get() without null checks)
-4. Missing SOQL fields (accessing fields not in query)
+4. Missing SOQL fields (accessing fields not in query), parsed with the
+   sf-data SOQL parser and, when a describe snapshot is configured, checked
+   for fields that do not exist on the object
+5. Non-selective SOQL on large objects, when an org statistics snapshot is
+   configured (sf-data query_plan.py)
 
 This validator is ADVISORY - it provides warnings but does not block operations.
 
 Source: https://salesforcediaries.com/2026/01/16/llm-mistakes-in-apex-lwc-salesforce-code-generation-rules/
 """
 
+import json
 import re
 import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from soql_in_apex import (  # noqa: E402
+    extract_queries,
+    field_reads,
+    is_selected,
+    load_describe,
+    load_org_stats,
+    selectivity_warning,
+)
+
+# Object-describe snapshot used when no ``describe`` argument is given
+DESCRIBE_ENV = "SF_DESCRIBE_CACHE"
+
+# Org statistics snapshot used when no ``stats`` argument is given
+ORG_STATS_ENV = "SF_ORG_STATS"
+
+# Rule packs (files or directories of *.json, os.pathsep-separated) used when
+# no ``rule_packs`` argument is given
+RULE_PACKS_ENV = "SF_APEX_RULE_PACKS"
+
+# ``TypeName<`` on one line — identifier tokens looked up in the Java type table
+_GENERIC_TYPE_RE = re.compile(r"\b([A-Za-z_]\w*)[ \t]*<")
+
+
+class RulePackError(ValueError):
+    """Raised when a rule pack cannot be read or contains an invalid rule."""
+
+
+class RuleTable:
+    """
+    Compiled Java-type and hallucinated-method rules.
+
+    Every rule pattern is compiled once, and all of them are also joined into
+    one case-insensitive alternation. A line is searched with the combined
+    regex first; only lines it hits are checked rule by rule, so each line is
+    scanned once however many rules there are. The alternatives are
+    non-capturing on purpose: capturing groups disable the regex engine's
+    literal-prefix scan and make the combined search about five times slower.
+    """
+
+    def __init__(self, java_types: dict, methods: list):
+        # Identifies the rule packs a table was built from (for result caches)
+        self.fingerprint = "[]"
+        self.java_types = dict(java_types)
+        # Report order: position in the table, as the rule-by-rule loops did
+        self.java_order = {name: n for n, name in enumerate(self.java_types)}
+        self.rules = []
+        for pattern, message, *extra in methods:
+            options = extra[0] if extra else {}
+            self.rules.append(
+                {
+                    "regex": re.compile(pattern, re.IGNORECASE),
+                    "message": message,
+                    "severity": options.get("severity", "CRITICAL"),
+                    "category": options.get("category", "hallucinated_method"),
+                    "fix": options.get("fix"),
+                }
+            )
+        self.combined = (
+            re.compile("|".join(f"(?:{rule['regex'].pattern})" for rule in self.rules), re.IGNORECASE)
+            if self.rules
+            else None
+        )
+
+    def extend(self, pack: dict, source: str) -> "RuleTable":
+        """A new table with a rule pack's entries appended (see load_rule_pack)."""
+        java_types = {**self.java_types, **pack.get("java_types", {})}
+        methods = [
+            (r["regex"].pattern, r["message"], {k: r[k] for k in ("severity", "category", "fix")})
+            for r in self.rules
+        ]
+        for n, rule in enumerate(pack.get("hallucinated_methods", [])):
+            if not isinstance(rule, dict) or not rule.get("pattern") or not rule.get("message"):
+                raise RulePackError(f"{source}: hallucinated_methods[{n}] needs 'pattern' and 'message'")
+            try:
+                re.compile(rule["pattern"])
+            except re.error as e:
+                raise RulePackError(f"{source}: hallucinated_methods[{n}]: {e}") from e
+            options = {k: rule[k] for k in ("severity", "category", "fix") if k in rule}
+            methods.append((rule["pattern"], rule["message"], options))
+        try:
+            return RuleTable(java_types, methods)
+        except re.error as e:
+            # Group names / numbered back-references clash once rules are combined
+            raise RulePackError(f"{source}: {e}") from e
+
+
+def load_rule_pack(path: str | os.PathLike) -> dict:
+    """
+    Read a JSON rule pack::
+
+        {
+          "name": "acme-apex-rules",
+          "java_types": {"Optional": "null checks"},
+          "hallucinated_methods": [
+            {"pattern": "\\.legacyCall\\s*\\(", "message": "legacyCall() was removed",
+             "severity": "WARNING", "category": "org_rule", "fix": "Use newCall()"}
+          ]
+        }
+
+    Patterns are case-insensitive Python regexes matched per line;
+    ``severity`` defaults to CRITICAL and ``category`` to hallucinated_method.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            pack = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RulePackError(f"Cannot read rule pack {path}: {e}") from e
+    if not isinstance(pack, dict) or not isinstance(pack.get("java_types", {}), dict):
+        raise RulePackError(f"{path}: expected an object with 'java_types' and 'hallucinated_methods'")
+    if not isinstance(pack.get("hallucinated_methods", []), list):
+        raise RulePackError(f"{path}: 'hallucinated_methods' must be a list")
+    return pack
+
+
+def _pack_files(rule_packs) -> list[Path]:
+    """Expand rule-pack paths (files, or directories of *.json) in a stable order."""
+    if isinstance(rule_packs, (str, os.PathLike)):
+        rule_packs = [p for p in str(rule_packs).split(os.pathsep) if p]
+    files = []
+    for entry in rule_packs:
+        path = Path(entry)
+        files.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+    return files
+
+
+# (path, mtime_ns) tuples → RuleTable; the base table is keyed by ()
+_TABLES: dict[tuple, RuleTable] = {}
+
+
+def rule_table(rule_packs=None) -> RuleTable:
+    """The built-in rule table extended with *rule_packs*, compiled once per process."""
+    files = _pack_files(rule_packs or [])
+    key = tuple((str(f.resolve()), f.stat().st_mtime_ns if f.exists() else 0) for f in files)
+    if key not in _TABLES:
+        table = _TABLES[()]
+        for path in files:
+            table = table.extend(load_rule_pack(path), str(path))
+        table.fingerprint = json.dumps(key)
+        _TABLES[key] = table
+    return _TABLES[key]
 
 
 class LLMPatternValidator:
@@ -141,31 +291,92 @@ class LLMPatternValidator:
         r"(\w+)\.get\s*\([^)]+\)\s*\.\s*\w+\s*[^?]",  # map.get(key).property (not safe nav)
     ]
 
-    def __init__(self, file_path: str):
+    def __init__(
+        self,
+        file_path: str,
+        *,
+        source: str | None = None,
+        describe=None,
+        rule_packs=None,
+        stats=None,
+    ):
         """
         Initialize the validator with an Apex file.
 
         Args:
             file_path: Path to .cls or .trigger file
+            source: Apex source text. When given, nothing is read from disk and
+                file_path is only used as the reported file name. Prefer
+                from_source() for this.
+            describe: Object-describe snapshot (a DescribeCache or a JSON path)
+                for field-existence checks. Defaults to the path in
+                $SF_DESCRIBE_CACHE; without one only SELECT coverage is checked.
+            rule_packs: Extra Java-type / hallucinated-method rules — rule-pack
+                JSON files or directories of them (see load_rule_pack()).
+                Defaults to $SF_APEX_RULE_PACKS.
+            stats: Org statistics snapshot (an OrgStats or a JSON path) for
+                query selectivity checks. Defaults to the path in
+                $SF_ORG_STATS; without one selectivity is not checked.
         """
         self.file_path = file_path
         self.content = ""
         self.lines = []
         self.issues = []
+        if describe is None and os.environ.get(DESCRIBE_ENV):
+            describe = os.environ[DESCRIBE_ENV]
+        self.describe = load_describe(describe) if isinstance(describe, str) else describe
+        if stats is None and os.environ.get(ORG_STATS_ENV):
+            stats = os.environ[ORG_STATS_ENV]
+        self.stats = load_org_stats(stats) if isinstance(stats, str) else stats
+        self._queries = None
+        if rule_packs is None:
+            rule_packs = os.environ.get(RULE_PACKS_ENV, "")
+        self.rules = rule_table(rule_packs)
+        # Lines the checks cover (1-based, inclusive); validate() covers all
+        self._span = (1, 0)
+
+        if source is None:
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    source = f.read()
+            except Exception as e:
+                self.issues.append(
+                    {
+                        "severity": "ERROR",
+                        "category": "file",
+                        "message": f"Cannot read file: {e}",
+                        "line": 0,
+                    }
+                )
+                return
+
+        self.content = source
+        self.lines = source.split("\n")
+
+    @classmethod
+    def from_source(
+        cls,
+        source: str,
+        name: str = "unnamed.cls",
+        api_version: float | None = None,
+        *,
+        describe=None,
+        rule_packs=None,
+        stats=None,
+    ) -> "LLMPatternValidator":
+        """
+        Build a validator over Apex source text held in memory.
 
-        try:
-            with open(file_path, encoding="utf-8") as f:
-                self.content = f.read()
-                self.lines = self.content.split("\n")
-        except Exception as e:
-            self.issues.append(
-                {
-                    "severity": "ERROR",
-                    "category": "file",
-                    "message": f"Cannot read file: {e}",
-                    "line": 0,
-                }
-            )
+        Args:
+            source: Apex class or trigger body
+            name: File name reported in results (e.g. "AccountService.cls")
+            api_version: Accepted for signature parity with
+                ApexValidator.from_source(); no LLM pattern is version-sensitive.
+            describe: Object-describe snapshot, as for __init__()
+            rule_packs: Extra rule packs, as for __init__()
+            stats: Org statistics snapshot, as for __init__()
+        """
+        return cls(name, source=source, describe=describe, rule_packs=rule_packs, stats=stats)
 
     def validate(self) -> dict:
         """
@@ -181,11 +392,8 @@ class LLMPatternValidator:
                 "issue_count": len(self.issues),
             }
 
-        # Run all checks
-        self._check_java_types()
-        self._check_hallucinated_methods()
-        self._check_unsafe_map_access()
-        self._check_soql_field_coverage()
+        self._span = (1, len(self.lines))
+        self._run_checks()
 
         return {
             "file": os.path.basename(self.file_path),
@@ -193,49 +401,86 @@ class LLMPatternValidator:
             "issue_count": len(self.issues),
         }
 
+    def check_lines(self, start: int, end: int) -> dict:
+        """
+        Run the checks over lines ``start``..``end`` only (1-based, inclusive).
+
+        Context lines outside the span (null checks above a Map.get(), field
+        accesses after a query) are still read from the whole file, so the
+        findings for those lines match what validate() reports for them.
+
+        Returns:
+            {"issues": [...]}
+        """
+        self.issues = []
+        self._span = (start, end)
+        if self.content:
+            self._run_checks()
+        return {"issues": self.issues}
+
+    def _run_checks(self):
+        self._check_java_types()
+        self._check_hallucinated_methods()
+        self._check_unsafe_map_access()
+        self._check_soql_field_coverage()
+        self._check_soql_selectivity()
+
+    def _numbered_lines(self):
+        """(line number, text) pairs for the lines the checks cover."""
+        start, end = self._span
+        return enumerate(self.lines[start - 1 : end], start)
+
+    def _code_lines(self):
+        """(line number, text) pairs for covered lines that are not comments."""
+        for i, line in self._numbered_lines():
+            stripped = line.strip()
+            if not (stripped.startswith("//") or stripped.startswith("*")):
+                yield i, line
+
     def _check_java_types(self):
         """Check for Java collection types that don't exist in Apex."""
-        for java_type, apex_alternative in self.JAVA_TYPES.items():
-            # Pattern: JavaType<...> or new JavaType<...>
-            pattern = rf"\b{java_type}\s*<"
-
-            for i, line in enumerate(self.lines, 1):
-                # Skip comments
-                stripped = line.strip()
-                if stripped.startswith("//") or stripped.startswith("*"):
-                    continue
+        java_types = self.rules.java_types
+        found = set()
+        for i, line in self._code_lines():
+            if "<" not in line:
+                continue
+            for match in _GENERIC_TYPE_RE.finditer(line):
+                name = match.group(1)
+                if name in java_types:
+                    found.add((self.rules.java_order[name], i, name))
 
-                if re.search(pattern, line):
-                    self.issues.append(
-                        {
-                            "severity": "CRITICAL",
-                            "category": "java_type",
-                            "message": f'Java type "{java_type}" does not exist in Apex',
-                            "line": i,
-                            "fix": f"Use {apex_alternative} instead",
-                            "source": "llm-pattern-validator",
-                        }
-                    )
+        for _order, i, java_type in sorted(found):
+            self.issues.append(
+                {
+                    "severity": "CRITICAL",
+                    "category": "java_type",
+                    "message": f'Java type "{java_type}" does not exist in Apex',
+                    "line": i,
+                    "fix": f"Use {java_types[java_type]} instead",
+                    "source": "llm-pattern-validator",
+                }
+            )
 
     def _check_hallucinated_methods(self):
         """Check for methods that LLMs commonly hallucinate."""
-        for pattern, message in self.HALLUCINATED_METHODS:
-            for i, line in enumerate(self.lines, 1):
-                # Skip comments
-                stripped = line.strip()
-                if stripped.startswith("//") or stripped.startswith("*"):
-                    continue
-
-                if re.search(pattern, line, re.IGNORECASE):
-                    self.issues.append(
-                        {
-                            "severity": "CRITICAL",
-                            "category": "hallucinated_method",
-                            "message": message,
-                            "line": i,
-                            "source": "llm-pattern-validator",
-                        }
-                    )
+        combined = self.rules.combined
+        if combined is None:
+            return
+        candidates = [(i, line) for i, line in self._code_lines() if combined.search(line)]
+
+        for rule in self.rules.rules:
+            for i, line in candidates:
+                if rule["regex"].search(line):
+                    issue = {
+                        "severity": rule["severity"],
+                        "category": rule["category"],
+                        "message": rule["message"],
+                        "line": i,
+                        "source": "llm-pattern-validator",
+                    }
+                    if rule["fix"]:
+                        issue["fix"] = rule["fix"]
+                    self.issues.append(issue)
 
     def _check_unsafe_map_access(self):
         """Check for Map.get() without null safety."""
@@ -244,7 +489,7 @@ class LLMPatternValidator:
 
         map_get_pattern = r"(\w+)\.get\s*\(([^)]+)\)\s*\.(?!\s*\?)"
 
-        for i, line in enumerate(self.lines, 1):
+        for i, line in self._numbered_lines():
             # Skip comments
             stripped = line.strip()
             if stripped.startswith("//") or stripped.startswith("*"):
@@ -285,60 +530,109 @@ class LLMPatternValidator:
                         }
                     )
 
+    def _soql_queries(self) -> list:
+        """Parsed SOQL of the whole file, extracted once per validator."""
+        if self._queries is None:
+            self._queries = extract_queries(self.content)
+        return self._queries
+
     def _check_soql_field_coverage(self):
         """
-        Check for potential SOQL field coverage issues.
+        Check inline SOQL against the fields the code reads afterwards.
 
-        This is a simplified check that looks for common patterns where
-        fields might be accessed but not queried.
+        Queries are parsed with the sf-data SOQL parser. A read of
+        ``record.Field`` within 20 lines of the query that the SELECT list
+        does not cover is a WARNING (SObjectException at runtime). With an
+        object-describe snapshot, fields that do not exist on the object are
+        CRITICAL for inline queries and WARNING for Database.query() strings.
         """
-        # Find SOQL queries and extract field lists
-        soql_pattern = r"\[\s*SELECT\s+([^F][^\]]+?)\s+FROM\s+(\w+)"
+        start, end = self._span
+        for query in self._soql_queries():
+            ast = query["ast"]
+            line = query["line"]
+            if ast is None or not start <= line <= end:
+                continue
 
-        soql_queries = []
-        for i, line in enumerate(self.lines, 1):
-            matches = re.finditer(soql_pattern, line, re.IGNORECASE)
-            for match in matches:
-                fields_str = match.group(1)
-                sobject = match.group(2)
-
-                # Parse field names (simplified)
-                fields = set()
-                for field in fields_str.split(","):
-                    field = field.strip()
-                    # Handle relationship fields like Account.Name
-                    if "(" not in field:  # Skip subqueries
-                        fields.add(field.lower())
-
-                soql_queries.append({"line": i, "sobject": sobject, "fields": fields})
-
-        # This is a very simplified check - just warn if a query has very few fields
-        # and later code accesses many properties
-        for query in soql_queries:
-            if len(query["fields"]) <= 2 and "id" in query["fields"]:
-                # Very minimal query - might be missing fields
-                # Check following lines for field access patterns
-                query_line = query["line"]
-                following_lines = "\n".join(
-                    self.lines[query_line : min(query_line + 20, len(self.lines))]
-                )
+            if self.describe is not None:
+                for problem in self.describe.check_query(ast):
+                    self.issues.append(
+                        {
+                            "severity": "CRITICAL" if query["kind"] == "inline" else "WARNING",
+                            "category": "soql_field_existence",
+                            "message": f"SOQL on line {line}: {problem['message']} ({problem['clause']})",
+                            "line": line,
+                            "fix": "Check the field API name against the object describe",
+                            "source": "llm-pattern-validator",
+                        }
+                    )
 
-                # Count distinct field accesses that look like sobject.Field
-                field_access_pattern = r"\.([A-Z][a-zA-Z0-9_]+)(?:\s*[;,\)\]\}=]|\s*!=|\s*==)"
-                accessed_fields = set(re.findall(field_access_pattern, following_lines))
+            missing = {}
+            for path, read_line in field_reads(self.content, query):
+                if not is_selected(ast, path):
+                    missing.setdefault(path.lower(), (path, read_line))
+            if not missing:
+                continue
 
-                # If accessing many more fields than queried, warn
-                if len(accessed_fields) > len(query["fields"]) + 2:
+            unqueried = []
+            for path, read_line in missing.values():
+                problem = self.describe.check_path(ast["object"], path) if self.describe else None
+                if problem:
                     self.issues.append(
                         {
-                            "severity": "INFO",
-                            "category": "soql_field_coverage",
-                            "message": f"SOQL on line {query_line} queries {len(query['fields'])} fields but code may access more",
-                            "line": query_line,
-                            "fix": "Verify all accessed fields are in the SELECT clause",
+                            "severity": "CRITICAL",
+                            "category": "soql_field_existence",
+                            "message": f"SOQL on line {line}: {problem}, read on line {read_line}",
+                            "line": line,
+                            "fix": "Check the field API name against the object describe",
                             "source": "llm-pattern-validator",
                         }
                     )
+                else:
+                    unqueried.append((path, read_line))
+            if unqueried:
+                selected = len(ast["fields"]) + len(ast["subqueries"])
+                names = ", ".join(path for path, _ in unqueried)
+                first = min(read_line for _, read_line in unqueried)
+                self.issues.append(
+                    {
+                        "severity": "WARNING",
+                        "category": "soql_field_coverage",
+                        "message": f"SOQL on line {line} queries {selected} fields but code reads {len(unqueried)} more: {names} (first read on line {first})",
+                        "line": line,
+                        "fix": "Add the fields to the SELECT clause - reading an unqueried field throws SObjectException",
+                        "source": "llm-pattern-validator",
+                    }
+                )
+
+    def _check_soql_selectivity(self):
+        """
+        Check each parsed query's WHERE against the org statistics snapshot.
+
+        A predicted full table scan of an object above the large-object size
+        is a WARNING: in trigger context Salesforce refuses it outright
+        ("Non-selective query against large object type").
+        """
+        if self.stats is None:
+            return
+        start, end = self._span
+        for query in self._soql_queries():
+            if query["ast"] is None or not start <= query["line"] <= end:
+                continue
+            message = selectivity_warning(query["ast"], self.stats)
+            if message:
+                self.issues.append(
+                    {
+                        "severity": "WARNING",
+                        "category": "soql_selectivity",
+                        "message": f"SOQL on line {query['line']}: {message}",
+                        "line": query["line"],
+                        "fix": "Filter on an indexed field (Id, Name, lookups, external IDs, custom indexes) that matches few enough rows",
+                        "source": "llm-pattern-validator",
+                    }
+                )
+
+
+_TABLES[()] = RuleTable(LLMPatternValidator.JAVA_TYPES, LLMPatternValidator.HALLUCINATED_METHODS)
 
 
 def validate_apex_llm_patterns(file_path: str) -> dict:
@@ -407,8 +701,6 @@ def format_output(results: dict) -> str:
 
 
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage: python llm_pattern_validator.py <file.cls|file.trigger>")
         sys.exit(1)
@@ -7,8 +7,9 @@ Validates Apex code being deployed via Cirra AI MCP metadata tools.
 
 Handles metadata_create, metadata_update, and tooling_api_dml for
 ApexClass and ApexTrigger metadata types. Extracts the code body from
-the MCP params, writes to a temp file, and delegates to the local
-ApexValidator (150-point scoring).
+the MCP params and validates it in memory with the local ApexValidator
+(150-point scoring). Nothing is written to disk, so concurrent hooks
+deploying the same class name cannot collide.
 
 For data operation validation (soql_query, sobject_dml), use
 sf-data instead.
@@ -24,7 +25,6 @@ Input format:
 import os
 import re
 import sys
-import tempfile
 from typing import Any
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -91,13 +91,18 @@ def _extract_code_body(tool: str, params: dict[str, Any]) -> tuple[str, str, str
 # ApexValidator delegation
 # ═══════════════════════════════════════════════════════════════════════
 
-def _run_apex_validator(file_path: str, api_version: float | None = None) -> dict[str, Any] | None:
-    """Import and run the local ApexValidator. Returns None if import fails."""
+def _run_apex_validator(
+    body: str, file_name: str, api_version: float | None = None
+) -> dict[str, Any] | None:
+    """Import and run the local ApexValidator on in-memory source.
+
+    Returns None if import fails.
+    """
     try:
         if _SCRIPT_DIR not in sys.path:
             sys.path.insert(0, _SCRIPT_DIR)
         from validate_apex import ApexValidator
-        validator = ApexValidator(file_path, api_version=api_version)
+        validator = ApexValidator.from_source(body, file_name, api_version=api_version)
         return validator.validate()
     except (ImportError, Exception):
         return None
@@ -252,8 +257,8 @@ def _rating(score: int, max_score: int) -> str:
 def validate_apex_deployment(input_data: dict[str, Any]) -> dict[str, Any]:
     """Validate Apex code being deployed via MCP metadata tools.
 
-    Extracts the Apex body from the metadata payload, writes it to a temp
-    file, and delegates to ApexValidator (150-pt scoring).
+    Extracts the Apex body from the metadata payload and delegates to
+    ApexValidator (150-pt scoring) without touching disk.
 
     Args:
         input_data: Dict with "tool", "params", and optional "context".
@@ -306,26 +311,15 @@ def validate_apex_deployment(input_data: dict[str, Any]) -> dict[str, Any]:
             "message": "No code body found in metadata payload",
         }
 
-    # Write to temp file and validate
     ext = ".trigger" if metadata_type == "ApexTrigger" else ".cls"
-    tmp_name = f"validate_{full_name or 'unnamed'}{ext}"
-    tmp_path = os.path.join(tempfile.gettempdir(), tmp_name)
+    file_name = f"{full_name or 'unnamed'}{ext}"
 
-    try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            f.write(body)
-
-        result = _run_apex_validator(tmp_path, api_version=api_version)
-        if result is not None:
-            return {**base, "validator": "ApexValidator", "status": "scored", **result}
-        else:
-            return {**base, "validator": "basic_apex_check", "status": "scored",
-                    **_basic_apex_check(body, full_name)}
-    finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
+    result = _run_apex_validator(body, file_name, api_version=api_version)
+    if result is not None:
+        return {**base, "validator": "ApexValidator", "status": "scored", **result}
+    else:
+        return {**base, "validator": "basic_apex_check", "status": "scored",
+                **_basic_apex_check(body, full_name)}
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -9,6 +9,10 @@ Integrates:
 1. Custom 150-point scoring (8 categories)
 2. LLM pattern validation (Java types, hallucinated methods)
 
+Both run incrementally (incremental_validate.py): after an Edit only the
+members around the changed lines are re-checked and merged into the cached
+file-level results, so feedback on large classes stays fast.
+
 Hook Input (stdin): JSON with tool_input and tool_response
 Hook Output (stdout): JSON with optional output message
 
@@ -30,12 +34,13 @@ SHARED_DIR = os.path.join(SKILLS_ROOT, "shared")
 sys.path.insert(0, SHARED_DIR)
 
 
-def validate_apex(file_path: str) -> dict:
+def validate_apex(file_path: str, tool_input: dict | None = None) -> dict:
     """
     Run comprehensive Apex validation on a file.
 
     Args:
         file_path: Path to .cls or .trigger file
+        tool_input: Edit/Write tool input, used to locate the edited lines
 
     Returns:
         dict with validation results and output message
@@ -44,12 +49,12 @@ def validate_apex(file_path: str) -> dict:
 
     try:
         # ═══════════════════════════════════════════════════════════════════
-        # PHASE 1: Custom 150-point validation
+        # PHASE 1: Custom 150-point validation (incremental)
         # ═══════════════════════════════════════════════════════════════════
+        from incremental_validate import validate_incremental
         from validate_apex import ApexValidator
 
-        validator = ApexValidator(file_path)
-        custom_results = validator.validate()
+        custom_results = validate_incremental(file_path, tool_input)
 
         custom_score = custom_results.get("score", 0)
         custom_max = custom_results.get("max_score", 150)
@@ -59,29 +64,20 @@ def validate_apex(file_path: str) -> dict:
         # ═══════════════════════════════════════════════════════════════════
         # PHASE 1.5: LLM Pattern Validation (Java types, hallucinated methods)
         # ═══════════════════════════════════════════════════════════════════
-        try:
-            from llm_pattern_validator import LLMPatternValidator
-
-            llm_validator = LLMPatternValidator(file_path)
-            llm_results = llm_validator.validate()
-            llm_issues = llm_results.get("issues", [])
-
-            # Add LLM issues to custom_issues with adjusted severity
-            for issue in llm_issues:
-                custom_issues.append(
-                    {
-                        "severity": issue.get("severity", "WARNING"),
-                        "category": issue.get("category", "llm_pattern"),
-                        "message": issue.get("message", ""),
-                        "line": issue.get("line", 0),
-                        "fix": issue.get("fix", ""),
-                        "source": "llm-validator",
-                    }
-                )
-        except ImportError:
-            pass  # LLM validator not available
-        except Exception:
-            pass  # Don't fail validation on LLM check errors
+        llm_issues = custom_results.get("llm_issues", [])
+
+        # Add LLM issues to custom_issues with adjusted severity
+        for issue in llm_issues:
+            custom_issues.append(
+                {
+                    "severity": issue.get("severity", "WARNING"),
+                    "category": issue.get("category", "llm_pattern"),
+                    "message": issue.get("message", ""),
+                    "line": issue.get("line", 0),
+                    "fix": issue.get("fix", ""),
+                    "source": "llm-validator",
+                }
+            )
 
         # ═══════════════════════════════════════════════════════════════════
         # PHASE 2: Calculate rating
@@ -115,13 +111,15 @@ def validate_apex(file_path: str) -> dict:
         output_parts.append(f"🔍 Apex Validation: {os.path.basename(file_path)}")
         output_parts.append("═" * 60)
         output_parts.append(f"📊 Score: {final_score}/{final_max} {stars} {rating}")
+        for warning in custom_results.get("warnings", []):
+            output_parts.append(f"⚠️ {warning}")
 
         # Category breakdown
         if custom_scores:
             output_parts.append("")
             output_parts.append("📋 Category Breakdown:")
             for cat, score in custom_scores.items():
-                max_score = validator.scores.get(cat, 0)
+                max_score = ApexValidator.CATEGORY_MAX.get(cat, 0)
                 if max_score > 0:
                     icon = "✅" if score == max_score else ("⚠️" if score >= max_score * 0.7 else "❌")
                     diff = f" (-{max_score - score})" if score < max_score else ""
@@ -212,7 +210,7 @@ def main():
         result = {"continue": True}
 
         if file_path.endswith(".cls") or file_path.endswith(".trigger"):
-            result = validate_apex(file_path)
+            result = validate_apex(file_path, tool_input)
 
         # Output result
         print(json.dumps(result))
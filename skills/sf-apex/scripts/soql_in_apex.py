@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+SOQL-in-Apex Extraction
+=======================
+
+Finds the SOQL in an Apex source file — inline ``[SELECT ...]`` expressions and
+``Database.query('...')`` calls whose argument is a string literal — and parses
+each query with the sf-data SOQL parser (skills/sf-data/scripts/soql_parser.py),
+so Apex checks and SOQLValidator read the same field lists.
+
+For inline queries assigned to a variable (``List<Account> accs = [...]``) or
+iterated directly (``for (Account a : [...])``) it also collects the
+``var.Field`` reads that follow the query in the same block, which is what the
+LLM pattern validator compares against the SELECT list.
+
+When the sf-data scripts are not installed alongside sf-apex, PARSER_AVAILABLE
+is False and extract_queries() returns no queries.
+"""
+
+import os
+import re
+import sys
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from apex_index import strip_comments_and_strings  # noqa: E402
+
+# sf-data's scripts are imported by name, sharing one parse cache with its validators
+SF_DATA_SCRIPTS = Path(SCRIPT_DIR).parent.parent / "sf-data" / "scripts"
+if str(SF_DATA_SCRIPTS) not in sys.path:
+    sys.path.append(str(SF_DATA_SCRIPTS))
+
+try:
+    import describe_cache as _describe_cache
+    import query_plan as _query_plan
+    import soql_parser as _soql_parser
+except ImportError:  # sf-data not installed
+    _soql_parser = _describe_cache = _query_plan = None
+
+PARSER_AVAILABLE = _soql_parser is not None
+
+# How far after a query field reads are attributed to it (lines)
+READ_WINDOW = 20
+
+_INLINE_RE = re.compile(r"\[\s*SELECT\b", re.IGNORECASE)
+_DYNAMIC_RE = re.compile(r"\bDatabase\s*\.\s*query\s*\(", re.IGNORECASE)
+_BLANKED_LITERAL_RE = re.compile(r"' *'")
+_LITERAL_CONCAT_RE = re.compile(r"\s*'(?:[^'\\]|\\.)*'\s*(?:\+\s*'(?:[^'\\]|\\.)*'\s*)*")
+_LITERAL_RE = re.compile(r"'((?:[^'\\]|\\.)*)'")
+_ASSIGN_RE = re.compile(r"\b([A-Za-z_]\w*)\s*=\s*$")
+_FOR_RE = re.compile(r"\bfor\s*\(\s*[\w.<>,\s]+?\s([A-Za-z_]\w*)\s*:\s*$", re.IGNORECASE)
+_FOR_OVER_RE = r"\bfor\s*\(\s*[\w.<>,\s]+?\s([A-Za-z_]\w*)\s*:\s*{var}\s*\)"
+_CHAIN_RE = r"\b({vars})(?:\s*\[[^\]\n]*\])?\s*\.\s*([A-Za-z_]\w*(?:\s*\.\s*[A-Za-z_]\w*)*)"
+
+
+def load_describe(path: str):
+    """Load an object-describe snapshot through sf-data's DescribeCache."""
+    if _describe_cache is None:
+        raise RuntimeError("describe_cache.py not found under sf-data/scripts")
+    return _describe_cache.DescribeCache.load(path)
+
+
+def load_org_stats(path: str):
+    """Load an org statistics snapshot through sf-data's OrgStats."""
+    if _query_plan is None:
+        raise RuntimeError("query_plan.py not found under sf-data/scripts")
+    return _query_plan.OrgStats.load(path)
+
+
+def selectivity_warning(ast: dict[str, Any], stats) -> str | None:
+    """sf-data's table-scan warning for a parsed query, if it scans a large object."""
+    return _query_plan.plan_warning(_query_plan.estimate(ast, stats))
+
+
+def _matching(text: str, open_idx: int, opener: str, closer: str) -> int:
+    depth = 0
+    for j in range(open_idx, len(text)):
+        if text[j] == opener:
+            depth += 1
+        elif text[j] == closer:
+            depth -= 1
+            if depth == 0:
+                return j
+    return -1
+
+
+def _parse(soql: str):
+    try:
+        return _soql_parser.parse_soql(soql)
+    except _soql_parser.SOQLParseError:
+        return None
+
+
+def _inline_soql(source: str, stripped: str, start: int, end: int) -> str:
+    """Query text between ``start`` and ``end``: comments stay blanked, string literals are
+    copied back from ``source`` (stripping keeps offsets) so filter values reach the parser."""
+    return _BLANKED_LITERAL_RE.sub(
+        lambda m: source[start + m.start() : start + m.end()], stripped[start:end]
+    )
+
+
+def extract_queries(source: str, stripped: str | None = None) -> list[dict[str, Any]]:
+    """Locate and parse the SOQL in an Apex source file.
+
+    Returns one dict per query, in source order::
+
+        {"kind": "inline" | "dynamic", "line": 12, "start": 340, "end": 402,
+         "soql": "SELECT Id FROM Account", "ast": {...} | None, "var": "accs" | None}
+
+    ``ast`` is None when the query does not parse; ``var`` is the variable an
+    inline query is assigned to or iterated into.
+    """
+    if not PARSER_AVAILABLE:
+        return []
+    if stripped is None:
+        stripped = strip_comments_and_strings(source)
+    line_starts = [0] + [m.end() for m in re.finditer("\n", stripped)]
+    queries = []
+
+    for match in _INLINE_RE.finditer(stripped):
+        start = match.start()
+        end = _matching(stripped, start, "[", "]")
+        if end == -1:
+            continue
+        before = stripped[max(0, start - 200) : start]
+        var_match = _ASSIGN_RE.search(before) or _FOR_RE.search(before)
+        soql = _inline_soql(source, stripped, start + 1, end)
+        queries.append(
+            {
+                "kind": "inline",
+                "line": bisect_right(line_starts, start),
+                "start": start,
+                "end": end + 1,
+                "soql": soql.strip(),
+                "ast": _parse(soql),
+                "var": var_match.group(1) if var_match else None,
+                "loop_var": bool(var_match) and var_match.re is _FOR_RE,
+            }
+        )
+
+    for match in _DYNAMIC_RE.finditer(stripped):
+        close = _matching(stripped, match.end() - 1, "(", ")")
+        if close == -1:
+            continue
+        argument = source[match.end() : close]
+        if not _LITERAL_CONCAT_RE.fullmatch(argument):
+            continue  # built at runtime: fields are not statically known
+        soql = "".join(part.replace("\\'", "'") for part in _LITERAL_RE.findall(argument))
+        queries.append(
+            {
+                "kind": "dynamic",
+                "line": bisect_right(line_starts, match.start()),
+                "start": match.start(),
+                "end": close + 1,
+                "soql": soql.strip(),
+                "ast": _parse(soql),
+                "var": None,
+                "loop_var": False,
+            }
+        )
+
+    queries.sort(key=lambda q: q["start"])
+    return queries
+
+
+def _scope_end(stripped: str, start: int, limit: int, loop_var: bool) -> int:
+    """Offset where the query variable goes out of scope (or ``limit``)."""
+    depth = 0
+    entered = False
+    for j in range(start, limit):
+        c = stripped[j]
+        if c == "{":
+            depth += 1
+            entered = True
+        elif c == "}":
+            depth -= 1
+            if depth < 0 or (loop_var and entered and depth == 0):
+                return j
+    return limit
+
+
+def field_reads(source: str, query: dict[str, Any], stripped: str | None = None) -> list[tuple[str, int]]:
+    """``(field path, line)`` for each read of the query's records after the query.
+
+    Reads are attributed within READ_WINDOW lines of the query line and the
+    variable's enclosing block. Method calls (``a.getSObjectType()``) drop the
+    method segment and writes (``a.Name = ...``) are skipped. List variables
+    follow ``for (T x : list)`` loops and ``list[0].Field`` indexing.
+    """
+    if not query["var"]:
+        return []
+    if stripped is None:
+        stripped = strip_comments_and_strings(source)
+    # End of line query["line"] + READ_WINDOW
+    limit = query["start"]
+    for _ in range(READ_WINDOW + 1):
+        nl = stripped.find("\n", limit)
+        if nl == -1:
+            limit = len(stripped)
+            break
+        limit = nl + 1
+    window_start = query["end"]
+    window_end = _scope_end(stripped, window_start, limit, query["loop_var"])
+
+    var = query["var"]
+    reassigned = re.search(rf"\b{re.escape(var)}\s*=(?!=)", stripped[window_start:window_end])
+    if reassigned:
+        window_end = window_start + reassigned.start()
+    window = stripped[window_start:window_end]
+
+    names = [var]
+    for loop in re.finditer(_FOR_OVER_RE.format(var=re.escape(var)), window):
+        names.append(loop.group(1))
+
+    base_line = stripped.count("\n", 0, window_start) + 1
+    reads = []
+    chain = re.compile(_CHAIN_RE.format(vars="|".join(re.escape(n) for n in names)))
+    for match in chain.finditer(window):
+        segments = [s.strip() for s in match.group(2).split(".")]
+        rest = window[match.end() :].lstrip()
+        if rest.startswith("("):
+            segments.pop()  # method call on the last segment
+        elif rest.startswith("=") and not rest.startswith("=="):
+            continue  # assignment, not a read
+        if segments:
+            line = base_line + window.count("\n", 0, match.start())
+            reads.append((".".join(segments), line))
+    return reads
+
+
+def is_selected(ast: dict[str, Any], path: str) -> bool:
+    """Whether reading ``path`` on a record from this query is safe."""
+    lowered = path.lower()
+    if ast["all_fields"] or lowered == "id":
+        return True
+    selected = _soql_parser.selected_paths(ast)
+    if lowered in selected or any(p.startswith(lowered + ".") for p in selected):
+        return True
+    alias = (ast["alias"] or "").lower()
+    if alias and f"{alias}.{lowered}" in selected:
+        return True
+    return any(sub["object"].lower() == lowered for sub in ast["subqueries"])
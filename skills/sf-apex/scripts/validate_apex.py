@@ -24,7 +24,21 @@ import os
 class ApexValidator:
     """Validates Apex code for best practices."""
 
-    def __init__(self, file_path: str, api_version: float | None = None):
+    # Points available per scoring category (150 total)
+    CATEGORY_MAX = {
+        "bulkification": 25,
+        "security": 25,
+        "testing": 25,
+        "architecture": 20,
+        "clean_code": 20,
+        "error_handling": 15,
+        "performance": 10,
+        "documentation": 10,
+    }
+
+    def __init__(
+        self, file_path: str, api_version: float | None = None, *, source: str | None = None
+    ):
         """
         Initialize the validator with an Apex file.
 
@@ -33,37 +47,57 @@ class ApexValidator:
             api_version: The ApiVersion the class is (or will be) deployed at.
                 Version-sensitive checks (e.g. WITH SECURITY_ENFORCED, removed
                 in API 67.0) scale their severity on this. None = unknown.
+            source: Apex source text. When given, nothing is read from disk and
+                file_path is only used as the reported file name. Prefer
+                from_source() for this.
         """
         self.file_path = file_path
         self.api_version = float(api_version) if api_version is not None else None
         self.content = ""
         self.lines = []
         self.issues = []
-        self.scores = {
-            "bulkification": 25,
-            "security": 25,
-            "testing": 25,
-            "architecture": 20,
-            "clean_code": 20,
-            "error_handling": 15,
-            "performance": 10,
-            "documentation": 10,
-        }
+        self.scores = dict(self.CATEGORY_MAX)
+        # Lines the per-line rules cover (1-based, inclusive) and whether the
+        # file-level rules run; validate() covers everything.
+        self._span = (1, 0)
+        self._file_level = True
+        self._facts = None
+
+        if source is None:
+            # Read file content
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    source = f.read()
+            except Exception as e:
+                self.issues.append(
+                    {
+                        "severity": "CRITICAL",
+                        "category": "file",
+                        "message": f"Cannot read file: {e}",
+                        "line": 0,
+                    }
+                )
+                return
 
-        # Read file content
-        try:
-            with open(file_path, encoding="utf-8") as f:
-                self.content = f.read()
-                self.lines = self.content.split("\n")
-        except Exception as e:
-            self.issues.append(
-                {
-                    "severity": "CRITICAL",
-                    "category": "file",
-                    "message": f"Cannot read file: {e}",
-                    "line": 0,
-                }
-            )
+        self.content = source
+        self.lines = source.split("\n")
+
+    @classmethod
+    def from_source(
+        cls, source: str, name: str = "unnamed.cls", api_version: float | None = None
+    ) -> "ApexValidator":
+        """
+        Build a validator over Apex source text held in memory.
+
+        No temp file is written, so concurrent validations of the same class
+        name cannot collide.
+
+        Args:
+            source: Apex class or trigger body
+            name: File name reported in results (e.g. "AccountService.cls")
+            api_version: Deploy ApiVersion, as for the constructor
+        """
+        return cls(name, api_version=api_version, source=source)
 
     def validate(self) -> dict:
         """
@@ -81,6 +115,76 @@ class ApexValidator:
                 "issues": self.issues,
             }
 
+        self._span = (1, len(self.lines))
+        self._file_level = True
+        self._run_checks()
+
+        # Calculate total score
+        total_score = sum(self.scores.values())
+
+        return {
+            "file": os.path.basename(self.file_path),
+            "score": total_score,
+            "max_score": 150,
+            "rating": self.rating_for(total_score),
+            "scores": self.scores.copy(),
+            "issues": self.issues,
+        }
+
+    def check_lines(self, start: int, end: int) -> dict:
+        """
+        Run only the per-line rules over lines ``start``..``end`` (1-based, inclusive).
+
+        File-wide facts (class names, @isTest position, escapeSingleQuotes) still
+        come from the whole file, but file-level findings are left to
+        check_file_level(). ``start`` must be a line outside any loop, e.g. the
+        first line of a class member, because loop context is rebuilt from there.
+        Together, check_file_level() and check_lines() over consecutive spans
+        report what validate() reports.
+
+        Returns:
+            {"issues": [...], "deductions": {category: points}}
+        """
+        return self._partial_run((start, end), file_level=False)
+
+    def check_file_level(self) -> dict:
+        """
+        Run only the rules that judge the file as a whole (class sharing and
+        class naming).
+
+        Returns:
+            {"issues": [...], "deductions": {category: points}}
+        """
+        return self._partial_run((1, 0), file_level=True)
+
+    @staticmethod
+    def rating_for(total_score: int) -> str:
+        """Star rating for a 150-point total."""
+        if total_score >= 135:
+            return "⭐⭐⭐⭐⭐ Excellent"
+        if total_score >= 112:
+            return "⭐⭐⭐⭐ Very Good"
+        if total_score >= 90:
+            return "⭐⭐⭐ Good"
+        if total_score >= 67:
+            return "⭐⭐ Needs Work"
+        return "⭐ Critical Issues"
+
+    def _partial_run(self, span: tuple[int, int], file_level: bool) -> dict:
+        self.issues = []
+        self.scores = dict(self.CATEGORY_MAX)
+        self._span = span
+        self._file_level = file_level
+        if self.content:
+            self._run_checks()
+        deductions = {
+            cat: self.CATEGORY_MAX[cat] - score
+            for cat, score in self.scores.items()
+            if score != self.CATEGORY_MAX[cat]
+        }
+        return {"issues": self.issues, "deductions": deductions}
+
+    def _run_checks(self):
         # Build loop map once; reused by both loop checks
         self._loop_map = self._build_loop_line_map()
 
@@ -93,34 +197,75 @@ class ApexValidator:
         self._check_error_handling()
         self._check_documentation()
 
-        # Calculate total score
-        total_score = sum(self.scores.values())
+    def _numbered_lines(self):
+        """(line number, text) pairs for the lines the per-line rules cover."""
+        start, end = self._span
+        return enumerate(self.lines[start - 1 : end], start)
 
-        # Determine rating
-        if total_score >= 135:
-            rating = "⭐⭐⭐⭐⭐ Excellent"
-        elif total_score >= 112:
-            rating = "⭐⭐⭐⭐ Very Good"
-        elif total_score >= 90:
-            rating = "⭐⭐⭐ Good"
-        elif total_score >= 67:
-            rating = "⭐⭐ Needs Work"
-        else:
-            rating = "⭐ Critical Issues"
+    def _file_facts(self) -> dict:
+        """File-wide facts the rules depend on, computed once per validator.
 
+        Keys: is_test_class, has_escape, first_is_test_line, class_names,
+        class_declarations [(line, has_sharing, is_without)] and
+        named_classes [(line, name)].
+        """
+        if self._facts is not None:
+            return self._facts
+
+        # Pattern handles optional modifiers (e.g. "with sharing", "virtual", "abstract")
+        # between the access modifier and the "class" keyword.
+        class_decl_pattern = r"\b(public|private|global)\b.*?\bclass\s+\w+"
+        sharing_pattern = r"\b(with\s+sharing|without\s+sharing|inherited\s+sharing)\b"
+        # Match actual class declarations (with optional modifiers), not "class" in comments
+        class_pattern = r"^\s*(?:public|private|global|virtual|abstract|with\s+sharing|without\s+sharing|\s)*\s*class\s+(\w+)"
+
+        class_declarations = []
+        named_classes = []
+        first_is_test_line = 0
+        for i, line in enumerate(self.lines, 1):
+            if not first_is_test_line and "@isTest" in line:
+                first_is_test_line = i
+            # Skip comment lines
+            stripped = line.strip()
+            if stripped.startswith("//") or stripped.startswith("*") or stripped.startswith("/*"):
+                continue
+            if re.search(class_decl_pattern, line, re.IGNORECASE):
+                has_sharing = bool(re.search(sharing_pattern, line, re.IGNORECASE))
+                is_without = bool(re.search(r"\bwithout\s+sharing\b", line, re.IGNORECASE))
+                class_declarations.append((i, has_sharing, is_without))
+            match = re.search(class_pattern, line, re.IGNORECASE)
+            if match:
+                named_classes.append((i, match.group(1)))
+
+        self._facts = {
+            # @IsTest classes run in system mode and do not require sharing declarations.
+            "is_test_class": bool(re.search(r"@istest\b", self.content, re.IGNORECASE)),
+            # Check if using String.escapeSingleQuotes (once per file, not per query)
+            "has_escape": "escapeSingleQuotes" in self.content,
+            "first_is_test_line": first_is_test_line,
+            "class_names": {name for _line, name in named_classes},
+            "class_declarations": class_declarations,
+            "named_classes": named_classes,
+        }
+        return self._facts
+
+    def file_facts(self) -> dict:
+        """The file-wide facts that per-line rule results depend on.
+
+        When these are unchanged between two versions of a file, per-line
+        results for unchanged lines are unchanged too.
+        """
+        facts = self._file_facts()
         return {
-            "file": os.path.basename(self.file_path),
-            "score": total_score,
-            "max_score": 150,
-            "rating": rating,
-            "scores": self.scores.copy(),
-            "issues": self.issues,
+            "has_escape": facts["has_escape"],
+            "first_is_test_line": facts["first_is_test_line"],
+            "class_names": sorted(facts["class_names"]),
         }
 
     def _build_loop_line_map(self) -> list[tuple[bool, int, bool]]:
-        """Build loop context for every line in the file.
+        """Build loop context for every line the per-line rules cover.
 
-        Returns a list (one entry per line, 1-based index → result[i-1]) of
+        Returns a list (one entry per line; line i → result[i - span start]) of
         (in_loop, loop_start_line, outer_loop_active) tuples.
 
         Fixes the pending_loop leak that occurs with braceless single-statement
@@ -143,12 +288,16 @@ class ApexValidator:
         )
         # Stack entries: ('loop', start_line) or ('other', start_line)
         brace_stack: list[tuple[str, int]] = []
+        # Start lines of the currently open loop scopes, outermost first. Kept in
+        # step with brace_stack so per-line loop context is O(1) rather than a
+        # scan of the whole stack.
+        loop_starts: list[int] = []
         pending_loop = False
         loop_header_line = 0
         paren_depth = 0
         result = []
 
-        for i, line in enumerate(self.lines, 1):
+        for i, line in self._numbered_lines():
             stripped = line.strip()
             is_comment = stripped.startswith("//") or stripped.startswith("*") or stripped.startswith("/*")
 
@@ -157,7 +306,7 @@ class ApexValidator:
             # Capture outer loop context BEFORE this line potentially starts a new loop.
             # Used to distinguish a standalone for-each (outer_loop_active=False) from
             # one that is nested inside an enclosing loop (outer_loop_active=True).
-            outer_loop_active = any(t == "loop" for t, _ in brace_stack)
+            outer_loop_active = bool(loop_starts)
 
             if not is_comment:
                 # Strip string literals first so that // inside strings (e.g.
@@ -181,28 +330,27 @@ class ApexValidator:
                     elif char == "{":
                         if pending_loop:
                             brace_stack.append(("loop", loop_header_line))
+                            loop_starts.append(loop_header_line)
                             loop_scope_opened_line = True
                             pending_loop = False
                         else:
                             brace_stack.append(("other", i))
                     elif char == "}":
-                        if brace_stack:
-                            brace_stack.pop()
+                        if brace_stack and brace_stack.pop()[0] == "loop":
+                            loop_starts.pop()
                     elif char == ";" and paren_depth == 0 and pending_loop:
                         # Semicolon outside parens while waiting for loop body brace:
                         # braceless single-statement body — this line IS inside the loop.
                         braceless_body_line = True
                         pending_loop = False
 
-            in_loop = (
-                any(t == "loop" for t, _ in brace_stack)
-                or braceless_body_line
-                or loop_scope_opened_line
-            )
-            loop_start = next(
-                (ln for t, ln in brace_stack if t == "loop"),
-                loop_header_line if (braceless_body_line or loop_scope_opened_line) else 0,
-            )
+            in_loop = bool(loop_starts) or braceless_body_line or loop_scope_opened_line
+            if loop_starts:
+                loop_start = loop_starts[0]
+            elif braceless_body_line or loop_scope_opened_line:
+                loop_start = loop_header_line
+            else:
+                loop_start = 0
             result.append((in_loop, loop_start, outer_loop_active))
 
         return result
@@ -214,12 +362,13 @@ class ApexValidator:
         # iterable, not inside the body; this is the correct bulkified pattern.
         foreach_soql_pattern = r"\bfor\s*\([^:]+:\s*\["
         loop_map = self._loop_map
+        offset = self._span[0]
 
-        for i, line in enumerate(self.lines, 1):
+        for i, line in self._numbered_lines():
             stripped = line.strip()
             if stripped.startswith("//") or stripped.startswith("*") or stripped.startswith("/*"):
                 continue
-            in_loop, loop_start, outer_loop_active = loop_map[i - 1]
+            in_loop, loop_start, outer_loop_active = loop_map[i - offset]
             if in_loop and re.search(soql_pattern, line, re.IGNORECASE):
                 # Exempt standalone for-each-over-SOQL only when NOT nested in an outer
                 # loop. When outer_loop_active is True, the for-each is inside an
@@ -249,13 +398,14 @@ class ApexValidator:
             r"Database\.(insert|update|delete|upsert)",
         ]
         loop_map = self._loop_map
+        offset = self._span[0]
 
-        for i, line in enumerate(self.lines, 1):
+        for i, line in self._numbered_lines():
             # Skip comment lines (avoids false positives from words like "update" in JavaDoc)
             stripped = line.strip()
             if stripped.startswith("//") or stripped.startswith("*") or stripped.startswith("/*"):
                 continue
-            in_loop, loop_start, _outer = loop_map[i - 1]
+            in_loop, loop_start, _outer = loop_map[i - offset]
             if in_loop:
                 for dml_pattern in dml_patterns:
                     if re.search(dml_pattern, line, re.IGNORECASE):
@@ -272,28 +422,12 @@ class ApexValidator:
 
     def _check_security_patterns(self):
         """Check for security-related patterns."""
-        # Pattern handles optional modifiers (e.g. "with sharing", "virtual", "abstract")
-        # between the access modifier and the "class" keyword.
-        class_decl_pattern = r"\b(public|private|global)\b.*?\bclass\s+\w+"
-        sharing_pattern = r"\b(with\s+sharing|without\s+sharing|inherited\s+sharing)\b"
-
-        # @IsTest classes run in system mode and do not require sharing declarations.
-        # Check if the file-level @IsTest annotation is present (before the first class).
-        is_test_class = bool(re.search(r"@istest\b", self.content, re.IGNORECASE))
-
-        # Collect all class declarations: (line_num, has_sharing, is_without_sharing)
-        class_declarations = []
-
-        for i, line in enumerate(self.lines, 1):
-            stripped = line.strip()
-            if stripped.startswith("//") or stripped.startswith("*") or stripped.startswith("/*"):
-                continue
-            if re.search(class_decl_pattern, line, re.IGNORECASE):
-                has_sharing = bool(re.search(sharing_pattern, line, re.IGNORECASE))
-                is_without = bool(re.search(r"\bwithout\s+sharing\b", line, re.IGNORECASE))
-                class_declarations.append((i, has_sharing, is_without))
+        facts = self._file_facts()
+        is_test_class = facts["is_test_class"]
+        # All class declarations: (line_num, has_sharing, is_without_sharing)
+        class_declarations = facts["class_declarations"]
 
-        if class_declarations:
+        if class_declarations and self._file_level:
             # Outer class (first declaration) must have an explicit sharing keyword
             # Exception: @IsTest classes run in system mode — sharing is irrelevant
             outer_line, outer_has_sharing, outer_is_without = class_declarations[0]
@@ -337,7 +471,7 @@ class ApexValidator:
         # WITH SECURITY_ENFORCED is removed in API 67.0 (Summer '26): classes at
         # 67.0+ that use it do not compile. At <= 66.0 it still compiles, but
         # WITH USER_MODE (available since API 58.0) is the replacement either way.
-        for i, line in enumerate(self.lines, 1):
+        for i, line in self._numbered_lines():
             stripped = line.strip()
             if stripped.startswith("//") or stripped.startswith("*") or stripped.startswith("/*"):
                 continue
@@ -386,10 +520,10 @@ class ApexValidator:
 
         # Check for SOQL injection vulnerability
         dynamic_soql_pattern = r"Database\.query\s*\("
-        for i, line in enumerate(self.lines, 1):
+        has_escape = facts["has_escape"]
+        for i, line in self._numbered_lines():
             if re.search(dynamic_soql_pattern, line):
-                # Check if using String.escapeSingleQuotes
-                if "escapeSingleQuotes" not in self.content:
+                if not has_escape:
                     self.issues.append(
                         {
                             "severity": "WARNING",
@@ -408,18 +542,19 @@ class ApexValidator:
         pass
 
     def _check_naming_conventions(self):
-        """Check for naming convention violations."""
+        """Check for naming convention violations.
+
+        Runs in O(file size): class names and the first ``@isTest`` line come
+        from the once-per-file facts scan, so method checks never re-scan the
+        preceding text of the file.
+        """
+        facts = self._file_facts()
+        class_names = facts["class_names"]
+        first_is_test_line = facts["first_is_test_line"]
+
         # Class names should be PascalCase
-        # Match actual class declarations (with optional modifiers), not "class" in comments
-        class_pattern = r"^\s*(?:public|private|global|virtual|abstract|with\s+sharing|without\s+sharing|\s)*\s*class\s+(\w+)"
-        for i, line in enumerate(self.lines, 1):
-            # Skip comment lines
-            stripped = line.strip()
-            if stripped.startswith("//") or stripped.startswith("*") or stripped.startswith("/*"):
-                continue
-            match = re.search(class_pattern, line, re.IGNORECASE)
-            if match:
-                class_name = match.group(1)
+        if self._file_level:
+            for i, class_name in facts["named_classes"]:
                 if not class_name[0].isupper():
                     self.issues.append(
                         {
@@ -433,30 +568,32 @@ class ApexValidator:
 
         # Method names should be camelCase
         method_pattern = r"(public|private|protected|global)\s+(static\s+)?(\w+)\s+(\w+)\s*\("
-        for i, line in enumerate(self.lines, 1):
+        for i, line in self._numbered_lines():
             match = re.search(method_pattern, line)
             if match:
                 method_name = match.group(4)
-                # Skip constructors and test methods
-                if method_name[0].isupper() and "@isTest" not in "\n".join(self.lines[:i - 1]):
-                    if method_name not in [
-                        m.group(1) for m in re.finditer(class_pattern, self.content)
-                    ]:
-                        self.issues.append(
-                            {
-                                "severity": "INFO",
-                                "category": "clean_code",
-                                "message": f'Method name "{method_name}" should be camelCase',
-                                "line": i,
-                            }
-                        )
-                        self.scores["clean_code"] -= 2
+                # Skip constructors and test methods (anything after an @isTest annotation)
+                after_is_test = 0 < first_is_test_line < i
+                if (
+                    method_name[0].isupper()
+                    and not after_is_test
+                    and method_name not in class_names
+                ):
+                    self.issues.append(
+                        {
+                            "severity": "INFO",
+                            "category": "clean_code",
+                            "message": f'Method name "{method_name}" should be camelCase',
+                            "line": i,
+                        }
+                    )
+                    self.scores["clean_code"] -= 2
 
     def _check_error_handling(self):
         """Check for error handling patterns."""
         # Check for empty catch blocks
         empty_catch_pattern = r"catch\s*\([^)]+\)\s*\{\s*\}"
-        for i, line in enumerate(self.lines, 1):
+        for i, line in self._numbered_lines():
             if re.search(empty_catch_pattern, line):
                 self.issues.append(
                     {
@@ -479,7 +616,7 @@ class ApexValidator:
         # Check for ApexDoc on public methods
         public_method_pattern = r"public\s+(\w+)\s+(\w+)\s*\("
 
-        for i, line in enumerate(self.lines, 1):
+        for i, line in self._numbered_lines():
             if re.search(public_method_pattern, line):
                 # Check if there's a comment/ApexDoc before this line
                 has_doc = False
@@ -10,22 +10,95 @@ Usage:
   python3 validate_apex_cli.py path/to/MyClass.cls [api_version]
   python3 validate_apex_cli.py path/to/AccountTrigger.trigger [api_version]
 
+Directory / glob mode (sfdx-repo execution mode):
+  python3 validate_apex_cli.py force-app/main/default/classes [api_version]
+  python3 validate_apex_cli.py "force-app/**/*.cls" --format ndjson --jobs 8
+  python3 validate_apex_cli.py force-app --changed-since origin/main --format sarif
+
+  Every .cls/.trigger under the given directories (or matching the globs) is
+  scored in a process pool (--jobs, default: CPU count). One result per file is
+  streamed as it completes — a text line, an NDJSON record, or a SARIF result —
+  followed by an aggregate summary. --changed-since <git-ref> limits the run to
+  files changed since that ref (committed, staged, unstaged or untracked).
+  --format ndjson/sarif also applies to a single file.
+
 Pass the ApiVersion the code is (or will be) deployed at so version-sensitive
 checks apply correctly (e.g. WITH SECURITY_ENFORCED: CRITICAL at 67.0+ where it
 no longer compiles, informational at <= 66.0 where it still does).
 
 Exit codes:
-  0  — validation passed (score >= 67%)
+  0  — validation passed (score >= 67%; in directory mode, for every file)
   1  — validation failed (score < 67%) or file not found
 """
 
+import argparse
+import glob
+import json
 import os
+import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, SCRIPT_DIR)
 
 THRESHOLD_PCT = 67
+APEX_EXTENSIONS = (".cls", ".trigger")
+
+# Validator severities → SARIF result levels
+SARIF_LEVELS = {
+    "CRITICAL": "error",
+    "HIGH": "error",
+    "MEDIUM": "warning",
+    "MODERATE": "warning",
+    "WARNING": "warning",
+    "LOW": "note",
+    "INFO": "note",
+}
+
+
+def score_file(file_path: str, api_version: float | None = None) -> dict:
+    """Run ApexValidator and LLMPatternValidator on one file.
+
+    Returns a dict with keys: file, score, max_score, pct, scores, issues
+    (LLM findings carry ``"source": "llm-validator"``). Top-level so it can run
+    in a worker process.
+    """
+    from validate_apex import ApexValidator
+
+    results = ApexValidator(file_path, api_version=api_version).validate()
+    score = results.get("score", 0)
+    max_score = results.get("max_score", 150)
+    issues = list(results.get("issues", []))
+
+    # LLM anti-pattern check
+    try:
+        from llm_pattern_validator import LLMPatternValidator
+
+        llm_results = LLMPatternValidator(file_path).validate()
+        for issue in llm_results.get("issues", []):
+            issues.append(
+                {
+                    "severity": issue.get("severity", "WARNING"),
+                    "category": issue.get("category", "llm_pattern"),
+                    "message": issue.get("message", ""),
+                    "line": issue.get("line", 0),
+                    "fix": issue.get("fix", ""),
+                    "source": "llm-validator",
+                }
+            )
+    except Exception:
+        pass
+
+    return {
+        "file": file_path,
+        "score": score,
+        "max_score": max_score,
+        "pct": round(score / max_score * 100, 1) if max_score > 0 else 0,
+        "scores": results.get("scores", {}),
+        "issues": issues,
+    }
 
 
 def run_validation(file_path: str, api_version: float | None = None) -> dict:
@@ -38,33 +111,12 @@ def run_validation(file_path: str, api_version: float | None = None) -> dict:
     try:
         from validate_apex import ApexValidator
 
-        validator = ApexValidator(file_path, api_version=api_version)
-        max_scores = dict(validator.scores)  # capture before validate() mutates in place
-        results = validator.validate()
-
-        score = results.get("score", 0)
-        max_score = results.get("max_score", 150)
-        issues = list(results.get("issues", []))
-        scores = results.get("scores", {})
-
-        # LLM anti-pattern check
-        try:
-            from llm_pattern_validator import LLMPatternValidator
-
-            llm_results = LLMPatternValidator(file_path).validate()
-            for issue in llm_results.get("issues", []):
-                issues.append(
-                    {
-                        "severity": issue.get("severity", "WARNING"),
-                        "category": issue.get("category", "llm_pattern"),
-                        "message": issue.get("message", ""),
-                        "line": issue.get("line", 0),
-                        "fix": issue.get("fix", ""),
-                        "source": "llm-validator",
-                    }
-                )
-        except Exception:
-            pass
+        max_scores = ApexValidator.CATEGORY_MAX
+        result = score_file(file_path, api_version)
+        score = result["score"]
+        max_score = result["max_score"]
+        issues = result["issues"]
+        scores = result["scores"]
 
         pct = (score / max_score * 100) if max_score > 0 else 0
 
@@ -135,28 +187,232 @@ def run_validation(file_path: str, api_version: float | None = None) -> dict:
         return {"success": False, "output": f"⚠️  Validation error: {e}", "pct": 0}
 
 
-def main() -> int:
-    args = sys.argv[1:]
-    if not args or args[0] in ("-h", "--help"):
-        print("Usage: validate_apex_cli.py <file.cls|file.trigger> [api_version]", file=sys.stderr)
-        return 1
+# ═══════════════════════════════════════════════════════════════════════════
+# Directory / glob mode
+# ═══════════════════════════════════════════════════════════════════════════
 
-    file_path = args[0]
-    if not os.path.exists(file_path):
-        print(f"File not found: {file_path}", file=sys.stderr)
-        return 1
 
+def collect_files(targets: list[str]) -> list[str]:
+    """Expand directories (recursively) and glob patterns into Apex file paths."""
+    found: dict[str, None] = {}
+    for target in targets:
+        if os.path.isdir(target):
+            for root, _dirs, names in os.walk(target):
+                for name in sorted(names):
+                    if name.endswith(APEX_EXTENSIONS):
+                        found[os.path.join(root, name)] = None
+        elif glob.has_magic(target):
+            for path in sorted(glob.glob(target, recursive=True)):
+                if path.endswith(APEX_EXTENSIONS) and os.path.isfile(path):
+                    found[path] = None
+        elif os.path.isfile(target):
+            found[target] = None
+    return list(found)
+
+
+def changed_since(ref: str, cwd: str = ".") -> set[str] | None:
+    """Absolute paths of files changed since ``ref`` in the git work tree at ``cwd``.
+
+    Covers commits after ``ref`` plus staged, unstaged and untracked files.
+    Returns None when git or the ref is unavailable.
+    """
+    try:
+        top = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=cwd, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        diff = subprocess.run(
+            ["git", "diff", "--name-only", "--diff-filter=ACMR", ref, "--"],
+            cwd=top, capture_output=True, text=True, check=True,
+        ).stdout
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=top, capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {
+        os.path.realpath(os.path.join(top, name))
+        for name in (diff + untracked).splitlines()
+        if name
+    }
+
+
+def iter_scores(files: list[str], api_version: float | None = None, jobs: int | None = None):
+    """Yield score_file() results as they complete, fanned out over ``jobs`` processes.
+
+    A file whose validation raises yields ``{"file", "error"}`` instead.
+    """
+    if jobs == 1 or len(files) <= 1:
+        for path in files:
+            try:
+                yield score_file(path, api_version)
+            except Exception as e:
+                yield {"file": path, "error": str(e)}
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(score_file, path, api_version): path for path in files}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"file": futures[future], "error": str(e)}
+
+
+def _summarize(results: list[dict], elapsed: float) -> dict:
+    scored = [r for r in results if "error" not in r]
+    by_severity: dict[str, int] = {}
+    for r in scored:
+        for issue in r["issues"]:
+            sev = issue.get("severity", "INFO")
+            by_severity[sev] = by_severity.get(sev, 0) + 1
+    below = sorted(
+        (r for r in scored if r["pct"] < THRESHOLD_PCT), key=lambda r: r["pct"]
+    )
+    return {
+        "files": len(results),
+        "passed": len(scored) - len(below),
+        "below_threshold": len(below),
+        "errors": len(results) - len(scored),
+        "average_pct": round(sum(r["pct"] for r in scored) / len(scored), 1) if scored else 0,
+        "issues_by_severity": by_severity,
+        "lowest": [{"file": r["file"], "pct": r["pct"]} for r in below[:10]],
+        "threshold_pct": THRESHOLD_PCT,
+        "elapsed_s": round(elapsed, 2),
+    }
+
+
+def _sarif_result(record: dict, issue: dict) -> dict:
+    rule = issue.get("category", "apex")
+    message = issue.get("message", "")
+    if issue.get("fix"):
+        message = f"{message} Fix: {issue['fix']}"
+    return {
+        "ruleId": f"llm/{rule}" if issue.get("source") else rule,
+        "level": SARIF_LEVELS.get(issue.get("severity", "INFO"), "note"),
+        "message": {"text": message},
+        "locations": [
+            {
+                "physicalLocation": {
+                    "artifactLocation": {"uri": record["file"].replace(os.sep, "/")},
+                    "region": {"startLine": max(1, issue.get("line", 0) or 1)},
+                }
+            }
+        ],
+    }
+
+
+def run_directory(
+    targets: list[str],
+    api_version: float | None = None,
+    fmt: str = "text",
+    jobs: int | None = None,
+    since: str | None = None,
+    out=None,
+) -> int:
+    """Score every Apex file under ``targets`` and stream results to ``out``.
+
+    Returns the process exit code: 0 when every file meets THRESHOLD_PCT.
+    """
+    out = out or sys.stdout
+    files = collect_files(targets)
+    if since:
+        changed = changed_since(since, targets[0] if os.path.isdir(targets[0]) else ".")
+        if changed is None:
+            print(f"Cannot resolve --changed-since {since} (not a git work tree?)", file=sys.stderr)
+            return 1
+        files = [f for f in files if os.path.realpath(f) in changed]
+
+    if fmt == "sarif":
+        out.write(
+            '{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0", '
+            '"runs": [{"tool": {"driver": {"name": "sf-apex validate_apex_cli", '
+            '"informationUri": "https://github.com/cirra-ai"}}, "results": ['
+        )
+
+    start = time.perf_counter()
+    results = []
+    first_sarif = True
+    for record in iter_scores(files, api_version, jobs):
+        results.append(record)
+        if fmt == "ndjson":
+            out.write(json.dumps({"type": "file", **record}) + "\n")
+        elif fmt == "sarif":
+            for issue in record.get("issues", []):
+                out.write(("" if first_sarif else ", ") + json.dumps(_sarif_result(record, issue)))
+                first_sarif = False
+        elif "error" in record:
+            out.write(f"⚠️  ERROR  {record['file']}: {record['error']}\n")
+        else:
+            icon = "✅" if record["pct"] >= THRESHOLD_PCT else "❌"
+            out.write(
+                f"{icon} {record['score']:>3}/{record['max_score']} ({record['pct']:>5.1f}%) "
+                f"{len(record['issues']):>3} issues  {record['file']}\n"
+            )
+        out.flush()
+
+    summary = _summarize(results, time.perf_counter() - start)
+    if fmt == "ndjson":
+        out.write(json.dumps({"type": "summary", **summary}) + "\n")
+    elif fmt == "sarif":
+        out.write("]}]}\n")
+        print(json.dumps(summary), file=sys.stderr)
+    else:
+        out.write("═" * 60 + "\n")
+        out.write(
+            f"📊 {summary['files']} files in {summary['elapsed_s']}s — "
+            f"{summary['passed']} passed, {summary['below_threshold']} below "
+            f"{THRESHOLD_PCT}%, {summary['errors']} errors, average {summary['average_pct']}%\n"
+        )
+        if summary["issues_by_severity"]:
+            counts = ", ".join(f"{sev}: {n}" for sev, n in sorted(summary["issues_by_severity"].items()))
+            out.write(f"⚠️  Issues — {counts}\n")
+    out.flush()
+    return 0 if summary["below_threshold"] == 0 and summary["errors"] == 0 else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Score Apex files against the 150-point + LLM anti-pattern pipeline",
+    )
+    parser.add_argument(
+        "target", nargs="+",
+        help="Apex file, directory, or glob (quote globs); optionally followed by api_version",
+    )
+    parser.add_argument("--format", choices=("text", "ndjson", "sarif"), default="text",
+                        help="Output format; text prints the full report for a single file (default: text)")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Worker processes in directory mode (default: CPU count)")
+    parser.add_argument("--changed-since", metavar="GIT_REF",
+                        help="Only score files changed since this git ref")
+    args = parser.parse_args()
+
+    targets = list(args.target)
     api_version = None
-    if len(args) > 1:
+    if len(targets) > 1 and not os.path.exists(targets[-1]) and not glob.has_magic(targets[-1]):
         try:
-            api_version = float(args[1])
+            api_version = float(targets[-1])
         except ValueError:
-            print(f"api_version must be a number, got: {args[1]}", file=sys.stderr)
+            print(f"api_version must be a number, got: {targets[-1]}", file=sys.stderr)
             return 1
+        targets.pop()
+
+    single = len(targets) == 1 and os.path.isfile(targets[0]) and not args.changed_since
+    if single and args.format == "text":
+        result = run_validation(targets[0], api_version=api_version)
+        print(result["output"])
+        return 0 if result.get("success") and result.get("pct", 0) >= THRESHOLD_PCT else 1
+
+    missing = [t for t in targets if not os.path.exists(t) and not glob.has_magic(t)]
+    if missing:
+        print(f"File not found: {missing[0]}", file=sys.stderr)
+        return 1
 
-    result = run_validation(file_path, api_version=api_version)
-    print(result["output"])
-    return 0 if result.get("success") and result.get("pct", 0) >= THRESHOLD_PCT else 1
+    return run_directory(
+        targets, api_version=api_version, fmt=args.format, jobs=args.jobs,
+        since=args.changed_since,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+"""Tests for apex_index.py — org-wide symbol index and transitive loop analysis."""
+
+from conftest import load_script
+
+mod = load_script("skills/sf-apex/scripts/apex_index.py")
+ApexSymbolIndex = mod.ApexSymbolIndex
+build_index = mod.build_index
+parse_apex_symbols = mod.parse_apex_symbols
+
+HANDLER = """\
+public with sharing class AccountHandler {
+    /** @description entry */
+    public static void handle(List<Account> accs) {
+        AccountService svc = new AccountService();
+        for (Account a : accs) {
+            svc.enrich(a); // AccountSelector.byId(a.Id) in a comment is not a call
+        }
+        for (Account a : accs)
+            Notifier.send(a);
+        AccountService.bulkEnrich(accs);
+    }
+}
+"""
+
+SERVICE = """\
+public with sharing class AccountService {
+    public void enrich(Account a) {
+        a.Description = lookup(a.Id);
+    }
+    private String lookup(Id accId) {
+        return AccountSelector.byId(accId).Name;
+    }
+    public static void bulkEnrich(List<Account> accs) {
+        for (Account a : [SELECT Id FROM Account WHERE Id IN :accs]) {
+            a.Name = 'Selector.byId(x)';
+        }
+    }
+}
+"""
+
+SELECTOR = """\
+public inherited sharing class AccountSelector {
+    public static Account byId(Id accId) {
+        return [SELECT Id, Name FROM Account WHERE Id = :accId];
+    }
+}
+"""
+
+NOTIFIER = """\
+public with sharing class Notifier {
+    public static void send(Account a) {
+        log(a);
+    }
+    static void log(Account a) {
+        insert new Task(WhatId = a.Id);
+        Notifier.send(a);
+    }
+}
+"""
+
+TRIGGER = """\
+trigger AccountTrigger on Account (before insert, after update) {
+    for (Account a : Trigger.new) {
+        AccountSelector.byId(a.Id);
+    }
+}
+"""
+
+
+def _write_org(tmp_path):
+    classes = tmp_path / "classes"
+    classes.mkdir()
+    for name, body in [
+        ("AccountHandler", HANDLER),
+        ("AccountService", SERVICE),
+        ("AccountSelector", SELECTOR),
+        ("Notifier", NOTIFIER),
+    ]:
+        (classes / f"{name}.cls").write_text(body)
+    triggers = tmp_path / "triggers"
+    triggers.mkdir()
+    (triggers / "AccountTrigger.trigger").write_text(TRIGGER)
+    return [classes, triggers]
+
+
+def _findings_for(index, stem):
+    return [f for f in index.loop_findings() if f["file"].endswith(stem)]
+
+
+class TestSymbolExtraction:
+    def test_methods_and_sites(self):
+        symbols = parse_apex_symbols(SERVICE)
+        keys = [m["key"] for m in symbols["methods"]]
+        assert keys == ["AccountService.enrich", "AccountService.lookup", "AccountService.bulkEnrich"]
+        assert [s["method"] for s in symbols["soql"]] == ["AccountService.bulkEnrich"]
+
+    def test_soql_in_for_each_header_is_not_in_loop(self):
+        symbols = parse_apex_symbols(SERVICE)
+        assert symbols["soql"][0]["loop_line"] == 0
+
+    def test_string_and_comment_calls_ignored(self):
+        calls = parse_apex_symbols(HANDLER)["calls"]
+        assert not any(c["method"] == "byId" for c in calls)
+
+    def test_braceless_loop_body(self):
+        calls = parse_apex_symbols(HANDLER)["calls"]
+        send = next(c for c in calls if c["method"] == "send")
+        assert send["loop_line"] == 8
+
+    def test_initializer_inside_parens_is_not_a_scope(self):
+        source = """\
+public class Seeder {
+    public static void run() {
+        for (String name : new List<String>{ 'a', 'b' }) {
+            log(new Map<String, Object>{ 'name' => name });
+            insert new Account(Name = name);
+        }
+    }
+    static void log(Map<String, Object> row) {}
+}
+"""
+        symbols = parse_apex_symbols(source)
+        assert [m["key"] for m in symbols["methods"]] == ["Seeder.run", "Seeder.log"]
+        assert (symbols["dml"][0]["loop_line"], symbols["dml"][0]["loop_depth"]) == (3, 1)
+        assert next(c for c in symbols["calls"] if c["method"] == "log")["loop_line"] == 3
+
+    def test_trigger_kind_and_sobject(self):
+        symbols = parse_apex_symbols(TRIGGER)
+        assert symbols["kind"] == "trigger"
+        assert symbols["sobject"] == "Account"
+        assert symbols["methods"][0]["key"] == "AccountTrigger.trigger"
+
+
+class TestTransitiveReachability:
+    def test_soql_three_frames_down_via_instance_call(self, tmp_path):
+        index = build_index(_write_org(tmp_path))
+        findings = [f for f in _findings_for(index, "AccountHandler.cls") if f["kind"] == "soql"]
+        assert len(findings) == 1
+        assert findings[0]["line"] == 6
+        assert findings[0]["loop_line"] == 5
+        assert findings[0]["chain"] == [
+            "AccountService.enrich",
+            "AccountService.lookup",
+            "AccountSelector.byId",
+        ]
+        assert findings[0]["site"]["line"] == 3
+
+    def test_dml_through_recursive_calls_terminates(self, tmp_path):
+        index = build_index(_write_org(tmp_path))
+        findings = [f for f in _findings_for(index, "AccountHandler.cls") if f["kind"] == "dml"]
+        assert len(findings) == 1
+        assert findings[0]["chain"] == ["Notifier.send", "Notifier.log"]
+
+    def test_call_outside_loop_not_flagged(self, tmp_path):
+        index = build_index(_write_org(tmp_path))
+        assert not any(f["line"] == 10 for f in _findings_for(index, "AccountHandler.cls"))
+
+    def test_trigger_loop_calling_selector_flagged(self, tmp_path):
+        index = build_index(_write_org(tmp_path))
+        findings = _findings_for(index, "AccountTrigger.trigger")
+        assert [f["chain"] for f in findings] == [["AccountSelector.byId"]]
+
+    def test_reaches_query_api(self, tmp_path):
+        index = build_index(_write_org(tmp_path))
+        assert index.reaches("accountservice.ENRICH", "soql")[-1] == "AccountSelector.byId"
+        assert index.reaches("AccountService.enrich", "dml") is None
+
+
+class TestIncrementalIndex:
+    def test_unchanged_files_come_from_cache(self, tmp_path):
+        roots = _write_org(tmp_path)
+        index_path = tmp_path / "apex_index.json"
+        assert build_index(roots, index_path).parsed_count == 5
+        assert build_index(roots, index_path).parsed_count == 0
+
+    def test_changed_file_reparsed_alone(self, tmp_path):
+        roots = _write_org(tmp_path)
+        index_path = tmp_path / "apex_index.json"
+        build_index(roots, index_path)
+        (roots[0] / "AccountSelector.cls").write_text(
+            SELECTOR.replace("return [SELECT Id, Name FROM Account WHERE Id = :accId];", "return null;")
+        )
+        index = build_index(roots, index_path)
+        assert index.parsed_count == 1
+        assert not any(f["kind"] == "soql" for f in _findings_for(index, "AccountHandler.cls"))
+
+    def test_default_index_lives_outside_the_source_tree(self, tmp_path):
+        roots = _write_org(tmp_path)
+        path = mod.default_index_path(roots[0])
+        assert path.parent == mod.CACHE_DIR
+        assert path == mod.default_index_path(roots[0] / "AccountSelector.cls")
+        assert path != mod.default_index_path(tmp_path)
+
+    def test_deleted_file_dropped(self, tmp_path):
+        roots = _write_org(tmp_path)
+        index_path = tmp_path / "apex_index.json"
+        build_index(roots, index_path)
+        (roots[0] / "Notifier.cls").unlink()
+        index = ApexSymbolIndex.load(index_path)
+        index.update(roots)
+        assert not any(path.endswith("Notifier.cls") for path in index.files)
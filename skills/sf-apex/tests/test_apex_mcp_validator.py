@@ -1,6 +1,7 @@
 """Tests for ApexMCPValidator — metadata deployment path behavior."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from conftest import load_script
 
@@ -124,6 +125,26 @@ class TestResultStructure:
         r = _mcp_create("ApexClass", "Custom_Name__c", body)
         assert r["full_name"] == "Custom_Name__c"
 
+    def test_file_named_after_full_name(self):
+        r = _mcp_create("ApexTrigger", "AccountTrigger", _read_fixture("good_trigger.trigger"))
+        assert r["file"] == "AccountTrigger.trigger"
+
+
+class TestConcurrentDeploys:
+    """Bodies are validated in memory, so same-named deploys cannot collide."""
+
+    def test_same_class_name_validated_independently(self):
+        good = _read_fixture("perfect_service.cls")
+        bad = _read_fixture("soql_in_loop.cls")
+        bodies = [good, bad] * 8
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda b: _mcp_create("ApexClass", "SameName", b), bodies))
+        expected_good = _mcp_create("ApexClass", "SameName", good)["score"]
+        expected_bad = _mcp_create("ApexClass", "SameName", bad)["score"]
+        assert expected_good != expected_bad
+        for body, r in zip(bodies, results, strict=True):
+            assert r["score"] == (expected_good if body is good else expected_bad)
+
 
 class TestApiVersionAwareness:
     """The deploy payload's ApiVersion drives version-sensitive checks."""
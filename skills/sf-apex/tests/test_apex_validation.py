@@ -132,3 +132,27 @@ class TestSecurityEnforcedVersionAware:
         path = os.path.join(FIXTURES_DIR, "perfect_service.cls")
         r = ApexValidator(path, api_version=67.0).validate()
         assert not any("SECURITY_ENFORCED" in i["message"] for i in r["issues"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IN-MEMORY SOURCE — from_source() matches the file-path constructor
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestFromSource:
+    def test_matches_file_path_result(self):
+        path = os.path.join(FIXTURES_DIR, "soql_in_loop.cls")
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        from_disk = ApexValidator(path, api_version=66.0).validate()
+        in_memory = ApexValidator.from_source(source, "soql_in_loop.cls", 66.0).validate()
+        assert in_memory == from_disk
+
+    def test_name_is_reported_as_file(self):
+        r = ApexValidator.from_source("public with sharing class A {}", "A.cls").validate()
+        assert r["file"] == "A.cls"
+
+    def test_does_not_touch_disk(self, tmp_path):
+        missing = tmp_path / "DoesNotExist.cls"
+        r = ApexValidator.from_source("public with sharing class A {}", str(missing)).validate()
+        assert not any(i["category"] == "file" for i in r["issues"])
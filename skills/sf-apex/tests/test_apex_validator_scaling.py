@@ -0,0 +1,95 @@
+"""Scaling benchmark for ApexValidator — validation time must grow linearly.
+
+Generated classes and test factories in real orgs reach 5,000–15,000 lines.
+Every rule must stay O(file size); these tests time validate() on synthetic
+Apex from 100 to 20,000 lines and fail if the per-line cost grows with size.
+"""
+
+import time
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-apex/scripts/validate_apex.py")
+ApexValidator = mod.ApexValidator
+
+SIZES = (100, 1_000, 5_000, 20_000)
+
+# Per-line cost at the largest size may be at most this multiple of the cost
+# at the baseline size. Linear rules stay near 1x; the old per-method
+# "@isTest above?" re-join measured ~3.5x on this input.
+MAX_PER_LINE_GROWTH = 2.0
+BASELINE_SIZE = 1_000
+
+
+def _synthetic_apex(line_count: int) -> str:
+    """Build a class of roughly ``line_count`` lines that exercises every rule.
+
+    Each block has PascalCase method names (naming rule, three per block as
+    in generated factories), an ApexDoc comment (documentation rule), a loop
+    with SOQL and DML inside it (bulkification rules) and a dynamic query
+    (security rule).
+    """
+    lines = ["public with sharing class SyntheticFactory {"]
+    block = 0
+    while len(lines) < line_count - 1:
+        lines.extend(
+            [
+                f"    /** @description block {block} */",
+                f"    public static Integer Build{block}(List<Id> ids) {{",
+                "        List<Account> accs = new List<Account>();",
+                "        for (Id recordId : ids) {",
+                "            Account a = [SELECT Id FROM Account WHERE Id = :recordId];",
+                "            update a;",
+                "        }",
+                "        Database.query('SELECT Id FROM Account');",
+                "        return accs.size();",
+                "    }",
+                f"    public static Integer Count{block}() {{ return {block}; }}",
+                f"    public static Integer Size{block}() {{ return {block}; }}",
+            ]
+        )
+        block += 1
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _time_validate(path: str, repeats: int = 3) -> float:
+    """Best-of-N wall time for a full validate() run."""
+    best = float("inf")
+    for _ in range(repeats):
+        validator = ApexValidator(path)
+        start = time.perf_counter()
+        validator.validate()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.parametrize("line_count", SIZES)
+def test_findings_scale_with_block_count(tmp_path, line_count):
+    """Sanity check: each synthetic block yields the same findings at every size."""
+    path = tmp_path / "SyntheticFactory.cls"
+    source = _synthetic_apex(line_count)
+    path.write_text(source, encoding="utf-8")
+    result = ApexValidator(str(path)).validate()
+
+    blocks = source.count("/** @description block")
+    soql = [i for i in result["issues"] if i["message"].startswith("SOQL query inside loop")]
+    dml = [i for i in result["issues"] if i["message"].startswith("DML inside loop")]
+    naming = [i for i in result["issues"] if "should be camelCase" in i["message"]]
+    assert len(soql) == len(dml) == blocks
+    assert len(naming) == 3 * blocks
+
+
+def test_validation_time_grows_linearly(tmp_path):
+    per_line: dict[int, float] = {}
+    for line_count in (BASELINE_SIZE, SIZES[-1]):
+        path = tmp_path / f"Synthetic{line_count}.cls"
+        path.write_text(_synthetic_apex(line_count), encoding="utf-8")
+        per_line[line_count] = _time_validate(str(path)) / line_count
+
+    growth = per_line[SIZES[-1]] / per_line[BASELINE_SIZE]
+    assert growth <= MAX_PER_LINE_GROWTH, (
+        f"per-line validation cost grew {growth:.1f}x from {BASELINE_SIZE} to "
+        f"{SIZES[-1]} lines — a rule is no longer O(file size)"
+    )
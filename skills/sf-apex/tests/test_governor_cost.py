@@ -0,0 +1,108 @@
+"""Tests for governor_cost.py — per-method governor-limit cost polynomials."""
+
+from conftest import load_script
+
+mod = load_script("skills/sf-apex/scripts/governor_cost.py")
+apex_index = load_script("skills/sf-apex/scripts/apex_index.py")
+
+SERVICE = """\
+public with sharing class AccountService {
+    public static void sync(List<Account> accounts) {
+        List<Contact> out = new List<Contact>();
+        for (Account a : accounts) {
+            for (Contact c : a.Contacts) {
+                ContactSelector.byId(c.Id);
+                out.add(c);
+            }
+            update a;
+        }
+        insert out;
+    }
+    public static void bulk(List<Account> accounts) {
+        Map<Id, Account> byId = new Map<Id, Account>([SELECT Id FROM Account WHERE Id IN :accounts]);
+        for (Account a : [SELECT Id FROM Account]) {
+            a.Name = 'x';
+        }
+        update byId.values();
+    }
+}
+"""
+
+SELECTOR = """\
+public inherited sharing class ContactSelector {
+    public static Contact byId(Id contactId) {
+        return [SELECT Id FROM Contact WHERE Id = :contactId];
+    }
+}
+"""
+
+RECURSIVE = """\
+public with sharing class Walker {
+    public static void walk(List<Id> ids) {
+        for (Id i : ids) {
+            visit(i);
+        }
+    }
+    static void visit(Id i) {
+        delete [SELECT Id FROM Task WHERE WhatId = :i];
+        walk(new List<Id>{ i });
+    }
+}
+"""
+
+
+def _costs():
+    index = apex_index.ApexSymbolIndex()
+    index.add_source("AccountService.cls", SERVICE)
+    index.add_source("ContactSelector.cls", SELECTOR)
+    index.add_source("Walker.cls", RECURSIVE)
+    return mod.method_costs(index)
+
+
+class TestPolynomials:
+    def test_format_and_evaluate(self):
+        assert mod.format_poly([2, 1, 3]) == "3N² + N + 2"
+        assert mod.format_poly([]) == "0"
+        assert mod.evaluate([2, 1, 3], 10) == 312
+
+    def test_breach_n(self):
+        assert mod.breach_n([0, 0, 1], 100) == 11
+        assert mod.breach_n([1, 1], 150) == 150
+        assert mod.breach_n([5], 100) is None
+        assert mod.breach_n([101], 100) == 1
+
+    def test_degree_is_capped(self):
+        assert len(mod.poly_add([], [1], mod.MAX_DEGREE + 3)) == mod.MAX_DEGREE + 1
+
+
+class TestMethodCosts:
+    def test_nested_loops_multiply_through_calls(self):
+        sync = _costs()["accountservice.sync"]
+        assert sync["soql"] == [0, 0, 1]  # selector call at loop depth 2
+        assert sync["dml"] == [1, 1]  # update per account + one insert
+        assert sync["heap"] == [0, 0, 1]
+        assert not sync["recursive"]
+
+    def test_for_each_over_query_runs_query_once(self):
+        bulk = _costs()["accountservice.bulk"]
+        assert bulk["soql"] == [2]
+        assert bulk["dml"] == [1]
+
+    def test_recursion_is_cut_and_flagged(self):
+        costs = _costs()
+        assert costs["walker.walk"]["recursive"]
+        assert costs["walker.walk"]["dml"] == [0, 1]
+
+
+class TestRanking:
+    def test_worst_offender_first(self):
+        rows = mod.rank_methods(_costs())
+        assert rows[0]["method"] == "AccountService.sync"
+        assert rows[0]["breach"] == {"soql": 11, "dml": 150}
+        assert mod.exposure_message(rows[0]) == (
+            "Governor exposure in AccountService.sync: "
+            "SOQL N² exceeds 100 at N=11; DML N + 1 exceeds 150 at N=150"
+        )
+        bulk = next(r for r in rows if r["method"] == "AccountService.bulk")
+        assert bulk["breach"] == {"soql": None, "dml": None}
+        assert mod.exposure_message(bulk) is None
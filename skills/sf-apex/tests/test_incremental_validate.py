@@ -0,0 +1,248 @@
+"""Tests for incremental_validate.py — region-level re-validation after edits."""
+
+import os
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-apex/scripts/incremental_validate.py")
+validate_incremental = mod.validate_incremental
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SERVICE = """\
+public with sharing class OrderService {
+    private static final Integer LIMIT_SIZE = 200;
+
+    /** @description loads orders */
+    public static List<Order> load(Set<Id> ids) {
+        List<Order> out = new List<Order>();
+        for (Id orderId : ids) {
+            Order o = [SELECT Id FROM Order WHERE Id = :orderId];
+            out.add(o);
+        }
+        return out;
+    }
+
+    public static void Save(List<Order> orders) {
+        for (Order o : orders)
+            update o;
+    }
+
+    public static void route(Map<Id, Order> byId, Id key) {
+        String status = byId.get(key).Status;
+        try {
+            Database.query('SELECT Id FROM Order');
+        } catch (Exception e) {}
+    }
+}
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(mod, "CACHE_DIR", tmp_path / "cache")
+
+
+def _full(path):
+    custom = mod.ApexValidator(str(path)).validate()
+    llm = mod.LLMPatternValidator(str(path)).validate()
+    return custom, llm
+
+
+def _key(issues):
+    return sorted((i["line"], i["message"]) for i in issues)
+
+
+def _assert_matches_full(path, result):
+    custom, llm = _full(path)
+    assert result["score"] == custom["score"]
+    assert result["scores"] == custom["scores"]
+    assert _key(result["issues"]) == _key(custom["issues"])
+    assert _key(result["llm_issues"]) == _key(llm["issues"])
+
+
+def _edit(path, old, new):
+    text = path.read_text()
+    assert text.count(old) == 1
+    path.write_text(text.replace(old, new))
+    return {"file_path": str(path), "old_string": old, "new_string": new}
+
+
+class TestSegmentation:
+    def test_members_are_regions(self):
+        regions = list(mod.segment_regions(SERVICE.split("\n")))
+        starts = [r[0] for r in regions]
+        # header, field, load (with its ApexDoc), Save, route, closing brace
+        assert starts[:5] == [1, 2, 3, 13, 18]
+        assert all(r[2] <= 1 for r in regions)
+
+
+class TestChangedLines:
+    def test_edit_hint_locates_replacement(self):
+        old = ["a", "b", "c", "b"]
+        new = ["a", "b", "x", "y", "b"]
+        hint = {"old_string": "c", "new_string": "x\ny"}
+        assert mod.changed_lines(old, new, hint) == (3, 3, 4)
+
+    def test_diff_fallback_without_hint(self):
+        assert mod.changed_lines(["a", "b", "c"], ["a", "c"]) == (2, 2, 1)
+
+
+class TestIncrementalValidation:
+    def test_first_run_is_full_and_second_is_cached(self, tmp_path):
+        path = tmp_path / "OrderService.cls"
+        path.write_text(SERVICE)
+        first = validate_incremental(str(path))
+        assert first["incremental"]["mode"] == "full"
+        _assert_matches_full(path, first)
+        assert validate_incremental(str(path))["incremental"]["mode"] == "cached"
+
+    @pytest.mark.parametrize(
+        "old,new",
+        [
+            # fix SOQL in loop (removes a line → later regions shift up)
+            (
+                "            Order o = [SELECT Id FROM Order WHERE Id = :orderId];\n            out.add(o);",
+                "            out.add(new Order(Id = orderId));",
+            ),
+            # introduce a loop with DML in a clean method (later regions shift down)
+            (
+                "        String status = byId.get(key).Status;",
+                "        for (Id k : byId.keySet()) {\n            insert new Task();\n        }\n"
+                "        String status = byId.get(key).Status;",
+            ),
+            # rename a method, no line delta
+            ("public static void Save(", "public static void save("),
+            # remove the ApexDoc above load()
+            ("    /** @description loads orders */\n", ""),
+        ],
+    )
+    def test_edit_matches_full_validation(self, tmp_path, old, new):
+        path = tmp_path / "OrderService.cls"
+        path.write_text(SERVICE)
+        validate_incremental(str(path))
+
+        result = validate_incremental(str(path), _edit(path, old, new))
+
+        assert result["incremental"]["mode"] == "incremental"
+        _assert_matches_full(path, result)
+
+    def test_shifted_loop_message_tracks_line(self, tmp_path):
+        path = tmp_path / "OrderService.cls"
+        path.write_text(SERVICE)
+        validate_incremental(str(path))
+        result = validate_incremental(
+            str(path), _edit(path, "    private static final", "\n\n    private static final")
+        )
+        soql = next(i for i in result["issues"] if i["message"].startswith("SOQL query inside loop"))
+        assert soql["line"] == 10
+        assert "loop started line 9" in soql["message"]
+
+    def test_shifted_field_coverage_message_tracks_lines(self, tmp_path):
+        path = tmp_path / "Coverage.cls"
+        with open(os.path.join(FIXTURES_DIR, "soql_field_coverage_risk.cls"), encoding="utf-8") as f:
+            path.write_text(f.read())
+        validate_incremental(str(path))
+        result = validate_incremental(str(path), _edit(path, "            System.debug(a.Type);\n", ""))
+        assert result["incremental"]["mode"] == "incremental"
+        _assert_matches_full(path, result)
+
+        result = validate_incremental(
+            str(path), _edit(path, "public with sharing", "\n\npublic with sharing")
+        )
+        (issue,) = result["llm_issues"]
+        assert issue["line"] == 8
+        assert "SOQL on line 8" in issue["message"] and "first read on line 11" in issue["message"]
+
+    def test_file_level_fact_change_forces_full_pass(self, tmp_path):
+        path = tmp_path / "OrderService.cls"
+        path.write_text(SERVICE)
+        validate_incremental(str(path))
+        tool_input = _edit(
+            path, "String status = byId.get(key).Status;", "String s = String.escapeSingleQuotes('x');"
+        )
+        result = validate_incremental(str(path), tool_input)
+        assert result["incremental"]["mode"] == "full"
+        _assert_matches_full(path, result)
+
+    def test_edit_without_hint_uses_diff(self, tmp_path):
+        path = tmp_path / "OrderService.cls"
+        path.write_text(SERVICE)
+        validate_incremental(str(path))
+        _edit(path, "public static void Save(", "public static void save(")
+        result = validate_incremental(str(path), {"file_path": str(path)})
+        assert result["incremental"]["mode"] == "incremental"
+        _assert_matches_full(path, result)
+
+    def test_trigger_fixture(self, tmp_path):
+        path = tmp_path / "good_trigger.trigger"
+        with open(os.path.join(FIXTURES_DIR, "good_trigger.trigger"), encoding="utf-8") as f:
+            path.write_text(f.read())
+        _assert_matches_full(path, validate_incremental(str(path)))
+
+    @pytest.mark.parametrize("blank", ["", "  \n\n\t"])
+    def test_blank_file_matches_full_validation(self, tmp_path, blank):
+        path = tmp_path / "Blank.cls"
+        path.write_text("public class Blank {}\n")
+        validate_incremental(str(path))  # leave a cache entry behind
+        path.write_text(blank)
+        result = validate_incremental(str(path))
+        custom, llm = _full(path)
+        assert (result["score"], result["rating"]) == (custom["score"], custom["rating"])
+        assert _key(result["issues"]) == _key(custom["issues"])
+        assert _key(result["llm_issues"]) == _key(llm["issues"])
+        assert result["incremental"]["mode"] == "full"
+
+    def test_large_class_rechecks_only_edited_member(self, tmp_path):
+        members = [
+            f"    /** @description m{n} */\n"
+            f"    public static Integer m{n}(List<Id> ids) {{\n"
+            f"        Integer total = 0;\n"
+            f"        for (Id i : ids) {{\n"
+            f"            total += {n};\n"
+            f"        }}\n"
+            f"        return total;\n"
+            f"    }}\n"
+            for n in range(400)
+        ]
+        source = "public with sharing class Big {\n" + "".join(members) + "}\n"
+        path = tmp_path / "Big.cls"
+        path.write_text(source)
+        validate_incremental(str(path))
+
+        result = validate_incremental(
+            str(path), _edit(path, "            total += 200;", "            update new Account();")
+        )
+
+        assert result["incremental"]["rechecked_lines"] <= 5 * 8
+        _assert_matches_full(path, result)
+
+
+class TestBrokenLLMInputs:
+    def test_bad_rule_pack_still_reports_the_score(self, tmp_path, monkeypatch):
+        path = tmp_path / "OrderService.cls"
+        path.write_text(SERVICE)
+        monkeypatch.setenv("SF_APEX_RULE_PACKS", str(tmp_path / "missing.json"))
+        result = validate_incremental(str(path))
+        custom = mod.ApexValidator(str(path)).validate()
+        assert (result["score"], result["llm_issues"]) == (custom["score"], [])
+        (warning,) = result["warnings"]
+        assert warning.startswith("LLM pattern checks skipped: Cannot read rule pack")
+
+        # Once the pack is fixed the LLM checks run again instead of reusing the cache
+        monkeypatch.delenv("SF_APEX_RULE_PACKS")
+        result = validate_incremental(str(path))
+        assert (result["incremental"]["mode"], result["warnings"]) == ("full", [])
+
+    def test_hook_prints_the_score_and_the_warning(self, tmp_path, monkeypatch):
+        hook = load_script("skills/sf-apex/scripts/post-tool-validate.py")
+        path = tmp_path / "OrderService.cls"
+        path.write_text(SERVICE)
+        bad = tmp_path / "pack.json"
+        bad.write_text("{not json")
+        monkeypatch.setenv("SF_APEX_RULE_PACKS", str(bad))
+        output = hook.validate_apex(str(path))["output"]
+        assert "📊 Score:" in output
+        assert "⚠️ LLM pattern checks skipped:" in output
+        assert "Apex validation error" not in output
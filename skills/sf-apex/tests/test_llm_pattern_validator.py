@@ -1,11 +1,14 @@
 """Tests for LLMPatternValidator — LLM-specific Apex anti-pattern detection."""
 
+import json
 import os
 
+import pytest
 from conftest import load_script
 
 mod = load_script("skills/sf-apex/scripts/llm_pattern_validator.py")
 LLMPatternValidator = mod.LLMPatternValidator
+DescribeCache = load_script("skills/sf-data/scripts/describe_cache.py").DescribeCache
 
 FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
 
@@ -49,3 +52,159 @@ class TestSoqlFieldCoverageHeuristic:
         r = _validate_fixture("soql_field_coverage_risk.cls")
         msgs = _messages(r)
         assert any("queries" in m and "fields" in m for m in msgs)
+
+
+COVERAGE = """\
+public with sharing class CoverageCheck {
+    public static void run(Set<Id> ids) {
+        List<Account> accounts = [
+            SELECT Id, Name, Owner.Name, (SELECT Email FROM Contacts)
+            FROM Account WHERE Id IN :ids
+        ];
+        for (Account a : accounts) {
+            a.Description = a.Name + a.Owner.Name;
+            System.debug(a.Contacts.size() + a.Industry);
+            System.debug(accounts[0].Phone);
+        }
+        for (Contact c : [SELECT Id FROM Contact WHERE AccountId IN :ids]) {
+            System.debug(c.getSObjectType());
+        }
+        List<SObject> rows = Database.query('SELECT Id, Nmae FROM Account');
+    }
+}
+"""
+
+
+class TestSoqlFieldCoverage:
+    def _coverage(self, **kwargs):
+        r = LLMPatternValidator.from_source(COVERAGE, "CoverageCheck.cls", **kwargs).validate()
+        return [i for i in r["issues"] if i["category"].startswith("soql_field")]
+
+    def test_reads_not_in_select_are_reported_at_query_line(self, monkeypatch):
+        monkeypatch.delenv(mod.DESCRIBE_ENV, raising=False)
+        (issue,) = self._coverage()
+        assert issue["line"] == 3
+        assert issue["severity"] == "WARNING"
+        # Owner.Name, the Contacts subquery, writes and method calls are covered
+        assert "reads 2 more: Industry, Phone (first read on line 9)" in issue["message"]
+
+    def test_describe_snapshot_flags_unknown_fields(self):
+        describe = DescribeCache(
+            {"Account": ["Id", "Name", "Phone", "OwnerId"], "Contact": ["Email", "AccountId"]}
+        )
+        issues = self._coverage(describe=describe)
+        by_message = {i["message"]: i["severity"] for i in issues}
+        assert by_message == {
+            "SOQL on line 3 queries 4 fields but code reads 1 more: Phone (first read on line 10)": "WARNING",
+            'SOQL on line 3: No field "Industry" on Account, read on line 9': "CRITICAL",
+            'SOQL on line 15: No field "Nmae" on Account (SELECT)': "WARNING",
+        }
+
+
+class TestSoqlSelectivity:
+    SOURCE = """\
+public with sharing class Lookup {
+    public List<Account> byIndustry(String industry) {
+        return [SELECT Id FROM Account WHERE Industry = :industry];
+    }
+    public Account byId(Id recordId) {
+        return [SELECT Id FROM Account WHERE Id = :recordId];
+    }
+}
+"""
+
+    def test_table_scan_on_large_object_warned(self, tmp_path):
+        path = tmp_path / "stats.json"
+        path.write_text('{"Account": {"recordCount": 3000000}}')
+        r = LLMPatternValidator.from_source(self.SOURCE, "Lookup.cls", stats=str(path)).validate()
+        (issue,) = [i for i in r["issues"] if i["category"] == "soql_selectivity"]
+        assert issue["line"] == 3
+        assert issue["message"].startswith("SOQL on line 3: Non-selective query on Account (3,000,000 records)")
+
+    def test_inline_string_literals_reach_the_estimator(self, tmp_path):
+        path = tmp_path / "stats.json"
+        path.write_text(json.dumps({"Account": {
+            "recordCount": 2400000,
+            "customIndexes": ["Status__c"],
+            "fields": {"Status__c": {"values": {"Open": 120000, "Closed": 2280000}}},
+        }}))
+        source = """\
+public with sharing class Closed {
+    public void run() {
+        List<Account> a = [SELECT Id FROM Account WHERE Status__c = 'Closed'];
+        List<Account> b = [SELECT Id FROM Account WHERE Name LIKE '%acme' // trailing
+                           AND Status__c = 'Closed'];
+        List<SObject> c = Database.query('SELECT Id FROM Account WHERE Status__c = \\'Closed\\'');
+        List<Account> d = [SELECT Id FROM Account WHERE Status__c = 'Open'];
+    }
+}
+"""
+        r = LLMPatternValidator.from_source(source, "Closed.cls", stats=str(path)).validate()
+        lines = [i["line"] for i in r["issues"] if i["category"] == "soql_selectivity"]
+        assert lines == [3, 4, 6]
+
+    def test_no_snapshot_no_check(self, monkeypatch):
+        monkeypatch.delenv(mod.ORG_STATS_ENV, raising=False)
+        r = LLMPatternValidator.from_source(self.SOURCE, "Lookup.cls").validate()
+        assert not [i for i in r["issues"] if i["category"] == "soql_selectivity"]
+
+
+class TestFromSource:
+    def test_matches_file_path_result(self):
+        path = os.path.join(FIXTURES_DIR, "java_hallucinations.cls")
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        in_memory = LLMPatternValidator.from_source(source, "java_hallucinations.cls").validate()
+        assert in_memory == LLMPatternValidator(path).validate()
+
+
+PACK = {
+    "name": "acme",
+    "java_types": {"Optional": "null checks"},
+    "hallucinated_methods": [
+        {
+            "pattern": r"\.legacyCall\s*\(",
+            "message": "legacyCall() was removed in the v2 service layer",
+            "severity": "WARNING",
+            "category": "org_rule",
+            "fix": "Use AcmeService.call()",
+        }
+    ],
+}
+
+PACK_SOURCE = """\
+public with sharing class UsesLegacy {
+    public void run(Optional<String> o) {
+        svc.legacyCall(1);
+        // svc.legacyCall(2) in a comment is ignored
+        List<String> s = new ArrayList<String>();
+    }
+}
+"""
+
+
+class TestRuleTable:
+    def test_table_is_compiled_once_per_process(self):
+        assert mod.rule_table() is mod.rule_table()
+        assert LLMPatternValidator.from_source("").rules is mod.rule_table()
+
+    def test_rule_pack_adds_rules(self, tmp_path):
+        pack = tmp_path / "acme.json"
+        pack.write_text(mod.json.dumps(PACK))
+        r = LLMPatternValidator.from_source(PACK_SOURCE, "UsesLegacy.cls", rule_packs=[pack]).validate()
+        org = [i for i in r["issues"] if i["category"] == "org_rule"]
+        assert [(i["line"], i["severity"], i["fix"]) for i in org] == [(3, "WARNING", "Use AcmeService.call()")]
+        java = {i["message"] for i in r["issues"] if i["category"] == "java_type"}
+        assert java == {'Java type "Optional" does not exist in Apex', 'Java type "ArrayList" does not exist in Apex'}
+
+    def test_rule_pack_directory_from_env(self, tmp_path, monkeypatch):
+        (tmp_path / "acme.json").write_text(mod.json.dumps(PACK))
+        monkeypatch.setenv(mod.RULE_PACKS_ENV, str(tmp_path))
+        r = LLMPatternValidator.from_source(PACK_SOURCE, "UsesLegacy.cls").validate()
+        assert any(i["category"] == "org_rule" for i in r["issues"])
+
+    def test_invalid_rule_pack_raises(self, tmp_path):
+        pack = tmp_path / "bad.json"
+        pack.write_text('{"hallucinated_methods": [{"pattern": "(", "message": "x"}]}')
+        with pytest.raises(mod.RulePackError, match="bad.json"):
+            LLMPatternValidator.from_source(PACK_SOURCE, rule_packs=[pack])
@@ -0,0 +1,115 @@
+"""Tests for validate_apex_cli.py directory mode — pool fan-out, NDJSON/SARIF, --changed-since."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from conftest import REPO_ROOT
+
+CLI = str(REPO_ROOT / "skills" / "sf-apex" / "scripts" / "validate_apex_cli.py")
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+BAD_CLASS = """\
+public class BadService {
+    public static void run(List<Account> accs) {
+        for (Account a : accs) {
+            Account fresh = [SELECT Id FROM Account WHERE Id = :a.Id];
+            update fresh;
+            delete fresh;
+            insert new Task();
+            upsert fresh;
+            undelete fresh;
+        }
+    }
+}
+"""
+
+
+def _run(*args, cwd=None):
+    return subprocess.run(
+        [sys.executable, CLI, *args], capture_output=True, text=True, cwd=cwd, timeout=120
+    )
+
+
+def _tree(tmp_path):
+    classes = tmp_path / "classes"
+    triggers = tmp_path / "triggers"
+    classes.mkdir()
+    triggers.mkdir()
+    for name in ("perfect_service.cls", "soql_in_loop.cls", "java_hallucinations.cls"):
+        shutil.copy(os.path.join(FIXTURES_DIR, name), classes / name)
+    shutil.copy(os.path.join(FIXTURES_DIR, "good_trigger.trigger"), triggers / "good_trigger.trigger")
+    return tmp_path
+
+
+def test_ndjson_streams_one_record_per_file_and_summary(tmp_path):
+    root = _tree(tmp_path)
+    proc = _run(str(root), "--format", "ndjson", "--jobs", "2")
+    records = [json.loads(line) for line in proc.stdout.splitlines()]
+    files = [r for r in records if r["type"] == "file"]
+    assert len(files) == 4
+    assert records[-1]["type"] == "summary"
+    assert records[-1]["files"] == 4
+    assert proc.returncode == 0
+
+
+def test_sarif_is_a_valid_document(tmp_path):
+    root = _tree(tmp_path)
+    proc = _run(str(root / "classes"), "--format", "sarif")
+    sarif = json.loads(proc.stdout)
+    results = sarif["runs"][0]["results"]
+    assert sarif["version"] == "2.1.0"
+    assert any(r["level"] == "error" and r["ruleId"] == "bulkification" for r in results)
+    assert any(r["ruleId"].startswith("llm/") for r in results)
+    assert json.loads(proc.stderr)["files"] == 3
+
+
+def test_glob_and_api_version_argument(tmp_path):
+    root = _tree(tmp_path)
+    proc = _run(str(root / "**" / "*.trigger"), "66.0")
+    assert "good_trigger.trigger" in proc.stdout
+    assert "1 files" in proc.stdout
+
+
+def test_below_threshold_file_fails_the_run(tmp_path):
+    root = _tree(tmp_path)
+    (root / "classes" / "BadService.cls").write_text(BAD_CLASS)
+    proc = _run(str(root), "--jobs", "1")
+    assert proc.returncode == 1
+    assert "❌" in proc.stdout and "BadService.cls" in proc.stdout
+
+
+def test_changed_since_limits_to_modified_files(tmp_path):
+    root = _tree(tmp_path)
+    git = ["git", "-c", "user.email=t@example.com", "-c", "user.name=t"]
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run([*git, "add", "."], cwd=root, check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "base"], cwd=root, check=True)
+    (root / "classes" / "BadService.cls").write_text(BAD_CLASS)
+    with open(root / "classes" / "perfect_service.cls", "a") as f:
+        f.write("\n")
+
+    proc = _run(str(root), "--changed-since", "HEAD", "--format", "ndjson")
+    files = sorted(
+        os.path.basename(r["file"])
+        for r in map(json.loads, proc.stdout.splitlines())
+        if r["type"] == "file"
+    )
+    assert files == ["BadService.cls", "perfect_service.cls"]
+
+
+def test_single_file_report_unchanged():
+    proc = _run(os.path.join(FIXTURES_DIR, "perfect_service.cls"))
+    assert "🔍 Apex Validation: perfect_service.cls" in proc.stdout
+    assert proc.returncode == 0
+
+
+def test_single_file_honors_format():
+    path = os.path.join(FIXTURES_DIR, "soql_in_loop.cls")
+    records = [json.loads(line) for line in _run(path, "--format", "ndjson").stdout.splitlines()]
+    assert [r["type"] for r in records] == ["file", "summary"]
+    assert records[0]["file"] == path
+    sarif = json.loads(_run(path, "--format", "sarif").stdout)
+    assert sarif["runs"][0]["results"]
@@ -83,6 +83,7 @@ INPUT_FILES = {
     "counts": "counts.json",
     "apex_scores": "apex_scores.json",
     "trigger_findings": "trigger_findings.json",
+    "trigger_topology": "trigger_topology.json",
     "flow_scores": "flow_scores.json",
     "process_builders": "process_builders.json",
     "lwc_scores": "lwc_scores.json",
@@ -109,14 +110,22 @@ _DICT_DEFAULTS = {"counts", "test_coverage", "licensing", "team_evaluation",
 
 
 def load_inputs(input_dir):
-    """Load all JSON input files. Missing files become empty dicts/lists."""
+    """Load all JSON input files. Missing files become empty dicts/lists.
+
+    A list input may instead be an NDJSON file of the same name (e.g.
+    apex_scores.ndjson, one entry per line, as artifact_fetch.py writes).
+    """
     data = {}
     input_path = Path(input_dir)
     for key, filename in INPUT_FILES.items():
         fpath = input_path / filename
+        ndjson = fpath.with_suffix(".ndjson")
         if fpath.exists():
             with open(fpath, encoding="utf-8") as f:
                 data[key] = json.load(f)
+        elif key not in _DICT_DEFAULTS and ndjson.exists():
+            with open(ndjson, encoding="utf-8") as f:
+                data[key] = [json.loads(line) for line in f if line.strip()]
         else:
             data[key] = {} if key in _DICT_DEFAULTS else []
     return data
@@ -2397,6 +2406,25 @@ def generate_standalone_reports(data, summary, org_name, run_date, output_dir):
             f'<div class="card"><h2>Automation Overlap ({len(overlaps)} objects)</h2>'
             f'{_table_html(["Object", "Automation Types"], ol_rows)}</div>'
         )
+    # Trigger topology (per-object table from trigger_topology.py)
+    topology = [row for row in data.get("trigger_topology", []) if row.get("findings")]
+    if topology:
+        tt_rows = [
+            [
+                _esc(row.get("object", "")),
+                _esc(", ".join(row.get("triggers", []))),
+                _esc(row.get("events", "")),
+                _esc(", ".join(row.get("handlers", []))),
+                _esc(", ".join(row.get("flows", []))),
+                _severity_badge_html(row.get("severity", "LOW")),
+                "<br>".join(_esc(f.get("message", "")) for f in row.get("findings", [])),
+            ]
+            for row in topology
+        ]
+        arch_sections.append(
+            f'<div class="card"><h2>Trigger Topology ({len(topology)} objects with findings)</h2>'
+            f'{_table_html(["Object", "Triggers", "Events", "Handlers", "Flows", "Severity", "Findings"], tt_rows)}</div>'
+        )
     if arch_sections:
         body = "\n".join(arch_sections)
         p = out / "Architectural_Analysis.html"
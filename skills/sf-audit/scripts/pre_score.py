@@ -15,7 +15,30 @@ Usage:
 Validators invoked:
     - validate_apex.py   (ApexValidator)      → apex_scores.json
     - validate_flow.py   (EnhancedFlowValidator) → flow_scores.json
-    - validate_slds.py   (SLDSValidator)      → lwc_scores.json
+    - lwc_bundle.py      (SLDSValidator + template checks per bundle,
+      plus cross-file handler/binding/CSS checks) → lwc_scores.json
+
+Cross-file analysis:
+    - apex_index.py      (ApexSymbolIndex)    → extra issues on apex/trigger
+      entries for loops that call into SOQL/DML a few frames down. The index
+      is cached in <intermediate-dir>/apex_index.json keyed by file hash, so
+      re-runs only re-parse changed files.
+    - trigger_topology.py                     → trigger_topology.json, plus
+      object/events and consolidation findings on trigger_findings entries
+      (triggers grouped by SObject, cross-referenced with handler classes
+      from the same index and record-triggered flows).
+    - governor_cost.py                        → governor_cost.json (methods
+      ranked by predicted SOQL/DML limit exposure as a function of input
+      size N), plus an issue on each component with a method that exceeds a
+      limit within one 200-record batch.
+
+Query results:
+    Bulk Tooling query results saved as NDJSON (artifact_fetch.py in
+    sf-data streams MCP artifacts to that format) are unpacked into the
+    per-file layout first, one record at a time:
+    apex.ndjson (Name, Body) → apex/<Name>.cls, triggers.ndjson → triggers/
+    <Name>.trigger, lwc.ndjson (LightningComponentResource FilePath, Source)
+    → lwc/<bundle>/<file>.
 
 Components scoring below --threshold (percentage of max) are flagged
 in pre_score_summary.json for LLM review.
@@ -25,7 +48,7 @@ import argparse
 import importlib.util
 import json
 import sys
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 # ---------------------------------------------------------------------------
 # Dynamic module loading
@@ -53,6 +76,51 @@ def _load_module(rel_path: str):
     return module
 
 
+# ---------------------------------------------------------------------------
+# Query results
+# ---------------------------------------------------------------------------
+
+# NDJSON file → (name field, body field, path under the intermediate dir)
+QUERY_RESULTS = [
+    ("apex.ndjson", "Name", "Body", "apex/{}.cls"),
+    ("triggers.ndjson", "Name", "Body", "triggers/{}.trigger"),
+    ("lwc.ndjson", "FilePath", "Source", "{}"),
+]
+
+
+def _unpack_query_results(intermediate_dir: Path) -> dict:
+    """Write each NDJSON query record to its own file. Returns files per domain."""
+    present = [q for q in QUERY_RESULTS if (intermediate_dir / q[0]).is_file()]
+    if not present:
+        return {}
+    mod = _load_module("sf-data/scripts/artifact_fetch.py")
+    if mod is None:
+        return {}
+
+    unpacked = {}
+    for filename, name_field, body_field, template in present:
+        domain = filename.split(".")[0]
+        count = 0
+        for record in mod.iter_ndjson(intermediate_dir / filename):
+            if not isinstance(record, dict):
+                continue
+            name, body = record.get(name_field), record.get(body_field)
+            if not isinstance(name, str) or not isinstance(body, str):
+                continue
+            rel = PurePosixPath(template.format(name))
+            # Names come from the org; never write outside the domain directory
+            if rel.parts[0] != domain or ".." in rel.parts or len(rel.parts) < 2:
+                continue
+            target = intermediate_dir.joinpath(*rel.parts)
+            # Unchanged files keep their mtime, so re-runs stay cheap
+            if not target.is_file() or target.read_text(encoding="utf-8") != body:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text(body, encoding="utf-8")
+            count += 1
+        unpacked[domain] = count
+    return unpacked
+
+
 # ---------------------------------------------------------------------------
 # Scoring helpers
 # ---------------------------------------------------------------------------
@@ -143,6 +211,94 @@ def _score_apex_files(apex_dir: Path, trigger_dir: Path, threshold_pct: int):
     return apex_scores, trigger_findings, needs_review
 
 
+def _build_apex_index(apex_dir: Path, trigger_dir: Path, index_path: Path):
+    """Build (or refresh) the cached Apex symbol index, or None if unavailable."""
+    mod = _load_module("sf-apex/scripts/apex_index.py")
+    roots = [d for d in (apex_dir, trigger_dir) if d.is_dir()]
+    if mod is None or not roots:
+        return None
+    try:
+        return mod.build_index(roots, index_path)
+    except Exception:
+        return None
+
+
+def _apex_transitive_findings(index):
+    """Loops that transitively reach SOQL/DML, from the Apex symbol index.
+
+    Returns a dict mapping component name (file stem) to its findings.
+    """
+    if index is None:
+        return {}
+    try:
+        findings = index.loop_findings()
+    except Exception:
+        return {}
+
+    by_name: dict[str, list[dict]] = {}
+    for finding in findings:
+        by_name.setdefault(Path(finding["file"]).stem, []).append(finding)
+    return by_name
+
+
+def _trigger_topology(index, flows_dir: Path):
+    """Per-object trigger topology plus per-trigger details and findings.
+
+    Returns ``(rows, details, per_trigger_findings, flow_info)``; all empty
+    when the index or trigger_topology.py is unavailable.
+    """
+    mod = _load_module("sf-audit/scripts/trigger_topology.py")
+    if mod is None:
+        return [], {}, {}, {}
+    flow_info = mod.read_flow_info(flows_dir)
+    if index is None:
+        return [], {}, {}, flow_info
+    try:
+        rows, per_trigger = mod.analyze_topology(index, flow_info)
+        details = mod.trigger_details(index)
+    except Exception:
+        return [], {}, {}, flow_info
+    return rows, details, per_trigger, flow_info
+
+
+def _governor_costs(index):
+    """Methods ranked by predicted governor-limit exposure.
+
+    Returns ``(rows, by_name)``: rows for governor_cost.json, and exposure
+    messages keyed by component name (file stem). Both empty when the index
+    or governor_cost.py is unavailable.
+    """
+    mod = _load_module("sf-apex/scripts/governor_cost.py")
+    if mod is None or index is None:
+        return [], {}
+    try:
+        ranked = mod.rank_methods(mod.method_costs(index))
+    except Exception:
+        return [], {}
+
+    rows = []
+    by_name: dict[str, list[str]] = {}
+    for row in ranked:
+        name = Path(row["file"]).stem
+        rows.append(
+            {
+                "method": row["method"],
+                "component": name,
+                "line": row["line"],
+                "soql": row["formatted"]["soql"],
+                "dml": row["formatted"]["dml"],
+                "heap": row["formatted"]["heap"],
+                "soql_breach_n": row["breach"]["soql"],
+                "dml_breach_n": row["breach"]["dml"],
+                "recursive": row["recursive"],
+            }
+        )
+        message = mod.exposure_message(row)
+        if message:
+            by_name.setdefault(name, []).append(message)
+    return rows, by_name
+
+
 def _score_flow_files(flows_dir: Path, threshold_pct: int):
     """Score .flow-meta.xml files with the Flow validator."""
     mod = _load_module("sf-flow/scripts/validate_flow.py")
@@ -204,8 +360,8 @@ def _score_flow_files(flows_dir: Path, threshold_pct: int):
 
 
 def _score_lwc_bundles(lwc_dir: Path, threshold_pct: int):
-    """Score LWC bundles by validating each file and aggregating per bundle."""
-    mod = _load_module("sf-lwc/scripts/validate_slds.py")
+    """Score LWC bundles with the sf-lwc bundle analyzer (all files in one pass)."""
+    mod = _load_module("sf-lwc/scripts/lwc_bundle.py")
     if mod is None:
         return [], []
 
@@ -219,43 +375,27 @@ def _score_lwc_bundles(lwc_dir: Path, threshold_pct: int):
         if not bundle_dir.is_dir():
             continue
 
-        # Validate each file in the bundle; average per-file scores.
-        all_issues = []
+        # The analyzer averages per-file SLDS scores so bundles with multiple
+        # files aren't penalized more than single-file components, then
+        # deducts cross-file findings (missing handlers, unused CSS, ...).
+        # Bundles with no scoreable files (no .html/.css/.js) get 0 so they
+        # are flagged.
         max_score = 165
-        file_scores = []
-
-        for ext in ("*.html", "*.css", "*.js"):
-            for fp in bundle_dir.glob(ext):
-                try:
-                    result = mod.SLDSValidator(str(fp)).validate()
-                except Exception as exc:
-                    result = {
-                        "score": 0,
-                        "max_score": max_score,
-                        "issues": [
-                            {
-                                "message": f"Validator error: {exc}",
-                                "severity": "CRITICAL",
-                            }
-                        ],
-                    }
+        try:
+            result = mod.analyze_bundle(str(bundle_dir))
+        except Exception as exc:
+            result = {
+                "score": 0,
+                "max_score": max_score,
+                "issues": [{"message": f"Validator error: {exc}", "severity": "CRITICAL"}],
+            }
 
-                file_scores.append(result.get("score", 0))
-
-                for issue in result.get("issues", []):
-                    msg = (
-                        issue.get("message", str(issue))
-                        if isinstance(issue, dict)
-                        else str(issue)
-                    )
-                    all_issues.append(msg)
-
-        # Average per-file scores so bundles with multiple files aren't
-        # penalized more than single-file components.  Bundles with no
-        # scoreable files (no .html/.css/.js) get 0 so they are flagged.
-        score = (
-            round(sum(file_scores) / len(file_scores)) if file_scores else 0
-        )
+        score = result.get("score", 0)
+        max_score = result.get("max_score", max_score)
+        all_issues = [
+            issue.get("message", str(issue)) if isinstance(issue, dict) else str(issue)
+            for issue in result.get("issues", [])
+        ]
         name = bundle_dir.name
 
         lwc_scores.append(
@@ -294,6 +434,7 @@ def pre_score(intermediate_dir: Path, output_dir: Path, threshold_pct: int = 70)
     Returns a summary dict suitable for pre_score_summary.json.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
+    unpacked = _unpack_query_results(intermediate_dir)
 
     # --- Apex ---
     apex_scores, trigger_findings, apex_review = _score_apex_files(
@@ -302,11 +443,45 @@ def pre_score(intermediate_dir: Path, output_dir: Path, threshold_pct: int = 70)
         threshold_pct,
     )
 
+    # Cross-file findings are reported alongside the per-file issues but do
+    # not change the per-file score. The index is built once and shared.
+    index = _build_apex_index(
+        intermediate_dir / "apex",
+        intermediate_dir / "triggers",
+        intermediate_dir / "apex_index.json",
+    )
+    transitive = _apex_transitive_findings(index)
+    topology, trigger_details, topology_findings, flow_info = _trigger_topology(
+        index, intermediate_dir / "flows"
+    )
+    governor_cost, exposure = _governor_costs(index)
+    for entry in apex_scores:
+        entry["issues"].extend(f["message"] for f in transitive.get(entry["name"], []))
+        entry["issues"].extend(exposure.get(entry["name"], []))
+    for entry in trigger_findings:
+        detail = trigger_details.get(entry["name"])
+        if detail:
+            entry["object"] = detail["object"]
+            entry["events"] = ", ".join(detail["events"])
+        entry["findings"].extend(
+            {"severity": f["severity"], "message": f["message"]}
+            for f in transitive.get(entry["name"], [])
+        )
+        entry["findings"].extend(topology_findings.get(entry["name"], []))
+        entry["findings"].extend(
+            {"severity": "HIGH", "message": message} for message in exposure.get(entry["name"], [])
+        )
+
     # --- Flows ---
     flow_scores, flow_review = _score_flow_files(
         intermediate_dir / "flows",
         threshold_pct,
     )
+    for entry in flow_scores:
+        info = flow_info.get(entry["name"], {})
+        entry["process_type"] = entry["process_type"] or info.get("process_type", "")
+        if info.get("object"):
+            entry["object"] = info["object"]
 
     # --- LWC ---
     lwc_scores, lwc_review = _score_lwc_bundles(
@@ -318,6 +493,8 @@ def pre_score(intermediate_dir: Path, output_dir: Path, threshold_pct: int = 70)
     for filename, data in [
         ("apex_scores.json", apex_scores),
         ("trigger_findings.json", trigger_findings),
+        ("trigger_topology.json", topology),
+        ("governor_cost.json", governor_cost),
         ("flow_scores.json", flow_scores),
         ("lwc_scores.json", lwc_scores),
     ]:
@@ -333,12 +510,18 @@ def pre_score(intermediate_dir: Path, output_dir: Path, threshold_pct: int = 70)
             "below_threshold": len(
                 [r for r in apex_review if r["domain"] == "apex"]
             ),
+            "transitive_loop_findings": sum(len(v) for v in transitive.values()),
+            "methods_exceeding_limits": sum(len(v) for v in exposure.values()),
         },
         "triggers": {
             "scored": len(trigger_findings),
             "below_threshold": len(
                 [r for r in apex_review if r["domain"] == "triggers"]
             ),
+            "objects": len(topology),
+            "objects_with_multiple_triggers": len(
+                [row for row in topology if len(row["triggers"]) > 1]
+            ),
         },
         "flows": {
             "scored": len(flow_scores),
@@ -350,6 +533,8 @@ def pre_score(intermediate_dir: Path, output_dir: Path, threshold_pct: int = 70)
         },
         "needs_llm_review": needs_review,
     }
+    if unpacked:
+        summary["query_results"] = unpacked
 
     (output_dir / "pre_score_summary.json").write_text(json.dumps(summary, indent=2))
     return summary
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Trigger topology analysis for Salesforce org audits.
+
+Parses every trigger once (through the cached Apex symbol index), fills in
+each trigger's SObject and events, groups triggers by SObject and cross-
+references the handler classes and trigger frameworks they call into. Record-
+triggered flows from the intermediate flows directory are folded in so mixed
+trigger/flow automation on the same object is visible.
+
+The result is a compact per-object table (trigger_topology.json) that
+generate_reports.py renders directly, so the audit does not need an LLM pass
+to work out trigger topology.
+
+Usage:
+    python trigger_topology.py \\
+      --intermediate-dir ./audit_output/intermediate \\
+      --output-dir ./audit_output
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+SKILLS_ROOT = Path(__file__).resolve().parent.parent.parent  # skills/
+
+FLOW_NS = "{http://soap.sforce.com/2006/04/metadata}"
+
+# Class names that identify a trigger framework when a trigger calls or
+# instantiates them, or when its handler extends them (keys lower-case).
+FRAMEWORK_MARKERS = {
+    "metadatatriggerhandler": "Trigger Actions Framework",
+    "fflib_sobjectdomain": "fflib Domain",
+    "triggerhandler": "TriggerHandler base class",
+}
+HANDLER_CLASS = "Handler class"
+NO_HANDLER = "None (logic in trigger body)"
+
+# start/triggerType → timing; start/recordTriggerType → DML events
+_FLOW_TIMING = {
+    "RecordBeforeSave": "before",
+    "RecordAfterSave": "after",
+    "RecordBeforeDelete": "before",
+}
+_FLOW_EVENTS = {
+    "Create": ("insert",),
+    "Update": ("update",),
+    "CreateAndUpdate": ("insert", "update"),
+    "Delete": ("delete",),
+}
+_SEVERITY_RANK = {"CRITICAL": 4, "HIGH": 3, "MEDIUM": 2, "LOW": 1}
+
+
+def _load_module(rel_path: str):
+    """Import a Python module from *rel_path* (relative to skills/ dir)."""
+    path = SKILLS_ROOT / rel_path
+    if not path.exists():
+        return None
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec is None or spec.loader is None:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------------------------------------------------------------------------
+# Flows
+# ---------------------------------------------------------------------------
+
+
+def read_flow_info(flows_dir: Path) -> dict[str, dict]:
+    """Process type, and object/events for record-triggered flows, per flow name.
+
+    Only ``processType`` and ``start`` are read; malformed files are skipped.
+    """
+    flows: dict[str, dict] = {}
+    if not flows_dir.is_dir():
+        return flows
+    for fp in sorted(flows_dir.glob("*.flow-meta.xml")):
+        name = fp.name.removesuffix(".flow-meta.xml")
+        try:
+            root = ET.parse(fp).getroot()
+        except (ET.ParseError, OSError):
+            continue
+        info = {"process_type": root.findtext(f"{FLOW_NS}processType", "") or ""}
+        start = root.find(f"{FLOW_NS}start")
+        if start is not None:
+            obj = start.findtext(f"{FLOW_NS}object", "") or ""
+            timing = _FLOW_TIMING.get(start.findtext(f"{FLOW_NS}triggerType", "") or "")
+            if obj and timing:
+                record_type = start.findtext(f"{FLOW_NS}recordTriggerType", "") or ""
+                info["object"] = obj
+                info["events"] = [
+                    f"{timing} {event}" for event in _FLOW_EVENTS.get(record_type, ())
+                ]
+        flows[name] = info
+    return flows
+
+
+# ---------------------------------------------------------------------------
+# Triggers
+# ---------------------------------------------------------------------------
+
+
+def _class_table(index) -> dict[str, dict]:
+    """lower-case class name → {"name", "extends"} over every indexed file."""
+    table: dict[str, dict] = {}
+    for entry in index.files.values():
+        symbols = entry["symbols"]
+        extends = symbols.get("extends", {})
+        for name in symbols["classes"]:
+            table.setdefault(name.lower(), {"name": name, "extends": extends.get(name, "")})
+    return table
+
+
+def trigger_details(index) -> dict[str, dict]:
+    """Per-trigger object, events, handler classes and framework."""
+    classes = _class_table(index)
+    details: dict[str, dict] = {}
+    for entry in index.files.values():
+        symbols = entry["symbols"]
+        if symbols.get("kind") != "trigger" or not symbols["classes"]:
+            continue
+        name = symbols["classes"][0]
+        referenced = [c["qualifier"] for c in symbols["calls"] if c["qualifier"]]
+        referenced += [n["class"] for n in symbols.get("instantiates", [])]
+
+        handlers: list[str] = []
+        frameworks: list[str] = []
+        for ref in referenced:
+            ref_lower = ref.lower()
+            if ref_lower in FRAMEWORK_MARKERS:
+                frameworks.append(FRAMEWORK_MARKERS[ref_lower])
+            local = classes.get(ref_lower)
+            if local is None or local["name"] in handlers:
+                continue
+            handlers.append(local["name"])
+            parent = local["extends"].rsplit(".", 1)[-1].lower()
+            if parent in FRAMEWORK_MARKERS:
+                frameworks.append(FRAMEWORK_MARKERS[parent])
+
+        if frameworks:
+            framework = frameworks[0]
+        else:
+            framework = HANDLER_CLASS if handlers else NO_HANDLER
+        details[name] = {
+            "object": symbols.get("sobject", ""),
+            "events": symbols.get("events", []),
+            "handlers": handlers,
+            "framework": framework,
+        }
+    return details
+
+
+# ---------------------------------------------------------------------------
+# Per-object table
+# ---------------------------------------------------------------------------
+
+
+def analyze_topology(index, flow_info: dict[str, dict] | None = None):
+    """Group triggers (and record-triggered flows) by SObject and flag risks.
+
+    Returns ``(rows, trigger_findings)``: one row per SObject that has at
+    least one trigger, and a mapping of trigger name → findings for that
+    trigger alone (to merge into trigger_findings.json).
+    """
+    details = trigger_details(index)
+    flow_info = flow_info or {}
+
+    by_object: dict[str, dict] = {}
+    for name, info in sorted(details.items()):
+        key = info["object"].lower()
+        group = by_object.setdefault(key, {"object": info["object"], "triggers": [], "flows": []})
+        group["triggers"].append(name)
+    for flow_name, info in sorted(flow_info.items()):
+        group = by_object.get(info.get("object", "").lower())
+        if group is not None:
+            group["flows"].append(flow_name)
+
+    per_trigger: dict[str, list[dict]] = {name: [] for name in details}
+    rows = []
+    for group in sorted(by_object.values(), key=lambda g: g["object"].lower()):
+        obj, triggers, flows = group["object"], group["triggers"], group["flows"]
+        findings: list[dict] = []
+
+        event_owners: dict[str, list[str]] = {}
+        for name in triggers:
+            for event in details[name]["events"]:
+                event_owners.setdefault(event, []).append(name)
+        shared = {event: names for event, names in event_owners.items() if len(names) > 1}
+
+        if shared:
+            for event, names in sorted(shared.items()):
+                message = (
+                    f"Multiple triggers on {obj} for {event} ({', '.join(names)}) — "
+                    f"execution order is not guaranteed"
+                )
+                findings.append({"severity": "HIGH", "message": message})
+                for name in names:
+                    per_trigger[name].append({"severity": "HIGH", "message": message})
+        elif len(triggers) > 1:
+            findings.append(
+                {
+                    "severity": "MEDIUM",
+                    "message": f"{len(triggers)} triggers on {obj} — consolidate into one trigger per object",
+                }
+            )
+
+        frameworks = sorted({details[name]["framework"] for name in triggers})
+        if len(frameworks) > 1:
+            findings.append(
+                {
+                    "severity": "MEDIUM",
+                    "message": f"Triggers on {obj} mix handler patterns: {', '.join(frameworks)}",
+                }
+            )
+
+        if flows:
+            flow_events = sorted({e for f in flows for e in flow_info[f].get("events", [])})
+            overlap = sorted(set(flow_events) & set(event_owners))
+            detail = f" (both on {', '.join(overlap)})" if overlap else ""
+            findings.append(
+                {
+                    "severity": "MEDIUM",
+                    "message": (
+                        f"{obj} is automated by both Apex triggers and record-triggered "
+                        f"flows ({', '.join(flows)}){detail}"
+                    ),
+                }
+            )
+
+        for name in triggers:
+            if details[name]["framework"] == NO_HANDLER:
+                message = "Logic in trigger body instead of a handler class"
+                per_trigger[name].append({"severity": "HIGH", "message": message})
+                findings.append({"severity": "HIGH", "message": f"{name}: {message}"})
+
+        rows.append(
+            {
+                "object": obj,
+                "triggers": triggers,
+                "events": ", ".join(sorted(event_owners)),
+                "handlers": sorted({h for name in triggers for h in details[name]["handlers"]}),
+                "frameworks": frameworks,
+                "flows": flows,
+                "severity": max(
+                    (f["severity"] for f in findings),
+                    key=lambda s: _SEVERITY_RANK.get(s, 0),
+                    default="LOW",
+                ),
+                "findings": findings,
+            }
+        )
+    return rows, per_trigger
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-object trigger topology for org audits")
+    parser.add_argument("--intermediate-dir", required=True, help="Directory with apex/, triggers/, flows/")
+    parser.add_argument("--output-dir", required=True, help="Where to write trigger_topology.json")
+    args = parser.parse_args()
+
+    apex_index = _load_module("sf-apex/scripts/apex_index.py")
+    if apex_index is None:
+        print("apex_index.py not found — install the sf-apex skill alongside sf-audit", file=sys.stderr)
+        return 1
+
+    inter = Path(args.intermediate_dir)
+    roots = [d for d in (inter / "apex", inter / "triggers") if d.is_dir()]
+    index = apex_index.build_index(roots, inter / "apex_index.json")
+    rows, _ = analyze_topology(index, read_flow_info(inter / "flows"))
+
+    out = Path(args.output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    (out / "trigger_topology.json").write_text(json.dumps(rows, indent=2))
+    print(f"Trigger topology: {len(rows)} objects written to {out / 'trigger_topology.json'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -70,6 +70,16 @@ def test_load_inputs_missing_dir_returns_defaults(gen, tmp_path):
     assert data["apex_scores"] == []
 
 
+def test_load_inputs_reads_ndjson_lists(gen, tmp_path):
+    rows = [{"name": "A", "score": 120, "max_score": 150}, {"name": "B", "score": 90, "max_score": 150}]
+    (tmp_path / "apex_scores.ndjson").write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+    # Dict inputs are never read from NDJSON
+    (tmp_path / "counts.ndjson").write_text('{"apex_classes": 2}\n')
+    data = gen.load_inputs(str(tmp_path))
+    assert data["apex_scores"] == rows
+    assert data["counts"] == {}
+
+
 # ── Score computation ───────────────────────────────────────────────────────
 
 
@@ -328,3 +338,26 @@ def test_standalone_reports_with_empty_data(gen, output_dir, tmp_path):
     )
     # With empty data, no standalone reports should be generated
     assert generated == []
+
+
+def test_architectural_analysis_renders_trigger_topology(gen, output_dir):
+    data = gen.load_inputs(str(FIXTURES_DIR))
+    data["trigger_topology"] = [
+        {
+            "object": "Account",
+            "triggers": ["AccountTrigger", "AccountAudit"],
+            "events": "before insert",
+            "handlers": ["AccountTriggerHandler"],
+            "flows": [],
+            "severity": "HIGH",
+            "findings": [{"severity": "HIGH", "message": "Multiple triggers on Account <x>"}],
+        },
+        {"object": "Contact", "triggers": ["ContactTrigger"], "findings": []},
+    ]
+    summary = gen.compute_summary(data)
+    output_dir.mkdir(parents=True)
+    gen.generate_standalone_reports(data, summary, "Test Org", "2026-03-06", str(output_dir))
+    content = (output_dir / "Architectural_Analysis.html").read_text(encoding="utf-8")
+    assert "Trigger Topology (1 objects with findings)" in content
+    assert "AccountTrigger, AccountAudit" in content
+    assert "&lt;x&gt;" in content
@@ -292,3 +292,139 @@ def test_summary_written_to_disk(tmp_path):
     assert summary_path.exists()
     summary = json.loads(summary_path.read_text())
     assert summary["threshold_pct"] == 70
+
+
+def test_transitive_soql_in_loop_reported_without_rescoring(tmp_path):
+    """A loop that calls into a selector gets a cross-file finding from the index."""
+    inter = _setup_intermediate(tmp_path)
+    (inter / "apex" / "AccountTriggerHandler.cls").write_text(
+        """\
+public with sharing class AccountTriggerHandler {
+    public static void handle(List<Account> accs) {
+        for (Account a : accs) {
+            AccountSelector.byId(a.Id);
+        }
+    }
+}
+"""
+    )
+    (inter / "apex" / "AccountSelector.cls").write_text(
+        """\
+public inherited sharing class AccountSelector {
+    public static Account byId(Id accId) {
+        return [SELECT Id FROM Account WHERE Id = :accId];
+    }
+}
+"""
+    )
+    output = tmp_path / "output"
+
+    summary = pre_score_mod.pre_score(inter, output)
+
+    scores = {e["name"]: e for e in json.loads((output / "apex_scores.json").read_text())}
+    handler_issues = scores["AccountTriggerHandler"]["issues"]
+    assert any("SOQL reachable inside loop" in m for m in handler_issues)
+    assert summary["apex"]["transitive_loop_findings"] == 1
+    assert (inter / "apex_index.json").exists()
+
+
+def test_trigger_object_events_and_topology_written(tmp_path):
+    """Trigger entries get object/events and a per-object topology file is written."""
+    inter = _setup_intermediate(tmp_path)
+    (inter / "triggers" / "AccountTrigger2.trigger").write_text(
+        "trigger AccountTrigger2 on Account (before insert, after update) {\n"
+        "    for (Account a : Trigger.new) { a.Name = 'x'; }\n"
+        "}\n"
+    )
+    output = tmp_path / "output"
+
+    summary = pre_score_mod.pre_score(inter, output)
+
+    findings = {e["name"]: e for e in json.loads((output / "trigger_findings.json").read_text())}
+    assert findings["AccountTrigger2"]["object"] == "Account"
+    assert findings["AccountTrigger2"]["events"] == "before insert, after update"
+    messages = [f["message"] for f in findings["AccountTrigger2"]["findings"]]
+    assert any("execution order is not guaranteed" in m for m in messages)
+    assert any(m.startswith("Logic in trigger body") for m in messages)
+
+    topology = json.loads((output / "trigger_topology.json").read_text())
+    assert [row["object"] for row in topology] == ["Account"]
+    assert topology[0]["triggers"] == ["AccountTrigger", "AccountTrigger2"]
+    assert summary["triggers"]["objects_with_multiple_triggers"] == 1
+
+
+def test_governor_cost_ranked_and_reported(tmp_path):
+    """Methods are ranked by limit exposure; batch-size breaches become issues."""
+    inter = _setup_intermediate(tmp_path)
+    (inter / "apex" / "OrderSync.cls").write_text(
+        """\
+public with sharing class OrderSync {
+    public static void sync(List<Order> orders) {
+        for (Order o : orders) {
+            for (OrderItem item : o.OrderItems) {
+                update item;
+            }
+        }
+    }
+}
+"""
+    )
+    output = tmp_path / "output"
+
+    summary = pre_score_mod.pre_score(inter, output)
+
+    ranked = json.loads((output / "governor_cost.json").read_text())
+    assert ranked[0]["method"] == "OrderSync.sync"
+    assert ranked[0]["dml"] == "N²"
+    assert ranked[0]["dml_breach_n"] == 13
+    scores = {e["name"]: e for e in json.loads((output / "apex_scores.json").read_text())}
+    assert any(m.startswith("Governor exposure in OrderSync.sync") for m in scores["OrderSync"]["issues"])
+    exposed = [
+        r for r in ranked if min(r["soql_breach_n"] or 999, r["dml_breach_n"] or 999) <= 200
+    ]
+    assert summary["apex"]["methods_exceeding_limits"] == len(exposed) >= 1
+
+
+def test_lwc_bundle_cross_file_findings(tmp_path):
+    """Handlers missing from the bundle JS are reported and deducted."""
+    inter = tmp_path / "intermediate"
+    html = SIMPLE_LWC_HTML.replace("<p ", "<p onclick={handleClick} ")
+    for name, js in (
+        ("helloClick", SIMPLE_LWC_JS),
+        ("helloWorld", SIMPLE_LWC_JS.replace("{}", "{\n    handleClick() {}\n}")),
+    ):
+        lwc_dir = inter / "lwc" / name
+        lwc_dir.mkdir(parents=True)
+        (lwc_dir / f"{name}.html").write_text(html)
+        (lwc_dir / f"{name}.js").write_text(js)
+
+    output = tmp_path / "output"
+    pre_score_mod.pre_score(inter, output)
+
+    broken, clean = json.loads((output / "lwc_scores.json").read_text())
+    assert "Handler handleClick used in helloClick.html is not defined in helloClick.js" in broken["issues"]
+    assert broken["score"] == clean["score"] - 5
+
+
+def test_ndjson_query_results_are_unpacked_and_scored(tmp_path):
+    """Bulk query results fetched to NDJSON become per-file bodies."""
+    inter = tmp_path / "intermediate"
+    inter.mkdir()
+    rows = [
+        {"attributes": {"type": "ApexClass"}, "Name": "SimpleService", "Body": SIMPLE_APEX},
+        {"attributes": {"type": "ApexClass"}, "Name": "../Escape", "Body": BAD_APEX},
+    ]
+    (inter / "apex.ndjson").write_text("".join(json.dumps(r) + "\n" for r in rows))
+    (inter / "triggers.ndjson").write_text(json.dumps({"Name": "AccountTrigger", "Body": SIMPLE_TRIGGER}) + "\n")
+    lwc = [
+        {"FilePath": "lwc/helloWorld/helloWorld.html", "Source": SIMPLE_LWC_HTML},
+        {"FilePath": "lwc/helloWorld/helloWorld.js", "Source": SIMPLE_LWC_JS},
+    ]
+    (inter / "lwc.ndjson").write_text("".join(json.dumps(r) + "\n" for r in lwc))
+
+    summary = pre_score_mod.pre_score(inter, tmp_path / "output")
+
+    assert summary["query_results"] == {"apex": 1, "triggers": 1, "lwc": 2}
+    assert (inter / "apex" / "SimpleService.cls").read_text() == SIMPLE_APEX
+    assert not (tmp_path / "Escape.cls").exists()
+    assert (summary["apex"]["scored"], summary["triggers"]["scored"], summary["lwc"]["scored"]) == (1, 1, 1)
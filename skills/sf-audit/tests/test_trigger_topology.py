@@ -0,0 +1,118 @@
+"""Tests for trigger_topology.py — per-object trigger consolidation analysis."""
+
+from conftest import load_script
+
+topo = load_script("skills/sf-audit/scripts/trigger_topology.py")
+apex_index = load_script("skills/sf-apex/scripts/apex_index.py")
+
+HANDLER = """\
+public with sharing class AccountTriggerHandler extends TriggerHandler {
+    public override void beforeInsert() {}
+}
+"""
+
+TAF_TRIGGER = """\
+trigger AccountTrigger on Account (before insert, after update) {
+    new MetadataTriggerHandler().run();
+}
+"""
+
+HANDLER_TRIGGER = """\
+trigger AccountAudit on Account (before insert) {
+    new AccountTriggerHandler().run();
+}
+"""
+
+INLINE_TRIGGER = """\
+trigger ContactTrigger on Contact (before update) {
+    for (Contact c : Trigger.new) {
+        c.Description = 'x';
+    }
+}
+"""
+
+ACCOUNT_FLOW = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<Flow xmlns="http://soap.sforce.com/2006/04/metadata">
+    <processType>AutoLaunchedFlow</processType>
+    <start>
+        <object>Account</object>
+        <recordTriggerType>CreateAndUpdate</recordTriggerType>
+        <triggerType>RecordAfterSave</triggerType>
+    </start>
+</Flow>
+"""
+
+
+def _index(tmp_path):
+    classes = tmp_path / "apex"
+    classes.mkdir()
+    (classes / "AccountTriggerHandler.cls").write_text(HANDLER)
+    triggers = tmp_path / "triggers"
+    triggers.mkdir()
+    for name, body in [
+        ("AccountTrigger", TAF_TRIGGER),
+        ("AccountAudit", HANDLER_TRIGGER),
+        ("ContactTrigger", INLINE_TRIGGER),
+    ]:
+        (triggers / f"{name}.trigger").write_text(body)
+    return apex_index.build_index([classes, triggers])
+
+
+def _flows(tmp_path):
+    flows = tmp_path / "flows"
+    flows.mkdir()
+    (flows / "Account_After_Save.flow-meta.xml").write_text(ACCOUNT_FLOW)
+    (flows / "Broken.flow-meta.xml").write_text("<Flow")
+    return topo.read_flow_info(flows)
+
+
+def _row(rows, obj):
+    return next(r for r in rows if r["object"] == obj)
+
+
+class TestTriggerDetails:
+    def test_object_and_events(self, tmp_path):
+        details = topo.trigger_details(_index(tmp_path))
+        assert details["AccountTrigger"]["object"] == "Account"
+        assert details["AccountTrigger"]["events"] == ["before insert", "after update"]
+
+    def test_frameworks(self, tmp_path):
+        details = topo.trigger_details(_index(tmp_path))
+        assert details["AccountTrigger"]["framework"] == "Trigger Actions Framework"
+        assert details["AccountAudit"]["framework"] == "TriggerHandler base class"
+        assert details["AccountAudit"]["handlers"] == ["AccountTriggerHandler"]
+        assert details["ContactTrigger"]["framework"] == topo.NO_HANDLER
+
+
+class TestFlowInfo:
+    def test_record_triggered_flow(self, tmp_path):
+        info = _flows(tmp_path)
+        assert info["Account_After_Save"]["object"] == "Account"
+        assert info["Account_After_Save"]["events"] == ["after insert", "after update"]
+        assert "Broken" not in info
+
+
+class TestAnalyzeTopology:
+    def test_shared_event_is_high(self, tmp_path):
+        rows, per_trigger = topo.analyze_topology(_index(tmp_path), _flows(tmp_path))
+        account = _row(rows, "Account")
+        assert account["triggers"] == ["AccountAudit", "AccountTrigger"]
+        assert account["severity"] == "HIGH"
+        assert any("before insert" in f["message"] for f in account["findings"])
+        assert any("execution order" in f["message"] for f in per_trigger["AccountAudit"])
+
+    def test_mixed_patterns_and_flows(self, tmp_path):
+        rows, _ = topo.analyze_topology(_index(tmp_path), _flows(tmp_path))
+        messages = [f["message"] for f in _row(rows, "Account")["findings"]]
+        assert any("mix handler patterns" in m for m in messages)
+        assert any("Account_After_Save" in m and "after update" in m for m in messages)
+        assert _row(rows, "Account")["flows"] == ["Account_After_Save"]
+
+    def test_logic_in_trigger_body(self, tmp_path):
+        rows, per_trigger = topo.analyze_topology(_index(tmp_path))
+        assert _row(rows, "Contact")["severity"] == "HIGH"
+        assert per_trigger["ContactTrigger"][0]["message"].startswith("Logic in trigger body")
+        assert per_trigger["AccountTrigger"] == [
+            f for f in per_trigger["AccountTrigger"] if "execution order" in f["message"]
+        ]
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Artifact Fetcher
+================
+
+Streams the full dataset behind an MCP artifact response (see
+references/mcp-pagination.md) to a local NDJSON file, one record per line,
+so scoring and report scripts can read it from disk instead of through the
+conversation.
+
+Two sources, tried in order:
+
+1. ``artifactAccess.downloadUrl`` — fetched with urllib and parsed with the
+   pull parser from sobject_tree.py, so only one record is held at a time
+   however large the download is
+2. ``fetch_more`` pages from ``_pagination.nextCursor`` — through a
+   *transport*, any ``callable(artifact_id, cursor) -> page``. http_transport()
+   POSTs to an endpoint, command_transport() runs a command that prints the
+   page as JSON
+
+The preview records in the response itself are not written; the artifact
+holds them too.
+
+Progress is checkpointed to ``<output>.checkpoint.json`` (written atomically)
+after every page and every 1000 downloaded records: the cursor of the next
+page, the records written and the output size. An interrupted run resumes
+from there — the output is truncated back to the checkpointed size, so a
+half-written page is never duplicated. A download cannot seek, so a resumed
+download restarts the stream and skips the records already written.
+
+A signed URL that has expired (HTTP 403/404/410, or a resumed run older than
+``downloadExpiry``) falls back to ``fetch_more`` when a transport is given,
+skipping the records already written. Without one, ArtifactExpiredError says
+to re-run the original query.
+
+Usage:
+    fetcher = ArtifactFetcher(response, "accounts.ndjson", transport=my_fetch_more)
+    stats = fetcher.fetch()
+    for record in iter_ndjson("accounts.ndjson"):
+        ...
+
+    python artifact_fetch.py response.json out.ndjson
+        [--fetch-more-url URL | --fetch-more-cmd "client fetch_more {artifactId} {cursor}"]
+        [--checkpoint PATH] [--timeout SECONDS]
+"""
+
+import http.client
+import io
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Callable, Iterator
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sobject_tree import CHUNK_SIZE, JSONStreamError, iter_events  # noqa: E402
+
+# Downloaded records between checkpoints
+COMMIT_RECORDS = 1000
+DEFAULT_EXPIRY = 3600
+TIMEOUT = 60
+# Status codes a signed URL or artifact returns once it is gone
+EXPIRED_STATUS = frozenset({403, 404, 410})
+# Response keys that describe the response rather than hold data
+META_KEYS = frozenset({"_pagination", "artifactAccess", "instructions"})
+
+_EXPIRY_RE = re.compile(r"(\d+)\s*(second|sec|s|minute|min|m|hour|hr|h)", re.IGNORECASE)
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600}
+
+Transport = Callable[[str, str], Any]
+
+
+class ArtifactError(RuntimeError):
+    """Raised when an artifact cannot be retrieved."""
+
+
+class ArtifactExpiredError(ArtifactError):
+    """Raised when the artifact (or its signed URL) is no longer available."""
+
+
+def artifact_info(response: Any) -> dict[str, Any] | None:
+    """Retrieval metadata of an artifact response, or None for inline data.
+
+    Returns:
+        {"artifactId", "downloadUrl", "expiry", "cursor"} — expiry in seconds
+    """
+    access = response.get("artifactAccess") if isinstance(response, dict) else None
+    if not isinstance(access, dict) or not access.get("artifactId"):
+        return None
+    return {
+        "artifactId": access["artifactId"],
+        "downloadUrl": access.get("downloadUrl") or None,
+        "expiry": expiry_seconds(access.get("downloadExpiry")),
+        "cursor": next_cursor(response),
+    }
+
+
+def expiry_seconds(text: Any) -> int:
+    """``"1 hour"`` / ``"30 minutes"`` → seconds (1 hour when unreadable)."""
+    match = _EXPIRY_RE.search(str(text or ""))
+    if not match:
+        return DEFAULT_EXPIRY
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)[0].lower()]
+
+
+def next_cursor(page: Any) -> str | None:
+    pagination = page.get("_pagination") if isinstance(page, dict) else None
+    return (pagination.get("nextCursor") or None) if isinstance(pagination, dict) else None
+
+
+def page_items(page: Any) -> list[Any]:
+    """The records of one page: its ``records`` array, or the page itself."""
+    if isinstance(page, list):
+        return page
+    if not isinstance(page, dict):
+        return [page]
+    if isinstance(page.get("records"), list):
+        return page["records"]
+    rest = {k: v for k, v in page.items() if k not in META_KEYS}
+    return [rest] if rest else []
+
+
+def _check_page(page: Any) -> Any:
+    """Raise for an error page (``{"error": ...}`` with no data)."""
+    if isinstance(page, dict) and page.get("error") and set(page) <= META_KEYS | {"error"}:
+        message = str(page["error"])
+        raise (ArtifactExpiredError if "expire" in message.lower() else ArtifactError)(
+            f"fetch_more failed: {message}"
+        )
+    return page
+
+
+def iter_ndjson(path: str | os.PathLike) -> Iterator[Any]:
+    """Yield the records of an NDJSON file, one line at a time."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Transports
+# ═══════════════════════════════════════════════════════════════════════
+
+def http_transport(url: str, timeout: float = TIMEOUT) -> Transport:
+    """fetch_more over HTTP: POST ``{"artifactId", "cursor"}``, read the page as JSON."""
+
+    def fetch_more(artifact_id: str, cursor: str) -> Any:
+        body = json.dumps({"artifactId": artifact_id, "cursor": cursor}).encode()
+        request = urllib.request.Request(
+            url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                page = json.load(response)
+        except urllib.error.HTTPError as e:
+            if e.code in EXPIRED_STATUS:
+                raise ArtifactExpiredError(f"fetch_more: HTTP {e.code} — artifact {artifact_id} has expired") from e
+            raise ArtifactError(f"fetch_more: HTTP {e.code} {e.reason}") from e
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            raise ArtifactError(f"fetch_more: {e}") from e
+        return page
+
+    return fetch_more
+
+
+def command_transport(command: str, timeout: float = TIMEOUT) -> Transport:
+    """fetch_more through a command that prints the page as JSON.
+
+    ``{artifactId}`` and ``{cursor}`` in *command* are replaced per call.
+    """
+    template = shlex.split(command)
+
+    def fetch_more(artifact_id: str, cursor: str) -> Any:
+        argv = [a.replace("{artifactId}", artifact_id).replace("{cursor}", cursor) for a in template]
+        try:
+            done = subprocess.run(argv, capture_output=True, text=True, timeout=timeout, check=False)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise ArtifactError(f"fetch_more command failed: {e}") from e
+        if done.returncode != 0:
+            raise ArtifactError(f"fetch_more command exited {done.returncode}: {done.stderr.strip()[:200]}")
+        try:
+            page = json.loads(done.stdout)
+        except ValueError as e:
+            raise ArtifactError(f"fetch_more command printed invalid JSON: {e}") from e
+        return page
+
+    return fetch_more
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Download streaming
+# ═══════════════════════════════════════════════════════════════════════
+
+def _value(events, kind: str, value: Any) -> Any:
+    """Materialise one value whose first event was *kind*."""
+    if kind == "scalar":
+        return value
+    if kind == "start_map":
+        result: dict[str, Any] = {}
+        for kind, key, _ in events:
+            if kind == "end_map":
+                return result
+            kind, value, _ = next(events)
+            result[key] = _value(events, kind, value)
+        return result
+    items = []
+    for kind, value, _ in events:
+        if kind == "end_array":
+            return items
+        items.append(_value(events, kind, value))
+    return items
+
+
+def _elements(events) -> Iterator[Any]:
+    """Yield each element of an array (after start_array)."""
+    for kind, value, _ in events:
+        if kind == "end_array":
+            return
+        yield _value(events, kind, value)
+
+
+def iter_items(handle, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Stream the records of a JSON document, as page_items() would return them."""
+    events = iter_events(handle, chunk_size)
+    kind, value, _ = next(events)
+    if kind == "start_array":
+        yield from _elements(events)
+        return
+    if kind != "start_map":
+        yield value
+        return
+    rest: dict[str, Any] = {}
+    found = False
+    for kind, key, _ in events:
+        if kind == "end_map":
+            break
+        kind, value, _ = next(events)
+        if key == "records" and kind == "start_array":
+            found = True
+            yield from _elements(events)
+        else:
+            rest[key] = _value(events, kind, value)
+    if not found:
+        rest = {k: v for k, v in rest.items() if k not in META_KEYS}
+        if rest:
+            yield rest
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Fetcher
+# ═══════════════════════════════════════════════════════════════════════
+
+class ArtifactFetcher:
+    """Resumable retrieval of one artifact into an NDJSON file."""
+
+    def __init__(
+        self,
+        response: dict[str, Any],
+        output: str | os.PathLike,
+        transport: Transport | None = None,
+        checkpoint: str | os.PathLike | None = None,
+        timeout: float = TIMEOUT,
+        chunk_size: int = CHUNK_SIZE,
+        commit_every: int = COMMIT_RECORDS,
+    ):
+        self.info = artifact_info(response)
+        if self.info is None:
+            raise ArtifactError("Response has no artifactAccess.artifactId — its data is inline")
+        self.output = str(output)
+        self.checkpoint = str(checkpoint) if checkpoint else self.output + ".checkpoint.json"
+        self.transport = transport
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.commit_every = commit_every
+        self.state = self._load_state()
+        self._out: io.BufferedWriter | None = None
+
+    # ── checkpoint ────────────────────────────────────────────────────
+    def _load_state(self) -> dict[str, Any]:
+        try:
+            with open(self.checkpoint, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = None
+        fresh = {
+            "artifactId": self.info["artifactId"], "source": None, "cursor": self.info["cursor"],
+            "records": 0, "bytes": 0, "pages": 0, "started": time.time(), "complete": False,
+        }
+        if (
+            not isinstance(state, dict)
+            or state.get("artifactId") != self.info["artifactId"]
+            or not os.path.exists(self.output)
+            or os.path.getsize(self.output) < state.get("bytes", 0)
+        ):
+            return fresh
+        return {**fresh, **state}
+
+    def _commit(self):
+        """Flush the output and record how far it got."""
+        self._out.flush()
+        os.fsync(self._out.fileno())
+        self.state["bytes"] = self._out.tell()
+        tmp = self.checkpoint + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.checkpoint)
+
+    def _write(self, record: Any):
+        self._out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode() + b"\n")
+        self.state["records"] += 1
+
+    # ── sources ───────────────────────────────────────────────────────
+    def _download(self, skip: int):
+        url = self.info["downloadUrl"]
+        request = urllib.request.Request(url, headers={"Accept": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                text = io.TextIOWrapper(response, encoding="utf-8-sig")
+                for n, record in enumerate(iter_items(text, self.chunk_size)):
+                    if n < skip:
+                        continue
+                    self._write(record)
+                    if self.state["records"] % self.commit_every == 0:
+                        self._commit()
+        except urllib.error.HTTPError as e:
+            if e.code in EXPIRED_STATUS:
+                raise ArtifactExpiredError(f"downloadUrl returned HTTP {e.code} — the signed URL has expired") from e
+            raise ArtifactError(f"Download failed: HTTP {e.code} {e.reason}") from e
+        except (OSError, http.client.HTTPException, JSONStreamError, UnicodeDecodeError) as e:
+            raise ArtifactError(f"Download interrupted after {self.state['records']} record(s): {e}") from e
+        self.state["pages"] = 1
+        self.state["cursor"] = None
+
+    def _page(self, skip: int):
+        artifact_id = self.info["artifactId"]
+        while self.state["cursor"]:
+            cursor = self.state["cursor"]
+            page = _check_page(self.transport(artifact_id, cursor))
+            for record in page_items(page):
+                if skip:
+                    skip -= 1
+                    continue
+                self._write(record)
+            following = next_cursor(page)
+            if following == cursor:
+                raise ArtifactError(f"fetch_more returned the same cursor twice ({cursor})")
+            self.state["cursor"] = following
+            self.state["pages"] += 1
+            self._commit()
+
+    def _expired(self) -> bool:
+        return time.time() - self.state["started"] > self.info["expiry"]
+
+    def fetch(self) -> dict[str, Any]:
+        """Retrieve the rest of the artifact.
+
+        Returns:
+            {"artifactId", "output", "source", "records", "pages", "resumed", "complete"}
+        """
+        state = self.state
+        resumed = state["records"] > 0 or state["pages"] > 0
+        if not state["complete"]:
+            mode = "r+b" if os.path.exists(self.output) else "wb"
+            with open(self.output, mode) as self._out:
+                self._out.truncate(state["bytes"])
+                self._out.seek(state["bytes"])
+                try:
+                    self._run()
+                    state["complete"] = True
+                finally:
+                    self._commit()
+                    self._out = None
+        return {
+            "artifactId": state["artifactId"],
+            "output": self.output,
+            "source": state["source"],
+            "records": state["records"],
+            "pages": state["pages"],
+            "resumed": resumed,
+            "complete": state["complete"],
+        }
+
+    def _run(self):
+        state = self.state
+        if state["source"] != "fetch_more" and self.info["downloadUrl"]:
+            state["source"] = "download"
+            try:
+                if not (state["records"] and self._expired()):
+                    self._download(skip=state["records"])
+                    return
+                expired = ArtifactExpiredError("The signed downloadUrl has expired")
+            except ArtifactExpiredError as e:
+                expired = e
+            if self.transport is None or not self.info["cursor"]:
+                raise ArtifactExpiredError(f"{expired} — re-run the original query for a fresh artifact") from expired
+            # Page from the start, past what the download already wrote
+            state["source"] = "fetch_more"
+            state["cursor"] = self.info["cursor"]
+            state["pages"] = 0
+            self._page(skip=state["records"])
+            return
+        if self.transport is None:
+            raise ArtifactError("No downloadUrl in the response — pass a fetch_more transport")
+        if state["source"] is None and not state["cursor"]:
+            raise ArtifactError("No _pagination.nextCursor in the response — fetch_more needs a cursor")
+        state["source"] = "fetch_more"
+        try:
+            self._page(skip=0)
+        except ArtifactExpiredError as e:
+            raise ArtifactExpiredError(f"{e} — re-run the original query for a fresh artifact") from e
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options: dict[str, str] = {}
+    for flag in ("--fetch-more-url", "--fetch-more-cmd", "--checkpoint", "--timeout"):
+        if flag in args:
+            at = args.index(flag)
+            if at + 1 >= len(args):
+                print(f"{flag} needs a value")
+                sys.exit(1)
+            options[flag] = args[at + 1]
+            del args[at:at + 2]
+    if len(args) != 2:
+        print("Usage: python artifact_fetch.py <response.json|-> <out.ndjson> "
+              "[--fetch-more-url URL | --fetch-more-cmd CMD] [--checkpoint PATH] [--timeout SECONDS]")
+        sys.exit(1)
+
+    timeout_arg = float(options.get("--timeout", TIMEOUT))
+    if args[0] == "-":
+        response_arg = json.load(sys.stdin)
+    else:
+        with open(args[0], encoding="utf-8") as f:
+            response_arg = json.load(f)
+    transport_arg = None
+    if "--fetch-more-url" in options:
+        transport_arg = http_transport(options["--fetch-more-url"], timeout_arg)
+    elif "--fetch-more-cmd" in options:
+        transport_arg = command_transport(options["--fetch-more-cmd"], timeout_arg)
+    try:
+        fetcher = ArtifactFetcher(response_arg, args[1], transport_arg, options.get("--checkpoint"), timeout_arg)
+        stats = fetcher.fetch()
+    except ArtifactError as e:
+        print(f"ERROR: {e}")
+        if not isinstance(e, ArtifactExpiredError) and os.path.exists(args[1]):
+            print("Progress is checkpointed — run the same command again to resume.")
+        sys.exit(1)
+    print(f"{stats['output']}: {stats['records']} record(s) from {stats['source']}"
+          + (f" ({stats['pages']} page(s))" if stats["source"] == "fetch_more" else "")
+          + (", resumed" if stats["resumed"] else ""))
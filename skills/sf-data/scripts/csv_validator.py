@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Streaming CSV Validator
+=======================
+
+Validates a Data Loader / Bulk API CSV file in one pass with bounded memory,
+however large the file is. Rows are read with the ``csv`` module through a
+1 MB buffered reader, so quoted commas and newlines inside quoted values
+parse correctly; only the current row and a PII chunk (see pii_scanner.py)
+are held at a time.
+
+Per row:
+
+- column count matches the header
+- required fields are not empty (insert files, i.e. without an Id column)
+- Id and lookup columns hold 15- or 18-character Ids with a valid suffix
+- date, datetime, number, integer and boolean columns are well formed
+- values carry no PII
+
+Field types and required fields come from an object describe (see
+describe_cache.py); without one only Id columns (``Id``, ``*Id``) are
+type-checked. The object is ``sobject``, or the file name's first word
+when it names an object in the describe (``account-import.csv``).
+
+Problems are aggregated per check and column with a count and the first
+line numbers, instead of stopping at the first bad row.
+
+Usage:
+    result = CSVValidator("accounts.csv", describe="describe.json").validate()
+    result["rows"], result["issues"], result["pii"]
+
+    python csv_validator.py accounts.csv [describe.json] [--sobject Account]
+"""
+
+import csv
+import datetime
+import os
+import re
+import sys
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from describe_cache import DescribeCache  # noqa: E402
+from pii_scanner import get_scanner  # noqa: E402
+
+READ_BUFFER = 1 << 20
+# Line numbers kept per issue
+LINE_SAMPLES = 10
+
+ID_RE = re.compile(r"^[A-Za-z0-9]{15}(?:[A-Za-z0-9]{3})?$")
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DATETIME_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2})(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,3})?)?(?:Z|[+-]\d{2}:?\d{2})?)?$"
+)
+NUMBER_RE = re.compile(r"^[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$")
+INTEGER_RE = re.compile(r"^[-+]?\d+$")
+BOOLEANS = frozenset({"true", "false", "1", "0", "yes", "no", "y", "n"})
+_SUFFIX_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ012345"
+
+
+def id_valid(value: str) -> bool:
+    """15-character Id, or 18-character Id whose case-checksum suffix matches."""
+    if not ID_RE.match(value):
+        return False
+    if len(value) == 15:
+        return True
+    suffix = ""
+    for start in (0, 5, 10):
+        bits = sum(1 << n for n, c in enumerate(value[start:start + 5]) if "A" <= c <= "Z")
+        suffix += _SUFFIX_CHARS[bits]
+    return value[15:] == suffix
+
+
+def _date_valid(value: str) -> bool:
+    if not DATE_RE.match(value):
+        return False
+    try:
+        datetime.date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _datetime_valid(value: str) -> bool:
+    match = DATETIME_RE.match(value)
+    return bool(match) and _date_valid(match.group(1))
+
+
+# Describe type → (check code, validity test, message suffix)
+TYPE_CHECKS = {
+    "id": ("id", id_valid, "is not a 15/18-character Salesforce Id"),
+    "reference": ("id", id_valid, "is not a 15/18-character Salesforce Id"),
+    "date": ("date", _date_valid, "is not a date (YYYY-MM-DD)"),
+    "datetime": ("datetime", _datetime_valid, "is not a datetime (YYYY-MM-DDThh:mm:ssZ)"),
+    "double": ("number", NUMBER_RE.match, "is not a number"),
+    "currency": ("number", NUMBER_RE.match, "is not a number"),
+    "percent": ("number", NUMBER_RE.match, "is not a number"),
+    "int": ("integer", INTEGER_RE.match, "is not an integer"),
+    "long": ("integer", INTEGER_RE.match, "is not an integer"),
+    "boolean": ("boolean", lambda v: v.lower() in BOOLEANS, "is not a boolean (true/false)"),
+}
+
+
+class CSVValidator:
+    """Single-pass CSV checks with per-check counts and first line numbers."""
+
+    def __init__(
+        self,
+        file_path: str,
+        describe: DescribeCache | str | None = None,
+        sobject: str | None = None,
+        required: list[str] | None = None,
+    ):
+        self.file_path = file_path
+        self.describe = DescribeCache.load(describe) if isinstance(describe, str) else describe
+        self.sobject = sobject or self._infer_sobject()
+        self.extra_required = list(required or [])
+        # (code, column) → issue dict
+        self._issues: dict[tuple[str, str | None], dict[str, Any]] = {}
+        self.rows = 0
+        self.header: list[str] = []
+
+    def _infer_sobject(self) -> str | None:
+        if self.describe is None:
+            return None
+        stem = os.path.basename(self.file_path).split(".")[0]
+        word = re.split(r"[-_ ]", stem)[0]
+        return self.describe.object_name(word) if word and self.describe.has_object(word) else None
+
+    # ── issues ────────────────────────────────────────────────────────
+    def _tally(self, code: str, column: str | None, message: str, line: int):
+        issue = self._issues.get((code, column))
+        if issue is None:
+            issue = self._issues[(code, column)] = {
+                "code": code, "column": column, "message": message, "count": 0, "lines": [],
+            }
+        issue["count"] += 1
+        if len(issue["lines"]) < LINE_SAMPLES:
+            issue["lines"].append(line)
+
+    # ── header ────────────────────────────────────────────────────────
+    def _column_checks(self) -> list[tuple[int, str, str, Any, str]]:
+        """(index, column, code, test, message) for every type-checked column."""
+        checks = []
+        known = self.describe is not None and self.sobject is not None and self.describe.has_object(self.sobject)
+        seen: set[str] = set()
+        for k, raw in enumerate(self.header):
+            column = raw.strip()
+            if column.lower() in seen:
+                self._tally("duplicate_column", column, f"Column '{column}' appears more than once", 1)
+            seen.add(column.lower())
+            if not column or "." in column:
+                continue  # unnamed, or a relationship path (Account.External_Id__c)
+            if known and not self.describe.has_field(self.sobject, column):
+                self._tally("unknown_column", column, f"No field '{column}' on {self.sobject}", 1)
+                continue
+            kind = self.describe.field_type(self.sobject, column) if known else None
+            if kind is None and (column == "Id" or (column.endswith("Id") and "__" not in column)):
+                kind = "id"
+            if kind in TYPE_CHECKS:
+                code, test, suffix = TYPE_CHECKS[kind]
+                checks.append((k, column, code, test, f"'{column}' {suffix}"))
+        return checks
+
+    def _required_columns(self) -> list[tuple[int, str]]:
+        """(index, column) for required fields; missing columns are reported once."""
+        index = {c.strip().lower(): k for k, c in enumerate(self.header)}
+        required = list(self.extra_required)
+        if self.describe is not None and self.sobject and "id" not in index:
+            required += self.describe.required_fields(self.sobject)
+        columns = []
+        for field in dict.fromkeys(required):
+            if field.lower() in index:
+                columns.append((index[field.lower()], field))
+            else:
+                self._tally("required_missing", field, f"Required field '{field}' has no column", 1)
+        return columns
+
+    # ── rows ──────────────────────────────────────────────────────────
+    def _rows(self, reader, checks, required):
+        """Check each row, then pass ``(line, row)`` on to the PII scan."""
+        width = len(self.header)
+        tally = self._tally
+        previous = reader.line_num
+        for row in reader:
+            line = previous + 1
+            previous = reader.line_num
+            size = len(row)
+            if size != width:
+                if size == 0 or (size == 1 and not row[0].strip()):
+                    continue
+                tally("column_count", None, f"Column count differs from the header ({width})", line)
+            self.rows += 1
+            for k, column, code, test, message in checks:
+                if k < size:
+                    value = row[k].strip()
+                    if value and not test(value):
+                        tally(code, column, message, line)
+            for k, field in required:
+                if k >= size or not row[k].strip():
+                    tally("required", field, f"Required field '{field}' is empty", line)
+            yield line, row
+
+    def validate(self) -> dict[str, Any]:
+        """Run every check in one pass over the file.
+
+        Returns:
+            {
+                "file", "sobject", "rows", "columns",
+                "issues": [{"code", "column", "message", "count", "lines"}],
+                "pii": {type: {"count", "fields", "samples"}},
+            }
+        """
+        pii: dict[str, Any] = {}
+        with open(self.file_path, encoding="utf-8-sig", newline="", buffering=READ_BUFFER) as f:
+            reader = csv.reader(f)
+            try:
+                self.header = next(reader, None) or []
+                if self.header:
+                    checks = self._column_checks()
+                    required = self._required_columns()
+                    report = get_scanner().scan_csv_rows(self.header, self._rows(reader, checks, required))
+                    pii = report.findings
+            except csv.Error as e:
+                self._tally("malformed", None, f"CSV parse error: {e}", reader.line_num)
+            except UnicodeDecodeError as e:
+                self._tally("encoding", None, f"File is not UTF-8: {e.reason}", reader.line_num + 1)
+        return {
+            "file": self.file_path,
+            "sobject": self.sobject,
+            "rows": self.rows,
+            "columns": [c.strip() for c in self.header],
+            "issues": list(self._issues.values()),
+            "pii": pii,
+        }
+
+
+def format_issue(issue: dict[str, Any]) -> str:
+    """``message — N row(s), line(s) 3, 7, ...`` for one aggregated issue."""
+    lines = ", ".join(str(n) for n in issue["lines"])
+    more = "..." if issue["count"] > len(issue["lines"]) else ""
+    return f"{issue['message']} — {issue['count']} row(s), line(s) {lines}{more}"
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python csv_validator.py <file.csv> [describe.json] [--sobject Name]")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    sobject_arg = None
+    if "--sobject" in args:
+        at = args.index("--sobject")
+        sobject_arg = args[at + 1] if at + 1 < len(args) else None
+        del args[at:at + 2]
+    result = CSVValidator(args[0], args[1] if len(args) > 1 else None, sobject_arg).validate()
+    print(f"{result['file']}: {result['rows']} row(s)"
+          + (f", object {result['sobject']}" if result["sobject"] else ""))
+    for issue in result["issues"]:
+        print(f"  [{issue['code']}] {format_issue(issue)}")
+    for pii_type, finding in result["pii"].items():
+        print(f"  [pii] {pii_type} in {finding['count']} value(s), first on {finding['samples'][0]}")
+    if not result["issues"] and not result["pii"]:
+        print("  No issues found.")
+    sys.exit(1 if result["issues"] or result["pii"] else 0)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Describe Cache Module
+=====================
+
+Loads a local snapshot of org object describes and answers field-existence
+questions for parsed SOQL (see soql_parser.py) without calling the org.
+
+Accepted snapshot shapes (JSON):
+
+    {"sobjects": {"Account": <describe>, ...}}          # wrapped
+    {"Account": <describe>, "Contact": <describe>}      # describe per object
+    {"Account": ["Id", "Name", "Industry"], ...}        # field names only
+
+A <describe> is the sObject describe result (``fields`` with ``name``,
+``relationshipName``, ``referenceTo`` and, for CSV checks, ``type``,
+``nillable``, ``createable`` and ``defaultedOnCreate``; ``childRelationships`` with
+``relationshipName`` and ``childSObject``). Extra keys are ignored.
+
+Snapshots are parsed once per (path, mtime, size) and indexed by lower-cased
+object, field and relationship name, so every lookup is a dict hit.
+
+Usage:
+    cache = DescribeCache.load("describe.json")
+    cache.check_path("Contact", "Account.Name")   # -> None (exists)
+    cache.check_path("Account", "Foo__c")         # -> 'No field "Foo__c" on Account'
+"""
+
+import json
+import os
+from typing import Any
+
+# (realpath, mtime_ns, size) -> DescribeCache
+_LOADED: dict[tuple[str, int, int], "DescribeCache"] = {}
+
+# Fields present on every object even when a simplified snapshot omits them
+_IMPLICIT_FIELDS = {"id"}
+
+
+class DescribeCache:
+    """Case-insensitive index of object, field and relationship names."""
+
+    def __init__(self, data: dict[str, Any]):
+        if isinstance(data.get("sobjects"), dict):
+            data = data["sobjects"]
+        self.objects: dict[str, dict[str, Any]] = {}
+        # "path:mtime_ns:size" when loaded from a file, for callers that cache results
+        self.fingerprint: str | None = None
+        for name, describe in data.items():
+            if isinstance(describe, dict):
+                name = describe.get("name", name)
+            self.objects[name.lower()] = self._index_object(name, describe)
+
+    @staticmethod
+    def _index_object(name: str, describe: Any) -> dict[str, Any]:
+        entry: dict[str, Any] = {
+            "name": name, "fields": {}, "parents": {}, "children": {}, "types": {}, "required": [],
+        }
+        if isinstance(describe, list):
+            entry["fields"] = {str(f).lower(): str(f) for f in describe}
+            return entry
+        for field in describe.get("fields", []):
+            entry["fields"][field["name"].lower()] = field["name"]
+            if field.get("type"):
+                entry["types"][field["name"].lower()] = field["type"]
+            # Required on insert: not nillable, settable, and no default
+            if (
+                field.get("nillable") is False
+                and field.get("createable", True)
+                and not field.get("defaultedOnCreate")
+                and field.get("type") not in ("boolean", "id")
+            ):
+                entry["required"].append(field["name"])
+            if field.get("relationshipName"):
+                entry["parents"][field["relationshipName"].lower()] = list(field.get("referenceTo") or [])
+        for child in describe.get("childRelationships", []):
+            if child.get("relationshipName"):
+                entry["children"][child["relationshipName"].lower()] = child["childSObject"]
+        return entry
+
+    @classmethod
+    def load(cls, path: str) -> "DescribeCache":
+        """Load a snapshot, reusing the parsed index while the file is unchanged."""
+        real = os.path.realpath(path)
+        stat = os.stat(real)
+        key = (real, stat.st_mtime_ns, stat.st_size)
+        if key not in _LOADED:
+            with open(real, encoding="utf-8") as f:
+                cache = cls(json.load(f))
+            cache.fingerprint = ":".join(str(part) for part in key)
+            _LOADED[key] = cache
+        return _LOADED[key]
+
+    # ── lookups ───────────────────────────────────────────────────────
+    def has_object(self, sobject: str) -> bool:
+        return sobject.lower() in self.objects
+
+    def object_name(self, sobject: str) -> str:
+        """Canonical API name for an object (input returned unchanged if unknown)."""
+        entry = self.objects.get(sobject.lower())
+        return entry["name"] if entry else sobject
+
+    def has_field(self, sobject: str, field: str) -> bool:
+        entry = self.objects.get(sobject.lower())
+        return entry is not None and (field.lower() in entry["fields"] or field.lower() in _IMPLICIT_FIELDS)
+
+    def field_type(self, sobject: str, field: str) -> str | None:
+        """Describe ``type`` of a field (e.g. "date", "reference"), None if unknown."""
+        entry = self.objects.get(sobject.lower())
+        return entry["types"].get(field.lower()) if entry else None
+
+    def required_fields(self, sobject: str) -> list[str]:
+        """Fields an insert must set: not nillable, createable and not defaulted."""
+        entry = self.objects.get(sobject.lower())
+        return list(entry["required"]) if entry else []
+
+    def child_object(self, sobject: str, relationship: str) -> str | None:
+        """Child object behind a parent-to-child relationship name (e.g. Account.Contacts)."""
+        entry = self.objects.get(sobject.lower())
+        return entry["children"].get(relationship.lower()) if entry else None
+
+    def check_path(self, sobject: str, path: str) -> str | None:
+        """Check a dotted field path from ``sobject``.
+
+        Returns None when the path exists or cannot be verified (an object on
+        the path is missing from the snapshot), otherwise a short message
+        naming the first missing segment.
+        """
+        current = [sobject]
+        *relationships, field = path.split(".")
+        for segment in relationships:
+            targets: list[str] = []
+            for name in current:
+                entry = self.objects.get(name.lower())
+                if entry is None:
+                    return None
+                targets.extend(entry["parents"].get(segment.lower(), []))
+            if not targets:
+                if not any(self.objects[n.lower()]["parents"] for n in current):
+                    return None  # field-name-only snapshot: relationships unknown
+                return f'No relationship "{segment}" on {self._names(current)}'
+            current = targets
+        if not all(self.has_object(name) for name in current):
+            return None
+        if any(self.has_field(name, field) for name in current):
+            return None
+        return f'No field "{field}" on {self._names(current)}'
+
+    def check_query(self, ast: dict[str, Any], sobject: str | None = None) -> list[dict[str, str]]:
+        """Missing fields in a soql_parser AST, including subqueries and semi-joins.
+
+        Returns a list of {"path", "clause", "message"}. Queries on objects
+        absent from the snapshot are not checked.
+        """
+        sobject = sobject or ast["object"]
+        if not self.has_object(sobject):
+            return []
+        alias = (ast.get("alias") or "").lower()
+        select_aliases = {(f["alias"] or "").lower() for f in ast["fields"]} - {""}
+        refs = [(f["path"], "SELECT") for f in ast["fields"] if f["path"]]
+        refs += [(r["path"], r["clause"]) for r in ast["references"]]
+
+        problems = []
+        for path, clause in refs:
+            if path.lower() in select_aliases:
+                continue
+            if alias and path.lower().startswith(alias + "."):
+                path = path[len(alias) + 1 :]
+            message = self.check_path(sobject, path)
+            if message:
+                problems.append({"path": path, "clause": clause, "message": message})
+        for sub in ast["subqueries"]:
+            child = self.child_object(sobject, sub["object"])
+            if child:
+                problems.extend(self.check_query(sub, child))
+            elif self.objects[sobject.lower()]["children"]:
+                problems.append(
+                    {
+                        "path": sub["object"],
+                        "clause": "SELECT",
+                        "message": f'No child relationship "{sub["object"]}" on {self.object_name(sobject)}',
+                    }
+                )
+        for semi in ast["semi_joins"]:
+            problems.extend(self.check_query(semi))
+        return problems
+
+    def _names(self, sobjects: list[str]) -> str:
+        return "/".join(self.object_name(name) for name in sobjects)
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+DML Batch Planner
+=================
+
+Splits a record set larger than one sobject_dml call into a minimal, ordered
+sequence of calls the MCP server will accept.
+
+Each batch:
+
+- holds at most 200 records (the MCP per-call limit), fewer when
+  ``rows_per_record`` says each record costs more than one DML row
+  (triggers, cascades) so a call stays under the 10,000-row transaction limit
+- targets one sObject and carries one identical field set, so every record
+  in a call is written the same way
+- comes after every batch holding a record it references, so parents are
+  written before children
+
+Records are deduplicated first: for update, delete and upsert, records that
+share an Id (or, for upsert, an external ID value) are merged in input order,
+later values winning, as if the calls had been made one after the other.
+Salesforce rejects duplicate Ids within one call, so without this step a
+duplicate either fails the call or silently depends on batch boundaries.
+
+A record references another when it carries a relationship value such as
+``{"Parent__r": {"Legacy_Id__c": "A-1"}}`` that matches the other record's
+``Legacy_Id__c``. Lookups set to an Id need no ordering — a record with an
+Id already exists in the org.
+
+Records may carry ``{"attributes": {"type": "Contact"}}`` to mix objects in
+one load; otherwise every record belongs to ``sobject``.
+
+Usage:
+    plan = plan_dml(records, operation="upsert", sobject="Account",
+                    external_id_field="Legacy_Id__c")
+    plan["round_trips"]        # number of sobject_dml calls
+    for batch in plan["batches"]:
+        call_tool("sobject_dml", batch["params"])
+
+    python dml_planner.py records.ndjson --operation insert --sobject Contact
+"""
+
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+MCP_RECORD_LIMIT = 200
+DML_ROW_LIMIT = 10_000
+
+_META_KEYS = frozenset({"attributes"})
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Input
+# ═══════════════════════════════════════════════════════════════════════
+
+def iter_records(path: str) -> Iterator[Any]:
+    """Yield records from a JSON array, {"records": [...]} or NDJSON file ("-" = stdin)."""
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        first = ""
+        for line in handle:
+            if line.strip():
+                first = line
+                break
+        if not first:
+            return
+        try:
+            record = json.loads(first) if first.lstrip().startswith("{") else None
+        except json.JSONDecodeError:
+            record = None
+        if record is None or "records" in record:
+            # A single JSON document (array or {"records": [...]}), not NDJSON
+            data = record if record is not None else json.loads(first + handle.read())
+            yield from data.get("records", []) if isinstance(data, dict) else data
+            return
+        yield record
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Planning
+# ═══════════════════════════════════════════════════════════════════════
+
+def batch_limit(batch_size: int = MCP_RECORD_LIMIT, rows_per_record: int = 1) -> int:
+    """Records per call that respect both the MCP and DML-row limits."""
+    return max(1, min(batch_size, MCP_RECORD_LIMIT, DML_ROW_LIMIT // max(1, rows_per_record)))
+
+
+def _type_of(record: dict, sobject: str | None) -> str | None:
+    attributes = record.get("attributes")
+    if isinstance(attributes, dict) and attributes.get("type"):
+        return attributes["type"]
+    return sobject
+
+
+def _id_key(record_id: str) -> str:
+    """15-character form of a record Id; the 18-character form only adds a checksum."""
+    return record_id[:15]
+
+
+def _dedup_key(record: dict, operation: str, external_id_field: str | None):
+    if isinstance(record.get("Id"), str) and record["Id"]:
+        return ("Id", _id_key(record["Id"]))
+    if operation == "upsert" and external_id_field and record.get(external_id_field) not in (None, ""):
+        return (external_id_field, record[external_id_field])
+    return None
+
+
+def _dedupe(records: list[dict], types: list, operation: str, external_id_field: str | None):
+    """Merge records sharing an Id / external ID. Returns (records, types, merged_count)."""
+    if operation == "insert":
+        return records, types, 0
+    out: list[dict] = []
+    out_types: list = []
+    seen: dict[tuple, int] = {}
+    merged = 0
+    for record, sobject in zip(records, types, strict=True):
+        key = _dedup_key(record, operation, external_id_field)
+        if key is not None and (sobject, key) in seen:
+            index = seen[(sobject, key)]
+            out[index] = {**out[index], **record}
+            merged += 1
+            continue
+        if key is not None:
+            seen[(sobject, key)] = len(out)
+        out.append(record)
+        out_types.append(sobject)
+    return out, out_types, merged
+
+
+def _references(records: list[dict], operation: str) -> list[set[int]]:
+    """For each record, the indexes of other records in the set it references."""
+    deps: list[set[int]] = [set() for _ in records]
+    if operation == "delete":
+        return deps
+
+    wanted: dict[tuple[str, Any], list[int]] = {}
+    for i, record in enumerate(records):
+        for key, value in record.items():
+            if key not in _META_KEYS and isinstance(value, dict):
+                for ref_field, ref_value in value.items():
+                    if ref_field not in _META_KEYS and isinstance(ref_value, str | int | float):
+                        wanted.setdefault((ref_field, ref_value), []).append(i)
+    if not wanted:
+        return deps
+
+    fields = {field for field, _ in wanted}
+    for parent, record in enumerate(records):
+        for field in fields & record.keys():
+            value = record[field]
+            if isinstance(value, str | int | float):
+                for child in wanted.get((field, value), ()):
+                    if child != parent:
+                        deps[child].add(parent)
+    return deps
+
+
+def _levels(deps: list[set[int]]) -> tuple[list[int], int]:
+    """Topological level per record (parents first). Returns (levels, cyclic_count)."""
+    level = [0] * len(deps)
+    children: list[list[int]] = [[] for _ in deps]
+    pending = [len(d) for d in deps]
+    for child, parents in enumerate(deps):
+        for parent in parents:
+            children[parent].append(child)
+    frontier = [i for i, n in enumerate(pending) if n == 0]
+    placed = 0
+    while frontier:
+        placed += len(frontier)
+        nxt = []
+        for parent in frontier:
+            for child in children[parent]:
+                level[child] = max(level[child], level[parent] + 1)
+                pending[child] -= 1
+                if pending[child] == 0:
+                    nxt.append(child)
+        frontier = nxt
+    cyclic = len(deps) - placed
+    if cyclic:
+        last = max(level, default=0) + 1
+        for i, n in enumerate(pending):
+            if n:
+                level[i] = last
+    return level, cyclic
+
+
+def plan_dml(
+    records: Iterable[Any] | None = None,
+    *,
+    record_ids: Iterable[Any] | None = None,
+    operation: str = "insert",
+    sobject: str | None = None,
+    external_id_field: str | None = None,
+    batch_size: int = MCP_RECORD_LIMIT,
+    rows_per_record: int = 1,
+) -> dict[str, Any]:
+    """Plan the sobject_dml calls for a record set.
+
+    Args:
+        records: Record dicts (insert, update, upsert, or delete by Id).
+        record_ids: Id strings for delete; used instead of records.
+        operation: insert | update | upsert | delete.
+        sobject: Default object for records without attributes.type.
+        external_id_field: Upsert key, also matched by relationship references.
+        batch_size: Upper bound on records per call (never above 200).
+        rows_per_record: DML rows each record costs, including automation.
+
+    Returns:
+        {
+            "operation", "batch_size",
+            "record_count":        records after deduplication,
+            "duplicates_merged":   records folded into an earlier duplicate,
+            "round_trips":         number of calls in "batches",
+            "minimum_round_trips": calls needed if field sets and order did not matter,
+            "batches": [{"level", "sObject", "fields", "size", "params"}],
+            "errors": [str], "warnings": [str],
+        }
+    """
+    size = batch_limit(batch_size, rows_per_record)
+    errors: list[str] = []
+    warnings: list[str] = []
+    batches: list[dict[str, Any]] = []
+
+    def params(obj: str | None, key: str, chunk: list) -> dict[str, Any]:
+        call: dict[str, Any] = {"sObject": obj, "operation": operation, key: chunk}
+        if operation == "upsert" and external_id_field:
+            call["externalIdField"] = external_id_field
+        return call
+
+    if record_ids is not None:
+        ids = [i for i in record_ids if isinstance(i, str) and i]
+        first: dict[str, str] = {}
+        for record_id in ids:
+            first.setdefault(_id_key(record_id), record_id)
+        unique = list(first.values())
+        for start in range(0, len(unique), size):
+            chunk = unique[start:start + size]
+            batches.append({
+                "level": 0, "sObject": sobject, "fields": ["Id"], "size": len(chunk),
+                "params": params(sobject, "recordIds", chunk),
+            })
+        return _result(operation, size, len(unique), len(ids) - len(unique), batches, errors, warnings)
+
+    rows: list[dict] = []
+    types: list = []
+    for n, record in enumerate(records or ()):
+        if not isinstance(record, dict):
+            errors.append(f"Record {n} is not an object")
+            continue
+        obj = _type_of(record, sobject)
+        if not obj:
+            errors.append(f"Record {n} has no sObject (pass sobject or attributes.type)")
+            continue
+        rows.append(record)
+        types.append(obj)
+
+    rows, types, merged = _dedupe(rows, types, operation, external_id_field)
+    levels, cyclic = _levels(_references(rows, operation))
+    if cyclic:
+        warnings.append(
+            f"{cyclic} record(s) reference each other in a cycle — they are written last; "
+            f"set the cyclic lookups in a follow-up update"
+        )
+
+    # Delete only needs Ids, so every delete batch is a recordIds call
+    groups: dict[tuple, list] = {}
+    for n, (record, obj, level) in enumerate(zip(rows, types, levels, strict=True)):
+        if operation == "delete":
+            if not isinstance(record.get("Id"), str):
+                errors.append(f"Record {n} has no Id to delete")
+                continue
+            groups.setdefault((0, obj, frozenset({"Id"})), []).append(record["Id"])
+            continue
+        body = {k: v for k, v in record.items() if k not in _META_KEYS}
+        groups.setdefault((level, obj, frozenset(body)), []).append(body)
+
+    key = "recordIds" if operation == "delete" else "records"
+    for (level, obj, fields), members in sorted(groups.items(), key=lambda g: g[0][0]):
+        for start in range(0, len(members), size):
+            chunk = members[start:start + size]
+            batches.append({
+                "level": level, "sObject": obj, "fields": sorted(fields), "size": len(chunk),
+                "params": params(obj, key, chunk),
+            })
+
+    if len(groups) > len({(level, obj) for level, obj, _ in groups}):
+        warnings.append(
+            f"{len(groups)} distinct field sets — records with different fields go in separate calls"
+        )
+    return _result(operation, size, len(rows), merged, batches, errors, warnings)
+
+
+def _result(operation, size, count, merged, batches, errors, warnings) -> dict[str, Any]:
+    return {
+        "operation": operation,
+        "batch_size": size,
+        "record_count": count,
+        "duplicates_merged": merged,
+        "round_trips": len(batches),
+        "minimum_round_trips": -(-count // size),
+        "batches": batches,
+        "errors": errors,
+        "warnings": warnings,
+    }
+
+
+def plan_summary(plan: dict[str, Any]) -> str:
+    """One-line description of a plan for reports and validator messages."""
+    extra = plan["round_trips"] - plan["minimum_round_trips"]
+    text = (
+        f"{plan['record_count']} records in {plan['round_trips']} call(s) "
+        f"of up to {plan['batch_size']}"
+    )
+    if plan["duplicates_merged"]:
+        text += f", {plan['duplicates_merged']} duplicate(s) merged"
+    if extra > 0:
+        text += f", {extra} extra call(s) for field sets and parent-child order"
+    return text
+
+
+if __name__ == "__main__":
+    usage = (
+        "Usage: python dml_planner.py <records.json|records.ndjson|-> --operation OP "
+        "[--sobject NAME] [--external-id FIELD] [--batch-size N] [--rows-per-record N] "
+        "[--ids] [--summary]"
+    )
+    args = sys.argv[1:]
+    options: dict[str, Any] = {"operation": "insert"}
+    flags = {
+        "--operation": "operation", "--sobject": "sobject", "--external-id": "external_id_field",
+        "--batch-size": "batch_size", "--rows-per-record": "rows_per_record",
+    }
+    source = None
+    ids = summary = False
+    i = 0
+    while i < len(args):
+        if args[i] in flags and i + 1 < len(args):
+            value = args[i + 1]
+            options[flags[args[i]]] = int(value) if args[i] in ("--batch-size", "--rows-per-record") else value
+            i += 2
+        elif args[i] == "--ids":
+            ids = True
+            i += 1
+        elif args[i] == "--summary":
+            summary = True
+            i += 1
+        elif args[i] in ("--help", "-h"):
+            print(usage)
+            sys.exit(0)
+        elif source is None and (args[i] == "-" or not args[i].startswith("-")):
+            source = args[i]
+            i += 1
+        else:
+            print(usage, file=sys.stderr)
+            sys.exit(1)
+    if source is None:
+        print(usage, file=sys.stderr)
+        sys.exit(1)
+
+    data = iter_records(source)
+    plan = plan_dml(record_ids=data, **options) if ids else plan_dml(data, **options)
+    if summary:
+        print(plan_summary(plan))
+        for n, batch in enumerate(plan["batches"], 1):
+            print(f"  {n:>4}. level {batch['level']} {batch['sObject']} "
+                  f"x{batch['size']} [{', '.join(batch['fields'])}]")
+        for message in plan["errors"]:
+            print(f"[error] {message}")
+        for message in plan["warnings"]:
+            print(f"[warning] {message}")
+    else:
+        print(json.dumps(plan, indent=2))
+    sys.exit(1 if plan["errors"] else 0)
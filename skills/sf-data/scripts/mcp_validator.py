@@ -21,9 +21,18 @@ Input format:
 }
 """
 
+import os
 import re
+import sys
 from typing import Any
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dml_planner import MCP_RECORD_LIMIT, plan_dml, plan_summary  # noqa: E402
+from pii_scanner import get_scanner  # noqa: E402
+from query_plan import OrgStats, estimate, plan_warning  # noqa: E402
+from soql_parser import SOQLParseError, parse_soql  # noqa: E402
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # Data Parameter Checks — lightweight pass/fail
@@ -32,15 +41,6 @@ from typing import Any
 VALID_DML_OPERATIONS = ("insert", "update", "delete", "upsert")
 SOBJECT_NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9_]*(__c|__mdt|__e|__b|__x)?$")
 
-PII_PATTERNS = {
-    "SSN": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
-    "Credit card": re.compile(r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b"),
-    "Personal email": re.compile(
-        r"\b[A-Za-z0-9._%+-]+@(gmail|yahoo|hotmail|outlook|aol)\.(com|net|org)\b",
-        re.IGNORECASE,
-    ),
-}
-
 
 def validate_data_params(input_data: dict[str, Any]) -> dict[str, Any]:
     """Validate soql_query or sobject_dml parameters.
@@ -80,6 +80,9 @@ def validate_data_params(input_data: dict[str, Any]) -> dict[str, Any]:
         where = params.get("whereClause") or ""
         if where.strip():
             _check_where_syntax(where, warnings)
+        stats = OrgStats.from_env()
+        if stats is not None and isinstance(params.get("sObject"), str):
+            _check_selectivity(params["sObject"], where, stats, warnings)
 
     # ── sobject_dml checks ──────────────────────────────────────────
     elif tool == "sobject_dml":
@@ -102,11 +105,8 @@ def validate_data_params(input_data: dict[str, Any]) -> dict[str, Any]:
                 if not isinstance(records, list) or len(records) == 0:
                     errors.append({"message": "Delete requires 'recordIds' (string array of Ids)"})
                 else:
-                    if len(records) > 200:
-                        errors.append({
-                            "message": f"Too many records ({len(records)}). "
-                                       f"MCP server limit is 200 per call — split into batches"
-                        })
+                    if len(records) > MCP_RECORD_LIMIT:
+                        errors.append({"message": _too_many("records", params, records=records)})
                     missing_id = [
                         i for i, r in enumerate(records)
                         if isinstance(r, dict) and "Id" not in r
@@ -120,22 +120,16 @@ def validate_data_params(input_data: dict[str, Any]) -> dict[str, Any]:
                         "message": "Delete should use 'recordIds' parameter (string array) "
                                    "instead of 'records' — e.g. recordIds=[\"001xx...\", \"001yy...\"]"
                     })
-            elif len(record_ids) > 200:
-                errors.append({
-                    "message": f"Too many recordIds ({len(record_ids)}). "
-                               f"MCP server limit is 200 per call — split into batches"
-                })
+            elif len(record_ids) > MCP_RECORD_LIMIT:
+                errors.append({"message": _too_many("recordIds", params, record_ids=record_ids)})
 
         # Records array for non-delete operations
         elif not isinstance(records, list) or len(records) == 0:
             errors.append({"message": "Empty or missing records array"})
         else:
             # Check 200-record limit
-            if len(records) > 200:
-                errors.append({
-                    "message": f"Too many records ({len(records)}). "
-                               f"MCP server limit is 200 per call — split into batches"
-                })
+            if len(records) > MCP_RECORD_LIMIT:
+                errors.append({"message": _too_many("records", params, records=records)})
 
             # Update must have Id
             if operation == "update":
@@ -200,44 +194,64 @@ def validate_data_params(input_data: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _too_many(key: str, params: dict[str, Any], **payload) -> str:
+    """200-record limit error, with the dml_planner batch plan for the payload."""
+    count = len(next(iter(payload.values())))
+    plan = plan_dml(
+        **payload,
+        operation=params.get("operation", ""),
+        sobject=params.get("sObject") if isinstance(params.get("sObject"), str) else None,
+        external_id_field=params.get("externalIdField"),
+    )
+    return (
+        f"Too many {key} ({count}). MCP server limit is {MCP_RECORD_LIMIT} per call — "
+        f"split into batches: {plan_summary(plan)} (plan them with dml_planner.py)"
+    )
+
+
+# Parse-error codes (soql_parser.SOQLParseError.code) with their whereClause wording
+WHERE_SYNTAX_MESSAGES = {
+    "double_equals": "Invalid '==' operator in whereClause — SOQL uses '='",
+    "double_quotes": "Double-quoted string in whereClause — SOQL uses single quotes",
+    "unbalanced": "Unbalanced parentheses in whereClause",
+}
+_WHERE_PREFIX = "SELECT Id FROM Account WHERE "
+
+
 def _check_where_syntax(where: str, warnings: list[dict[str, str]]):
-    """Check for common SOQL syntax mistakes in whereClause."""
-    if re.search(r"==", where):
-        warnings.append({
-            "message": "Invalid '==' operator in whereClause — SOQL uses '='"
-        })
-    if re.search(r'=\s*"[^"]*"', where):
-        warnings.append({
-            "message": "Double-quoted string in whereClause — SOQL uses single quotes"
-        })
-    if where.count("(") != where.count(")"):
-        warnings.append({
-            "message": "Unbalanced parentheses in whereClause"
-        })
+    """Check for common SOQL syntax mistakes in whereClause.
+
+    The clause is parsed as the WHERE of a stub query, so quotes and
+    operators inside string literals are not mistaken for mistakes.
+    """
+    try:
+        parse_soql(_WHERE_PREFIX + where)
+    except SOQLParseError as exc:
+        message = WHERE_SYNTAX_MESSAGES.get(exc.code)
+        if message is None:
+            position = max(exc.position - len(_WHERE_PREFIX), 0)
+            message = f"whereClause does not parse: {exc.message} (at position {position})"
+        warnings.append({"message": message})
+
+
+def _check_selectivity(sobject: str, where: str, stats: OrgStats, warnings: list[dict[str, str]]):
+    """Warn when the query would scan a large object ($SF_ORG_STATS snapshot)."""
+    soql = f"SELECT Id FROM {sobject}" + (f" WHERE {where}" if where.strip() else "")
+    try:
+        ast = parse_soql(soql)
+    except SOQLParseError:
+        return  # reported by _check_where_syntax
+    message = plan_warning(estimate(ast, stats))
+    if message:
+        warnings.append({"message": message})
 
 
 def _check_pii(records: list, warnings: list[dict[str, str]]):
-    """Scan record values for PII patterns."""
-    pii_found: dict[str, list[str]] = {}
-
-    for i, record in enumerate(records):
-        if not isinstance(record, dict):
-            continue
-        for field, value in record.items():
-            if not isinstance(value, str):
-                continue
-            for pii_type, pattern in PII_PATTERNS.items():
-                if pattern.search(value):
-                    if pii_type not in pii_found:
-                        pii_found[pii_type] = []
-                    pii_found[pii_type].append(f"record {i}, field '{field}'")
-                    break  # one match per value is enough
-
-    for pii_type, locations in pii_found.items():
-        sample = locations[0]
-        extra = f" (and {len(locations) - 1} more)" if len(locations) > 1 else ""
+    """Scan record values for PII patterns (see pii_scanner.py)."""
+    report = get_scanner().scan_records(records)
+    for pii_type in report.findings:
         warnings.append({
-            "message": f"{pii_type} pattern detected in {sample}{extra} "
+            "message": f"{pii_type} pattern detected in {report.describe(pii_type)} "
                        f"— use synthetic test data instead"
         })
 
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Query Plan Estimator
+====================
+
+Predicts whether Salesforce will answer a parsed SOQL query (see
+soql_parser.py) from an index or with a full table scan, using a local
+snapshot of org statistics instead of the org's Query Plan tool.
+
+Snapshot shape (JSON), one entry per object; every key but recordCount is
+optional:
+
+    {"objects": {
+        "Account": {
+            "recordCount": 2400000,
+            "customIndexes": ["Region__c"],
+            "externalIds": ["Legacy_Id__c"],
+            "uniqueFields": ["Legacy_Id__c"],
+            "lookups": ["Parent_Division__c"],
+            "skinnyTables": [["Name", "Industry", "Region__c"]],
+            "fields": {
+                "Industry": {"distinct": 40},
+                "Status__c": {"values": {"Open": 120000, "Closed": 2280000}}
+            }
+        }
+    }}
+
+The ``{"Account": {...}}`` form without the "objects" wrapper is accepted too.
+
+Each WHERE predicate is matched against the object's indexes and, where the
+snapshot has field statistics, given a row estimate that is compared with
+Salesforce's selectivity thresholds:
+
+    standard index   30% of the first million records, 15% beyond,
+                     at most 1,000,000 rows
+    custom index     10% of the first million records, 5% beyond,
+                     at most 333,333 rows
+
+Negative operators (!=, NOT IN, EXCLUDES, NOT), leading-wildcard LIKE, null
+comparisons, functions over a field and parent-field filters cannot use an
+index. An AND can use its most selective indexed operand; an OR only when
+every operand can. Without statistics an indexed predicate's row count is
+unknown and the plan is reported as "unknown" rather than guessed.
+
+Usage:
+    stats = OrgStats.load("org-stats.json")
+    plan = estimate(parse_soql("SELECT Id FROM Account WHERE Industry = 'Tech'"), stats)
+    plan["plan"]              # "index" | "table_scan" | "unknown" | None
+    plan_warning(plan)        # message for a table scan on a large object
+"""
+
+import json
+import os
+import sys
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from soql_parser import iter_values  # noqa: E402
+
+# Snapshot used by the validators when none is passed explicitly
+ORG_STATS_ENV = "SF_ORG_STATS"
+
+# Objects above this size throw "Non-selective query against large object
+# type" from triggers and time out elsewhere when scanned
+LARGE_OBJECT_ROWS = 200_000
+
+# Assumed size of a bound IN list (:ids) — one trigger batch
+BIND_LIST_SIZE = 200
+
+# Standard fields Salesforce indexes on every object
+STANDARD_INDEXED = {"id", "name", "ownerid", "createddate", "systemmodstamp", "recordtypeid"}
+
+# Standard indexed fields that exist only on some objects
+STANDARD_INDEXED_BY_OBJECT = {"contact": {"email"}, "lead": {"email"}}
+
+_NEGATIVE_OPS = {"!=", "<>", "NOT IN", "EXCLUDES"}
+
+# (realpath, mtime_ns, size) -> OrgStats
+_LOADED: dict[tuple[str, int, int], "OrgStats"] = {}
+
+
+def index_threshold(records: int, custom: bool) -> int:
+    """Most rows an index lookup may return and still be used."""
+    first, rest = min(records, 1_000_000), max(records - 1_000_000, 0)
+    if custom:
+        return int(min(first * 0.10 + rest * 0.05, 333_333))
+    return int(min(first * 0.30 + rest * 0.15, 1_000_000))
+
+
+class OrgStats:
+    """Case-insensitive index of per-object record counts, indexes and field statistics."""
+
+    def __init__(self, data: dict[str, Any]):
+        if isinstance(data.get("objects"), dict):
+            data = data["objects"]
+        self.objects: dict[str, dict[str, Any]] = {}
+        # "path:mtime_ns:size" when loaded from a file, for callers that cache results
+        self.fingerprint: str | None = None
+        for name, entry in data.items():
+            if isinstance(entry, dict):
+                self.objects[name.lower()] = self._index_object(name, entry)
+
+    @staticmethod
+    def _index_object(name: str, entry: dict[str, Any]) -> dict[str, Any]:
+        def lowered(key):
+            return {str(field).lower() for field in entry.get(key) or []}
+
+        return {
+            "name": name,
+            "records": int(entry.get("recordCount") or 0),
+            "custom": lowered("customIndexes") | lowered("externalIds") | lowered("uniqueFields"),
+            "unique": lowered("uniqueFields"),
+            "lookups": lowered("lookups"),
+            "skinny": [{str(f).lower() for f in table} for table in entry.get("skinnyTables") or []],
+            "fields": {
+                str(field).lower(): stats
+                for field, stats in (entry.get("fields") or {}).items()
+                if isinstance(stats, dict)
+            },
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "OrgStats":
+        """Load a snapshot, reusing the parsed index while the file is unchanged."""
+        real = os.path.realpath(path)
+        stat = os.stat(real)
+        key = (real, stat.st_mtime_ns, stat.st_size)
+        if key not in _LOADED:
+            with open(real, encoding="utf-8") as f:
+                stats = cls(json.load(f))
+            stats.fingerprint = ":".join(str(part) for part in key)
+            _LOADED[key] = stats
+        return _LOADED[key]
+
+    @classmethod
+    def from_env(cls) -> "OrgStats | None":
+        """The snapshot named by $SF_ORG_STATS, or None when unset or unreadable."""
+        path = os.environ.get(ORG_STATS_ENV)
+        if not path:
+            return None
+        try:
+            return cls.load(path)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, sobject: str) -> dict[str, Any] | None:
+        return self.objects.get(sobject.lower())
+
+    def index_kind(self, sobject: str, field: str) -> str | None:
+        """Index type of a field of ``sobject``: "standard", "custom" or None."""
+        entry = self.get(sobject)
+        lowered = field.lower()
+        if lowered in STANDARD_INDEXED or lowered in STANDARD_INDEXED_BY_OBJECT.get(sobject.lower(), ()):
+            return "standard"
+        if entry is None:
+            return None
+        if lowered in entry["custom"]:
+            return "custom"
+        if lowered in entry["lookups"] or (field.endswith("Id") and "__" not in field):
+            return "standard"  # lookup and master-detail fields (AccountId, ParentId)
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Estimation
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _value_rows(entry: dict[str, Any], field: str, value: dict[str, Any]) -> int | None:
+    """Rows matching ``field = value`` for one value, from the snapshot's field statistics."""
+    lowered = field.lower()
+    if lowered == "id" or lowered in entry["unique"]:
+        return 1
+    stats = entry["fields"].get(lowered, {})
+    values = stats.get("values")
+    if isinstance(values, dict) and value["kind"] in ("string", "number", "boolean"):
+        text = str(value["value"]).lower()
+        counts = {str(k).lower(): v for k, v in values.items()}
+        return int(counts.get(text, 0))
+    if stats.get("distinct"):
+        return max(1, entry["records"] // int(stats["distinct"]))
+    return None
+
+
+def _predicate(node: dict[str, Any], ast: dict[str, Any], entry: dict[str, Any], stats: OrgStats) -> dict[str, Any]:
+    field, operator, value = node["path"], node["operator"], node["value"]
+    if ast["alias"] and field.lower().startswith(f"{ast['alias']}.".lower()):
+        field = field[len(ast["alias"]) + 1 :]
+    sobject = ast["object"]
+    result = {
+        "field": field,
+        "operator": operator,
+        "index": None,
+        "rows": None,
+        "threshold": None,
+        "selective": False,
+        "reason": "",
+    }
+    index = stats.index_kind(sobject, field) if node["function"] is None and "." not in field else None
+    if node["function"] is not None:
+        result["reason"] = f"{node['function']}() over the field cannot use an index"
+    elif "." in field:
+        result["reason"] = "filters on a parent field"
+    elif index is None:
+        result["reason"] = "field is not indexed"
+    elif operator in _NEGATIVE_OPS:
+        result["reason"] = f"negative operator {operator}"
+    elif value["kind"] == "null" or (operator == "LIKE" and str(value["value"]).startswith("%")):
+        result["reason"] = "null comparison" if value["kind"] == "null" else "leading wildcard"
+    else:
+        result["index"] = index
+    if result["index"] is None:
+        return result
+
+    result["threshold"] = index_threshold(entry["records"], index == "custom")
+    if operator in ("=", "IN", "INCLUDES"):
+        rows = 0
+        for member in iter_values(value):
+            if member["kind"] == "subquery":
+                rows = None
+                break
+            per_value = _value_rows(entry, field, member)
+            if per_value is None:
+                rows = None
+                break
+            rows += per_value * (BIND_LIST_SIZE if member["kind"] == "bind" and operator != "=" else 1)
+        result["rows"] = rows
+    if result["rows"] is None:
+        result["reason"] = "no statistics to estimate matching rows"
+        result["selective"] = None
+    else:
+        result["selective"] = result["rows"] <= result["threshold"]
+        share = result["rows"] / entry["records"] if entry["records"] else 0
+        result["reason"] = f"~{result['rows']:,} rows ({share:.0%}) vs threshold {result['threshold']:,}"
+    return result
+
+
+def _combine(node, ast, entry, stats, predicates) -> tuple[str, int | None, list[str]]:
+    """(state, estimated rows, index fields) for a condition subtree.
+
+    state is "index", "unknown" (an index applies but its selectivity cannot
+    be estimated) or "scan".
+    """
+    if "op" not in node:
+        predicate = _predicate(node, ast, entry, stats)
+        predicates.append(predicate)
+        if predicate["selective"]:
+            return "index", predicate["rows"], [predicate["field"]]
+        if predicate["selective"] is None:
+            return "unknown", None, [predicate["field"]]
+        return "scan", None, []
+    if node["op"] == "NOT":
+        for operand in node["operands"]:
+            _combine(operand, ast, entry, stats, predicates)
+        return "scan", None, []
+    results = [_combine(operand, ast, entry, stats, predicates) for operand in node["operands"]]
+    if node["op"] == "AND":
+        indexed = [r for r in results if r[0] == "index"]
+        if indexed:
+            return min(indexed, key=lambda r: r[1])
+        unknown = [r for r in results if r[0] == "unknown"]
+        return unknown[0] if unknown else ("scan", None, [])
+    # OR: every branch must be answered from an index
+    if any(r[0] == "scan" for r in results):
+        return "scan", None, []
+    fields = [f for r in results for f in r[2]]
+    if any(r[0] == "unknown" for r in results):
+        return "unknown", None, fields
+    rows = sum(r[1] for r in results)
+    if rows > index_threshold(entry["records"], custom=False):
+        return "scan", None, []
+    return "index", rows, fields
+
+
+def _query_fields(ast: dict[str, Any]) -> set[str]:
+    """Lower-cased plain fields of the queried object the query touches."""
+    alias = f"{ast['alias']}.".lower() if ast["alias"] else None
+    paths = [f["path"] for f in ast["fields"] if f["path"]] + [r["path"] for r in ast["references"]]
+    fields = set()
+    for path in paths:
+        lowered = path.lower()
+        if alias and lowered.startswith(alias):
+            lowered = lowered[len(alias) :]
+        fields.add(lowered)
+    return fields
+
+
+def estimate(ast: dict[str, Any], stats: OrgStats) -> dict[str, Any]:
+    """Predict the plan for the top-level query of ``ast``.
+
+    Returns::
+
+        {"object": "Account", "records": 2400000,
+         "plan": "index" | "table_scan" | "unknown" | None,   # None: object not in snapshot
+         "index": ["Region__c"], "estimated_rows": 1200 | None,
+         "skinny_table": False, "predicates": [...]}
+    """
+    sobject = ast["object"]
+    entry = stats.get(sobject)
+    result: dict[str, Any] = {
+        "object": entry["name"] if entry else sobject,
+        "records": entry["records"] if entry else None,
+        "plan": None,
+        "index": [],
+        "estimated_rows": None,
+        "skinny_table": False,
+        "predicates": [],
+    }
+    if entry is None:
+        return result
+    if ast["where"] is None:
+        state, rows, fields = "scan", None, []
+    else:
+        state, rows, fields = _combine(ast["where"], ast, entry, stats, result["predicates"])
+    result["plan"] = {"index": "index", "unknown": "unknown", "scan": "table_scan"}[state]
+    result["index"] = fields
+    result["estimated_rows"] = rows
+    if state == "scan" and entry["skinny"]:
+        touched = _query_fields(ast)
+        result["skinny_table"] = any(touched <= table for table in entry["skinny"])
+    return result
+
+
+def plan_warning(plan: dict[str, Any]) -> str | None:
+    """A one-line warning for a table scan on a large object, else None."""
+    if plan["plan"] != "table_scan" or (plan["records"] or 0) <= LARGE_OBJECT_ROWS:
+        return None
+    reasons = [f"{p['field']}: {p['reason']}" for p in plan["predicates"] if not p["selective"]]
+    detail = "; ".join(reasons) if reasons else "no WHERE clause"
+    message = (
+        f"Non-selective query on {plan['object']} ({plan['records']:,} records) - "
+        f"expect a full table scan ({detail})"
+    )
+    if plan["skinny_table"]:
+        message += "; a skinny table covers the queried fields"
+    return message
+
+
+# Standalone execution for testing
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python query_plan.py <org-stats.json> <soql>")
+        sys.exit(1)
+
+    from soql_parser import parse_soql  # noqa: E402
+
+    plan = estimate(parse_soql(sys.argv[2]), OrgStats.load(sys.argv[1]))
+    print(json.dumps(plan, indent=2))
+    warning = plan_warning(plan)
+    if warning:
+        print(f"\n[warning] {warning}")
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+sObject Tree Validator
+======================
+
+Validates an sObject Tree import file (``{"records": [...]}``, as used by
+``sf data import tree`` and the composite/tree API) without loading it:
+a small stdlib pull parser reads the file in 64 KB chunks and emits JSON
+events, and only one record's ``attributes`` are materialised at a time.
+
+Checks:
+
+- every record, at any depth, has ``attributes`` with ``type`` and
+  ``referenceId``
+- child relationships are ``{"records": [...]}`` and nest at most 5 levels
+- ``referenceId`` values are unique across the file, and every ``"@Ref"``
+  field value names one of them
+- no single top-level tree holds more than 200 records
+
+referenceIds are kept as 64-bit string hashes, not strings, so a file with
+a million records needs a few tens of MB for the set, not the whole tree.
+
+The result includes a batch split: consecutive top-level trees of one
+object grouped into requests of at most 200 records. Each batch is a
+character range of the original file, so write_batches() copies the
+trees out verbatim rather than re-serialising them.
+
+Usage:
+    result = TreeValidator("tree.json").validate()
+    result["issues"], result["batches"]
+    write_batches("tree.json", result["batches"], "out/")
+
+    python sobject_tree.py tree.json [--split OUT_DIR]
+"""
+
+import os
+import re
+import sys
+from collections.abc import Iterator
+from json import JSONDecodeError
+from json.decoder import scanstring
+from typing import Any
+
+TREE_RECORD_LIMIT = 200
+TREE_DEPTH_LIMIT = 5
+CHUNK_SIZE = 1 << 16
+# Record paths kept per issue
+PATH_SAMPLES = 10
+
+_WS_RE = re.compile(r"[ \t\n\r]*")
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+class JSONStreamError(ValueError):
+    """Malformed JSON, with the 1-based line it was found on."""
+
+    def __init__(self, message: str, line: int):
+        super().__init__(f"{message} (line {line})")
+        self.line = line
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Pull parser
+# ═══════════════════════════════════════════════════════════════════════
+
+class _Buffer:
+    """A sliding window over a text stream, with absolute character offsets."""
+
+    def __init__(self, handle, chunk_size: int = CHUNK_SIZE):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.base = 0  # offset of buf[0] in the stream
+        self.line = 1  # line of buf[0]
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Drop consumed text and read another chunk. False at end of stream."""
+        if self.eof:
+            return False
+        chunk = self.handle.read(self.chunk_size)
+        self.line += self.buf.count("\n", 0, self.pos)
+        self.base += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of stream)."""
+        while True:
+            self.pos = _WS_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    @property
+    def offset(self) -> int:
+        return self.base + self.pos
+
+    def error(self, message: str) -> JSONStreamError:
+        return JSONStreamError(message, self.line + self.buf.count("\n", 0, self.pos))
+
+    def string(self) -> str:
+        while True:
+            try:
+                value, end = scanstring(self.buf, self.pos + 1)
+            except JSONDecodeError as e:
+                # Only a string (or escape) cut off by the chunk end is worth more input
+                cut = e.msg.startswith("Unterminated") or e.pos >= len(self.buf) - 6
+                if cut and self.fill():
+                    continue
+                raise self.error(e.msg.removesuffix(" at")) from e
+            self.pos = end
+            return value
+
+    def scalar(self) -> Any:
+        while True:
+            match = _NUMBER_RE.match(self.buf, self.pos)
+            word = self.buf[self.pos:self.pos + 5]
+            # A number may continue past the chunk end ("1." + "5", "1e" + "+3")
+            cut = match and len(self.buf) - match.end() < 3
+            if (cut or len(word) < 5) and not self.eof:
+                self.fill()  # shifts the buffer, so match again either way
+                continue
+            break
+        if match:
+            self.pos = match.end()
+            text = match.group()
+            return float(text) if any(c in text for c in ".eE") else int(text)
+        for literal, value in _LITERALS.items():
+            if self.buf.startswith(literal, self.pos):
+                self.pos += len(literal)
+                return value
+        raise self.error(f"Unexpected character {self.buf[self.pos]!r}")
+
+
+def iter_events(handle, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, Any, int]]:
+    """Yield ``(event, value, offset)`` for a JSON text stream.
+
+    Events: start_map, end_map, start_array, end_array, key, scalar. Offsets
+    are character positions: the opening bracket for start events and just
+    past the closing bracket for end events.
+    """
+    buf = _Buffer(handle, chunk_size)
+    stack: list[str] = []
+    state = "value"  # value | value_or_end | key | key_or_end | colon | comma_or_end | done
+    while True:
+        c = buf.peek()
+        offset = buf.offset
+        if not c:
+            if state == "done":
+                return
+            raise buf.error("Unexpected end of JSON")
+        if state == "done":
+            raise buf.error("Extra data after the JSON document")
+        if state == "colon":
+            if c != ":":
+                raise buf.error("Expected ':'")
+            buf.pos += 1
+            state = "value"
+        elif state == "comma_or_end":
+            closer = "}" if stack[-1] == "map" else "]"
+            if c == ",":
+                buf.pos += 1
+                state = "key" if stack[-1] == "map" else "value"
+            elif c == closer:
+                buf.pos += 1
+                yield ("end_map" if stack.pop() == "map" else "end_array"), None, offset + 1
+                state = "comma_or_end" if stack else "done"
+            else:
+                raise buf.error(f"Expected ',' or '{closer}'")
+        elif state in ("key", "key_or_end"):
+            if c == "}" and state == "key_or_end":
+                buf.pos += 1
+                stack.pop()
+                yield "end_map", None, offset + 1
+                state = "comma_or_end" if stack else "done"
+            elif c == '"':
+                yield "key", buf.string(), offset
+                state = "colon"
+            else:
+                raise buf.error("Expected a property name in double quotes")
+        elif c == "]" and state == "value_or_end":
+            buf.pos += 1
+            stack.pop()
+            yield "end_array", None, offset + 1
+            state = "comma_or_end" if stack else "done"
+        elif c == "{":
+            buf.pos += 1
+            stack.append("map")
+            yield "start_map", None, offset
+            state = "key_or_end"
+        elif c == "[":
+            buf.pos += 1
+            stack.append("array")
+            yield "start_array", None, offset
+            state = "value_or_end"
+        else:
+            value = buf.string() if c == '"' else buf.scalar()
+            yield "scalar", value, offset
+            state = "comma_or_end" if stack else "done"
+
+
+def _skip(events, event: str):
+    """Consume the rest of a value whose first event was *event*."""
+    if event not in ("start_map", "start_array"):
+        return
+    depth = 1
+    for kind, _, _ in events:
+        if kind in ("start_map", "start_array"):
+            depth += 1
+        elif kind in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _scalars(events) -> dict[str, Any]:
+    """Materialise a small map (after start_map), keeping scalar values only."""
+    result: dict[str, Any] = {}
+    for kind, key, _ in events:
+        if kind == "end_map":
+            return result
+        kind, value, _ = next(events)
+        if kind == "scalar":
+            result[key] = value
+        else:
+            _skip(events, kind)
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Tree validation
+# ═══════════════════════════════════════════════════════════════════════
+
+class TreeValidator:
+    """One streaming pass over an sObject Tree file."""
+
+    def __init__(self, file_path: str, record_limit: int = TREE_RECORD_LIMIT):
+        self.file_path = file_path
+        self.record_limit = record_limit
+        self._issues: dict[str, dict[str, Any]] = {}
+        # hash(referenceId) — compact and only compared within this process
+        self._ref_ids: set[int] = set()
+        # hash → (referenceId, first path) for "@Ref" values not yet defined
+        self._pending: dict[int, tuple[str, str]] = {}
+        self.records = 0
+        self.trees = 0
+        self.max_depth = 0
+        self.batches: list[dict[str, Any]] = []
+
+    def _tally(self, code: str, message: str, path: str):
+        issue = self._issues.get(code)
+        if issue is None:
+            issue = self._issues[code] = {"code": code, "message": message, "count": 0, "paths": []}
+        issue["count"] += 1
+        if len(issue["paths"]) < PATH_SAMPLES:
+            issue["paths"].append(path)
+
+    # ── structure ─────────────────────────────────────────────────────
+    def _document(self, events):
+        kind, _, _ = next(events)
+        if kind != "start_map":
+            self._tally("missing_records", 'Missing "records" array', "$")
+            _skip(events, kind)
+            return
+        found = False
+        for _, key, _ in events:
+            if key is None:
+                break  # end_map
+            kind, _, _ = next(events)
+            if key == "records" and kind == "start_array":
+                found = True
+                self._top_level(events)
+            else:
+                _skip(events, kind)
+        if not found:
+            self._tally("missing_records", 'Missing "records" array', "$")
+
+    def _top_level(self, events):
+        for kind, _, offset in events:
+            if kind == "end_array":
+                return
+            path = f"records[{self.trees}]"
+            self.trees += 1
+            if kind != "start_map":
+                self._tally("not_a_record", "Record is not a JSON object", path)
+                _skip(events, kind)
+                continue
+            count, end, sobject = self._record(events, 1, path)
+            if count > self.record_limit:
+                self._tally(
+                    "tree_too_large",
+                    f"Tree has more than {self.record_limit} records — split its children across requests",
+                    f"{path} ({count} records)",
+                )
+                continue
+            self._add_to_batch(sobject, count, offset, end)
+
+    def _record(self, events, depth: int, path: str) -> tuple[int, int, str | None]:
+        """Check one record (after start_map). Returns (records in subtree, end offset, type)."""
+        self.records += 1
+        self.max_depth = max(self.max_depth, depth)
+        if depth > TREE_DEPTH_LIMIT:
+            self._tally("too_deep", f"Records nest deeper than {TREE_DEPTH_LIMIT} levels", path)
+        count = 1
+        attributes = None
+        end = 0
+        for kind, key, offset in events:
+            if kind == "end_map":
+                end = offset
+                break
+            kind, value, _ = next(events)
+            if key == "attributes":
+                if kind == "start_map":
+                    attributes = _scalars(events)
+                else:
+                    _skip(events, kind)
+                    attributes = {}
+            elif kind == "start_map":
+                count += self._relationship(events, depth, f"{path}.{key}")
+            elif kind == "scalar":
+                if isinstance(value, str) and value.startswith("@") and len(value) > 1:
+                    self._reference(value[1:], f"{path}.{key}")
+            else:
+                _skip(events, kind)
+
+        if attributes is None:
+            self._tally("missing_attributes", 'Record missing "attributes"', path)
+            return count, end, None
+        if not attributes.get("type"):
+            self._tally("missing_type", "Record missing object type", path)
+        ref = attributes.get("referenceId")
+        if not ref:
+            self._tally("missing_reference_id", "Record missing referenceId", path)
+        else:
+            digest = hash(str(ref))
+            if digest in self._ref_ids:
+                self._tally("duplicate_reference_id", "referenceId used more than once", f"{path} ({ref})")
+            self._ref_ids.add(digest)
+            self._pending.pop(digest, None)
+        return count, end, attributes.get("type")
+
+    def _relationship(self, events, depth: int, path: str) -> int:
+        """A map value (after start_map): child records when it has "records"."""
+        count = 0
+        for _, key, _ in events:
+            if key is None:
+                break  # end_map
+            kind, _, _ = next(events)
+            if key != "records":
+                _skip(events, kind)
+                continue
+            if kind != "start_array":
+                self._tally("invalid_children", 'Child relationship "records" is not an array', path)
+                _skip(events, kind)
+                continue
+            n = 0
+            for kind, _, _ in events:
+                if kind == "end_array":
+                    break
+                child = f"{path}.records[{n}]"
+                n += 1
+                if kind != "start_map":
+                    self._tally("not_a_record", "Record is not a JSON object", child)
+                    _skip(events, kind)
+                    continue
+                count += self._record(events, depth + 1, child)[0]
+        return count
+
+    def _reference(self, ref: str, path: str):
+        digest = hash(ref)
+        if digest not in self._ref_ids and digest not in self._pending:
+            self._pending[digest] = (ref, path)
+
+    # ── batching ──────────────────────────────────────────────────────
+    def _add_to_batch(self, sobject: str | None, count: int, start: int, end: int):
+        batch = self.batches[-1] if self.batches else None
+        if batch is None or batch["sObject"] != sobject or batch["records"] + count > self.record_limit:
+            batch = {"sObject": sobject, "trees": [self.trees - 1, self.trees - 1],
+                     "records": 0, "start": start, "end": end}
+            self.batches.append(batch)
+        batch["trees"][1] = self.trees - 1
+        batch["records"] += count
+        batch["end"] = end
+
+    def validate(self) -> dict[str, Any]:
+        """Run every check in one pass.
+
+        Returns:
+            {
+                "file", "trees", "records", "max_depth",
+                "issues": [{"code", "message", "count", "paths"}],
+                "batches": [{"sObject", "trees": [first, last], "records", "start", "end"}],
+            }
+        """
+        with open(self.file_path, encoding="utf-8-sig", newline="") as f:
+            try:
+                self._document(iter_events(f))
+            except JSONStreamError as e:
+                self._tally("invalid_json", f"Invalid JSON: {e}", f"line {e.line}")
+                self.batches = []
+            except UnicodeDecodeError as e:
+                self._tally("invalid_json", f"Invalid JSON: not UTF-8 text ({e.reason})", "file")
+                self.batches = []
+        for ref, path in self._pending.values():
+            self._tally("unresolved_reference", "Reference to an undefined referenceId", f"{path} (@{ref})")
+        return {
+            "file": self.file_path,
+            "trees": self.trees,
+            "records": self.records,
+            "max_depth": self.max_depth,
+            "issues": list(self._issues.values()),
+            "batches": self.batches,
+        }
+
+
+def format_issue(issue: dict[str, Any]) -> str:
+    """``message — N record(s), at path, path, ...`` for one aggregated issue."""
+    paths = ", ".join(issue["paths"])
+    more = ", ..." if issue["count"] > len(issue["paths"]) else ""
+    return f"{issue['message']} — {issue['count']} record(s), at {paths}{more}"
+
+
+def write_batches(file_path: str, batches: list[dict[str, Any]], out_dir: str) -> list[str]:
+    """Write each batch as its own ``{"records": [...]}`` file, copied from the source text."""
+    os.makedirs(out_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    written = []
+    with open(file_path, encoding="utf-8-sig", newline="") as src:
+        position = 0
+        for n, batch in enumerate(batches, 1):
+            # Batches are in file order, so one forward read covers them all
+            remaining = batch["start"] - position
+            while remaining > 0:
+                remaining -= len(src.read(min(remaining, CHUNK_SIZE)))
+            path = os.path.join(out_dir, f"{stem}-{n:03d}.json")
+            with open(path, "w", encoding="utf-8", newline="") as out:
+                out.write('{"records": [')
+                remaining = batch["end"] - batch["start"]
+                while remaining > 0:
+                    chunk = src.read(min(remaining, CHUNK_SIZE))
+                    out.write(chunk)
+                    remaining -= len(chunk)
+                out.write("]}\n")
+            position = batch["end"]
+            written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python sobject_tree.py <tree.json> [--split OUT_DIR]")
+        sys.exit(1)
+
+    result = TreeValidator(sys.argv[1]).validate()
+    print(f"{result['file']}: {result['trees']} tree(s), {result['records']} record(s), "
+          f"depth {result['max_depth']}, {len(result['batches'])} request(s)")
+    for issue in result["issues"]:
+        print(f"  [{issue['code']}] {format_issue(issue)}")
+    if "--split" in sys.argv[2:]:
+        at = sys.argv.index("--split")
+        if at + 1 >= len(sys.argv):
+            print("--split needs an output directory")
+            sys.exit(1)
+        for path in write_batches(sys.argv[1], result["batches"], sys.argv[at + 1]):
+            print(f"  wrote {path}")
+    sys.exit(1 if result["issues"] else 0)
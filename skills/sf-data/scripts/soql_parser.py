@@ -0,0 +1,675 @@
+#!/usr/bin/env python3
+"""
+SOQL Parser Module
+==================
+
+Recursive-descent parser turning a SOQL query into a small dict-based AST:
+
+    {
+        "object": "Account",          # FROM target (relationship name in a subquery)
+        "alias": None,
+        "fields": [{"path": "Owner.Name", "function": None, "alias": None}],
+        "all_fields": False,          # FIELDS(ALL|STANDARD|CUSTOM) selected
+        "subqueries": [<ast>],        # parent-to-child subqueries in SELECT
+        "semi_joins": [<ast>],        # (SELECT ...) subqueries in WHERE / HAVING
+        "typeof": [{"path": "What", "fields": {"Account": ["Name"], ...}}],
+        "references": [{"path": "Name", "clause": "WHERE"}],
+        "binds": ["accountIds"],
+        "clauses": ["SELECT", "FROM", "WHERE", "LIMIT"],
+        "where": <condition> | None,
+        "having": <condition> | None,
+        "group_by": [{"path": "Industry", "function": None}],
+        "order_by": [{"path": "Name", "function": None, "direction": "ASC", "nulls": None}],
+        "limit": 10 | "bindName" | None,
+        "offset": None,
+        "with": ["SECURITY_ENFORCED"],
+        "for": ["UPDATE"],            # FOR VIEW / REFERENCE / UPDATE
+        "update": [],                 # UPDATE TRACKING / VIEWSTAT
+        "scope": None,                # USING SCOPE
+    }
+
+A condition is either a boolean node or a comparison:
+
+    {"op": "AND" | "OR" | "NOT", "operands": [<condition>, ...]}
+    {"field": "CreatedDate", "function": None, "operator": "=",
+     "value": {"kind": "date_literal", "value": "LAST_N_DAYS:30"}}
+
+Value kinds are string, number, date, datetime, date_literal, bind, null,
+boolean, literal (other bare words such as currency values), list (IN,
+INCLUDES) and subquery (the semi-join, also listed under "semi_joins").
+
+Field paths keep the case used in the query. Shared by SOQLValidator, the
+sf-data MCP validator and the sf-apex LLM pattern validator (inline
+``[SELECT ...]`` and Database.query() strings), so all of them reason about the
+same parsed query.
+
+parse_soql() keeps the most recent ASTs in an LRU cache keyed on the query
+text with whitespace collapsed, so the same query checked by several
+validators, or repeated in a file, is parsed once. Cached ASTs are shared:
+treat them as read-only.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any
+
+PARSE_CACHE_SIZE = 512
+
+
+class SOQLParseError(ValueError):
+    """Raised when a query cannot be parsed; ``position`` is the character offset.
+
+    ``code`` names the common mistakes validators report in their own words:
+    select_star, double_equals, double_quotes, missing_from, unbalanced,
+    typeof_end (None for any other syntax error).
+    """
+
+    def __init__(self, message: str, position: int, code: str | None = None):
+        super().__init__(f"{message} (at position {position})")
+        self.message = message
+        self.position = position
+        self.code = code
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+    | (?P<comment>--[^\n]*|/\*[\s\S]*?\*/)
+    | (?P<string>'(?:[^'\\]|\\.)*')
+    | (?P<datetime>\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)?)
+    | (?P<number>-?\d+(?:\.\d+)?)
+    | (?P<date_n>[A-Za-z_]\w*:\d+)
+    | (?P<currency>[A-Z]{3}\d+\.\d+\b)
+    | (?P<ident>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)
+    | (?P<op>!=|<>|<=|>=|==|=|<|>)
+    | (?P<punct>[(),*])
+    """,
+    re.VERBOSE,
+)
+
+# Clause keywords that end the SELECT list / FROM clause / a clause body
+_CLAUSE_STARTS = {
+    "WHERE", "WITH", "GROUP", "HAVING", "ORDER", "LIMIT", "OFFSET", "FOR", "USING", "UPDATE",
+}
+
+# Order in which clauses may follow FROM ("ALL ROWS" is Apex-only)
+_CLAUSE_ORDER = [
+    "USING SCOPE", "WHERE", "WITH", "GROUP BY", "HAVING", "ORDER BY", "LIMIT", "OFFSET",
+    "FOR", "UPDATE", "ALL ROWS",
+]
+
+DATE_LITERALS = {
+    "TODAY", "YESTERDAY", "TOMORROW", "THIS_WEEK", "LAST_WEEK", "NEXT_WEEK", "THIS_MONTH",
+    "LAST_MONTH", "NEXT_MONTH", "LAST_90_DAYS", "NEXT_90_DAYS", "THIS_QUARTER",
+    "LAST_QUARTER", "NEXT_QUARTER", "THIS_YEAR", "LAST_YEAR", "NEXT_YEAR",
+    "THIS_FISCAL_QUARTER", "LAST_FISCAL_QUARTER", "NEXT_FISCAL_QUARTER",
+    "THIS_FISCAL_YEAR", "LAST_FISCAL_YEAR", "NEXT_FISCAL_YEAR",
+}
+
+# Words inside clauses that are never field references
+_NON_FIELD_WORDS = {
+    "AND", "OR", "NOT", "IN", "INCLUDES", "EXCLUDES", "LIKE", "NULL", "TRUE", "FALSE",
+    "BY", "ROLLUP", "CUBE", "ASC", "DESC", "NULLS", "FIRST", "LAST", "ALL", "ROWS",
+    "VIEW", "REFERENCE", "TRACKING", "VIEWSTAT", "SCOPE", "SECURITY_ENFORCED",
+    "USER_MODE", "SYSTEM_MODE", "DATA", "CATEGORY", "AT", "ABOVE", "BELOW", "ABOVE_OR_BELOW",
+} | DATE_LITERALS | _CLAUSE_STARTS
+
+_COMPARISON_OPS = {"=", "!=", "<>", "<", "<=", ">", ">="}
+_WORD_OPS = {"LIKE", "IN", "INCLUDES", "EXCLUDES"}
+
+_NORMALIZE_RE = re.compile(r"('(?:[^'\\]|\\.)*')|--[^\n]*|/\*[\s\S]*?\*/|\s+")
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NAME_RE = re.compile(r"[A-Za-z_]\w*")
+_BRACKETS = {"(": ")", "[": "]"}
+
+
+def _scan_brackets(soql: str, start: int, bind_pos: int) -> int:
+    """End offset of the balanced ( ) / [ ] group opening at ``start``, skipping strings."""
+    closers = []
+    pos = start
+    while pos < len(soql):
+        char = soql[pos]
+        if char == "'":
+            match = _STRING_RE.match(soql, pos)
+            if not match:
+                break
+            pos = match.end()
+            continue
+        if char in _BRACKETS:
+            closers.append(_BRACKETS[char])
+        elif char in ")]":
+            if char != closers.pop():
+                break
+            if not closers:
+                return pos + 1
+        pos += 1
+    raise SOQLParseError("Unbalanced bind expression", bind_pos, "unbalanced")
+
+
+def _scan_bind(soql: str, pos: int) -> int:
+    """End offset of the Apex bind expression whose ':' is at ``pos``.
+
+    Accepts a name with member access, indexing and calls chained onto it
+    (``:acc.Id``, ``:ids[0]``, ``:Date.today().addDays(-3)``) or a
+    parenthesized expression (``:(a + b)``, ``:('%' + term)``).
+    """
+    end = pos + 1
+    while end < len(soql) and soql[end].isspace():
+        end += 1
+    if soql.startswith("(", end):
+        return _scan_brackets(soql, end, pos)
+    match = _NAME_RE.match(soql, end)
+    if not match:
+        raise SOQLParseError("Expected a bind expression after ':'", pos)
+    end = match.end()
+    while end < len(soql):
+        if soql[end] == "." and (member := _NAME_RE.match(soql, end + 1)):
+            end = member.end()
+        elif soql[end] in _BRACKETS:
+            end = _scan_brackets(soql, end, pos)
+        else:
+            break
+    return end
+
+
+def tokenize(soql: str) -> list[tuple[str, str, int]]:
+    """Split a query into (kind, text, offset) tokens, dropping whitespace and comments."""
+    tokens = []
+    pos = 0
+    while pos < len(soql):
+        if soql[pos] == ":":
+            end = _scan_bind(soql, pos)
+            tokens.append(("bind", soql[pos:end], pos))
+            pos = end
+            continue
+        match = _TOKEN_RE.match(soql, pos)
+        if not match:
+            if soql[pos] == '"':
+                raise SOQLParseError(
+                    "Use single quotes for string literals in SOQL", pos, "double_quotes"
+                )
+            raise SOQLParseError(f"Unexpected character {soql[pos]!r}", pos)
+        kind = match.lastgroup
+        if kind not in ("ws", "comment"):
+            tokens.append((kind, match.group(), pos))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list[tuple[str, str, int]], length: int):
+        self.tokens = tokens
+        self.i = 0
+        self.length = length
+
+    # ── token helpers ─────────────────────────────────────────────────
+    def peek(self, offset: int = 0):
+        j = self.i + offset
+        return self.tokens[j] if j < len(self.tokens) else ("eof", "", self.length)
+
+    def word(self, offset: int = 0) -> str:
+        kind, text, _pos = self.peek(offset)
+        return text.upper() if kind == "ident" else ""
+
+    def is_punct(self, char: str, offset: int = 0) -> bool:
+        kind, text, _pos = self.peek(offset)
+        return kind == "punct" and text == char
+
+    def take(self):
+        token = self.peek()
+        self.i += 1
+        return token
+
+    def expect_word(self, word: str):
+        if self.word() != word:
+            kind, text, pos = self.peek()
+            raise SOQLParseError(f"Expected {word}, found {text or 'end of query'!r}", pos)
+        return self.take()
+
+    def expect_punct(self, char: str):
+        kind, text, pos = self.peek()
+        if kind != "punct" or text != char:
+            if char == ")" and kind == "eof":
+                raise SOQLParseError("Unbalanced parentheses: missing ')'", pos, "unbalanced")
+            raise SOQLParseError(f"Expected {char!r}, found {text or 'end of query'!r}", pos)
+        return self.take()
+
+    def at_close(self) -> bool:
+        kind, text, _pos = self.peek()
+        return kind == "eof" or (kind == "punct" and text == ")")
+
+    # ── grammar ───────────────────────────────────────────────────────
+    def query(self) -> dict[str, Any]:
+        ast: dict[str, Any] = {
+            "object": "",
+            "alias": None,
+            "fields": [],
+            "all_fields": False,
+            "subqueries": [],
+            "semi_joins": [],
+            "typeof": [],
+            "references": [],
+            "binds": [],
+            "clauses": ["SELECT", "FROM"],
+            "where": None,
+            "having": None,
+            "group_by": [],
+            "order_by": [],
+            "limit": None,
+            "offset": None,
+            "with": [],
+            "for": [],
+            "update": [],
+            "scope": None,
+        }
+        self.expect_word("SELECT")
+        self.select_list(ast)
+        if self.word() != "FROM" and self.peek()[0] == "eof":
+            raise SOQLParseError("SELECT statement missing FROM clause", self.peek()[2], "missing_from")
+        self.expect_word("FROM")
+        kind, text, pos = self.take()
+        if kind != "ident":
+            raise SOQLParseError("Expected an object name after FROM", pos)
+        ast["object"] = text
+        if self.word() and self.word() not in _CLAUSE_STARTS and not self.all_rows_ahead():
+            ast["alias"] = self.take()[1]
+        self.clauses(ast)
+        return ast
+
+    def select_list(self, ast: dict[str, Any]):
+        while True:
+            kind, text, pos = self.peek()
+            if kind == "punct" and text == "(":
+                self.take()
+                ast["subqueries"].append(self.query())
+                self.expect_punct(")")
+            elif kind == "punct" and text == "*":
+                raise SOQLParseError(
+                    "SELECT * is not valid in SOQL - specify field names", pos, "select_star"
+                )
+            elif self.word() == "TYPEOF":
+                self.typeof(ast)
+            elif kind == "ident" and self.is_punct("(", 1):
+                self.function_item(ast)
+            elif kind == "ident" and self.word() != "FROM":
+                self.take()
+                ast["fields"].append({"path": text, "function": None, "alias": self.alias()})
+            else:
+                raise SOQLParseError(f"Expected a field, found {text or 'end of query'!r}", pos)
+            if not self.is_punct(","):
+                return
+            self.take()
+
+    def function_item(self, ast: dict[str, Any]):
+        name = self.take()[1]
+        args = self.select_arguments()
+        upper = name.upper()
+        if upper == "FIELDS":
+            ast["all_fields"] = True
+            return
+        path = args[0] if args and args[0].upper() not in _NON_FIELD_WORDS else ""
+        ast["fields"].append({"path": path, "function": upper, "alias": self.alias()})
+
+    def select_arguments(self) -> list[str]:
+        """Words among a SELECT function's arguments, nested calls included
+        (FORMAT(MIN(CloseDate)), DISTANCE(Location__c, GEOLOCATION(...), 'mi'))."""
+        self.expect_punct("(")
+        args = []
+        while not self.at_close():
+            kind, text, _pos = self.peek()
+            if kind == "punct" and text == "(":
+                args.extend(self.select_arguments())
+                continue
+            self.take()
+            if kind == "ident" and self.is_punct("("):
+                args.extend(self.select_arguments())
+            elif kind == "ident":
+                args.append(text)
+        self.expect_punct(")")
+        return args
+
+    def alias(self):
+        kind, text, _pos = self.peek()
+        if kind == "ident" and self.word() != "FROM":
+            self.take()
+            return text
+        return None
+
+    def typeof(self, ast: dict[str, Any]):
+        self.expect_word("TYPEOF")
+        kind, path, pos = self.take()
+        if kind != "ident":
+            raise SOQLParseError("Expected a polymorphic field after TYPEOF", pos)
+        entry: dict[str, Any] = {"path": path, "fields": {}}
+        current = None
+        while self.word() != "END":
+            kind, text, pos = self.take()
+            if kind == "eof":
+                raise SOQLParseError("TYPEOF expression missing END keyword", pos, "typeof_end")
+            upper = text.upper() if kind == "ident" else ""
+            if upper == "WHEN":
+                current = entry["fields"].setdefault(self.take()[1], [])
+            elif upper == "ELSE":
+                current = entry["fields"].setdefault("", [])
+            elif upper == "THEN" or (kind == "punct" and text == ","):
+                continue
+            elif kind == "ident" and current is not None:
+                current.append(text)
+        self.take()  # END
+        ast["typeof"].append(entry)
+
+    # ── clauses after FROM ────────────────────────────────────────────
+    def all_rows_ahead(self) -> bool:
+        return self.word() == "ALL" and self.word(1) == "ROWS"
+
+    def clauses(self, ast: dict[str, Any]):
+        last = -1
+        while not self.at_close():
+            kind, text, pos = self.peek()
+            clause = self.word()
+            if clause in ("GROUP", "ORDER"):
+                self.take()
+                self.expect_word("BY")
+                clause = f"{clause} BY"
+            elif clause == "USING":
+                self.take()
+                self.expect_word("SCOPE")
+                clause = "USING SCOPE"
+            elif self.all_rows_ahead():
+                self.take()
+                self.take()
+                clause = "ALL ROWS"
+            elif clause in _CLAUSE_STARTS:
+                self.take()
+            else:
+                raise SOQLParseError(f"Unexpected {text!r} after {ast['clauses'][-1]} clause", pos)
+            index = _CLAUSE_ORDER.index(clause)
+            if index <= last:
+                raise SOQLParseError(f"{clause} clause out of order", pos)
+            last = index
+            ast["clauses"].append(clause)
+            self.clause_body(ast, clause)
+
+    def clause_body(self, ast: dict[str, Any], clause: str):
+        if clause == "WHERE":
+            ast["where"] = self.condition(ast, clause)
+        elif clause == "HAVING":
+            ast["having"] = self.condition(ast, clause)
+        elif clause == "GROUP BY":
+            self.group_by(ast)
+        elif clause == "ORDER BY":
+            self.order_by(ast)
+        elif clause in ("LIMIT", "OFFSET"):
+            kind, text, pos = self.take()
+            if kind == "number" and text.isdigit():
+                ast[clause.lower()] = int(text)
+            elif kind == "bind":
+                ast[clause.lower()] = self.bind(ast, text)
+            else:
+                raise SOQLParseError(f"{clause} expects a number or bind variable", pos)
+        elif clause == "USING SCOPE":
+            ast["scope"] = self.identifier("a scope name")
+        elif clause == "WITH":
+            self.with_clause(ast)
+        elif clause in ("FOR", "UPDATE"):
+            key = "for" if clause == "FOR" else "update"
+            while True:
+                ast[key].append(self.identifier(f"a {clause} option").upper())
+                if not self.is_punct(","):
+                    break
+                self.take()
+
+    def identifier(self, what: str) -> str:
+        kind, text, pos = self.take()
+        if kind != "ident":
+            raise SOQLParseError(f"Expected {what}, found {text or 'end of query'!r}", pos)
+        return text
+
+    def with_clause(self, ast: dict[str, Any]):
+        option = self.identifier("a WITH option").upper()
+        if option != "DATA":
+            ast["with"].append(option)
+            return
+        self.expect_word("CATEGORY")
+        ast["with"].append("DATA CATEGORY")
+        # Category filters (Geo__c AT (usa__c, uk__c) AND ...) carry no fields
+        depth = 0
+        while depth or not (self.at_close() or self.word() in _CLAUSE_STARTS):
+            kind, text, pos = self.take()
+            if kind == "eof":
+                raise SOQLParseError("Unbalanced parentheses: missing ')'", pos, "unbalanced")
+            if kind == "punct" and text in "()":
+                depth += 1 if text == "(" else -1
+
+    def group_by(self, ast: dict[str, Any]):
+        while True:
+            if self.word() in ("ROLLUP", "CUBE") and self.is_punct("(", 1):
+                self.take()
+                self.take()
+                while True:
+                    ast["group_by"].append(self.field_expr(ast, "GROUP BY"))
+                    if not self.is_punct(","):
+                        break
+                    self.take()
+                self.expect_punct(")")
+            else:
+                ast["group_by"].append(self.field_expr(ast, "GROUP BY"))
+            if not self.is_punct(","):
+                return
+            self.take()
+
+    def order_by(self, ast: dict[str, Any]):
+        while True:
+            item = self.field_expr(ast, "ORDER BY")
+            item["direction"] = "ASC"
+            item["nulls"] = None
+            if self.word() in ("ASC", "DESC"):
+                item["direction"] = self.take()[1].upper()
+            if self.word() == "NULLS":
+                self.take()
+                if self.word() not in ("FIRST", "LAST"):
+                    kind, text, pos = self.peek()
+                    raise SOQLParseError(f"Expected FIRST or LAST, found {text or 'end of query'!r}", pos)
+                item["nulls"] = self.take()[1].upper()
+            ast["order_by"].append(item)
+            if not self.is_punct(","):
+                return
+            self.take()
+
+    # ── conditions (WHERE / HAVING) ───────────────────────────────────
+    def condition(self, ast: dict[str, Any], clause: str) -> dict[str, Any]:
+        return self.boolean(ast, clause, "OR")
+
+    def boolean(self, ast: dict[str, Any], clause: str, op: str) -> dict[str, Any]:
+        parse = self.negation if op == "AND" else lambda a, c: self.boolean(a, c, "AND")
+        operands = [parse(ast, clause)]
+        while self.word() == op:
+            self.take()
+            operands.append(parse(ast, clause))
+        return operands[0] if len(operands) == 1 else {"op": op, "operands": operands}
+
+    def negation(self, ast: dict[str, Any], clause: str) -> dict[str, Any]:
+        if self.word() == "NOT":
+            self.take()
+            return {"op": "NOT", "operands": [self.negation(ast, clause)]}
+        if self.is_punct("("):
+            self.take()
+            node = self.condition(ast, clause)
+            self.expect_punct(")")
+            return node
+        return self.comparison(ast, clause)
+
+    def comparison(self, ast: dict[str, Any], clause: str) -> dict[str, Any]:
+        node = self.field_expr(ast, clause)
+        kind, text, pos = self.take()
+        upper = text.upper() if kind == "ident" else ""
+        if kind == "op" and text == "==":
+            raise SOQLParseError('Invalid operator "==" - use "=" in SOQL', pos, "double_equals")
+        if kind == "op" and text in _COMPARISON_OPS:
+            operator = text
+        elif upper in _WORD_OPS:
+            operator = upper
+        elif upper == "NOT" and self.word() == "IN":
+            self.take()
+            operator = "NOT IN"
+        else:
+            raise SOQLParseError(
+                f"Expected a comparison operator, found {text or 'end of query'!r}", pos
+            )
+        node["operator"] = operator
+        node["value"] = self.value(ast)
+        return node
+
+    def field_expr(self, ast: dict[str, Any], clause: str) -> dict[str, Any]:
+        """A field path, or a function over one (CALENDAR_YEAR(CreatedDate), COUNT(Id))."""
+        kind, text, pos = self.take()
+        if kind != "ident":
+            raise SOQLParseError(f"Expected a field, found {text or 'end of query'!r}", pos)
+        if not self.is_punct("("):
+            if text.upper() not in _NON_FIELD_WORDS:
+                ast["references"].append({"path": text, "clause": clause})
+            return {"path": text, "function": None}
+        fields = self.arguments(ast, clause)
+        return {"path": fields[0] if fields else "", "function": text.upper()}
+
+    def arguments(self, ast: dict[str, Any], clause: str) -> list[str]:
+        """Function arguments; returns the field paths among them."""
+        self.expect_punct("(")
+        fields = []
+        while not self.is_punct(")"):
+            kind, text, pos = self.take()
+            if kind == "eof":
+                raise SOQLParseError("Unbalanced parentheses: missing ')'", pos, "unbalanced")
+            if kind == "ident" and self.is_punct("("):
+                # GEOLOCATION(lat, lng) inside DISTANCE(), convertTimezone(...) inside HOUR_IN_DAY()
+                fields.extend(self.arguments(ast, clause))
+            elif kind == "ident" and text.upper() not in _NON_FIELD_WORDS:
+                fields.append(text)
+                ast["references"].append({"path": text, "clause": clause})
+            elif kind == "bind":
+                self.bind(ast, text)
+        self.take()
+        return fields
+
+    def value(self, ast: dict[str, Any]) -> dict[str, Any]:
+        kind, text, pos = self.take()
+        if kind == "punct" and text == "(":
+            if self.word() == "SELECT":
+                sub = self.query()
+                ast["semi_joins"].append(sub)
+                self.expect_punct(")")
+                return {"kind": "subquery", "value": sub}
+            values = [self.value(ast)]
+            while self.is_punct(","):
+                self.take()
+                values.append(self.value(ast))
+            self.expect_punct(")")
+            return {"kind": "list", "value": values}
+        if kind == "string":
+            return {"kind": "string", "value": text[1:-1]}
+        if kind == "number":
+            return {"kind": "number", "value": text}
+        if kind == "currency":
+            return {"kind": "literal", "value": text}
+        if kind == "datetime":
+            return {"kind": "datetime" if "T" in text else "date", "value": text}
+        if kind == "date_n":
+            return {"kind": "date_literal", "value": text.upper()}
+        if kind == "bind":
+            return {"kind": "bind", "value": self.bind(ast, text)}
+        if kind == "ident":
+            upper = text.upper()
+            if upper == "NULL":
+                return {"kind": "null", "value": None}
+            if upper in ("TRUE", "FALSE"):
+                return {"kind": "boolean", "value": upper == "TRUE"}
+            if upper in DATE_LITERALS:
+                return {"kind": "date_literal", "value": upper}
+            return {"kind": "literal", "value": text}
+        raise SOQLParseError(f"Expected a value, found {text or 'end of query'!r}", pos)
+
+    def bind(self, ast: dict[str, Any], text: str) -> str:
+        name = text[1:].strip()
+        ast["binds"].append(name)
+        return name
+
+
+def _parse(soql: str) -> dict[str, Any]:
+    parser = _Parser(tokenize(soql), len(soql))
+    ast = parser.query()
+    kind, text, pos = parser.peek()
+    if kind == "punct" and text == ")":
+        raise SOQLParseError("Unbalanced parentheses: unexpected ')'", pos, "unbalanced")
+    if kind != "eof":
+        raise SOQLParseError(f"Unexpected {text!r} after query", pos)
+    return ast
+
+
+def normalize_soql(soql: str) -> str:
+    """Query text with comments and whitespace outside string literals collapsed to single
+    spaces and any trailing ';' dropped."""
+    text = _NORMALIZE_RE.sub(lambda m: m.group(1) or " ", soql).strip()
+    return text[:-1].rstrip() if text.endswith(";") else text
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_normalized(text: str) -> dict[str, Any]:
+    return _parse(text)
+
+
+def parse_soql(soql: str) -> dict[str, Any]:
+    """Parse a SOQL query into the dict AST described in the module docstring.
+
+    Results are cached by normalized text and shared between callers; do not
+    modify the returned AST.
+
+    Raises:
+        SOQLParseError: when the query is not well-formed; ``position`` is an
+            offset into ``soql`` as given
+    """
+    try:
+        return _parse_normalized(normalize_soql(soql))
+    except SOQLParseError:
+        _parse(soql.rstrip().rstrip(";"))  # re-raise with offsets into the original text
+        raise
+
+
+def iter_queries(ast: dict[str, Any]):
+    """Yield ``ast`` and every subquery and semi-join nested in it."""
+    yield ast
+    for sub in ast["subqueries"] + ast["semi_joins"]:
+        yield from iter_queries(sub)
+
+
+def iter_comparisons(node: dict[str, Any] | None):
+    """Yield the comparison leaves of a WHERE / HAVING condition tree."""
+    if node is None:
+        return
+    if "op" in node:
+        for operand in node["operands"]:
+            yield from iter_comparisons(operand)
+    else:
+        yield node
+
+
+def iter_values(value: dict[str, Any]):
+    """Yield a comparison value, or each member of an IN list."""
+    if value["kind"] == "list":
+        for member in value["value"]:
+            yield from iter_values(member)
+    else:
+        yield value
+
+
+def selected_paths(ast: dict[str, Any]) -> set[str]:
+    """Lower-cased field paths a query selects (plain fields and TYPEOF branches)."""
+    paths = {f["path"].lower() for f in ast["fields"] if f["path"] and not f["function"]}
+    paths |= {
+        f["path"].lower()
+        for f in ast["fields"]
+        if f["path"] and f["function"] in ("TOLABEL", "FORMAT", "CONVERTCURRENCY")
+    }
+    for entry in ast["typeof"]:
+        for fields in entry["fields"].values():
+            paths |= {f"{entry['path']}.{name}".lower() for name in fields}
+    return paths
@@ -5,11 +5,39 @@ SOQL Validator Module
 
 Validates SOQL query syntax and patterns.
 Used by the main validation module for query-specific checks.
+
+Every check reads the AST from soql_parser.py (parsed once per query text and
+cached), so keywords, quotes and operators inside string literals or nested
+subqueries are never mistaken for clauses. Comments are skipped by the
+tokenizer, outside string literals only. A query that does not parse is
+reported as a syntax issue; its WHERE and LIMIT flags then come from a plain
+text scan (string literals blanked) and the other structural flags stay False.
+
+When given an object-describe snapshot (see describe_cache.py), every field the
+query selects or filters on is also checked against the snapshot. With an org
+statistics snapshot (see query_plan.py; defaults to $SF_ORG_STATS) the WHERE
+predicates are checked for selectivity and a table scan on a large object is
+reported.
 """
 
+import os
 import re
+import sys
 from typing import Any
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from describe_cache import DescribeCache  # noqa: E402
+from query_plan import OrgStats, estimate, plan_warning  # noqa: E402
+from soql_parser import (  # noqa: E402
+    SOQLParseError,
+    iter_comparisons,
+    iter_queries,
+    iter_values,
+    normalize_soql,
+    parse_soql,
+)
+
 
 class SOQLValidator:
     """Validates SOQL queries for best practices."""
@@ -76,8 +104,39 @@ class SOQLValidator:
         "IsDeleted",
     ]
 
-    def __init__(self, content: str):
+    # Aggregate functions counted by get_query_complexity()
+    AGGREGATES = {"COUNT", "COUNT_DISTINCT", "SUM", "AVG", "MIN", "MAX"}
+
+    # SOQL keywords most likely to appear as accidental field-name tokens in a
+    # generated SELECT list. Not exhaustive — Salesforce treats many tokens
+    # (NULL, TRUE/FALSE, etc.) as values rather than identifiers.
+    RESERVED_WORDS = {
+        "SELECT", "FROM", "WHERE", "ORDER", "GROUP", "LIMIT",
+        "AND", "OR", "NOT", "IN", "LIKE", "BY", "ASC", "DESC",
+        "HAVING", "OFFSET", "DISTINCT", "WITH", "TYPEOF",
+    }
+
+    # Quoted 15/18-character record Ids
+    ID_LITERAL_RE = re.compile(r"[a-zA-Z0-9]{15}(?:[a-zA-Z0-9]{3})?")
+
+    # Text fallback for a query that does not parse
+    STRING_LITERAL_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+    WHERE_RE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+    LIMIT_RE = re.compile(r"\bLIMIT\s*(?:\d|:)", re.IGNORECASE)
+
+    def __init__(
+        self,
+        content: str,
+        describe: "DescribeCache | str | None" = None,
+        stats: "OrgStats | str | None" = None,
+    ):
         self.content = content
+        if isinstance(describe, str):
+            describe = DescribeCache.load(describe)
+        self.describe = describe
+        if isinstance(stats, str):
+            stats = OrgStats.load(stats)
+        self.stats = stats if stats is not None else OrgStats.from_env()
         self.issues: list[dict[str, Any]] = []
         self.recommendations: list[str] = []
 
@@ -96,33 +155,37 @@ class SOQLValidator:
             "recommendations": [],
         }
 
-        # Clean content (remove comments)
-        clean_content = self._remove_comments(self.content)
-
-        # Check for WHERE clause
-        result["has_where_clause"] = self._has_where_clause(clean_content)
-
-        # Check for LIMIT
-        result["has_limit"] = self._has_limit(clean_content)
-
-        # Check for ORDER BY
-        result["has_order_by"] = bool(re.search(r"\bORDER\s+BY\b", clean_content, re.IGNORECASE))
-
-        # Check for hardcoded IDs
-        result["has_hardcoded_ids"] = self._has_hardcoded_ids(clean_content)
-
-        # Check for indexed fields in WHERE
-        result["uses_indexed_fields"] = self._uses_indexed_fields(clean_content)
-
-        # Check for subqueries
-        result["has_subquery"] = self._has_subquery(clean_content)
-
-        # Check for relationship queries
-        result["has_relationship"] = self._has_relationship(clean_content)
-
-        # Syntax validation
-        syntax_issues = self._validate_syntax(clean_content)
-        result["issues"].extend(syntax_issues)
+        # Parse once (the tokenizer skips comments)
+        ast, parse_issue = self._parse(self.content)
+
+        if parse_issue:
+            result["issues"].append(parse_issue)
+            text = self.STRING_LITERAL_RE.sub("''", normalize_soql(self.content))
+            result["has_where_clause"] = bool(self.WHERE_RE.search(text))
+            result["has_limit"] = bool(self.LIMIT_RE.search(text))
+        else:
+            result["has_where_clause"] = self._has_where_clause(ast)
+            result["has_limit"] = self._has_limit(ast)
+            result["has_order_by"] = bool(ast["order_by"])
+            result["has_hardcoded_ids"] = self._has_hardcoded_ids(ast)
+            result["uses_indexed_fields"] = self._uses_indexed_fields(ast)
+            result["has_subquery"] = self._has_subquery(ast)
+            result["has_relationship"] = self._has_relationship(ast)
+
+            # Syntax validation
+            result["issues"].extend(self._validate_syntax(ast))
+
+            # Field existence against the describe snapshot
+            if self.describe is not None:
+                result["issues"].extend(self._check_fields(ast))
+
+            # Index use against the org statistics snapshot
+            if self.stats is not None:
+                plan = estimate(ast, self.stats)
+                result["query_plan"] = plan
+                warning = plan_warning(plan)
+                if warning:
+                    result["issues"].append({"severity": "warning", "message": warning})
 
         # Add recommendations
         if not result["has_where_clause"]:
@@ -141,79 +204,89 @@ class SOQLValidator:
 
         return result
 
-    def _remove_comments(self, content: str) -> str:
-        """Remove SQL comments from content."""
-        # Remove single-line comments
-        content = re.sub(r"--.*$", "", content, flags=re.MULTILINE)
-        # Remove multi-line comments
-        content = re.sub(r"/\*[\s\S]*?\*/", "", content)
-        return content
-
-    def _has_where_clause(self, content: str) -> bool:
+    def _parse(self, content: str) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+        """Parse content; returns (ast, None) or (None, syntax issue)."""
+        try:
+            return parse_soql(content), None
+        except SOQLParseError as exc:
+            # Double quotes are the one mistake Salesforce users hit constantly
+            # and fix trivially; keep it advisory as it always was.
+            severity = "warning" if exc.code == "double_quotes" else "error"
+            message = exc.message if exc.code else f"SOQL syntax error: {exc}"
+            return None, {"severity": severity, "message": message}
+
+    def _has_where_clause(self, ast: dict[str, Any]) -> bool:
         """Check if query has a WHERE clause."""
-        return bool(re.search(r"\bWHERE\b", content, re.IGNORECASE))
-
-    def _has_limit(self, content: str) -> bool:
-        """Check if query has a LIMIT clause."""
-        return bool(re.search(r"\bLIMIT\s+\d+", content, re.IGNORECASE))
-
-    def _has_hardcoded_ids(self, content: str) -> bool:
-        """Check for hardcoded Salesforce IDs."""
-        # Salesforce IDs are 15 or 18 character alphanumeric
-        # Starting with specific prefixes: 001 (Account), 003 (Contact), etc.
-        id_pattern = r"'[a-zA-Z0-9]{15}'"  # 15-char ID
-        id_pattern_18 = r"'[a-zA-Z0-9]{18}'"  # 18-char ID
-
-        return bool(re.search(id_pattern, content) or re.search(id_pattern_18, content))
-
-    def _uses_indexed_fields(self, content: str) -> bool:
-        """Check if WHERE clause uses indexed fields."""
-        # Extract WHERE clause
-        where_match = re.search(
-            r"\bWHERE\b(.*?)(?:\bORDER\b|\bGROUP\b|\bLIMIT\b|$)", content, re.IGNORECASE | re.DOTALL
+        return ast["where"] is not None
+
+    def _has_limit(self, ast: dict[str, Any]) -> bool:
+        """Check if query has a LIMIT clause (literal or bind)."""
+        return ast["limit"] is not None
+
+    def _literals(self, ast: dict[str, Any]):
+        """String literals compared against in any WHERE / HAVING of the query."""
+        for query in iter_queries(ast):
+            for node in iter_comparisons(query["where"]):
+                for value in iter_values(node["value"]):
+                    if value["kind"] == "string":
+                        yield value["value"]
+            for node in iter_comparisons(query["having"]):
+                for value in iter_values(node["value"]):
+                    if value["kind"] == "string":
+                        yield value["value"]
+
+    def _has_hardcoded_ids(self, ast: dict[str, Any]) -> bool:
+        """Check for hardcoded Salesforce IDs among the query's string literals."""
+        return any(
+            self.ID_LITERAL_RE.fullmatch(text) and any(c.isdigit() for c in text)
+            for text in self._literals(ast)
         )
-        if not where_match:
-            return False
 
-        where_clause = where_match.group(1)
+    def _uses_indexed_fields(self, ast: dict[str, Any]) -> bool:
+        """Check if the top-level WHERE filters directly on an indexed field.
+
+        With an org statistics snapshot covering the object, the predicted
+        plan decides; otherwise a filter on INDEXED_FIELDS counts.
+        """
+        if self.stats is not None:
+            plan = estimate(ast, self.stats)
+            if plan["plan"] is not None:
+                return plan["plan"] != "table_scan"
+        indexed = {field.lower() for field in self.INDEXED_FIELDS}
+        return any(
+            node["function"] is None and node["path"].rsplit(".", 1)[-1].lower() in indexed
+            for node in iter_comparisons(ast["where"])
+        )
 
-        # Check for indexed fields
-        for field in self.INDEXED_FIELDS:
-            if re.search(rf"\b{field}\b", where_clause, re.IGNORECASE):
-                return True
+    def _has_subquery(self, ast: dict[str, Any]) -> bool:
+        """Check if query has subqueries (parent-to-child or semi-joins)."""
+        return bool(ast["subqueries"] or ast["semi_joins"])
 
+    def _has_relationship(self, ast: dict[str, Any]) -> bool:
+        """Check if query traverses a relationship (dot notation or TYPEOF)."""
+        for query in iter_queries(ast):
+            if query["typeof"]:
+                return True
+            prefix = f"{query['alias']}.".lower() if query["alias"] else None
+            paths = [f["path"] for f in query["fields"]] + [r["path"] for r in query["references"]]
+            for path in paths:
+                if prefix and path.lower().startswith(prefix):
+                    path = path[len(prefix) :]
+                if "." in path:
+                    return True
         return False
 
-    def _has_subquery(self, content: str) -> bool:
-        """Check if query has subqueries."""
-        # Look for nested SELECT in parentheses
-        return bool(re.search(r"\(\s*SELECT\b", content, re.IGNORECASE))
-
-    def _has_relationship(self, content: str) -> bool:
-        """Check if query uses relationship queries."""
-        # Look for dot notation (child-to-parent) or __r suffix
-        return bool(re.search(r"\w+\.\w+|__r\.", content))
-
-    def _validate_syntax(self, content: str) -> list[dict[str, Any]]:
-        """Validate SOQL syntax and return issues."""
+    def _validate_syntax(self, ast: dict[str, Any]) -> list[dict[str, Any]]:
+        """Advisory syntax issues in a query that parsed."""
         issues = []
 
-        # Check for SELECT without FROM
-        if re.search(r"\bSELECT\b", content, re.IGNORECASE):
-            if not re.search(r"\bFROM\b", content, re.IGNORECASE):
-                issues.append(
-                    {"severity": "error", "message": "SELECT statement missing FROM clause"}
-                )
-
-        # Check for invalid operators
-        if re.search(r"==", content):
-            issues.append(
-                {"severity": "error", "message": 'Invalid operator "==" - use "=" in SOQL'}
-            )
-
-        if re.search(r"!=\s*null", content, re.IGNORECASE):
-            pass  # Valid
-        elif re.search(r"<>", content):
+        operators = {
+            node["operator"]
+            for query in iter_queries(ast)
+            for clause in ("where", "having")
+            for node in iter_comparisons(query[clause])
+        }
+        if "<>" in operators:
             issues.append(
                 {
                     "severity": "warning",
@@ -221,103 +294,75 @@ class SOQLValidator:
                 }
             )
 
-        # Check for SELECT *
-        if re.search(r"\bSELECT\s+\*", content, re.IGNORECASE):
-            issues.append(
-                {
-                    "severity": "error",
-                    "message": "SELECT * is not valid in SOQL - specify field names",
-                }
-            )
-
-        # Check for proper string quoting
-        if re.search(r"=\s*\"[^\"]*\"", content):
+        # Reserved words used as field names or aliases
+        names = [f["path"] for f in ast["fields"]] + [f["alias"] for f in ast["fields"]]
+        for word in sorted({n.upper() for n in names if n} & self.RESERVED_WORDS):
             issues.append(
-                {"severity": "warning", "message": "Use single quotes for string literals in SOQL"}
+                {"severity": "warning", "message": f'Possible misuse of reserved word "{word}"'}
             )
 
-        # Check for unbalanced parentheses
-        open_parens = content.count("(")
-        close_parens = content.count(")")
-        if open_parens != close_parens:
-            issues.append(
-                {
-                    "severity": "error",
-                    "message": f"Unbalanced parentheses: {open_parens} open, {close_parens} close",
-                }
-            )
+        return issues
 
-        # Check for TYPEOF without END
-        if re.search(r"\bTYPEOF\b", content, re.IGNORECASE):
-            if not re.search(r"\bEND\b", content, re.IGNORECASE):
-                issues.append(
-                    {"severity": "error", "message": "TYPEOF expression missing END keyword"}
-                )
-
-        # Check for reserved words as field names (common issues). Covers the
-        # SOQL keywords most likely to appear as accidental field-name tokens
-        # in a generated SELECT list. Not exhaustive — Salesforce treats many
-        # tokens (NULL, TRUE/FALSE, etc.) as values rather than identifiers —
-        # but extends well beyond the original six-keyword list.
-        reserved = [
-            "SELECT", "FROM", "WHERE", "ORDER", "GROUP", "LIMIT",
-            "AND", "OR", "NOT", "IN", "LIKE", "BY", "ASC", "DESC",
-            "HAVING", "OFFSET", "DISTINCT", "WITH", "TYPEOF",
+    def _check_fields(self, ast: dict[str, Any]) -> list[dict[str, Any]]:
+        """Report fields the describe snapshot says do not exist."""
+        return [
+            {"severity": "error", "message": f"{problem['message']} ({problem['clause']})"}
+            for problem in self.describe.check_query(ast)
         ]
-        for word in reserved:
-            # Look for patterns like "SELECT SELECT" or "field, SELECT"
-            if re.search(rf"\b{word}\s*,|\,\s*{word}\b", content, re.IGNORECASE):
-                issues.append(
-                    {"severity": "warning", "message": f'Possible misuse of reserved word "{word}"'}
-                )
-
-        return issues
 
     def get_query_complexity(self, content: str) -> dict[str, int]:
-        """Analyze query complexity metrics."""
-        clean = self._remove_comments(content)
-
+        """Analyze query complexity metrics (all zero when the query does not parse)."""
+        ast, _issue = self._parse(content)
+        if ast is None:
+            return dict.fromkeys(
+                ("select_fields", "where_conditions", "subqueries", "joins", "aggregates"), 0
+            )
+        nested = list(iter_queries(ast))[1:]
+        relationships = {
+            path.rsplit(".", 1)[0].lower()
+            for query in iter_queries(ast)
+            for path in [f["path"] for f in query["fields"]] + [r["path"] for r in query["references"]]
+            if "." in path
+        }
         return {
-            "select_fields": len(
-                re.findall(r"\bSELECT\b.*?\bFROM\b", clean, re.IGNORECASE | re.DOTALL)
+            "select_fields": len(ast["fields"]) + len(ast["subqueries"]) + len(ast["typeof"]),
+            "where_conditions": len(list(iter_comparisons(ast["where"]))),
+            "subqueries": len(nested),
+            "joins": len(relationships),
+            "aggregates": sum(
+                1
+                for query in iter_queries(ast)
+                for field in query["fields"]
+                if field["function"] in self.AGGREGATES
             ),
-            "where_conditions": len(re.findall(r"\b(AND|OR)\b", clean, re.IGNORECASE)) + 1
-            if self._has_where_clause(clean)
-            else 0,
-            "subqueries": len(re.findall(r"\(\s*SELECT\b", clean, re.IGNORECASE)),
-            "joins": len(re.findall(r"__r\.|\.Name|\.Id", clean)),
-            "aggregates": len(re.findall(r"\b(COUNT|SUM|AVG|MIN|MAX)\s*\(", clean, re.IGNORECASE)),
         }
 
     def suggest_optimizations(self, content: str) -> list[str]:
         """Suggest query optimizations."""
         suggestions = []
-        clean = self._remove_comments(content)
+        ast, _issue = self._parse(content)
+        if ast is None:
+            return suggestions
 
         # Check for missing indexed field in WHERE
-        if self._has_where_clause(clean) and not self._uses_indexed_fields(clean):
+        if self._has_where_clause(ast) and not self._uses_indexed_fields(ast):
             suggestions.append(
                 "Add an indexed field (Id, Name, CreatedDate) to WHERE for better performance"
             )
 
         # Check for ORDER BY without LIMIT
-        if re.search(r"\bORDER\s+BY\b", clean, re.IGNORECASE):
-            if not self._has_limit(clean):
-                suggestions.append("Consider adding LIMIT when using ORDER BY")
+        if ast["order_by"] and not self._has_limit(ast):
+            suggestions.append("Consider adding LIMIT when using ORDER BY")
 
         # Check for SELECT with many fields
-        select_match = re.search(r"\bSELECT\b(.*?)\bFROM\b", clean, re.IGNORECASE | re.DOTALL)
-        if select_match:
-            fields = select_match.group(1)
-            field_count = len([f.strip() for f in fields.split(",") if f.strip()])
-            if field_count > 20:
-                suggestions.append(
-                    f"Query selects {field_count} fields - consider selecting only needed fields"
-                )
+        field_count = len(ast["fields"]) + len(ast["subqueries"]) + len(ast["typeof"])
+        if field_count > 20:
+            suggestions.append(
+                f"Query selects {field_count} fields - consider selecting only needed fields"
+            )
 
         # Check for deeply nested subqueries
-        subquery_depth = len(re.findall(r"\(\s*SELECT\b", clean, re.IGNORECASE))
-        if subquery_depth > 2:
+        if len(list(iter_queries(ast))) - 1 > 2:
             suggestions.append(
                 "Consider simplifying query - deeply nested subqueries may impact performance"
             )
@@ -327,22 +372,26 @@ class SOQLValidator:
 
 # Standalone execution for testing
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) < 2:
-        print("Usage: python soql_validator.py <soql_file>")
+        print("Usage: python soql_validator.py <soql_file> [describe.json] [org-stats.json]")
         sys.exit(1)
 
     with open(sys.argv[1]) as f:
         content = f.read()
 
-    validator = SOQLValidator(content)
+    validator = SOQLValidator(
+        content,
+        sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] != "-" else None,
+        sys.argv[3] if len(sys.argv) > 3 else None,
+    )
     result = validator.validate()
 
     print("SOQL Validation Results:")
     print("=" * 40)
     for key, value in result.items():
-        if key not in ["issues", "recommendations"]:
+        if key == "query_plan":
+            print(f"query_plan: {value['plan']} (index: {', '.join(value['index']) or 'none'})")
+        elif key not in ["issues", "recommendations"]:
             print(f"{key}: {value}")
 
     if result["issues"]:
@@ -13,10 +13,58 @@ Validates data operation files against the 130-point scoring system:
 - Documentation (10 points)
 """
 
+import os
 import re
+import sys
 from pathlib import Path
 from typing import Any
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from csv_validator import CSVValidator, format_issue  # noqa: E402
+from pii_scanner import get_scanner  # noqa: E402
+from sobject_tree import TreeValidator  # noqa: E402
+from sobject_tree import format_issue as format_tree_issue  # noqa: E402
+
+# Messages for the PII types the scanner reports in Apex / JSON content
+PII_MESSAGES = {
+    "SSN": "SSN pattern detected",
+    "Credit card": "Credit card pattern detected",
+    "Personal email": "Personal email domain in test data",
+}
+
+# csv_validator issue code → Data Integrity points deducted per issue
+CSV_ISSUE_POINTS = {
+    "malformed": 10,
+    "encoding": 10,
+    "required_missing": 5,
+    "required": 5,
+    "id": 3,
+    "unknown_column": 3,
+    "duplicate_column": 3,
+    "column_count": 2,
+    "date": 2,
+    "datetime": 2,
+    "number": 2,
+    "integer": 2,
+    "boolean": 2,
+}
+
+# sobject_tree issue code → Data Integrity points deducted per issue
+TREE_ISSUE_POINTS = {
+    "invalid_json": 20,
+    "missing_records": 10,
+    "tree_too_large": 10,
+    "missing_attributes": 5,
+    "not_a_record": 5,
+    "duplicate_reference_id": 5,
+    "unresolved_reference": 5,
+    "too_deep": 5,
+    "invalid_children": 5,
+    "missing_type": 3,
+    "missing_reference_id": 2,
+}
+
 
 class DataOperationValidator:
     """Validates data operation files."""
@@ -32,8 +80,11 @@ class DataOperationValidator:
         "documentation": {"name": "Documentation", "max": 10, "score": 10, "issues": []},
     }
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, describe=None, sobject: str | None = None):
         self.file_path = Path(file_path)
+        # Object describe (path or DescribeCache) and object for CSV field checks
+        self.describe = describe
+        self.sobject = sobject
         self.content = ""
         self.file_type = ""
         self.issues: list[dict[str, Any]] = []
@@ -51,15 +102,17 @@ class DataOperationValidator:
         if not self.file_path.exists():
             return None
 
-        try:
-            with open(self.file_path, encoding="utf-8") as f:
-                self.content = f.read()
-        except Exception:
-            return None
-
         # Determine file type
         self.file_type = self.file_path.suffix.lower()
 
+        # CSV and JSON tree files are streamed (csv_validator, sobject_tree), never read whole
+        if self.file_type not in (".csv", ".json"):
+            try:
+                with open(self.file_path, encoding="utf-8") as f:
+                    self.content = f.read()
+            except Exception:
+                return None
+
         # Run type-specific validation
         if self.file_type == ".apex":
             self._validate_apex()
@@ -149,54 +202,50 @@ class DataOperationValidator:
             self._deduct("documentation", 5, "Missing SOQL documentation/comments")
 
     def _validate_csv(self):
-        """Validate CSV import file."""
-        lines = self.content.strip().split("\n")
+        """Validate CSV import file in one streaming pass (see csv_validator.py)."""
+        try:
+            result = CSVValidator(str(self.file_path), self.describe, self.sobject).validate()
+        except OSError as e:
+            self._deduct("data_integrity", 10, f"Cannot read CSV file: {e}")
+            return
 
-        if len(lines) < 2:
+        if result["rows"] == 0:
             self._deduct("data_integrity", 10, "CSV file has no data rows")
-            return
 
         # Check for header row
-        header = lines[0]
-        if not header or "," not in header:
+        if len(result["columns"]) < 2:
             self._deduct("data_integrity", 5, "CSV missing proper header row")
 
-        # Check for consistent column count
-        expected_cols = len(header.split(","))
-        for i, line in enumerate(lines[1:], 2):
-            if line.strip() and len(line.split(",")) != expected_cols:
-                self._deduct("data_integrity", 2, f"Inconsistent column count on line {i}")
-                break
+        # Column counts, required fields, Id and value formats
+        for issue in result["issues"]:
+            self._deduct("data_integrity", CSV_ISSUE_POINTS.get(issue["code"], 2), format_issue(issue))
 
         # Check for potential PII patterns
-        self._check_csv_security(self.content)
+        for pii_type, finding in result["pii"].items():
+            self._deduct(
+                "security_fls",
+                10,
+                f"{pii_type} pattern in {finding['count']} value(s), first on {finding['samples'][0]}",
+            )
 
     def _validate_json(self):
-        """Validate JSON tree import file."""
-        import json as json_lib
-
+        """Validate JSON tree import file in one streaming pass (see sobject_tree.py)."""
         try:
-            data = json_lib.loads(self.content)
-        except json_lib.JSONDecodeError as e:
-            self._deduct("data_integrity", 20, f"Invalid JSON: {str(e)}")
-            return
-
-        # Check for proper sObject tree format
-        if "records" not in data:
-            self._deduct("data_integrity", 10, 'Missing "records" array')
+            result = TreeValidator(str(self.file_path)).validate()
+        except OSError as e:
+            self._deduct("data_integrity", 20, f"Cannot read JSON file: {e}")
             return
 
-        records = data.get("records", [])
+        # Structure, attributes, referenceIds and the 200-record tree limit
+        for issue in result["issues"]:
+            message = issue["message"] if issue["code"] == "invalid_json" else format_tree_issue(issue)
+            self._deduct("data_integrity", TREE_ISSUE_POINTS.get(issue["code"], 2), message)
 
-        for i, record in enumerate(records):
-            if "attributes" not in record:
-                self._deduct("data_integrity", 5, f'Record {i + 1} missing "attributes"')
-            else:
-                attrs = record["attributes"]
-                if "type" not in attrs:
-                    self._deduct("data_integrity", 3, f"Record {i + 1} missing object type")
-                if "referenceId" not in attrs:
-                    self._deduct("data_integrity", 2, f"Record {i + 1} missing referenceId")
+        if len(result["batches"]) > 1:
+            self.recommendations.append(
+                f"{result['records']} records need {len(result['batches'])} tree requests of "
+                f"<= 200 records — split with: python sobject_tree.py {self.file_path.name} --split <dir>"
+            )
 
     def _check_query_efficiency(self, content: str):
         """Check for query efficiency issues."""
@@ -245,18 +294,8 @@ class DataOperationValidator:
     def _check_security(self, content: str):
         """Check for security issues."""
         # Check for PII patterns
-        pii_patterns = [
-            (r"\b\d{3}-\d{2}-\d{4}\b", "SSN pattern detected"),
-            (r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b", "Credit card pattern detected"),
-            (
-                r"\b[A-Za-z0-9._%+-]+@(gmail|yahoo|hotmail|outlook)\.(com|net|org)\b",
-                "Personal email domain in test data",
-            ),
-        ]
-
-        for pattern, message in pii_patterns:
-            if re.search(pattern, content):
-                self._deduct("security_fls", 10, message)
+        for pii_type in get_scanner().scan_text(content):
+            self._deduct("security_fls", 10, PII_MESSAGES.get(pii_type, f"{pii_type} pattern detected"))
 
         # Check for WITH USER_MODE usage (good practice)
         if "WITH USER_MODE" in content.upper():
@@ -318,20 +357,6 @@ class DataOperationValidator:
         else:
             self._deduct("documentation", 2, "Consider adding method/section documentation")
 
-    def _check_csv_security(self, content: str):
-        """Check CSV content for security issues."""
-        # Check for PII patterns in CSV
-        lines = content.split("\n")
-        for i, line in enumerate(lines, 1):
-            # SSN pattern
-            if re.search(r"\b\d{3}-\d{2}-\d{4}\b", line):
-                self._deduct("security_fls", 10, f"SSN pattern on line {i}")
-                break
-            # Credit card pattern
-            if re.search(r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b", line):
-                self._deduct("security_fls", 10, f"Credit card pattern on line {i}")
-                break
-
     def _deduct(self, category: str, points: int, message: str):
         """Deduct points from a category and record the issue."""
         if category in self.categories:
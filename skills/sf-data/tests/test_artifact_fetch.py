@@ -0,0 +1,195 @@
+"""Tests for artifact_fetch.py — resumable artifact retrieval to NDJSON."""
+
+import io
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-data/scripts/artifact_fetch.py")
+
+RECORDS = [{"attributes": {"type": "Account"}, "Id": f"001{i:015d}", "Name": f"Acme ☃ {i}"} for i in range(25)]
+PAGE_SIZE = 10
+
+
+class StandIn:
+    """A local stand-in for the artifact store: a signed download URL and fetch_more."""
+
+    def __init__(self):
+        self.records = RECORDS
+        self.download_status = 200
+        self.truncate_at = None  # bytes of the body sent before the connection drops
+        self.cursors: list[str] = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if stand_in.download_status != 200:
+                    self.send_error(stand_in.download_status)
+                    return
+                body = json.dumps({"totalSize": len(stand_in.records), "records": stand_in.records}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body[:stand_in.truncate_at])
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stand_in.cursors.append(request["cursor"])
+                start = int(request["cursor"].removeprefix("c"))
+                page = {"records": stand_in.records[start:start + PAGE_SIZE]}
+                if start + PAGE_SIZE < len(stand_in.records):
+                    page["_pagination"] = {"nextCursor": f"c{start + PAGE_SIZE}"}
+                body = json.dumps(page).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def response(self, download: bool = True) -> dict:
+        access = {"artifactId": "art_1", "artifactSize": "4 KB", "downloadExpiry": "1 hour"}
+        if download:
+            access["downloadUrl"] = f"{self.url}/artifact/art_1?sig=x"
+        return {"records": RECORDS[:3], "artifactAccess": access, "_pagination": {"nextCursor": "c0"}}
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def _lines(path) -> list:
+    return list(mod.iter_ndjson(path))
+
+
+class TestResponses:
+    def test_artifact_info(self):
+        response = {"artifactAccess": {"artifactId": "a", "downloadExpiry": "30 minutes"},
+                    "_pagination": {"nextCursor": "c"}}
+        info = mod.artifact_info(response)
+        assert (info["downloadUrl"], info["expiry"], info["cursor"]) == (None, 1800, "c")
+        assert mod.artifact_info({"records": [], "instructions": "retry later"}) is None
+
+    def test_inline_response_is_rejected(self, tmp_path):
+        with pytest.raises(mod.ArtifactError, match="inline"):
+            mod.ArtifactFetcher({"records": []}, tmp_path / "out.ndjson")
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_iter_items_streams_records(self, chunk_size):
+        text = json.dumps({"totalSize": 2, "records": RECORDS[:2], "done": True})
+        assert list(mod.iter_items(io.StringIO(text), chunk_size)) == RECORDS[:2]
+        # A document without "records" is one item, minus pagination metadata
+        text = json.dumps({"fields": [1, 2], "_pagination": {"nextCursor": None}})
+        assert list(mod.iter_items(io.StringIO(text), chunk_size)) == [{"fields": [1, 2]}]
+
+
+class TestDownload:
+    def test_download_streams_to_ndjson(self, stand_in, tmp_path):
+        out = tmp_path / "accounts.ndjson"
+        stats = mod.ArtifactFetcher(stand_in.response(), out, chunk_size=64).fetch()
+        assert (stats["source"], stats["records"], stats["complete"]) == ("download", 25, True)
+        assert _lines(out) == RECORDS
+        assert json.loads((tmp_path / "accounts.ndjson.checkpoint.json").read_text())["complete"]
+
+    def test_interrupted_download_resumes_without_duplicates(self, stand_in, tmp_path):
+        out = tmp_path / "accounts.ndjson"
+        stand_in.truncate_at = 1500
+        with pytest.raises(mod.ArtifactError, match="interrupted"):
+            mod.ArtifactFetcher(stand_in.response(), out, commit_every=5).fetch()
+        partial = len(_lines(out))
+        assert 0 < partial < 25
+        stand_in.truncate_at = None
+        stats = mod.ArtifactFetcher(stand_in.response(), out).fetch()
+        assert stats["resumed"]
+        assert _lines(out) == RECORDS
+
+    def test_expired_url_falls_back_to_fetch_more(self, stand_in, tmp_path):
+        stand_in.download_status = 410
+        out = tmp_path / "accounts.ndjson"
+        transport = mod.http_transport(f"{stand_in.url}/fetch_more")
+        stats = mod.ArtifactFetcher(stand_in.response(), out, transport).fetch()
+        assert (stats["source"], stats["pages"]) == ("fetch_more", 3)
+        assert _lines(out) == RECORDS
+
+    def test_expired_url_without_transport(self, stand_in, tmp_path):
+        stand_in.download_status = 403
+        with pytest.raises(mod.ArtifactExpiredError, match="re-run the original query"):
+            mod.ArtifactFetcher(stand_in.response(), tmp_path / "out.ndjson").fetch()
+
+
+class TestFetchMore:
+    def test_pages_over_http(self, stand_in, tmp_path):
+        out = tmp_path / "accounts.ndjson"
+        transport = mod.http_transport(f"{stand_in.url}/fetch_more")
+        stats = mod.ArtifactFetcher(stand_in.response(download=False), out, transport).fetch()
+        assert stand_in.cursors == ["c0", "c10", "c20"]
+        assert (stats["records"], stats["pages"]) == (25, 3)
+        assert _lines(out) == RECORDS
+
+    def test_resume_from_checkpointed_cursor(self, tmp_path):
+        calls = []
+
+        def flaky(artifact_id, cursor):
+            calls.append(cursor)
+            if cursor == "c20" and calls.count("c20") == 1:
+                raise mod.ArtifactError("connection reset")
+            start = int(cursor[1:])
+            page = {"records": RECORDS[start:start + PAGE_SIZE]}
+            if start + PAGE_SIZE < len(RECORDS):
+                page["_pagination"] = {"nextCursor": f"c{start + PAGE_SIZE}"}
+            return page
+
+        out = tmp_path / "accounts.ndjson"
+        response = {"artifactAccess": {"artifactId": "art_1"}, "_pagination": {"nextCursor": "c0"}}
+        with pytest.raises(mod.ArtifactError):
+            mod.ArtifactFetcher(response, out, flaky).fetch()
+        # A page half-written when the process died is cut off on resume
+        with open(out, "ab") as f:
+            f.write(b'{"Id": "partial"')
+        stats = mod.ArtifactFetcher(response, out, flaky).fetch()
+        assert calls == ["c0", "c10", "c20", "c20"]
+        assert (stats["resumed"], stats["records"]) == (True, 25)
+        assert _lines(out) == RECORDS
+        # A completed artifact is not fetched again
+        assert mod.ArtifactFetcher(response, out, flaky).fetch()["records"] == 25
+        assert len(calls) == 4
+
+    def test_error_page_and_repeated_cursor(self, tmp_path):
+        response = {"artifactAccess": {"artifactId": "art_1"}, "_pagination": {"nextCursor": "c0"}}
+        expired = mod.ArtifactFetcher(response, tmp_path / "a.ndjson", lambda a, c: {"error": "Artifact expired"})
+        with pytest.raises(mod.ArtifactExpiredError, match="re-run"):
+            expired.fetch()
+        stuck = lambda a, c: {"records": [], "_pagination": {"nextCursor": "c0"}}  # noqa: E731
+        with pytest.raises(mod.ArtifactError, match="same cursor"):
+            mod.ArtifactFetcher(response, tmp_path / "b.ndjson", stuck).fetch()
+
+    def test_command_transport(self, tmp_path):
+        script = tmp_path / "fetch_more.py"
+        script.write_text(
+            "import json, sys\n"
+            "start = int(sys.argv[2][1:])\n"
+            f"records = {RECORDS!r}\n"
+            "page = {'records': records[start:start + 10]}\n"
+            "if start + 10 < len(records): page['_pagination'] = {'nextCursor': f'c{start + 10}'}\n"
+            "print(json.dumps(page))\n",
+            encoding="utf-8",
+        )
+        transport = mod.command_transport(f'"{sys.executable}" "{script}" {{artifactId}} {{cursor}}')
+        response = {"artifactAccess": {"artifactId": "art_1"}, "_pagination": {"nextCursor": "c0"}}
+        out = tmp_path / "accounts.ndjson"
+        assert mod.ArtifactFetcher(response, out, transport).fetch()["pages"] == 3
+        assert _lines(out) == RECORDS
@@ -0,0 +1,143 @@
+"""Tests for csv_validator.py — single-pass streaming CSV validation."""
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-data/scripts/csv_validator.py")
+describe_mod = load_script("skills/sf-data/scripts/describe_cache.py")
+ops = load_script("skills/sf-data/scripts/validate_data_operation.py")
+
+DESCRIBE = {
+    "Account": {
+        "fields": [
+            {"name": "Id", "type": "id", "nillable": False, "createable": False},
+            {"name": "Name", "type": "string", "nillable": False, "createable": True},
+            {"name": "OwnerId", "type": "reference", "nillable": False, "defaultedOnCreate": True},
+            {"name": "Parent_Account__c", "type": "reference", "nillable": True},
+            {"name": "Founded__c", "type": "date", "nillable": True},
+            {"name": "Revenue__c", "type": "currency", "nillable": True},
+            {"name": "Employees__c", "type": "int", "nillable": True},
+            {"name": "Active__c", "type": "boolean", "nillable": False},
+            {"name": "Description", "type": "textarea", "nillable": True},
+        ]
+    }
+}
+
+
+def _validate(tmp_path, text: str, name: str = "account-import.csv", **kwargs) -> dict:
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return mod.CSVValidator(str(path), **kwargs).validate()
+
+
+def _issues(result: dict) -> dict:
+    return {(i["code"], i["column"]): i for i in result["issues"]}
+
+
+@pytest.fixture
+def describe():
+    return describe_mod.DescribeCache(DESCRIBE)
+
+
+class TestIds:
+    @pytest.mark.parametrize(
+        ("value", "valid"),
+        [
+            ("001000000000001", True),
+            ("001000000000001AAA", True),
+            ("001Dn00000Abcde", True),
+            ("001Dn00000AbcdeBAA", False),
+            ("001Dn00000AbcdeIAB", True),
+            ("001-not-an-id", False),
+        ],
+    )
+    def test_id_suffix_checksum(self, value, valid):
+        assert mod.id_valid(value) is valid
+
+
+class TestParsing:
+    def test_quoted_commas_and_newlines_are_one_value(self, tmp_path):
+        text = 'Name,Description\n"Acme, Inc.","line one\nline two"\nGlobex,plain\n'
+        result = _validate(tmp_path, text)
+        assert result["rows"] == 2
+        assert result["issues"] == []
+
+    def test_all_inconsistent_rows_are_counted(self, tmp_path):
+        text = "Name,Industry\na,b\nc\nd,e,f\ng,h\n"
+        (issue,) = _validate(tmp_path, text)["issues"]
+        assert issue["code"] == "column_count"
+        assert (issue["count"], issue["lines"]) == (2, [3, 4])
+
+    def test_line_numbers_follow_multiline_rows(self, tmp_path):
+        text = 'Name,Id\n"two\nlines",001000000000001\nbad,not-an-id\n'
+        issue = _issues(_validate(tmp_path, text))[("id", "Id")]
+        assert issue["lines"] == [4]
+
+    def test_bom_and_blank_lines(self, tmp_path):
+        result = _validate(tmp_path, "\ufeffName,Id\n\nAcme,001000000000001\n\n")
+        assert result["columns"] == ["Name", "Id"]
+        assert result["rows"] == 1
+
+    def test_line_samples_are_capped(self, tmp_path):
+        text = "Name,Id\n" + "".join(f"a{i},bad\n" for i in range(30))
+        issue = _issues(_validate(tmp_path, text))[("id", "Id")]
+        assert issue["count"] == 30
+        assert len(issue["lines"]) == mod.LINE_SAMPLES
+        assert mod.format_issue(issue).endswith("...")
+
+
+class TestDescribeChecks:
+    def test_formats_from_describe(self, tmp_path, describe):
+        text = (
+            "Name,Active__c,Founded__c,Revenue__c,Employees__c,Parent_Account__c\n"
+            "Acme,true,2020-02-30,1e3,12,001000000000001\n"
+            "Globex,maybe,2020-01-15,1.2.3,12.5,xyz\n"
+        )
+        issues = _issues(_validate(tmp_path, text, describe=describe))
+        assert issues[("date", "Founded__c")]["lines"] == [2]
+        assert issues[("boolean", "Active__c")]["lines"] == [3]
+        assert issues[("number", "Revenue__c")]["lines"] == [3]
+        assert issues[("integer", "Employees__c")]["lines"] == [3]
+        assert issues[("id", "Parent_Account__c")]["lines"] == [3]
+
+    def test_object_inferred_from_file_name(self, tmp_path, describe):
+        result = _validate(tmp_path, "Name,Bogus__c\nA,1\n", describe=describe)
+        assert result["sobject"] == "Account"
+        assert ("unknown_column", "Bogus__c") in _issues(result)
+
+    def test_required_fields_on_insert(self, tmp_path, describe):
+        issues = _issues(_validate(tmp_path, "Name,Active__c\nAcme,true\n,false\n", describe=describe))
+        assert issues[("required", "Name")]["lines"] == [3]
+        # OwnerId is defaulted on create, Active__c is a boolean — neither is required
+        assert not any(code == "required_missing" for code, _ in issues)
+
+    def test_update_files_skip_required_checks(self, tmp_path, describe):
+        result = _validate(tmp_path, "Id,Description\n001000000000001,x\n", describe=describe)
+        assert result["issues"] == []
+
+    def test_explicit_required_column_missing(self, tmp_path):
+        issues = _issues(_validate(tmp_path, "Name\nA\n", required=["External_Id__c"]))
+        assert ("required_missing", "External_Id__c") in issues
+
+
+class TestPiiAndErrors:
+    def test_pii_is_reported_per_column(self, tmp_path):
+        result = _validate(tmp_path, "Name,Notes\nA,ssn 123-45-6789\nB,ok\n")
+        assert result["pii"]["SSN"]["samples"] == ["line 2, column 'Notes'"]
+
+    def test_encoding_error_is_an_issue(self, tmp_path):
+        path = tmp_path / "latin.csv"
+        path.write_bytes(b"Name\nCaf\xe9\n")
+        result = mod.CSVValidator(str(path)).validate()
+        assert result["issues"][0]["code"] == "encoding"
+
+
+class TestDataOperationScoring:
+    def test_csv_issues_are_deducted_with_counts(self, tmp_path, describe):
+        path = tmp_path / "account-import.csv"
+        path.write_text("Name,Founded__c\nA,2020-13-01\nB,2020-14-01\n", encoding="utf-8")
+        result = ops.DataOperationValidator(str(path), describe=describe).validate()
+        messages = [i["message"] for i in result["issues"]]
+        assert "'Founded__c' is not a date (YYYY-MM-DD) — 2 row(s), line(s) 2, 3" in messages
+        di = result["categories"]["Data Integrity"]
+        assert di["score"] == di["max"] - 2
@@ -130,6 +130,16 @@ class TestSoqlQueryWhereWarnings:
         syntax_warns = [m for m in _warning_messages(r) if "==" in m or "parenthes" in m.lower()]
         assert len(syntax_warns) == 0
 
+    def test_literal_contents_not_flagged(self):
+        """TC-MW5: Operators and parentheses inside string literals are not mistakes."""
+        r = _validate(_soql_query("Account", whereClause="Name = 'a == b (' AND Type != null"))
+        assert not any("whereClause" in m for m in _warning_messages(r))
+
+    def test_malformed_where_warned(self):
+        """TC-MW6: A whereClause that does not parse is reported with its position."""
+        r = _validate(_soql_query("Account", whereClause="Name = 'Test' AND"))
+        assert any("does not parse" in m and "position 17" in m for m in _warning_messages(r))
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 4. sobject_dml — VALID OPERATIONS PASS
@@ -0,0 +1,69 @@
+"""Tests for describe_cache.py — field existence against a describe snapshot."""
+
+import json
+
+from conftest import load_script
+
+mod = load_script("skills/sf-data/scripts/describe_cache.py")
+parser = load_script("skills/sf-data/scripts/soql_parser.py")
+DescribeCache = mod.DescribeCache
+
+SNAPSHOT = {
+    "sobjects": {
+        "Account": {
+            "name": "Account",
+            "fields": [
+                {"name": "Id"},
+                {"name": "Name"},
+                {"name": "OwnerId", "relationshipName": "Owner", "referenceTo": ["User"]},
+            ],
+            "childRelationships": [{"relationshipName": "Contacts", "childSObject": "Contact"}],
+        },
+        "Contact": {
+            "fields": [
+                {"name": "Email"},
+                {"name": "AccountId", "relationshipName": "Account", "referenceTo": ["Account"]},
+            ]
+        },
+        "User": ["Id", "Name"],
+    }
+}
+
+
+class TestCheckPath:
+    def test_fields_and_relationships(self):
+        cache = DescribeCache(SNAPSHOT)
+        assert cache.check_path("account", "NAME") is None
+        assert cache.check_path("Contact", "Account.Owner.Name") is None
+        assert cache.check_path("Account", "Phone") == 'No field "Phone" on Account'
+        assert cache.check_path("Account", "Parent.Name") == 'No relationship "Parent" on Account'
+
+    def test_unknown_objects_are_not_reported(self):
+        cache = DescribeCache({"Account": ["Id", "Name"]})
+        assert cache.check_path("Lead", "Anything") is None
+        assert cache.check_path("Account", "Owner.Name") is None
+
+
+class TestCheckQuery:
+    def test_subquery_resolves_child_object(self):
+        cache = DescribeCache(SNAPSHOT)
+        ast = parser.parse_soql(
+            "SELECT Name, (SELECT Emial FROM Contacts), (SELECT Id FROM Cases) FROM Account"
+        )
+        messages = [p["message"] for p in cache.check_query(ast)]
+        assert messages == [
+            'No field "Emial" on Contact',
+            'No child relationship "Cases" on Account',
+        ]
+
+
+class TestLoad:
+    def test_load_is_memoized_until_file_changes(self, tmp_path):
+        path = tmp_path / "describe.json"
+        path.write_text(json.dumps({"Account": ["Id"]}))
+        first = DescribeCache.load(str(path))
+        assert DescribeCache.load(str(path)) is first
+        path.write_text(json.dumps({"Account": ["Id", "Name", "Phone"]}))
+        reloaded = DescribeCache.load(str(path))
+        assert reloaded is not first
+        assert reloaded.has_field("Account", "Phone")
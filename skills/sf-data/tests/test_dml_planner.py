@@ -0,0 +1,167 @@
+"""Tests for dml_planner.py — batch plans for sobject_dml payloads over 200 records."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import load_script
+
+mod = load_script("skills/sf-data/scripts/dml_planner.py")
+mcp = load_script("skills/sf-data/scripts/mcp_validator.py")
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "dml_planner.py"
+
+
+def _contacts(n: int, **extra) -> list[dict]:
+    return [{"LastName": f"Contact {i}", **extra} for i in range(n)]
+
+
+class TestBatchSizing:
+    def test_fifty_thousand_records_take_250_calls(self):
+        plan = mod.plan_dml(_contacts(50_000), operation="insert", sobject="Contact")
+        assert plan["round_trips"] == plan["minimum_round_trips"] == 250
+        assert {b["size"] for b in plan["batches"]} == {200}
+        assert plan["batches"][0]["params"]["sObject"] == "Contact"
+        assert plan["batches"][0]["params"]["operation"] == "insert"
+
+    def test_rows_per_record_shrinks_batches_under_dml_row_limit(self):
+        assert mod.batch_limit(rows_per_record=100) == 100
+        assert mod.batch_limit(batch_size=500) == 200
+        plan = mod.plan_dml(_contacts(250), sobject="Contact", rows_per_record=100)
+        assert [b["size"] for b in plan["batches"]] == [100, 100, 50]
+
+    def test_record_ids_are_deduplicated_and_chunked(self):
+        ids = [f"001{i:012d}" for i in range(300)] + ["001000000000000"]
+        plan = mod.plan_dml(record_ids=ids, operation="delete", sobject="Account")
+        assert plan["duplicates_merged"] == 1
+        assert [len(b["params"]["recordIds"]) for b in plan["batches"]] == [200, 100]
+
+    def test_record_ids_dedupe_15_and_18_character_forms(self):
+        ids = ["001000000000001AAA", "001000000000001", "001000000000002", "001000000000002AAC"]
+        plan = mod.plan_dml(record_ids=ids, operation="delete", sobject="Account")
+        assert plan["duplicates_merged"] == 2
+        assert plan["batches"][0]["params"]["recordIds"] == ["001000000000001AAA", "001000000000002"]
+
+
+class TestFieldSets:
+    def test_records_are_grouped_by_identical_field_set(self):
+        records = _contacts(150) + _contacts(150, Email="a@example.com") + _contacts(100)
+        plan = mod.plan_dml(records, sobject="Contact")
+        assert [(b["fields"], b["size"]) for b in plan["batches"]] == [
+            (["LastName"], 200),
+            (["LastName"], 50),
+            (["Email", "LastName"], 150),
+        ]
+        assert plan["round_trips"] == 3 > plan["minimum_round_trips"] == 2
+        assert any("field sets" in w for w in plan["warnings"])
+
+    def test_attributes_split_objects_and_are_stripped(self):
+        records = [
+            {"attributes": {"type": "Account"}, "Name": "A"},
+            {"attributes": {"type": "Contact"}, "LastName": "B"},
+        ]
+        plan = mod.plan_dml(records)
+        assert [b["sObject"] for b in plan["batches"]] == ["Account", "Contact"]
+        assert plan["batches"][0]["params"]["records"] == [{"Name": "A"}]
+
+
+class TestDeduplication:
+    def test_update_merges_duplicate_ids_later_values_win(self):
+        records = [
+            {"Id": "001000000000001AAA", "Name": "Old"},
+            {"Id": "001000000000001", "Phone": "555"},
+            {"Id": "001000000000001AAA", "Name": "New"},
+        ]
+        plan = mod.plan_dml(records, operation="update", sobject="Account")
+        assert plan["duplicates_merged"] == 2
+        (batch,) = plan["batches"]
+        assert batch["params"]["records"] == [
+            {"Id": "001000000000001AAA", "Name": "New", "Phone": "555"}
+        ]
+
+    def test_upsert_dedupes_by_external_id(self):
+        records = [{"Ext__c": "A", "Name": "x"}, {"Ext__c": "A", "Name": "y"}, {"Ext__c": "B", "Name": "z"}]
+        plan = mod.plan_dml(records, operation="upsert", sobject="Account", external_id_field="Ext__c")
+        assert plan["record_count"] == 2
+        assert plan["batches"][0]["params"]["externalIdField"] == "Ext__c"
+
+    def test_insert_is_not_deduplicated(self):
+        plan = mod.plan_dml(_contacts(1) * 3, sobject="Contact")
+        assert plan["record_count"] == 3
+
+
+class TestParentChildOrder:
+    def test_parents_are_written_before_children(self):
+        records = [
+            {"Ext__c": "C1", "Name": "Child", "Parent__r": {"Ext__c": "P1"}},
+            {"Ext__c": "G1", "Name": "Grandchild", "Parent__r": {"Ext__c": "C1"}},
+            {"Ext__c": "P1", "Name": "Parent"},
+        ]
+        plan = mod.plan_dml(records, operation="upsert", sobject="Account", external_id_field="Ext__c")
+        names = [b["params"]["records"][0]["Name"] for b in plan["batches"]]
+        assert names == ["Parent", "Child", "Grandchild"]
+        assert [b["level"] for b in plan["batches"]] == [0, 1, 2]
+
+    def test_cross_object_reference(self):
+        records = [
+            {"attributes": {"type": "Contact"}, "LastName": "X", "Account": {"Legacy__c": "A1"}},
+            {"attributes": {"type": "Account"}, "Name": "Acme", "Legacy__c": "A1"},
+        ]
+        plan = mod.plan_dml(records, operation="upsert")
+        assert [b["sObject"] for b in plan["batches"]] == ["Account", "Contact"]
+
+    def test_cycle_is_reported_and_written_last(self):
+        records = [
+            {"Ext__c": "A", "Peer__r": {"Ext__c": "B"}},
+            {"Ext__c": "B", "Peer__r": {"Ext__c": "A"}},
+            {"Ext__c": "C"},
+        ]
+        plan = mod.plan_dml(records, operation="upsert", sobject="Account", external_id_field="Ext__c")
+        assert plan["batches"][0]["params"]["records"] == [{"Ext__c": "C"}]
+        assert any("cycle" in w for w in plan["warnings"])
+
+
+class TestErrorsAndInput:
+    def test_non_dict_and_untyped_records_are_errors(self):
+        plan = mod.plan_dml(["nope", {"Name": "x"}])
+        assert plan["errors"] == [
+            "Record 0 is not an object",
+            "Record 1 has no sObject (pass sobject or attributes.type)",
+        ]
+
+    def test_delete_records_become_record_ids(self):
+        plan = mod.plan_dml([{"Id": "001000000000001"}, {"Name": "x"}], operation="delete", sobject="Account")
+        assert plan["batches"][0]["params"]["recordIds"] == ["001000000000001"]
+        assert plan["errors"] == ["Record 1 has no Id to delete"]
+
+    def test_iter_records_reads_ndjson_and_json(self, tmp_path):
+        ndjson = tmp_path / "r.ndjson"
+        ndjson.write_text('{"Name": "a"}\n\n{"Name": "b"}\n')
+        wrapped = tmp_path / "r.json"
+        wrapped.write_text(json.dumps({"records": [{"Name": "c"}]}, indent=2))
+        array = tmp_path / "a.json"
+        array.write_text(json.dumps([{"Name": "d"}]))
+        assert [r["Name"] for r in mod.iter_records(str(ndjson))] == ["a", "b"]
+        assert [r["Name"] for r in mod.iter_records(str(wrapped))] == ["c"]
+        assert [r["Name"] for r in mod.iter_records(str(array))] == ["d"]
+
+    def test_cli_summary(self, tmp_path):
+        path = tmp_path / "r.ndjson"
+        path.write_text("\n".join(json.dumps(r) for r in _contacts(450)))
+        proc = subprocess.run(
+            [sys.executable, str(SCRIPT), str(path), "--sobject", "Contact", "--summary"],
+            capture_output=True, text=True, check=True,
+        )
+        assert proc.stdout.startswith("450 records in 3 call(s) of up to 200")
+
+
+class TestValidatorMessage:
+    def test_too_many_records_reports_planned_calls(self):
+        result = mcp.validate_data_params({
+            "tool": "sobject_dml",
+            "params": {"sObject": "Contact", "operation": "insert", "records": _contacts(450)},
+        })
+        (error,) = result["errors"]
+        assert error["message"].startswith("Too many records (450)")
+        assert "450 records in 3 call(s)" in error["message"]
@@ -0,0 +1,130 @@
+"""Tests for pii_scanner.py — column-wise PII detection for payloads and data files."""
+
+import io
+import json
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-data/scripts/pii_scanner.py")
+mcp = load_script("skills/sf-data/scripts/mcp_validator.py")
+
+
+@pytest.fixture
+def scanner():
+    return mod.PIIScanner()
+
+
+class TestLuhn:
+    @pytest.mark.parametrize("number", ["4111 1111 1111 1111", "5500-0000-0000-0004", "4012888888881881"])
+    def test_valid_cards(self, number):
+        assert mod.luhn_valid(number)
+
+    def test_invalid_card_is_not_reported(self, scanner):
+        assert mod.luhn_valid("1234-5678-9012-3456") is False
+        assert scanner.scan_text("Order 1234-5678-9012-3456") == []
+        assert scanner.scan_text("Card 4111-1111-1111-1111") == ["Credit card"]
+
+
+class TestScanRecords:
+    def test_counts_per_type_and_field(self, scanner):
+        records = [
+            {"LastName": "A", "SSN__c": "111-22-3333", "Email": "a@gmail.com"},
+            {"LastName": "B", "SSN__c": "444-55-6666", "Email": "b@acme.com"},
+            {"LastName": "C", "Notes__c": "ssn 777-88-9999, card 4111111111111111"},
+        ]
+        report = scanner.scan_records(records)
+        ssn = report.findings["SSN"]
+        assert ssn["count"] == 3
+        assert ssn["fields"] == {"SSN__c": 2, "Notes__c": 1}
+        assert ssn["samples"][0] == "record 0, field 'SSN__c'"
+        # Every type in a value is reported, not just the first
+        assert report.findings["Credit card"]["samples"] == ["record 2, field 'Notes__c'"]
+        assert report.findings["Personal email"]["count"] == 1
+
+    def test_matches_do_not_span_values(self, scanner):
+        # "123-45" + "-6789" would only look like an SSN if the values were glued together
+        report = scanner.scan_records([{"F": "123-45"}, {"F": "-6789"}])
+        assert not report
+
+    def test_non_string_values_and_records_are_skipped(self, scanner):
+        assert not scanner.scan_records([None, {"N": 123456789}, "111-22-3333"])
+
+    def test_describe_lists_more_and_field_counts(self, scanner):
+        report = scanner.scan_records([{"SSN__c": "111-22-3333"}, {"SSN__c": "444-55-6666"}])
+        assert report.describe("SSN") == "record 0, field 'SSN__c' (and 1 more; SSN__c: 2)"
+
+    def test_samples_are_capped(self, scanner):
+        report = scanner.scan_records([{"SSN__c": f"111-22-{i:04d}"} for i in range(50)])
+        assert report.findings["SSN"]["count"] == 50
+        assert len(report.findings["SSN"]["samples"]) == mod.SAMPLE_LIMIT
+
+
+class TestStreaming:
+    def test_csv_reports_line_and_column_across_chunks(self, scanner):
+        rows = ["Name,SSN,Card"] + [f"n{i},,x" for i in range(9)] + ["John,123-45-6789,4111 1111 1111 1111"]
+        report = scanner.scan_csv(io.StringIO("\n".join(rows)), chunk_rows=4)
+        assert report.findings["SSN"]["samples"] == ["line 11, column 'SSN'"]
+        assert report.findings["Credit card"]["fields"] == {"Card": 1}
+
+    def test_csv_ragged_rows(self, scanner):
+        report = scanner.scan_csv(io.StringIO("A\nx,111-22-3333\ny\n"))
+        assert report.findings["SSN"]["samples"] == ["line 2, column 'column 2'"]
+
+    def test_scan_file_json_lines(self, scanner, tmp_path):
+        path = tmp_path / "tree.json"
+        path.write_text(json.dumps({"records": [{"Email": "x@yahoo.com"}]}, indent=2))
+        report = scanner.scan_file(path)
+        assert report.findings["Personal email"]["samples"] == ["line 4"]
+
+
+class TestExtraPatterns:
+    def test_pattern_file_extends_scanner(self, tmp_path, monkeypatch):
+        path = tmp_path / "pii.json"
+        path.write_text(json.dumps({"patterns": {"Employee ID": r"\bEMP-\d{6}\b"}}))
+        monkeypatch.setenv(mod.PII_PATTERNS_ENV, str(path))
+        scanner = mod.get_scanner()
+        assert scanner.prefilter is None
+        assert scanner.scan_text("owner emp-123456") == ["Employee ID"]
+        assert mod.get_scanner() is scanner
+
+    def test_invalid_pattern_raises(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps({"Bad": "("}))
+        with pytest.raises(mod.PIIPatternError, match="Bad"):
+            mod.get_scanner([path], strict=True)
+
+    def test_unreadable_pattern_file_falls_back_to_built_ins(self, tmp_path, capsys):
+        scanner = mod.get_scanner([tmp_path / "missing.json"])
+        assert "Cannot read PII patterns" in capsys.readouterr().err
+        assert scanner.scan_text("ssn 123-45-6789") == ["SSN"]
+
+
+class TestValidatorWarnings:
+    def test_warning_reports_field_counts(self, monkeypatch):
+        monkeypatch.delenv(mod.PII_PATTERNS_ENV, raising=False)
+        result = mcp.validate_data_params({
+            "tool": "sobject_dml",
+            "params": {
+                "sObject": "Contact",
+                "operation": "insert",
+                "records": [
+                    {"LastName": "A", "SSN__c": "111-22-3333"},
+                    {"LastName": "B", "SSN__c": "444-55-6666"},
+                    {"LastName": "C", "Card__c": "1234-5678-9012-3456"},
+                ],
+            },
+        })
+        messages = [w["message"] for w in result["warnings"]]
+        assert "SSN pattern detected in record 0, field 'SSN__c' (and 1 more; SSN__c: 2)" in messages[-1]
+        assert not any("Credit card" in m for m in messages)
+
+    def test_missing_pattern_file_keeps_other_findings(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(mod.PII_PATTERNS_ENV, str(tmp_path / "missing.json"))
+        records = [{"LastName": f"L{i}", "SSN__c": "111-22-3333"} for i in range(250)]
+        result = mcp.validate_data_params({
+            "tool": "sobject_dml",
+            "params": {"sObject": "Contact", "operation": "insert", "records": records},
+        })
+        assert any("Too many records (250)" in e["message"] for e in result["errors"])
+        assert any("SSN pattern detected" in w["message"] for w in result["warnings"])
@@ -0,0 +1,121 @@
+"""Tests for query_plan.py — selectivity estimates from an org statistics snapshot."""
+
+import json
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-data/scripts/query_plan.py")
+parser = load_script("skills/sf-data/scripts/soql_parser.py")
+validator_mod = load_script("skills/sf-data/scripts/soql_validator.py")
+mcp = load_script("skills/sf-data/scripts/mcp_validator.py")
+
+STATS = {
+    "objects": {
+        "Account": {
+            "recordCount": 2_400_000,
+            "customIndexes": ["Region__c", "Rating"],
+            "uniqueFields": ["Code__c"],
+            "skinnyTables": [["Id", "Name", "Industry"]],
+            "fields": {
+                "Industry": {"distinct": 40},
+                "Region__c": {"distinct": 4},
+                "Rating": {"values": {"Hot": 1000, "Cold": 2_000_000}},
+            },
+        },
+        "Case": {"recordCount": 5000},
+    }
+}
+
+
+def _plan(soql: str) -> dict:
+    return mod.estimate(parser.parse_soql(soql), mod.OrgStats(STATS))
+
+
+class TestThresholds:
+    @pytest.mark.parametrize(
+        ("records", "custom", "expected"),
+        [
+            (100_000, False, 30_000),
+            (2_000_000, False, 450_000),
+            (10_000_000, False, 1_000_000),
+            (100_000, True, 10_000),
+            (2_000_000, True, 150_000),
+            (10_000_000, True, 333_333),
+        ],
+    )
+    def test_standard_and_custom(self, records, custom, expected):
+        assert mod.index_threshold(records, custom) == expected
+
+
+class TestEstimate:
+    def test_unindexed_filter_scans(self):
+        plan = _plan("SELECT Id FROM Account WHERE Industry = 'Tech'")
+        assert plan["plan"] == "table_scan"
+        assert plan["predicates"][0]["reason"] == "field is not indexed"
+
+    def test_custom_index_over_threshold_scans(self):
+        plan = _plan("SELECT Id FROM Account WHERE Region__c = 'EMEA'")
+        assert plan["plan"] == "table_scan"
+        assert plan["predicates"][0]["rows"] == 600_000
+        assert plan["predicates"][0]["threshold"] == 170_000
+
+    def test_unique_and_value_counts_are_selective(self):
+        plan = _plan("SELECT Id FROM Account WHERE Code__c IN ('a', 'b') OR Id = :recordId")
+        assert (plan["plan"], plan["estimated_rows"], plan["index"]) == ("index", 3, ["Code__c", "Id"])
+
+    def test_and_uses_most_selective_operand(self):
+        plan = _plan("SELECT Id FROM Account WHERE Region__c = 'EMEA' AND Id = :recordId")
+        assert (plan["plan"], plan["index"]) == ("index", ["Id"])
+
+    def test_or_with_unindexed_operand_scans(self):
+        plan = _plan("SELECT Id FROM Account WHERE Id = :recordId OR Industry = 'Tech'")
+        assert plan["plan"] == "table_scan"
+
+    def test_indexed_without_statistics_is_unknown(self):
+        assert _plan("SELECT Id FROM Account WHERE Name = 'Acme'")["plan"] == "unknown"
+
+    @pytest.mark.parametrize(
+        "where",
+        ["Name != 'Acme'", "Name LIKE '%corp'", "OwnerId = null", "NOT Id = :x", "CALENDAR_YEAR(CreatedDate) = 2024"],
+    )
+    def test_unindexable_forms(self, where):
+        assert _plan(f"SELECT Id FROM Account WHERE {where}")["plan"] == "table_scan"
+
+    def test_unknown_object_has_no_plan(self):
+        assert _plan("SELECT Id FROM Contact")["plan"] is None
+
+
+class TestWarning:
+    def test_large_object_scan_warns_with_reason_and_skinny_table(self):
+        message = mod.plan_warning(_plan("SELECT Id, Name FROM Account WHERE Industry = 'Tech'"))
+        assert message.startswith("Non-selective query on Account (2,400,000 records)")
+        assert "Industry: field is not indexed" in message
+        assert message.endswith("a skinny table covers the queried fields")
+
+    def test_small_object_and_index_plans_do_not_warn(self):
+        assert mod.plan_warning(_plan("SELECT Id FROM Case")) is None
+        assert mod.plan_warning(_plan("SELECT Id FROM Account WHERE Rating = 'Hot'")) is None
+
+
+class TestConsumers:
+    def test_soql_validator_reports_plan(self, tmp_path):
+        path = tmp_path / "stats.json"
+        path.write_text(json.dumps(STATS))
+        result = validator_mod.SOQLValidator(
+            "SELECT Id FROM Account WHERE Industry = 'Tech'", stats=str(path)
+        ).validate()
+        assert result["query_plan"]["plan"] == "table_scan"
+        assert not result["uses_indexed_fields"]
+        assert any("Non-selective" in i["message"] for i in result["issues"])
+
+    def test_mcp_soql_query_preflight(self, tmp_path, monkeypatch):
+        path = tmp_path / "stats.json"
+        path.write_text(json.dumps(STATS))
+        monkeypatch.setenv(mod.ORG_STATS_ENV, str(path))
+        params = {"sObject": "Account", "sf_user": "u", "whereClause": "Industry = 'Tech'"}
+        result = mcp.validate_data_params({"tool": "soql_query", "params": params})
+        assert any("Non-selective query on Account" in w["message"] for w in result["warnings"])
+        params["whereClause"] = "Id = 'x'"
+        result = mcp.validate_data_params({"tool": "soql_query", "params": params})
+        assert not any("Non-selective" in w["message"] for w in result["warnings"])
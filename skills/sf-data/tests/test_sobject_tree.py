@@ -0,0 +1,175 @@
+"""Tests for sobject_tree.py — streaming sObject Tree validation and batch split."""
+
+import io
+import json
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-data/scripts/sobject_tree.py")
+ops = load_script("skills/sf-data/scripts/validate_data_operation.py")
+
+
+def _account(n: int, contacts: int = 0, **fields) -> dict:
+    record = {"attributes": {"type": "Account", "referenceId": f"Acc{n}"}, "Name": f"Account {n}", **fields}
+    if contacts:
+        record["Contacts"] = {
+            "records": [
+                {"attributes": {"type": "Contact", "referenceId": f"Con{n}_{i}"}, "LastName": f"C{i}"}
+                for i in range(contacts)
+            ]
+        }
+    return record
+
+
+def _validate(tmp_path, tree, indent=2) -> dict:
+    path = tmp_path / "tree.json"
+    path.write_text(tree if isinstance(tree, str) else json.dumps(tree, indent=indent), encoding="utf-8")
+    return mod.TreeValidator(str(path)).validate()
+
+
+def _codes(result: dict) -> dict:
+    return {i["code"]: i for i in result["issues"]}
+
+
+class TestPullParser:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+    def test_events_rebuild_the_document(self, chunk_size):
+        doc = {"a": [1, -2.5, 1e-7, True, None, "x\"\\u00e9\n☃"], "b": {"c": {}}, "d": []}
+        events = list(mod.iter_events(io.StringIO(json.dumps(doc)), chunk_size))
+        assert [e[0] for e in events[:3]] == ["start_map", "key", "start_array"]
+        scalars = [v for kind, v, _ in events if kind == "scalar"]
+        assert scalars == doc["a"]
+
+    @pytest.mark.parametrize(
+        ("text", "message"),
+        [
+            ('{"a" 1}', "Expected ':'"),
+            ("[1,]", "Unexpected character"),
+            ('{"a": 1}\n{}', "Extra data"),
+            ('{\n"a": "b', "Unterminated string"),
+        ],
+    )
+    def test_malformed_json_raises_with_line(self, text, message):
+        with pytest.raises(mod.JSONStreamError, match=message) as exc:
+            list(mod.iter_events(io.StringIO(text), 2))
+        assert exc.value.line >= 1
+
+    def test_offsets_bracket_values(self):
+        text = '{"records": [{"a": 1}, {"b": [2]}]}'
+        events = list(mod.iter_events(io.StringIO(text)))
+        start = next(o for k, _, o in events if k == "start_map" and o > 0)
+        ends = [o for k, _, o in events if k == "end_map"]
+        assert text[start:ends[0]] == '{"a": 1}'
+
+
+class TestTreeChecks:
+    def test_valid_tree(self, tmp_path):
+        result = _validate(tmp_path, {"records": [_account(1, contacts=2), _account(2)]})
+        assert result["issues"] == []
+        assert (result["trees"], result["records"], result["max_depth"]) == (2, 4, 2)
+
+    def test_nested_records_are_checked(self, tmp_path):
+        tree = _account(1, contacts=1)
+        tree["Contacts"]["records"].append({"attributes": {"type": "Contact"}, "LastName": "X"})
+        tree["Contacts"]["records"].append({"LastName": "Y"})
+        codes = _codes(_validate(tmp_path, {"records": [tree]}))
+        assert codes["missing_reference_id"]["paths"] == ["records[0].Contacts.records[1]"]
+        assert codes["missing_attributes"]["paths"] == ["records[0].Contacts.records[2]"]
+
+    def test_duplicate_reference_ids(self, tmp_path):
+        codes = _codes(_validate(tmp_path, {"records": [_account(1), _account(1)]}))
+        assert codes["duplicate_reference_id"]["paths"] == ["records[1] (Acc1)"]
+
+    def test_cross_references_resolve_in_either_direction(self, tmp_path):
+        records = [_account(1, ParentId="@Acc2"), _account(2), _account(3, ParentId="@Nope")]
+        codes = _codes(_validate(tmp_path, {"records": records}))
+        (issue,) = codes.values()
+        assert issue["code"] == "unresolved_reference"
+        assert issue["paths"] == ["records[2].ParentId (@Nope)"]
+
+    def test_depth_limit(self, tmp_path):
+        record = _account(0)
+        node = record
+        for level in range(1, 6):
+            child = {"attributes": {"type": "Account", "referenceId": f"L{level}"}}
+            node["ChildAccounts"] = {"records": [child]}
+            node = child
+        result = _validate(tmp_path, {"records": [record]})
+        assert result["max_depth"] == 6
+        assert _codes(result)["too_deep"]["paths"] == ["records[0]" + ".ChildAccounts.records[0]" * 5]
+
+    def test_child_records_must_be_an_array(self, tmp_path):
+        record = _account(1, Contacts={"records": {"LastName": "x"}})
+        assert "invalid_children" in _codes(_validate(tmp_path, {"records": [record]}))
+
+    def test_missing_records_and_invalid_json(self, tmp_path):
+        assert "missing_records" in _codes(_validate(tmp_path, '{"data": []}'))
+        issue = _codes(_validate(tmp_path, '{"records": [\n{"a": }]}'))["invalid_json"]
+        assert issue["paths"] == ["line 2"]
+
+    @pytest.mark.parametrize("attributes", [[], ["x", {"type": "Account"}], "Account"])
+    def test_malformed_attributes_keep_the_stream_in_step(self, tmp_path, attributes):
+        bad = {"attributes": attributes, "Name": "Bad"}
+        result = _validate(tmp_path, {"records": [bad, _account(2, contacts=1)]})
+        assert (result["trees"], result["records"]) == (2, 3)
+        assert set(_codes(result)) == {"missing_type", "missing_reference_id"}
+        assert all(0 < b["start"] < b["end"] for b in result["batches"])
+        files = mod.write_batches(str(tmp_path / "tree.json"), result["batches"], str(tmp_path / "out"))
+        written = [json.loads(open(f, encoding="utf-8").read())["records"] for f in files]
+        assert written == [[bad], [_account(2, contacts=1)]]
+
+    def test_non_utf8_file_is_invalid(self, tmp_path):
+        path = tmp_path / "tree.json"
+        path.write_bytes('{"records": [{"Name": "Café"}]}'.encode("latin-1"))
+        result = mod.TreeValidator(str(path)).validate()
+        assert "not UTF-8" in _codes(result)["invalid_json"]["message"]
+        assert result["batches"] == []
+        scored = ops.DataOperationValidator(str(path)).validate()
+        assert any("not UTF-8" in i["message"] for i in scored["issues"])
+
+
+class TestBatches:
+    def test_trees_pack_into_200_record_requests(self, tmp_path):
+        # 70 trees of 4 records: 50 fit in a request, 20 in the next
+        result = _validate(tmp_path, {"records": [_account(i, contacts=3) for i in range(70)]})
+        assert [(b["trees"], b["records"]) for b in result["batches"]] == [([0, 49], 200), ([50, 69], 80)]
+
+    def test_object_change_starts_a_new_request(self, tmp_path):
+        contact = {"attributes": {"type": "Contact", "referenceId": "Solo"}, "LastName": "S"}
+        result = _validate(tmp_path, {"records": [_account(1), contact, _account(2)]})
+        assert [b["sObject"] for b in result["batches"]] == ["Account", "Contact", "Account"]
+
+    def test_oversized_tree_is_an_issue(self, tmp_path):
+        result = _validate(tmp_path, {"records": [_account(1, contacts=200), _account(2)]})
+        assert _codes(result)["tree_too_large"]["paths"] == ["records[0] (201 records)"]
+        assert [b["trees"] for b in result["batches"]] == [[1, 1]]
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_write_batches_copies_trees_verbatim(self, tmp_path, indent):
+        records = [_account(i, contacts=3, Description="é ☃") for i in range(60)]
+        path = tmp_path / "tree.json"
+        path.write_text(json.dumps({"records": records}, indent=indent, ensure_ascii=False), encoding="utf-8")
+        result = mod.TreeValidator(str(path)).validate()
+        files = mod.write_batches(str(path), result["batches"], str(tmp_path / "out"))
+        batches = [json.loads(open(f, encoding="utf-8").read())["records"] for f in files]
+        assert [len(b) for b in batches] == [50, 10]
+        assert batches[0] + batches[1] == records
+
+
+class TestDataOperationScoring:
+    def test_nested_issue_is_deducted_with_paths(self, tmp_path):
+        tree = _account(1, contacts=1)
+        del tree["Contacts"]["records"][0]["attributes"]["referenceId"]
+        path = tmp_path / "tree.json"
+        path.write_text(json.dumps({"records": [tree]}), encoding="utf-8")
+        result = ops.DataOperationValidator(str(path)).validate()
+        assert "Record missing referenceId — 1 record(s), at records[0].Contacts.records[0]" in [
+            i["message"] for i in result["issues"]
+        ]
+
+    def test_large_file_recommends_split(self, tmp_path):
+        path = tmp_path / "tree.json"
+        path.write_text(json.dumps({"records": [_account(i) for i in range(250)]}), encoding="utf-8")
+        result = ops.DataOperationValidator(str(path)).validate()
+        assert any("2 tree requests" in r for r in result["recommendations"])
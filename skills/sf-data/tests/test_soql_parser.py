@@ -0,0 +1,221 @@
+"""Tests for soql_parser.py — SOQL tokenizer and dict AST."""
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-data/scripts/soql_parser.py")
+parse_soql = mod.parse_soql
+
+
+def _paths(entries):
+    return [e["path"] for e in entries]
+
+
+class TestSelectList:
+    def test_fields_relationships_and_subquery(self):
+        ast = parse_soql(
+            "SELECT Id, Owner.Name, (SELECT Email FROM Contacts WHERE Email != null) "
+            "FROM Account WHERE Industry = :industry ORDER BY Name LIMIT 10"
+        )
+        assert ast["object"] == "Account"
+        assert _paths(ast["fields"]) == ["Id", "Owner.Name"]
+        assert ast["subqueries"][0]["object"] == "Contacts"
+        assert _paths(ast["subqueries"][0]["references"]) == ["Email"]
+        assert ast["binds"] == ["industry"]
+        assert ast["clauses"] == ["SELECT", "FROM", "WHERE", "ORDER BY", "LIMIT"]
+
+    def test_aggregates_and_aliases(self):
+        ast = parse_soql(
+            "SELECT COUNT(Id) total, Industry FROM Account GROUP BY Industry HAVING COUNT(Id) > 1"
+        )
+        assert ast["fields"][0] == {"path": "Id", "function": "COUNT", "alias": "total"}
+        assert mod.selected_paths(ast) == {"industry"}
+        assert ("Industry", "GROUP BY") in [(r["path"], r["clause"]) for r in ast["references"]]
+
+    def test_fields_function_and_typeof(self):
+        assert parse_soql("SELECT FIELDS(STANDARD) FROM Account")["all_fields"]
+        ast = parse_soql("SELECT TYPEOF What WHEN Account THEN Phone ELSE Name END FROM Task")
+        assert mod.selected_paths(ast) == {"what.phone", "what.name"}
+
+    def test_nested_function_calls(self):
+        ast = parse_soql(
+            "SELECT Name, DISTANCE(Location__c, GEOLOCATION(37.775,-122.418), 'mi') dist "
+            "FROM Warehouse__c"
+        )
+        assert ast["fields"][1] == {"path": "Location__c", "function": "DISTANCE", "alias": "dist"}
+        ast = parse_soql("SELECT FORMAT(MIN(CloseDate)) Amt FROM Opportunity")
+        assert ast["fields"] == [{"path": "CloseDate", "function": "FORMAT", "alias": "Amt"}]
+        ast = parse_soql(
+            "SELECT HOUR_IN_DAY(convertTimezone(CreatedDate)), COUNT(Id) FROM Opportunity "
+            "GROUP BY HOUR_IN_DAY(convertTimezone(CreatedDate))"
+        )
+        assert ast["fields"][0] == {"path": "CreatedDate", "function": "HOUR_IN_DAY", "alias": None}
+        assert ast["group_by"] == [{"path": "CreatedDate", "function": "HOUR_IN_DAY"}]
+
+
+class TestClauses:
+    def test_semi_join_and_date_literals(self):
+        ast = parse_soql(
+            "SELECT Id FROM Account WHERE CreatedDate = LAST_N_DAYS:30 AND Id IN "
+            "(SELECT AccountId FROM Opportunity WHERE IsWon = true) WITH SECURITY_ENFORCED"
+        )
+        assert _paths(ast["references"]) == ["CreatedDate", "Id"]
+        assert ast["semi_joins"][0]["object"] == "Opportunity"
+        assert _paths(ast["semi_joins"][0]["references"]) == ["IsWon"]
+
+    def test_object_alias(self):
+        ast = parse_soql("SELECT a.Name FROM Account a WHERE a.Name LIKE 'Acme%'")
+        assert ast["alias"] == "a"
+
+
+class TestErrors:
+    @pytest.mark.parametrize(
+        "soql",
+        [
+            "SELECT FROM Account",
+            "SELECT Id Account",
+            "SELECT Id FROM Account WHERE (Name = 'x'",
+            "SELECT Id FROM Account WHERE Name = \"x\"",
+        ],
+    )
+    def test_malformed_queries_raise(self, soql):
+        with pytest.raises(mod.SOQLParseError):
+            parse_soql(soql)
+
+    @pytest.mark.parametrize(
+        ("soql", "code"),
+        [
+            ("SELECT * FROM Account", "select_star"),
+            ("SELECT Id FROM Account WHERE Name == 'x'", "double_equals"),
+            ("SELECT Id, Name", "missing_from"),
+            ("SELECT Id FROM Account WHERE (Name = 'x'", "unbalanced"),
+            ("SELECT Id FROM Account WHERE Name = 'x')", "unbalanced"),
+            ("SELECT TYPEOF What WHEN Account THEN Name FROM Task", "typeof_end"),
+            ("SELECT Id FROM Account LIMIT 5 WHERE Name = 'x'", None),
+        ],
+    )
+    def test_error_codes(self, soql, code):
+        with pytest.raises(mod.SOQLParseError) as err:
+            parse_soql(soql)
+        assert err.value.code == code
+
+
+class TestConditionTree:
+    def test_boolean_precedence_and_not(self):
+        ast = parse_soql(
+            "SELECT Id FROM Account WHERE NOT Name LIKE 'A%' AND (Type IN ('a', 'b') OR Id = :id)"
+        )
+        where = ast["where"]
+        assert where["op"] == "AND"
+        assert where["operands"][0] == {
+            "op": "NOT",
+            "operands": [
+                {"path": "Name", "function": None, "operator": "LIKE", "value": {"kind": "string", "value": "A%"}}
+            ],
+        }
+        group = where["operands"][1]
+        assert group["op"] == "OR"
+        assert [v["value"] for v in group["operands"][0]["value"]["value"]] == ["a", "b"]
+        assert group["operands"][1]["value"] == {"kind": "bind", "value": "id"}
+
+    def test_keywords_inside_literals_are_values(self):
+        ast = parse_soql("SELECT Id FROM Case WHERE Subject = 'ORDER BY (x == y) LIMIT 1'")
+        assert ast["clauses"] == ["SELECT", "FROM", "WHERE"]
+        assert [n["path"] for n in mod.iter_comparisons(ast["where"])] == ["Subject"]
+
+    def test_value_kinds(self):
+        ast = parse_soql(
+            "SELECT Id FROM Opportunity WHERE CloseDate = THIS_QUARTER AND CreatedDate > "
+            "2024-01-01T00:00:00Z AND Amount > -5.5 AND IsWon = false AND Type NOT IN "
+            "(SELECT Name FROM Product2) AND CALENDAR_YEAR(CloseDate) = 2024"
+        )
+        nodes = list(mod.iter_comparisons(ast["where"]))
+        assert [n["value"]["kind"] for n in nodes] == [
+            "date_literal", "datetime", "number", "boolean", "subquery", "number",
+        ]
+        assert nodes[4]["operator"] == "NOT IN"
+        assert nodes[4]["value"]["value"] is ast["semi_joins"][0]
+        assert (nodes[5]["function"], nodes[5]["path"]) == ("CALENDAR_YEAR", "CloseDate")
+
+    def test_currency_literals(self):
+        ast = parse_soql(
+            "SELECT Id FROM Opportunity WHERE Amount > USD5000.50 AND Amount < USD6000"
+        )
+        values = [n["value"] for n in mod.iter_comparisons(ast["where"])]
+        assert values == [
+            {"kind": "literal", "value": "USD5000.50"}, {"kind": "literal", "value": "USD6000"},
+        ]
+
+
+class TestBindsAndComments:
+    @pytest.mark.parametrize(
+        "bind, name",
+        [
+            (":(a + b)", "(a + b)"),
+            (":('%' + x)", "('%' + x)"),
+            (":Date.today().addDays(-3)", "Date.today().addDays(-3)"),
+            (":accounts[0].Owner.Id", "accounts[0].Owner.Id"),
+            (": (')' + suffix)", "(')' + suffix)"),
+        ],
+    )
+    def test_bind_expressions(self, bind, name):
+        ast = parse_soql(f"SELECT Id FROM Account WHERE Name LIKE {bind} LIMIT 5")
+        assert ast["where"]["value"] == {"kind": "bind", "value": name}
+        assert ast["binds"] == [name] and ast["limit"] == 5
+
+    @pytest.mark.parametrize("soql", [
+        "SELECT Id FROM Account WHERE Name = :(a + b",
+        "SELECT Id FROM Account WHERE Name = :",
+    ])
+    def test_malformed_bind_raises(self, soql):
+        with pytest.raises(mod.SOQLParseError):
+            parse_soql(soql)
+
+    def test_comments_are_skipped_outside_strings(self):
+        ast = parse_soql(
+            "SELECT Id -- owner later\nFROM Account /* all */ WHERE Name = 'a--b /* c */' LIMIT 1"
+        )
+        assert ast["where"]["value"]["value"] == "a--b /* c */"
+        assert ast["clauses"] == ["SELECT", "FROM", "WHERE", "LIMIT"]
+
+
+class TestTrailingClauses:
+    def test_group_order_limit_offset(self):
+        ast = parse_soql(
+            "SELECT Industry, COUNT(Id) FROM Account GROUP BY ROLLUP(Industry) "
+            "HAVING COUNT(Id) > 1 ORDER BY Industry DESC NULLS LAST LIMIT :n OFFSET 20"
+        )
+        assert ast["group_by"] == [{"path": "Industry", "function": None}]
+        assert ast["having"]["function"] == "COUNT"
+        assert ast["order_by"] == [
+            {"path": "Industry", "function": None, "direction": "DESC", "nulls": "LAST"}
+        ]
+        assert (ast["limit"], ast["offset"]) == ("n", 20)
+
+    def test_with_for_and_all_rows(self):
+        ast = parse_soql(
+            "SELECT Id FROM Account WHERE Id IN :ids WITH USER_MODE LIMIT 1 FOR UPDATE"
+        )
+        assert (ast["with"], ast["for"]) == (["USER_MODE"], ["UPDATE"])
+        ast = parse_soql(
+            "SELECT Title FROM KnowledgeArticleVersion WITH DATA CATEGORY Geo__c AT (usa__c, uk__c)"
+        )
+        assert ast["with"] == ["DATA CATEGORY"]
+        ast = parse_soql("SELECT Id FROM Account WHERE IsDeleted = true ALL ROWS")
+        assert ast["alias"] is None and ast["clauses"][-1] == "ALL ROWS"
+
+
+class TestParseCache:
+    def test_whitespace_variants_share_one_parse(self):
+        mod._parse_normalized.cache_clear()
+        first = parse_soql("SELECT Id\n  FROM Account\tWHERE Name = 'a  b';")
+        second = parse_soql("SELECT Id FROM Account WHERE Name = 'a  b'")
+        assert first is second
+        assert first["where"]["value"]["value"] == "a  b"
+        assert mod._parse_normalized.cache_info().hits == 1
+
+    def test_error_position_refers_to_original_text(self):
+        soql = "SELECT Id\n\n\nFROM Account WHERE Name == 'x'"
+        with pytest.raises(mod.SOQLParseError) as err:
+            parse_soql(soql)
+        assert err.value.position == soql.index("==")
@@ -9,6 +9,7 @@ Covers:
   - Optimization suggestions
 """
 
+import pytest
 from conftest import load_script
 
 mod = load_script("skills/sf-data/scripts/soql_validator.py")
@@ -133,6 +134,31 @@ class TestSyntaxErrorDetection:
         assert not r["is_valid"]
         assert any("TYPEOF" in m or "END" in m for m in _error_messages(r))
 
+    @pytest.mark.parametrize(
+        "soql",
+        [
+            "SELECT Name, DISTANCE(Location__c, GEOLOCATION(37.775,-122.418), 'mi') dist "
+            "FROM Warehouse__c",
+            "SELECT FORMAT(MIN(CloseDate)) Amt FROM Opportunity",
+            "SELECT HOUR_IN_DAY(convertTimezone(CreatedDate)) h, COUNT(Id) FROM Opportunity "
+            "GROUP BY HOUR_IN_DAY(convertTimezone(CreatedDate))",
+            "SELECT Id FROM Opportunity WHERE Amount > USD5000.50",
+        ],
+    )
+    def test_nested_functions_and_currency_are_valid(self, soql):
+        """TC-S7: Nested function calls and decimal currency literals are valid SOQL."""
+        r = _validate(soql)
+        assert r["is_valid"], r["issues"]
+
+    def test_unparsed_query_keeps_where_and_limit_flags(self):
+        """TC-S6: A query that fails to parse is not told to add clauses it has."""
+        r = _validate("SELECT Id FROM Account WHERE Name == 'no WHERE here' LIMIT 10")
+        assert not r["is_valid"]
+        assert r["has_where_clause"] and r["has_limit"]
+        assert not r["recommendations"]
+        r = _validate("SELECT Id, Name FROM Account WHERE (Name = 'LIMIT 5'")
+        assert r["has_where_clause"] and not r["has_limit"]
+
     def test_double_quotes_warned(self):
         """TC-S6: Double-quoted strings produce a warning."""
         r = _validate('SELECT Id FROM Account WHERE Name = "Test"')
@@ -227,6 +253,13 @@ class TestCommentHandling:
         r = _validate(soql)
         assert r["is_valid"]
 
+    def test_comment_markers_inside_strings_are_kept(self):
+        """TC-C4: -- and /* */ inside a string literal are part of the value."""
+        soql = "SELECT Id FROM Account WHERE Name = 'a--b' AND Site = '/* x */' -- note\nLIMIT 5"
+        r = _validate(soql)
+        assert r["is_valid"]
+        assert r["has_where_clause"] and r["has_limit"]
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 6. QUERY COMPLEXITY ANALYSIS
@@ -294,3 +327,65 @@ class TestOptimizationSuggestions:
             "SELECT Id FROM Account WHERE Industry = 'Tech'"
         )
         assert any("indexed" in s.lower() for s in suggestions)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 8. FIELD EXISTENCE (describe snapshot)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestDescribeFieldCheck:
+    DESCRIBE = {"Account": ["Id", "Name", "Industry"]}
+
+    def test_unknown_field_is_error(self):
+        """TC-D1: A field missing from the describe snapshot is an error."""
+        describe = mod.DescribeCache(self.DESCRIBE)
+        result = SOQLValidator(
+            "SELECT Id, Nmae FROM Account WHERE Industry = 'Tech' LIMIT 5", describe
+        ).validate()
+        assert any('No field "Nmae" on Account' in m for m in _error_messages(result))
+        assert not result["is_valid"]
+
+    def test_known_fields_pass(self):
+        """TC-D2: Fields present in the snapshot raise nothing."""
+        describe = mod.DescribeCache(self.DESCRIBE)
+        result = SOQLValidator("SELECT Name FROM Account WHERE Industry = 'Tech'", describe).validate()
+        assert result["is_valid"]
+
+    def test_snapshot_path(self, tmp_path):
+        """TC-D3: The snapshot can be given as a JSON file path."""
+        path = tmp_path / "describe.json"
+        path.write_text('{"Account": ["Id", "Name"]}')
+        result = SOQLValidator("SELECT Phone FROM Account", str(path)).validate()
+        assert any('"Phone"' in m for m in _error_messages(result))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 9. AST-BASED CHECKS (string literals and nested queries)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestParsedChecks:
+    def test_keywords_in_literals_ignored(self):
+        """TC-P1: Clauses and operators inside string literals are not checks."""
+        r = _validate("SELECT Id FROM Case WHERE Subject = 'x == y ORDER BY (LIMIT 5'")
+        assert r["is_valid"]
+        assert not r["has_order_by"] and not r["has_limit"]
+        assert _warning_messages(r) == []
+
+    def test_indexed_field_only_counts_in_where(self):
+        """TC-P2: An indexed field selected or in a semi-join is not a filter."""
+        r = _validate(
+            "SELECT Id, Name FROM Account WHERE Industry IN (SELECT Name FROM Industry__c WHERE Id = :x)"
+        )
+        assert r["has_subquery"]
+        assert not r["uses_indexed_fields"]
+
+    def test_alias_prefix_is_not_relationship(self):
+        """TC-P3: a.Name on an aliased object is a plain field."""
+        assert not _validate("SELECT a.Name FROM Account a")["has_relationship"]
+        assert _validate("SELECT a.Owner.Name FROM Account a")["has_relationship"]
+
+    def test_bind_limit_counts(self):
+        """TC-P4: LIMIT :n is a limit."""
+        assert _validate("SELECT Id FROM Account LIMIT :pageSize")["has_limit"]
@@ -56,9 +56,11 @@ v2.0.0 New Validations:
 All non-critical checks are ADVISORY - they provide recommendations but don't block deployment.
 """
 
+import re
 import xml.etree.ElementTree as ET
 import sys
 import os
+from pathlib import Path
 
 # Import validators from local scripts directory (co-located for isolation).
 # These were previously imported from plugins/cirra-ai-sf/shared/hooks/scripts/
@@ -69,6 +71,32 @@ sys.path.insert(0, SCRIPT_DIR)
 from naming_validator import NamingValidator  # noqa: E402
 from security_validator import SecurityValidator  # noqa: E402
 
+# sf-data's SOQL parser and query planner, imported by name when installed alongside
+SF_DATA_SCRIPTS = Path(SCRIPT_DIR).parent.parent / "sf-data" / "scripts"
+if str(SF_DATA_SCRIPTS) not in sys.path:
+    sys.path.append(str(SF_DATA_SCRIPTS))
+
+# Org statistics snapshot (sf-data query_plan.py) for Get Records selectivity
+ORG_STATS_ENV = "SF_ORG_STATS"
+
+# Get Records filter operator -> SOQL operator
+FLOW_FILTER_OPERATORS = {
+    "EqualTo": "=",
+    "NotEqualTo": "!=",
+    "GreaterThan": ">",
+    "GreaterThanOrEqualTo": ">=",
+    "LessThan": "<",
+    "LessThanOrEqualTo": "<=",
+    "In": "IN",
+    "NotIn": "NOT IN",
+    "StartsWith": "LIKE",
+    "EndsWith": "LIKE",
+    "Contains": "LIKE",
+}
+
+# Wildcards the text operators put around their value
+FLOW_LIKE_PATTERNS = {"StartsWith": "{}%", "EndsWith": "%{}", "Contains": "%{}%"}
+
 
 class EnhancedFlowValidator:
     """Comprehensive flow validator with 6-category scoring."""
@@ -597,6 +625,20 @@ class EnhancedFlowValidator:
                 }
             )
 
+        # ═══════════════════════════════════════════════════════════════════════
+        # Non-selective Get Records on large objects ($SF_ORG_STATS snapshot)
+        # ═══════════════════════════════════════════════════════════════════════
+        nonselective = self._get_nonselective_lookups()
+        if nonselective:
+            score -= 3
+            warnings.append(
+                {
+                    "severity": "HIGH",
+                    "message": f"⚠️ Non-selective Get Records: {'; '.join(nonselective[:3])}",
+                    "suggestion": "Filter on an indexed field (Id, Name, lookups, external IDs, custom indexes) that matches few enough rows",
+                }
+            )
+
         # ═══════════════════════════════════════════════════════════════════════
         # NEW v2.0.0: getFirstRecordOnly recommendation
         # ═══════════════════════════════════════════════════════════════════════
@@ -1651,6 +1693,97 @@ class EnhancedFlowValidator:
         # A more sophisticated check would trace the execution path
         return len(formulas) > 0 and len(loops) > 0
 
+    def _lookup_soql(self, lookup) -> str | None:
+        """The SOQL a Get Records element runs (None when it has no object).
+
+        Element references become bind variables, since their values are
+        only known at run time.
+        """
+
+        def quoted(text: str) -> str:
+            return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+        obj = lookup.find("sf:object", self.namespace)
+        if obj is None or not obj.text:
+            return None
+        conditions = []
+        for flt in lookup.findall("sf:filters", self.namespace):
+            field = flt.findtext("sf:field", "", self.namespace)
+            operator = flt.findtext("sf:operator", "", self.namespace)
+            value = flt.find("sf:value", self.namespace)
+            kind, raw = None, ""
+            if value is not None and len(value):
+                kind, raw = value[0].tag.split("}")[-1], value[0].text or ""
+            if operator == "IsNull":
+                conditions.append(f"{field} {'=' if raw == 'true' else '!='} null")
+                continue
+            soql_op = FLOW_FILTER_OPERATORS.get(operator)
+            if soql_op is None or not field or kind is None:
+                return None  # an operator or value the estimator cannot model
+            if operator in FLOW_LIKE_PATTERNS:
+                # Only the wildcard position matters for index use
+                text = raw if kind == "stringValue" else "x"
+                literal = quoted(FLOW_LIKE_PATTERNS[operator].format(text))
+            elif kind == "elementReference":
+                literal = ":" + re.sub(r"\W", "_", raw.lstrip("$"))
+            elif kind == "stringValue":
+                literal = quoted(raw)
+            else:
+                literal = raw
+            conditions.append(f"{field} {soql_op} {literal}")
+        soql = f"SELECT Id FROM {obj.text}"
+        if not conditions:
+            return soql
+        logic = (lookup.findtext("sf:filterLogic", "and", self.namespace) or "and").strip()
+        if logic.lower() in ("and", "or"):
+            where = f" {logic.upper()} ".join(conditions)
+        else:
+            where = re.sub(
+                r"\d+",
+                lambda m: f"({conditions[int(m.group()) - 1]})" if 0 < int(m.group()) <= len(conditions) else m.group(),
+                logic,
+            )
+        return f"{soql} WHERE {where}"
+
+    def _get_nonselective_lookups(self) -> list[str]:
+        """
+        Get Records elements predicted to scan a large object.
+
+        Runs only when $SF_ORG_STATS names an org statistics snapshot; each
+        element's filters are translated to SOQL and estimated with sf-data's
+        query_plan.py.
+
+        Returns:
+            "Element: warning" strings
+        """
+        path = os.environ.get(ORG_STATS_ENV)
+        if not path:
+            return []
+        try:
+            import query_plan
+            import soql_parser
+        except ImportError:  # sf-data not installed
+            return []
+        try:
+            stats = query_plan.OrgStats.load(path)
+        except (OSError, ValueError):
+            return []
+
+        issues = []
+        for lookup in self.root.findall(".//sf:recordLookups", self.namespace):
+            soql = self._lookup_soql(lookup)
+            if soql is None:
+                continue
+            try:
+                ast = soql_parser.parse_soql(soql)
+            except soql_parser.SOQLParseError:
+                continue
+            message = query_plan.plan_warning(query_plan.estimate(ast, stats))
+            if message:
+                name = lookup.find("sf:name", self.namespace)
+                issues.append(f"{name.text if name is not None else 'Unknown'}: {message}")
+        return issues
+
     def _get_lookups_without_filters(self) -> list[str]:
         """
         Get recordLookups elements without filter conditions.
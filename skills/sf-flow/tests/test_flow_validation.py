@@ -9,6 +9,7 @@ Test fixtures live in ./fixtures/ and range from a minimal before-save flow
 to a maximally complex flow stacked with every anti-pattern.
 """
 
+import json
 import os
 
 from conftest import load_script
@@ -267,6 +268,35 @@ class TestCompoundFieldsInFormulas:
         assert not any("compound" in m.lower() for m in crits), crits
 
 
+class TestGetRecordsSelectivity:
+    """With $SF_ORG_STATS set, Get Records filters are estimated like SOQL."""
+
+    FIXTURE = "complex_multi_object.flow-meta.xml"
+
+    def _stats(self, tmp_path, monkeypatch, distinct):
+        path = tmp_path / "stats.json"
+        stats = {"Contact": {"recordCount": 5_000_000, "fields": {"AccountId": {"distinct": distinct}}}}
+        path.write_text(json.dumps(stats))
+        monkeypatch.setenv(mod.ORG_STATS_ENV, str(path))
+
+    def test_lookup_translated_to_soql(self):
+        validator = EnhancedFlowValidator(os.path.join(FIXTURES_DIR, self.FIXTURE))
+        lookup = validator.root.find(".//sf:recordLookups", validator.namespace)
+        assert validator._lookup_soql(lookup) == "SELECT Id FROM Contact WHERE AccountId = :Record_Id"
+
+    def test_non_selective_lookup_warned(self, tmp_path, monkeypatch):
+        self._stats(tmp_path, monkeypatch, distinct=2)
+        warnings = _warning_messages(_validate(self.FIXTURE))
+        assert any(
+            "Non-selective Get Records: Get_Related_Contacts: Non-selective query on Contact" in m
+            for m in warnings
+        ), warnings
+
+    def test_selective_lookup_not_warned(self, tmp_path, monkeypatch):
+        self._stats(tmp_path, monkeypatch, distinct=100_000)
+        assert not any("Non-selective" in m for m in _warning_messages(_validate(self.FIXTURE)))
+
+
 class TestSubflowFaultConnector:
     """FlowSubflow elements cannot carry a faultConnector (deploy error)."""
 
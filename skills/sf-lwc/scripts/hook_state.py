@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Hook State Store.
+
+Small persistent bookkeeping for hooks that count things per key — auto-fix
+attempts, rate limits — across processes and parallel agent sessions.
+
+Counters live in one SQLite database per store, in WAL mode, under
+tempdir/sf-hook-state/. Each read or update touches a single row by primary
+key, so the cost does not grow with the number of tracked keys, and
+concurrent hooks never lose an update: increments are one atomic upsert.
+A counter expires ``ttl`` seconds after its last update; expired counters
+read as 0 and are purged when a store is opened.
+
+Usage:
+    from hook_state import CounterStore
+
+    attempts = CounterStore("lwc_lsp_attempts", ttl=3600)
+    count = attempts.increment(file_path)
+    attempts.reset(file_path)
+
+Errors (read-only temp dir, corrupt database) never propagate. When the
+database cannot be used, counters fall back to a JSON file beside it
+(best-effort, without cross-process atomicity); when that cannot be written
+either, ``increment`` returns LIMIT_REACHED so attempt limits still trip
+instead of every call looking like the first.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DEFAULT_TTL = 3600.0
+BUSY_TIMEOUT = 5.0  # seconds to wait for another writer
+LIMIT_REACHED = sys.maxsize  # increment() result when no counter can be persisted
+
+
+def state_dir() -> Path:
+    return Path(tempfile.gettempdir()) / "sf-hook-state"
+
+
+class CounterStore:
+    """Per-key integer counters with TTL expiry, safe across processes."""
+
+    def __init__(self, name: str, ttl: float = DEFAULT_TTL, path: str | os.PathLike | None = None):
+        self.name = name
+        self.ttl = ttl
+        self.path = Path(path) if path is not None else state_dir() / f"{name}.sqlite3"
+        self.fallback_path = self.path.with_name(self.path.name + ".json")
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS counters_expires ON counters (expires)")
+            conn.execute("DELETE FROM counters WHERE expires < ?", (time.time(),))
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> int:
+        """Current value of ``key``; 0 when unset or expired."""
+        try:
+            row = self._db().execute(
+                "SELECT value FROM counters WHERE key = ? AND expires >= ?", (key, time.time())
+            ).fetchone()
+        except (OSError, sqlite3.Error):
+            entry = self._read_fallback().get(key)
+            return entry[0] if entry and entry[1] >= time.time() else 0
+        return row[0] if row else 0
+
+    def increment(self, key: str, amount: int = 1) -> int:
+        """Add ``amount`` to ``key`` (restarting an expired counter) and return the new value."""
+        now = time.time()
+        try:
+            row = self._db().execute(
+                "INSERT INTO counters (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "value = CASE WHEN counters.expires < ? THEN excluded.value "
+                "ELSE counters.value + excluded.value END, "
+                "expires = excluded.expires "
+                "RETURNING value",
+                (key, amount, now + self.ttl, now),
+            ).fetchone()
+        except (OSError, sqlite3.Error):
+            return self._increment_fallback(key, amount, now)
+        return row[0]
+
+    def reset(self, key: str):
+        """Forget ``key``."""
+        try:
+            self._db().execute("DELETE FROM counters WHERE key = ?", (key,))
+        except (OSError, sqlite3.Error):
+            counters = self._read_fallback()
+            if counters.pop(key, None) is not None:
+                self._write_fallback(counters)
+
+    # ── JSON fallback ────────────────────────────────────────────────────
+
+    def _read_fallback(self) -> dict[str, list]:
+        try:
+            with open(self.fallback_path, encoding="utf-8") as f:
+                counters = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(counters, dict):
+            return {}
+        return {
+            k: v for k, v in counters.items()
+            if isinstance(v, list) and len(v) == 2 and all(isinstance(x, (int, float)) for x in v)
+        }
+
+    def _write_fallback(self, counters: dict[str, list]) -> bool:
+        tmp = self.fallback_path.with_name(f"{self.fallback_path.name}.{os.getpid()}.tmp")
+        try:
+            self.fallback_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(counters, f)
+            os.replace(tmp, self.fallback_path)
+        except OSError:
+            return False
+        return True
+
+    def _increment_fallback(self, key: str, amount: int, now: float) -> int:
+        counters = {k: v for k, v in self._read_fallback().items() if v[1] >= now}
+        value = (counters[key][0] if key in counters else 0) + amount
+        counters[key] = [value, now + self.ttl]
+        return value if self._write_fallback(counters) else LIMIT_REACHED
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -14,6 +14,10 @@ Behavior (Auto-fix loop):
 Prerequisites:
 - npm install -g @salesforce/lwc-language-server
 
+Diagnostics come from a warm, per-workspace language server kept by
+lwc_lsp_pool.py (started on first use, exits after 10 idle minutes). Set
+SF_LWC_LSP_POOL=0 to start a one-shot client on every event instead.
+
 Usage:
     Triggered automatically by hooks.json configuration
     Input: JSON from stdin with tool_name and tool_input
@@ -31,9 +35,14 @@ SCRIPT_DIR = Path(__file__).parent
 PLUGIN_ROOT = SCRIPT_DIR.parent.parent
 LSP_ENGINE_PATH = PLUGIN_ROOT.parent / "shared" / "lsp-engine"
 sys.path.insert(0, str(LSP_ENGINE_PATH))
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import lwc_lsp_pool  # noqa: E402
+from hook_state import CounterStore  # noqa: E402
 
-# Track validation attempts to prevent infinite loops
-ATTEMPT_FILE = Path("/tmp/lwc_lsp_attempts.json")
+# Track validation attempts to prevent infinite loops; counters left behind
+# by abandoned edit sessions expire after an hour
+ATTEMPTS = CounterStore("lwc_lsp_attempts", ttl=3600)
 MAX_ATTEMPTS = 3
 
 # LWC file extensions
@@ -62,50 +71,17 @@ SEVERITY_ICONS = {
 
 def get_attempt_count(file_path: str) -> int:
     """Get the current attempt count for a file."""
-    try:
-        if ATTEMPT_FILE.exists():
-            with open(ATTEMPT_FILE) as f:
-                attempts = json.load(f)
-                return attempts.get(file_path, 0)
-    except Exception:
-        pass
-    return 0
+    return ATTEMPTS.get(os.path.abspath(file_path))
 
 
 def increment_attempt_count(file_path: str) -> int:
     """Increment and return the attempt count for a file."""
-    attempts = {}
-    try:
-        if ATTEMPT_FILE.exists():
-            with open(ATTEMPT_FILE) as f:
-                attempts = json.load(f)
-    except Exception:
-        pass
-
-    attempts[file_path] = attempts.get(file_path, 0) + 1
-    count = attempts[file_path]
-
-    try:
-        with open(ATTEMPT_FILE, "w") as f:
-            json.dump(attempts, f)
-    except Exception:
-        pass
-
-    return count
+    return ATTEMPTS.increment(os.path.abspath(file_path))
 
 
 def reset_attempt_count(file_path: str):
     """Reset attempt count when validation succeeds."""
-    try:
-        if ATTEMPT_FILE.exists():
-            with open(ATTEMPT_FILE) as f:
-                attempts = json.load(f)
-            if file_path in attempts:
-                del attempts[file_path]
-                with open(ATTEMPT_FILE, "w") as f:
-                    json.dump(attempts, f)
-    except Exception:
-        pass
+    ATTEMPTS.reset(os.path.abspath(file_path))
 
 
 def format_lwc_diagnostics(
@@ -209,6 +185,38 @@ def is_lwc_js_file(file_path: str) -> bool:
     return True
 
 
+def _validate_one_shot(file_path: str) -> dict[str, Any]:
+    """Validate with a fresh LSPClient (cold start); exits quietly if unavailable."""
+    # Try to import LSP engine
+    try:
+        from lsp_client import LSPClient
+    except ImportError:
+        # LSP engine not available - skip validation silently
+        # This allows the plugin to work even without LSP
+        sys.exit(0)
+
+    # Check if LWC LSP wrapper exists
+    lwc_wrapper = LSP_ENGINE_PATH / "lwc_wrapper.sh"
+    if not lwc_wrapper.exists():
+        # LWC LSP wrapper not available - skip silently
+        sys.exit(0)
+
+    # Create LSP client with LWC wrapper and language ID
+    try:
+        client = LSPClient(wrapper_path=str(lwc_wrapper), language_id="javascript")
+    except Exception:
+        # LSP initialization error - skip silently
+        sys.exit(0)
+
+    # Validate the file
+    try:
+        return client.validate_file(file_path)
+    except Exception as e:
+        # Validation error - report but don't block
+        print(f"⚠️ LWC LSP validation error: {e}")
+        sys.exit(0)
+
+
 def main():
     """Main hook entry point."""
     # Read hook input from stdin
@@ -240,34 +248,10 @@ def main():
         reset_attempt_count(file_path)  # Reset for next edit session
         sys.exit(0)
 
-    # Try to import LSP engine
-    try:
-        from lsp_client import LSPClient
-    except ImportError:
-        # LSP engine not available - skip validation silently
-        # This allows the plugin to work even without LSP
-        sys.exit(0)
-
-    # Check if LWC LSP wrapper exists
-    lwc_wrapper = LSP_ENGINE_PATH / "lwc_wrapper.sh"
-    if not lwc_wrapper.exists():
-        # LWC LSP wrapper not available - skip silently
-        sys.exit(0)
-
-    # Create LSP client with LWC wrapper and language ID
-    try:
-        client = LSPClient(wrapper_path=str(lwc_wrapper), language_id="javascript")
-    except Exception:
-        # LSP initialization error - skip silently
-        sys.exit(0)
-
-    # Validate the file
-    try:
-        result = client.validate_file(file_path)
-    except Exception as e:
-        # Validation error - report but don't block
-        print(f"⚠️ LWC LSP validation error: {e}")
-        sys.exit(0)
+    # Warm language server first; fall back to a one-shot client
+    result = lwc_lsp_pool.validate(file_path)
+    if result is None:
+        result = _validate_one_shot(file_path)
 
     # Format output
     output = format_lwc_diagnostics(
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+LWC Bundle Analyzer.
+
+Validates a LightningComponentBundle — the .html, .css and .js files of one
+component directory — in a single pass. Every file is read once; the SLDS 2
+validator (validate_slds.py) and the template anti-pattern validator
+(template_validator.py) run on the loaded text, and a shared index of the
+bundle links the files:
+
+    classes    static class="..." names in the templates
+    handlers   on*={handler} references in the templates
+    bindings   {name} / {name.path} expressions in the templates
+    members    JS class members: fields, methods, getters/setters, and the
+               @api / @track / @wire decorated ones
+    selectors  class selectors in the CSS
+    strings    class-like tokens in JS string literals (computed classes)
+
+Cross-file checks over the index:
+1. Template handler not defined in the JS              (CRITICAL)
+2. Template binding with no JS property or getter      (WARNING)
+3. SLDS class built in JS that is neither an SLDS 2
+   class nor defined in the bundle CSS                 (WARNING)
+4. CSS class selector matching nothing in the
+   template or JS                                      (INFO)
+
+Classes defined in the bundle CSS are also accepted by the per-file SLDS
+class check. The bundle score is the average per-file SLDS score (as
+pre_score.py used to compute it) less CROSS_FILE_PENALTIES per cross-file
+finding.
+
+Usage:
+    python lwc_bundle.py <bundle_dir> [--json]
+"""
+
+import json
+import os
+import re
+import sys
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from template_validator import LWCTemplateValidator  # noqa: E402
+from validate_slds import SLDSValidator, load_slds_data, matches_slds_family  # noqa: E402
+from lwc_template_parser import Element, parse_template  # noqa: E402
+
+BUNDLE_EXTENSIONS = (".html", ".css", ".js")
+
+# Points taken off the bundle score per cross-file finding
+CROSS_FILE_PENALTIES = {"CRITICAL": 5, "WARNING": 2, "INFO": 1}
+
+# Prefix of SLDSValidator's per-file finding for unknown classes in classList calls
+_JS_CLASS_MESSAGE = "Unknown SLDS class in JS: "
+
+# Base classes whose template-visible members are all declared in the bundle
+_PLATFORM_BASES = ("LightningElement", "LightningModal")
+
+_JS_KEYWORDS = {
+    "if", "for", "while", "switch", "catch", "function", "return", "constructor", "super",
+    "new", "typeof", "await", "import", "export", "class", "const", "let", "var", "else",
+}
+
+# ── template patterns ────────────────────────────────────────────────────
+_IDENTIFIER_RE = re.compile(r"\s*([A-Za-z_$][\w$]*)\s*")
+_LOCAL_ATTRS = ("for:item", "for:index", "lwc:slot-data")
+
+# ── JS patterns ──────────────────────────────────────────────────────────
+_JS_TOKEN_RE = re.compile(
+    r"""//[^\n]*|/\*.*?\*/|'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|`(?:[^`\\]|\\.)*`""",
+    re.DOTALL,
+)
+_EXTENDS_RE = re.compile(r"\bclass\s+[\w$]+\s+extends\s+([\w$.]+(?:\s*\([^)]*\))?)")
+_DECORATED_RE = re.compile(
+    r"@(api|track|wire)\b(?:\s*\((?:[^()]|\([^()]*\))*\))?\s*(?:static\s+)?(?:get\s+|set\s+)?([A-Za-z_$][\w$]*)"
+)
+_ACCESSOR_RE = re.compile(r"\b(?:get|set)\s+([A-Za-z_$][\w$]*)\s*\(")
+_METHOD_RE = re.compile(r"^[ \t]*(?:static\s+)?(?:async\s+)?([A-Za-z_$][\w$]*)\s*\([^()]*\)\s*\{", re.MULTILINE)
+_FIELD_RE = re.compile(r"^[ \t]*(?:static\s+)?([A-Za-z_$][\w$]*)\s*(?:=(?!=)|;)", re.MULTILINE)
+_THIS_ASSIGN_RE = re.compile(r"\bthis\.([A-Za-z_$][\w$]*)\s*=(?!=)")
+_CLASS_TOKEN_RE = re.compile(r"-?[_a-zA-Z][\w-]*")
+
+# ── CSS patterns ─────────────────────────────────────────────────────────
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_PRELUDE_RE = re.compile(r"[^{};]*\{")
+_CSS_HOST_RE = re.compile(r":host(?:-context)?\([^)]*\)")
+_CSS_CLASS_RE = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+
+
+def _blank(match: re.Match) -> str:
+    """Replace a match with spaces, keeping newlines so offsets map to lines."""
+    return re.sub(r"[^\n]", " ", match.group())
+
+
+def _line_starts(text: str) -> list[int]:
+    return [0] + [m.end() for m in re.finditer("\n", text)]
+
+
+class LWCBundle:
+    """One LWC bundle loaded into memory with a cross-file index."""
+
+    def __init__(self, bundle_dir: str):
+        self.path = Path(bundle_dir)
+        self.name = self.path.name
+        # file name -> text, for every .html/.css/.js file in the bundle
+        self.files: dict[str, str] = {}
+        for fp in sorted(self.path.iterdir()) if self.path.is_dir() else []:
+            if fp.is_file() and fp.suffix.lower() in BUNDLE_EXTENSIONS:
+                try:
+                    self.files[fp.name] = fp.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    self.files[fp.name] = ""
+
+        # name -> [(file, line)]
+        self.classes: dict[str, list[tuple[str, int]]] = {}
+        self.handlers: dict[str, list[tuple[str, int]]] = {}
+        self.bindings: dict[str, list[tuple[str, int]]] = {}
+        self.selectors: dict[str, list[tuple[str, int]]] = {}
+        self.strings: dict[str, list[tuple[str, int]]] = {}
+        self.template_locals: set[str] = set()
+        # member name -> decorator ("api", "track", "wire") or "" for plain members
+        self.members: dict[str, str] = {}
+        # False when the class extends a custom base whose members are unknown
+        self.members_complete = True
+
+        for file_name, text in self.files.items():
+            suffix = Path(file_name).suffix.lower()
+            if suffix == ".html":
+                self._index_html(file_name, text)
+            elif suffix == ".css":
+                self._index_css(file_name, text)
+            elif suffix == ".js":
+                self._index_js(file_name, text)
+
+    def _files(self, suffix: str) -> list[str]:
+        return [name for name in self.files if name.lower().endswith(suffix)]
+
+    # ── indexing ──────────────────────────────────────────────────────
+    def _index_html(self, file_name: str, text: str):
+        def add(index: dict, name: str, line: int):
+            index.setdefault(name, []).append((file_name, line))
+
+        for node in parse_template(text):
+            if not isinstance(node, Element):
+                for expression in node.expressions:
+                    if expression.path_root:
+                        add(self.bindings, expression.path_root, expression.line)
+                continue
+            for attr in node.attrs:
+                name = attr.name.lower()
+                expression = attr.expression
+                if name == "class" and attr.value and expression is None and "{" not in attr.value:
+                    for cls in attr.value.split():
+                        add(self.classes, cls, attr.line)
+                elif name in _LOCAL_ATTRS and attr.value and expression is None:
+                    self.template_locals.add(attr.value.strip())
+                elif name.startswith("iterator:"):
+                    self.template_locals.add(attr.name.split(":", 1)[1])
+                if expression is None:
+                    continue
+                handler = _IDENTIFIER_RE.fullmatch(expression.text) if name.startswith("on") else None
+                if handler:
+                    add(self.handlers, handler.group(1), expression.line)
+                elif expression.path_root:
+                    add(self.bindings, expression.path_root, expression.line)
+
+    def _index_css(self, file_name: str, text: str):
+        text = _CSS_COMMENT_RE.sub(_blank, text)
+        starts = _line_starts(text)
+        for prelude in _CSS_PRELUDE_RE.finditer(text):
+            selector = prelude.group()
+            if selector.lstrip().startswith("@"):
+                continue  # @media / @supports / @keyframes
+            selector = _CSS_HOST_RE.sub(_blank, selector)
+            for match in _CSS_CLASS_RE.finditer(selector):
+                line = bisect_right(starts, prelude.start() + match.start())
+                self.selectors.setdefault(match.group(1), []).append((file_name, line))
+
+    def _index_js(self, file_name: str, text: str):
+        starts = _line_starts(text)
+        literals = []
+
+        def strip(match: re.Match) -> str:
+            token = match.group()
+            if token[0] in "'\"`":
+                literals.append(match)
+                return token[0] + " " * (len(token) - 2) + token[-1]
+            return _blank(match)
+
+        code = _JS_TOKEN_RE.sub(strip, text)
+
+        for match in literals:
+            for token in _CLASS_TOKEN_RE.finditer(match.group()[1:-1]):
+                line = bisect_right(starts, match.start() + 1 + token.start())
+                self.strings.setdefault(token.group(), []).append((file_name, line))
+
+        extends = _EXTENDS_RE.search(code)
+        if extends and not any(base in extends.group(1) for base in _PLATFORM_BASES):
+            self.members_complete = False
+        for match in _DECORATED_RE.finditer(code):
+            self.members[match.group(2)] = match.group(1)
+        for regex in (_ACCESSOR_RE, _METHOD_RE, _FIELD_RE, _THIS_ASSIGN_RE):
+            for match in regex.finditer(code):
+                name = match.group(1)
+                if name not in _JS_KEYWORDS:
+                    self.members.setdefault(name, "")
+
+    # ── cross-file checks ─────────────────────────────────────────────
+    def cross_file_issues(self, reported_classes=()) -> list[dict[str, Any]]:
+        """Findings that need more than one file of the bundle to detect.
+
+        ``reported_classes`` are SLDS classes the per-file validator already
+        flagged in JS (classList calls); they are not reported twice.
+        """
+        slds_classes = load_slds_data()["valid_slds_classes"]
+        issues: list[dict[str, Any]] = []
+        js_files = self._files(".js")
+        js_name = js_files[0] if len(js_files) == 1 else f"{self.name}.js"
+
+        if js_files and self.members_complete:
+            for name, sites in sorted(self.handlers.items()):
+                if name in self.members:
+                    continue
+                for file_name, line in sites:
+                    issues.append(
+                        _issue(
+                            "CRITICAL",
+                            "bundle_handlers",
+                            f"Handler {name} used in {file_name} is not defined in {js_name}",
+                            file_name,
+                            line,
+                            f"Add a {name}(event) method to {js_name}",
+                        )
+                    )
+            for name, sites in sorted(self.bindings.items()):
+                if name in self.members or name in self.template_locals:
+                    continue
+                file_name, line = sites[0]
+                issues.append(
+                    _issue(
+                        "WARNING",
+                        "bundle_bindings",
+                        f"Template binding {{{name}}} has no matching property or getter in {js_name}",
+                        file_name,
+                        line,
+                        "Declare the property, getter or @api/@wire member in the JS class",
+                    )
+                )
+
+        for cls, sites in sorted(self.strings.items()):
+            if not cls.startswith("slds-") or cls in self.selectors or cls in reported_classes:
+                continue
+            if not slds_classes or cls in slds_classes or matches_slds_family(cls):
+                continue
+            file_name, line = sites[0]
+            issues.append(
+                _issue(
+                    "WARNING",
+                    "bundle_classes",
+                    f"SLDS class {cls} built in {file_name} is not an SLDS 2 class or defined in the bundle CSS",
+                    file_name,
+                    line,
+                    f"Verify '{cls}' is a valid SLDS 2 class or define it in {self.name}.css",
+                )
+            )
+
+        if self._files(".html"):
+            for cls, sites in sorted(self.selectors.items()):
+                if cls in self.classes or cls in self.strings:
+                    continue
+                file_name, line = sites[0]
+                issues.append(
+                    _issue(
+                        "INFO",
+                        "bundle_css",
+                        f"CSS class .{cls} matches nothing in the template or JS",
+                        file_name,
+                        line,
+                        "Remove the unused rule or apply the class in the template",
+                    )
+                )
+        return issues
+
+
+def _issue(severity: str, category: str, message: str, file_name: str, line: int, fix: str) -> dict[str, Any]:
+    return {
+        "severity": severity,
+        "category": category,
+        "message": message,
+        "line": line,
+        "fix": fix,
+        "file": file_name,
+        "source": "lwc-bundle",
+    }
+
+
+def analyze_bundle(bundle_dir: str) -> dict[str, Any]:
+    """Validate an LWC bundle directory as a unit.
+
+    Returns::
+
+        {"name": "myCmp", "score": 150, "max_score": 165,
+         "files": {"myCmp.html": {<SLDSValidator result>}, ...},
+         "issues": [...],              # per-file and cross-file, each with "file"
+         "cross_file_issues": [...]}
+
+    Bundles with no .html/.css/.js files score 0.
+    """
+    bundle = LWCBundle(bundle_dir)
+    max_score = sum(SLDSValidator.max_scores.values())
+    defined = [cls for cls in bundle.selectors if cls.startswith("slds-")]
+
+    files: dict[str, dict[str, Any]] = {}
+    issues: list[dict[str, Any]] = []
+    for file_name, text in bundle.files.items():
+        path = str(bundle.path / file_name)
+        result = SLDSValidator(path, content=text, known_classes=defined).validate()
+        files[file_name] = result
+        issues.extend({**issue, "file": file_name} for issue in result["issues"])
+        if file_name.lower().endswith(".html") and text:
+            template = LWCTemplateValidator(path, content=text).validate()
+            issues.extend({**issue, "file": file_name} for issue in template["issues"])
+
+    reported = {
+        issue["message"].removeprefix(_JS_CLASS_MESSAGE)
+        for issue in issues
+        if issue["message"].startswith(_JS_CLASS_MESSAGE)
+    }
+    cross = bundle.cross_file_issues(reported)
+    issues.extend(cross)
+
+    scores = [result["score"] for result in files.values()]
+    score = round(sum(scores) / len(scores)) if scores else 0
+    score = max(0, score - sum(CROSS_FILE_PENALTIES[i["severity"]] for i in cross))
+    return {
+        "name": bundle.name,
+        "score": score,
+        "max_score": max_score,
+        "files": files,
+        "issues": issues,
+        "cross_file_issues": cross,
+    }
+
+
+def _format_report(result: dict[str, Any]) -> str:
+    parts = [
+        "",
+        f"🧩 LWC Bundle: {result['name']}",
+        "=" * 60,
+        f"📊 Score: {result['score']}/{result['max_score']}",
+        "",
+        "📄 Files:",
+    ]
+    for file_name, file_result in result["files"].items():
+        parts.append(f"   {file_name}: {file_result['score']}/{file_result['max_score']}")
+    cross = result["cross_file_issues"]
+    parts.append("")
+    if cross:
+        parts.append(f"🔗 Cross-file issues ({len(cross)}):")
+        icons = {"CRITICAL": "🔴", "WARNING": "🟡", "INFO": "⚪"}
+        for issue in cross:
+            parts.append(f"   {icons[issue['severity']]} {issue['file']}:{issue['line']} {issue['message']}")
+    else:
+        parts.append("✅ No cross-file issues")
+    parts.append(f"   {len(result['issues']) - len(cross)} per-file issues (use --json for details)")
+    parts.append("=" * 60)
+    return "\n".join(parts)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python lwc_bundle.py <bundle_dir> [--json]")
+        sys.exit(1)
+
+    bundle_dir = sys.argv[1]
+    if not os.path.isdir(bundle_dir):
+        print(f"Error: Not a directory: {bundle_dir}")
+        sys.exit(1)
+
+    results = analyze_bundle(bundle_dir)
+    if "--json" in sys.argv:
+        print(json.dumps(results, indent=2))
+    else:
+        print(_format_report(results))
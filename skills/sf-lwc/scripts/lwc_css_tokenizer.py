@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+LWC CSS Tokenizer.
+
+Splits a component stylesheet into its rules and declarations in one linear
+pass, so the SLDS CSS checks (validate_slds.py) share a single scan instead of
+each looping over every line:
+
+    Rule          selector (or @-rule prelude), line
+    Declaration   property, value, selector of the enclosing rule ("" at
+                  the top level, e.g. Sass-style ``$token: value;``), line
+
+Comments are dropped; strings and url(...) are kept whole, so ``;`` or ``{``
+inside them do not split a declaration. Nested blocks (@media, @supports)
+are followed, with declarations attributed to the innermost rule.
+
+Usage:
+    from lwc_css_tokenizer import tokenize_css, Rule, Declaration
+    for token in tokenize_css(text):
+        ...
+"""
+
+import re
+from bisect import bisect_right
+from collections.abc import Iterator
+
+_COMMENT_RE = re.compile(r"/\*.*?(?:\*/|\Z)", re.DOTALL)
+_STRUCTURE_RE = re.compile(r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|\burl\([^)]*\)|[{};]""")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class Rule:
+    __slots__ = ("selector", "line")
+
+    def __init__(self, selector: str, line: int):
+        self.selector = selector
+        self.line = line
+
+    @property
+    def is_at_rule(self) -> bool:
+        return self.selector.startswith("@")
+
+
+class Declaration:
+    __slots__ = ("property", "value", "selector", "line")
+
+    def __init__(self, property: str, value: str, selector: str, line: int):
+        self.property = property
+        self.value = value
+        self.selector = selector
+        self.line = line
+
+    @property
+    def text(self) -> str:
+        return f"{self.property}: {self.value}"
+
+
+def _blank(match: re.Match) -> str:
+    return re.sub(r"[^\n]", " ", match.group())
+
+
+def tokenize_css(text: str) -> Iterator[Rule | Declaration]:
+    """Yield the rules and declarations of ``text`` in source order."""
+    text = _COMMENT_RE.sub(_blank, text)
+    starts = [0] + [m.end() for m in re.finditer("\n", text)]
+    selectors: list[str] = []
+    segment = 0
+
+    def span(end: int) -> tuple[str, int]:
+        raw = text[segment:end]
+        stripped = raw.lstrip()
+        return stripped.rstrip(), bisect_right(starts, segment + len(raw) - len(stripped))
+
+    for match in _STRUCTURE_RE.finditer(text):
+        char = match.group()
+        if char not in "{};":
+            continue  # string or url(): opaque
+        body, line = span(match.start())
+        if char == "{":
+            selector = _SPACE_RE.sub(" ", body)
+            selectors.append(selector)
+            yield Rule(selector, line)
+        elif ":" in body and not body.startswith("@"):
+            prop, _, value = body.partition(":")
+            yield Declaration(prop.strip(), value.strip(), selectors[-1] if selectors else "", line)
+        if char == "}" and selectors:
+            selectors.pop()
+        segment = match.end()
+
+
+class TokenMatcher:
+    """Aho-Corasick automaton reporting every listed token found in a text.
+
+    Built once from the token list; each ``find`` is linear in the text
+    length plus the number of matches, however many tokens are listed.
+    """
+
+    def __init__(self, tokens):
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[list[str]] = [[]]
+        for token in tokens:
+            if not token:
+                continue
+            state = 0
+            for char in token:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(token)
+
+        # Breadth-first failure links; outputs inherit their suffix states'
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> list[str]:
+        """Distinct tokens occurring in ``text``, in the order their first match ends."""
+        found: dict[str, None] = {}
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for token in out[state]:
+                found.setdefault(token)
+        return list(found)
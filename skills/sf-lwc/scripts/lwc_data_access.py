@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+LWC Data Access Analyzer.
+
+Estimates how many server round trips a component costs per render and how
+wide the data it asks for is, from its JavaScript alone (no Node required).
+A lightweight tokenizer walks each component's .js file once and extracts:
+
+    wires        every @wire adapter, its module, reactive ($) parameters
+                 and the number of fields it requests
+    apex         imperative Apex imports (@salesforce/apex/Class.method) and
+                 each call site, with its enclosing method and whether it
+                 sits in a loop (for / while / forEach / map ...)
+    graphql      gql`...` / graphql`...` queries: the objects queried, their
+                 requested fields and page sizes (first:)
+
+Call sites are attributed to a lifecycle phase through the component's own
+this.method() call graph:
+
+    every_render   reachable from renderedCallback
+    initial        reachable from connectedCallback or the constructor
+    on_demand      anything else (event handlers, public methods)
+
+Round-trip estimate:
+    first_render   @wire adapters + initial and every_render Apex calls
+    each_rerender  every_render Apex calls
+    on_demand      the remaining Apex calls
+A call inside a loop counts LOOP_FANOUT times (an assumed item count).
+
+Findings (category "data_access"):
+1. Apex call reachable from renderedCallback       (CRITICAL)
+2. Apex call inside a loop                          (CRITICAL)
+3. More than MAX_WIRES @wire adapters               (WARNING)
+4. GraphQL page size above MAX_PAGE_SIZE            (WARNING)
+
+Usage:
+    python lwc_data_access.py <lwc_dir | bundle_dir | file.js> [--json] [--top N]
+"""
+
+import json
+import os
+import re
+import sys
+from typing import Any
+
+LOOP_FANOUT = 10  # assumed iterations for a call made inside a loop
+MAX_WIRES = 5
+MAX_PAGE_SIZE = 200
+DEFAULT_PAGE_SIZE = 10  # UI API GraphQL default when first: is omitted
+
+APEX_MODULE = "@salesforce/apex/"
+GRAPHQL_TAGS = {"gql", "graphql"}
+LOOP_KEYWORDS = {"for", "while"}
+LOOP_CALLBACKS = {"forEach", "map", "filter", "reduce", "some", "every", "find", "flatMap"}
+INITIAL_ROOTS = ("connectedCallback", "constructor")
+RENDER_ROOT = "renderedCallback"
+_NOT_METHODS = {"if", "for", "while", "switch", "catch", "function", "return", "with"}
+# UI API GraphQL wraps each field value: Name { value displayValue }
+_VALUE_LEAVES = {"value", "displayValue", "label", "format"}
+_SKIP_DIRS = {"node_modules", "__tests__", ".sfdx", ".sf", ".git"}
+
+_JS_TOKEN_RE = re.compile(
+    r"""(?P<space>\s+)
+      | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+      | (?P<template>`(?:\\.|[^`\\])*`)
+      | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")
+      | (?P<number>\d[\w.]*)
+      | (?P<name>[A-Za-z_$][\w$]*)
+      | (?P<punct>=>|\.\.\.|\?\.|[^\s\w$])""",
+    re.VERBOSE | re.DOTALL,
+)
+_GQL_TOKEN_RE = re.compile(r'#[^\n]*|"(?:\\.|[^"\\])*"|\$\{[^}]*\}|\$?[A-Za-z_]\w*|-?\d+|\.\.\.|[{}():,!=\[\]@]')
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# TOKENIZER
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class Token:
+    __slots__ = ("kind", "text", "line")
+
+    def __init__(self, kind: str, text: str, line: int):
+        self.kind = kind
+        self.text = text
+        self.line = line
+
+    def __repr__(self) -> str:
+        return f"Token({self.kind}, {self.text!r}, {self.line})"
+
+
+def tokenize_js(text: str) -> list[Token]:
+    """Names, punctuation, strings and template literals with their lines.
+
+    Comments and whitespace are dropped. Regex literals are not recognised;
+    their characters come out as punctuation, which the analyzer ignores.
+    """
+    tokens = []
+    line = 1
+    for match in _JS_TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind not in ("space", "comment"):
+            tokens.append(Token(kind, value, line))
+        line += value.count("\n")
+    return tokens
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# GRAPHQL
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _gql_selection(tokens: list[str], i: int) -> tuple[list[tuple], int]:
+    """Parse a ``{ ... }`` selection set at ``tokens[i]`` into (name, args, children)."""
+    fields = []
+    i += 1
+    while i < len(tokens) and tokens[i] != "}":
+        name = tokens[i]
+        if not (name[0].isalpha() or name[0] == "_"):
+            i += 1
+            continue
+        i += 1
+        if i < len(tokens) and tokens[i] == ":":  # alias: field
+            name = tokens[i + 1] if i + 1 < len(tokens) else name
+            i += 2
+        args: dict[str, str] = {}
+        if i < len(tokens) and tokens[i] == "(":
+            depth, key = 0, None
+            while i < len(tokens):
+                tok = tokens[i]
+                if tok in "([{":
+                    depth += 1
+                elif tok in ")]}":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                elif depth == 1 and tok not in (":", ",", "!"):
+                    if key is None:
+                        key = tok
+                    else:
+                        args[key] = tok
+                        key = None
+                i += 1
+            i += 1
+        while i < len(tokens) and tokens[i] == "@":  # directives
+            i += 2
+            if i < len(tokens) and tokens[i] == "(":
+                while i < len(tokens) and tokens[i] != ")":
+                    i += 1
+                i += 1
+        children = None
+        if i < len(tokens) and tokens[i] == "{":
+            children, i = _gql_selection(tokens, i)
+        fields.append((name, args, children))
+    return fields, i + 1
+
+
+def parse_graphql(query: str) -> dict[str, Any]:
+    """Objects queried with their page size and requested field count.
+
+    Returns ``{"objects": [{"name", "page_size", "fields"}], "fields",
+    "page_sizes"}``; ``page_size`` is None when ``first:`` is a variable
+    without a default.
+    """
+    tokens = [t for t in _GQL_TOKEN_RE.findall(query) if not t.startswith("#")]
+    defaults: dict[str, str] = {}
+    i = 0
+    while i < len(tokens) and tokens[i] != "{":
+        # ($pageSize: Int = 50)
+        if tokens[i].startswith("$") and "=" in tokens[i : i + 5]:
+            eq = tokens.index("=", i)
+            defaults[tokens[i]] = tokens[eq + 1] if eq + 1 < len(tokens) else ""
+        i += 1
+    if i >= len(tokens):
+        return {"objects": [], "fields": 0, "page_sizes": []}
+    selection, _ = _gql_selection(tokens, i)
+
+    objects: list[dict[str, Any]] = []
+
+    def width(children: list[tuple]) -> int:
+        total = 0
+        for name, _args, grand in children:
+            if name in ("pageInfo", "totalCount", "__typename"):
+                continue
+            if grand is None:
+                total += 1
+            elif any(g[0] == "edges" for g in grand):
+                collect(name, _args, grand)  # child relationship: its own object
+            elif all(g[2] is None and g[0] in _VALUE_LEAVES for g in grand):
+                total += 1
+            else:
+                total += width(grand)
+        return total
+
+    def collect(name: str, args: dict[str, str], children: list[tuple]):
+        entry: dict[str, Any] = {"name": name, "page_size": None, "fields": 0}
+        objects.append(entry)
+        first = args.get("first")
+        first = defaults.get(first, first) if first else str(DEFAULT_PAGE_SIZE)
+        entry["page_size"] = int(first) if first and first.lstrip("-").isdigit() else None
+        for edge_name, _a, edge_children in children:
+            if edge_name == "edges" and edge_children:
+                for node_name, _n, node_children in edge_children:
+                    if node_name == "node" and node_children:
+                        entry["fields"] += width(node_children)
+
+    def walk(fields: list[tuple]):
+        for name, args, children in fields:
+            if not children:
+                continue
+            if any(c[0] == "edges" for c in children):
+                collect(name, args, children)
+            else:
+                walk(children)
+
+    walk(selection)
+    return {
+        "objects": objects,
+        "fields": sum(o["fields"] for o in objects),
+        "page_sizes": [o["page_size"] for o in objects],
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# ANALYZER
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _match(tokens: list[Token], i: int) -> int:
+    """Index of the bracket closing the one at ``tokens[i]``."""
+    opening = tokens[i].text
+    closing = {"(": ")", "[": "]", "{": "}"}[opening]
+    depth = 0
+    for j in range(i, len(tokens)):
+        text = tokens[j].text
+        if text == opening:
+            depth += 1
+        elif text == closing:
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(tokens) - 1
+
+
+def _count_items(tokens: list[Token], start: int, end: int) -> int:
+    """Comma-separated items between brackets at ``start`` and ``end``."""
+    items, depth, seen = 0, 0, False
+    for tok in tokens[start + 1 : end]:
+        if tok.text in "([{":
+            depth += 1
+        elif tok.text in ")]}":
+            depth -= 1
+        if depth == 0 and tok.text == ",":
+            items += seen
+            seen = False
+        elif tok.kind in ("name", "string", "template"):
+            seen = True
+    return items + seen
+
+
+class DataAccessAnalyzer:
+    """Extract wires, Apex calls and GraphQL queries from one component JS file."""
+
+    def __init__(self, file_path: str, content: str | None = None):
+        self.file_path = file_path
+        if content is None:
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+        self.tokens = tokenize_js(content)
+        self.imports: dict[str, str] = {}  # local name -> module
+        self.apex: dict[str, str] = {}  # local name -> Class.method
+        self.wires: list[dict[str, Any]] = []
+        self.calls: list[dict[str, Any]] = []
+        self.queries: list[dict[str, Any]] = []
+        self.graph: dict[str, set[str]] = {}
+
+    # ── extraction ────────────────────────────────────────────────────
+    def _import(self, i: int) -> int:
+        """Record ``import ... from 'module'`` starting at ``tokens[i]``."""
+        tokens = self.tokens
+        names, j, braces = [], i + 1, False
+        while j < len(tokens) and tokens[j].kind != "string":
+            text = tokens[j].text
+            if text == "{":
+                braces = True
+            elif text == "}":
+                braces = False
+            elif text == "as" and names:
+                names.pop()
+            elif tokens[j].kind == "name" and text != "from" and (braces or not names or tokens[j - 1].text == ","):
+                names.append(text)
+            j += 1
+        if j < len(tokens):
+            module = tokens[j].text[1:-1]
+            for name in names:
+                self.imports[name] = module
+                if module.startswith(APEX_MODULE):
+                    self.apex[name] = module[len(APEX_MODULE) :]
+        return j
+
+    def _wire(self, i: int) -> int:
+        """Record ``@wire(adapter, {config})`` whose ``(`` is at ``tokens[i]``."""
+        tokens = self.tokens
+        end = _match(tokens, i)
+        adapter = tokens[i + 1].text if i + 1 < end else ""
+        module = self.imports.get(adapter, "")
+        if adapter in self.apex:
+            kind = "apex"
+        elif adapter in GRAPHQL_TAGS:
+            kind = "graphql"
+        else:
+            kind = "ui-api"
+        fields = 0
+        reactive = []
+        for j in range(i + 2, end):
+            tok = tokens[j]
+            if tok.kind == "string" and tok.text[1:2] == "$":
+                reactive.append(tok.text[2:-1])
+            elif (
+                tok.text in ("fields", "optionalFields")
+                and tokens[j + 1].text == ":"
+                and tokens[j + 2].text == "["
+            ):
+                fields += _count_items(tokens, j + 2, _match(tokens, j + 2))
+        member = tokens[end + 1].text if end + 1 < len(tokens) and tokens[end + 1].kind == "name" else ""
+        self.wires.append(
+            {
+                "adapter": adapter,
+                "module": module if adapter not in self.apex else APEX_MODULE + self.apex[adapter],
+                "kind": kind,
+                "member": member,
+                "line": tokens[i].line,
+                "reactive": reactive,
+                "fields": fields,
+            }
+        )
+        return end
+
+    def analyze(self) -> dict[str, Any]:
+        tokens = self.tokens
+        # Each open bracket: (kind, name) with kind class / method / loop / None
+        stack: list[tuple[str | None, str]] = []
+        pending: dict[int, tuple[str, str]] = {}  # token index of "{" or "(" -> frame
+        loop_statement: int | None = None  # stack depth of a brace-less loop body
+        expect_class = False
+        wire_end = -1
+
+        def context() -> tuple[str | None, bool]:
+            in_loop = loop_statement is not None
+            for kind, name in reversed(stack):
+                if kind == "loop":
+                    in_loop = True
+                elif kind == "method":
+                    return name, in_loop
+            return None, in_loop
+
+        i = 0
+        while i < len(tokens):
+            tok = tokens[i]
+            text = tok.text
+            nxt = tokens[i + 1].text if i + 1 < len(tokens) else ""
+            if i in pending and pending[i][0] == "statement" and text not in ("{", "(", "["):
+                loop_statement = len(stack)
+                del pending[i]
+            if tok.kind == "name":
+                if text == "import" and not stack and nxt not in ("(", "."):
+                    i = self._import(i) + 1
+                    continue
+                if text == "wire" and i and tokens[i - 1].text == "@" and nxt == "(":
+                    wire_end = self._wire(i + 1)
+                elif text == "class":
+                    expect_class = True
+                elif text in LOOP_KEYWORDS and nxt == "(":
+                    close = _match(tokens, i + 1)
+                    if close + 1 < len(tokens) and tokens[close + 1].text == "{":
+                        pending[close + 1] = ("loop", text)
+                    else:
+                        pending[close + 1] = ("statement", text)
+                elif text == "do" and nxt == "{":
+                    pending[i + 1] = ("loop", text)
+                elif text in LOOP_CALLBACKS and nxt == "(" and i and tokens[i - 1].text in (".", "?."):
+                    pending[i + 1] = ("loop", text)
+                elif (
+                    nxt == "("
+                    and stack
+                    and stack[-1][0] == "class"
+                    and text not in _NOT_METHODS
+                ):
+                    close = _match(tokens, i + 1)
+                    if close + 1 < len(tokens) and tokens[close + 1].text == "{":
+                        pending[close + 1] = ("method", text)
+                elif text == "this" and nxt == "." and i + 3 < len(tokens) and tokens[i + 3].text == "(":
+                    method, _ = context()
+                    if method:
+                        self.graph.setdefault(method, set()).add(tokens[i + 2].text)
+                elif text in self.apex and nxt == "(" and i > wire_end and tokens[i - 1].text not in (".", "?."):
+                    method, in_loop = context()
+                    self.calls.append(
+                        {
+                            "method": self.apex[text],
+                            "line": tok.line,
+                            "caller": method,
+                            "in_loop": in_loop,
+                        }
+                    )
+            elif tok.kind == "template" and i and tokens[i - 1].text in GRAPHQL_TAGS:
+                query = parse_graphql(text[1:-1])
+                query["line"] = tok.line
+                self.queries.append(query)
+            elif text in ("{", "(", "["):
+                kind, name = pending.pop(i, (None, ""))
+                if kind == "statement":
+                    loop_statement = len(stack)
+                    kind = None
+                if text == "{" and expect_class:
+                    kind, expect_class = "class", False
+                stack.append((kind, name))
+            elif text in ("}", ")", "]"):
+                if stack:
+                    stack.pop()
+                if loop_statement is not None and len(stack) < loop_statement:
+                    loop_statement = None
+            elif text == ";" and loop_statement is not None and len(stack) == loop_statement:
+                loop_statement = None
+            i += 1
+        return self._summary()
+
+    # ── estimation ────────────────────────────────────────────────────
+    def _reachable(self, roots) -> set[str]:
+        seen: set[str] = set()
+        todo = list(roots)
+        while todo:
+            method = todo.pop()
+            if method in seen:
+                continue
+            seen.add(method)
+            todo.extend(self.graph.get(method, ()))
+        return seen
+
+    def _summary(self) -> dict[str, Any]:
+        every_render = self._reachable([RENDER_ROOT])
+        initial = self._reachable(INITIAL_ROOTS)
+        trips = {"first_render": len(self.wires), "each_rerender": 0, "on_demand": 0}
+        issues = []
+        for call in self.calls:
+            fanout = LOOP_FANOUT if call["in_loop"] else 1
+            if call["caller"] in every_render:
+                call["phase"] = "every_render"
+                trips["first_render"] += fanout
+                trips["each_rerender"] += fanout
+                issues.append(
+                    {
+                        "severity": "CRITICAL",
+                        "category": "data_access",
+                        "message": f"Apex {call['method']} is called on every render (via {call['caller']})",
+                        "line": call["line"],
+                        "fix": "Call from connectedCallback or use @wire; guard renderedCallback with a flag",
+                    }
+                )
+            elif call["caller"] in initial:
+                call["phase"] = "initial"
+                trips["first_render"] += fanout
+            else:
+                call["phase"] = "on_demand"
+                trips["on_demand"] += fanout
+            if call["in_loop"]:
+                issues.append(
+                    {
+                        "severity": "CRITICAL",
+                        "category": "data_access",
+                        "message": f"Apex {call['method']} is called inside a loop (one round trip per item)",
+                        "line": call["line"],
+                        "fix": "Pass the whole collection to one Apex method that bulkifies the work",
+                    }
+                )
+        if len(self.wires) > MAX_WIRES:
+            issues.append(
+                {
+                    "severity": "WARNING",
+                    "category": "data_access",
+                    "message": f"{len(self.wires)} @wire adapters in one component (more than {MAX_WIRES})",
+                    "line": self.wires[MAX_WIRES]["line"],
+                    "fix": "Combine reads into one GraphQL query or one Apex method",
+                }
+            )
+        for query in self.queries:
+            for obj in query["objects"]:
+                if obj["page_size"] is not None and obj["page_size"] > MAX_PAGE_SIZE:
+                    issues.append(
+                        {
+                            "severity": "WARNING",
+                            "category": "data_access",
+                            "message": f"GraphQL {obj['name']} requests {obj['page_size']} records per page",
+                            "line": query["line"],
+                            "fix": f"Page with first: {MAX_PAGE_SIZE} or less and pageInfo.endCursor",
+                        }
+                    )
+        width = sum(w["fields"] for w in self.wires) + sum(q["fields"] for q in self.queries)
+        rows = sum(size or 0 for q in self.queries for size in q["page_sizes"])
+        return {
+            "file": self.file_path,
+            "component": os.path.splitext(os.path.basename(self.file_path))[0],
+            "wires": self.wires,
+            "apex_imports": self.apex,
+            "apex_calls": self.calls,
+            "graphql": self.queries,
+            "round_trips": trips,
+            "payload_width": width,
+            "page_rows": rows,
+            "issues": sorted(issues, key=lambda issue: issue["line"]),
+        }
+
+
+def analyze_file(file_path: str, content: str | None = None) -> dict[str, Any]:
+    return DataAccessAnalyzer(file_path, content).analyze()
+
+
+def _component_files(root: str) -> list[str]:
+    """The main .js file of every bundle under ``root`` (``<name>/<name>.js``)."""
+    if os.path.isfile(root):
+        return [root]
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+        main = os.path.basename(dirpath) + ".js"
+        if main in filenames:
+            found.append(os.path.join(dirpath, main))
+    return found
+
+
+def rank_key(result: dict[str, Any]) -> tuple[int, int, int, int]:
+    trips = result["round_trips"]
+    return trips["first_render"], trips["each_rerender"], result["payload_width"], result["page_rows"]
+
+
+def analyze_directory(root: str) -> list[dict[str, Any]]:
+    """Analyze every bundle under ``root``, worst (most round trips) first."""
+    results = []
+    for path in _component_files(root):
+        try:
+            results.append(analyze_file(path))
+        except (OSError, UnicodeDecodeError):
+            continue
+    return sorted(results, key=rank_key, reverse=True)
+
+
+def _format_report(results: list[dict[str, Any]], top: int) -> str:
+    parts = ["", f"📡 LWC Data Access: {len(results)} component(s)", "=" * 60]
+    for result in results[:top]:
+        trips = result["round_trips"]
+        parts.append(
+            f"{result['component']}: {trips['first_render']} round trip(s) on first render, "
+            f"{trips['each_rerender']} per re-render, {trips['on_demand']} on demand; "
+            f"{result['payload_width']} field(s), {result['page_rows']} row(s)/page"
+        )
+        for issue in result["issues"]:
+            parts.append(f"   {issue['severity']} L{issue['line']}: {issue['message']}")
+    if len(results) > top:
+        parts.append(f"... and {len(results) - top} more")
+    parts.append("=" * 60)
+    return "\n".join(parts)
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Usage: python lwc_data_access.py <lwc_dir | bundle_dir | file.js> [--json] [--top N]")
+        sys.exit(1)
+    top = 10
+    if "--top" in sys.argv:
+        try:
+            top = int(sys.argv[sys.argv.index("--top") + 1])
+            args = [a for a in args if a != str(top)]
+        except (IndexError, ValueError):
+            pass
+    results = analyze_directory(args[0])
+    if "--json" in sys.argv:
+        print(json.dumps(results[:top], indent=2))
+    else:
+        print(_format_report(results, top))
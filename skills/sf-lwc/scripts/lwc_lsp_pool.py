@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Warm LWC Language Server Pool
+=============================
+
+Keeps one initialized LWC language server (@salesforce/lwc-language-server)
+per workspace in a background process, so the PostToolUse hook
+(lwc-lsp-validate.py) does not pay for a Node cold start, ``initialize`` and
+project indexing on every edit.
+
+    hook ──(unix socket, one JSON line)──► pool daemon ──(stdio JSON-RPC)──► language server
+
+The daemon opens each file once (``didOpen``) and sends later edits as
+``didChange`` — a single range edit covering the changed span when the server
+supports incremental sync, the full text otherwise — then waits for the
+file's ``publishDiagnostics`` with a timeout. It shuts the server down and
+exits after IDLE_TIMEOUT seconds without a request.
+
+The first request for a workspace starts the daemon and waits for it;
+validate() returns None when the pool cannot be used (disabled, no server
+command, no unix sockets), and the hook falls back to a one-shot client.
+
+Environment:
+    SF_LWC_LSP_POOL=0        disable the pool
+    SF_LWC_LSP_COMMAND       server command line (default: lsp-engine
+                             lwc_wrapper.sh, else ``lwc-language-server --stdio``)
+    SF_LWC_LSP_IDLE          idle seconds before the daemon exits (default 600)
+
+Usage:
+    python lwc_lsp_pool.py check <file.js>
+    python lwc_lsp_pool.py stop <file-or-workspace>
+    python lwc_lsp_pool.py serve --workspace DIR [--idle SECONDS] -- <server command>
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+SCRIPT_DIR = Path(__file__).parent
+LSP_ENGINE_PATH = SCRIPT_DIR.parent.parent.parent / "shared" / "lsp-engine"
+
+POOL_ENV = "SF_LWC_LSP_POOL"
+COMMAND_ENV = "SF_LWC_LSP_COMMAND"
+IDLE_ENV = "SF_LWC_LSP_IDLE"
+
+IDLE_TIMEOUT = 600.0
+# initialize can include indexing the whole project on a cold start
+STARTUP_TIMEOUT = 60.0
+DIAGNOSTICS_TIMEOUT = 10.0
+# After the first publishDiagnostics, how long to wait for follow-up publishes
+SETTLE_SECONDS = 0.1
+
+# Exit code of a daemon that found another one already serving the workspace
+EXIT_ALREADY_RUNNING = 3
+
+# LSP TextDocumentSyncKind
+SYNC_NONE, SYNC_FULL, SYNC_INCREMENTAL = 0, 1, 2
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Language server session (stdio JSON-RPC)
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def text_change(old: str, new: str) -> dict[str, Any]:
+    """One incremental ``didChange`` content change turning ``old`` into ``new``.
+
+    The range spans from the first to the last differing character; positions
+    are (line, UTF-16 code unit) as LSP requires.
+    """
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[len(old) - 1 - end] == new[len(new) - 1 - end]:
+        end += 1
+    return {
+        "range": {"start": _position(old, start), "end": _position(old, len(old) - end)},
+        "text": new[start : len(new) - end],
+    }
+
+
+def _position(text: str, offset: int) -> dict[str, int]:
+    line_start = text.rfind("\n", 0, offset) + 1
+    return {
+        "line": text.count("\n", 0, offset),
+        "character": len(text[line_start:offset].encode("utf-16-le")) // 2,
+    }
+
+
+class LSPError(RuntimeError):
+    """The language server failed, exited or did not answer in time."""
+
+
+class LSPSession:
+    """An initialized language server process with open-document tracking."""
+
+    def __init__(self, command: list[str], root: str, timeout: float = STARTUP_TIMEOUT):
+        self.root = root
+        try:
+            self.proc = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=root,
+            )
+        except OSError as e:
+            raise LSPError(f"Cannot start language server: {e}") from e
+        self._write_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._next_id = 0
+        self._responses: dict[int, dict[str, Any]] = {}
+        # uri -> (publish sequence number, version, diagnostics)
+        self._published: dict[str, tuple[int, int | None, list]] = {}
+        self._seq = 0
+        # uri -> (version, text) of documents open on the server
+        self.documents: dict[str, tuple[int, str]] = {}
+        threading.Thread(target=self._read_loop, daemon=True).start()
+
+        root_uri = Path(root).resolve().as_uri()
+        result = self.request(
+            "initialize",
+            {
+                "processId": os.getpid(),
+                "rootUri": root_uri,
+                "workspaceFolders": [{"uri": root_uri, "name": Path(root).name}],
+                "capabilities": {
+                    "textDocument": {
+                        "synchronization": {"didSave": False},
+                        "publishDiagnostics": {"versionSupport": True},
+                    }
+                },
+            },
+            timeout,
+        )
+        sync = (result or {}).get("capabilities", {}).get("textDocumentSync", SYNC_FULL)
+        self.sync_kind = sync.get("change", SYNC_NONE) if isinstance(sync, dict) else sync
+        self.notify("initialized", {})
+
+    # ── transport ─────────────────────────────────────────────────────
+    def _send(self, message: dict[str, Any]):
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode("utf-8")
+        with self._write_lock:
+            try:
+                self.proc.stdin.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+                self.proc.stdin.flush()
+            except (BrokenPipeError, ValueError, OSError) as e:
+                raise LSPError(f"Language server is not running: {e}") from e
+
+    def _read_message(self) -> dict[str, Any] | None:
+        length = None
+        while True:
+            header = self.proc.stdout.readline()
+            if not header:
+                return None
+            header = header.strip()
+            if not header:
+                break
+            name, _, value = header.decode("ascii", "replace").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        if length is None:
+            return {}
+        return json.loads(self.proc.stdout.read(length))
+
+    def _read_loop(self):
+        while True:
+            try:
+                message = self._read_message()
+            except (OSError, ValueError):
+                message = None
+            if message is None:
+                with self._cond:
+                    self._cond.notify_all()
+                return
+            if "method" in message and "id" in message:
+                self._answer_server_request(message)
+            elif "id" in message:
+                with self._cond:
+                    self._responses[message["id"]] = message
+                    self._cond.notify_all()
+            elif message.get("method") == "textDocument/publishDiagnostics":
+                params = message.get("params", {})
+                with self._cond:
+                    self._seq += 1
+                    self._published[params.get("uri", "")] = (
+                        self._seq,
+                        params.get("version"),
+                        params.get("diagnostics", []),
+                    )
+                    self._cond.notify_all()
+
+    def _answer_server_request(self, message: dict[str, Any]):
+        # Servers block on some requests (configuration, capability
+        # registration, progress tokens); an empty answer keeps them going.
+        result = None
+        if message["method"] == "workspace/configuration":
+            result = [None] * len(message.get("params", {}).get("items", []))
+        try:
+            self._send({"id": message["id"], "result": result})
+        except LSPError:
+            pass
+
+    def request(self, method: str, params: Any, timeout: float) -> Any:
+        with self._cond:
+            self._next_id += 1
+            request_id = self._next_id
+        self._send({"id": request_id, "method": method, "params": params})
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: request_id in self._responses or not self.alive(), timeout
+            ):
+                raise LSPError(f"No response to {method} within {timeout:g}s")
+            response = self._responses.pop(request_id, None)
+        if response is None:
+            raise LSPError(f"Language server exited during {method}")
+        if "error" in response:
+            raise LSPError(f"{method} failed: {response['error'].get('message', response['error'])}")
+        return response.get("result")
+
+    def notify(self, method: str, params: Any):
+        self._send({"method": method, "params": params})
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    # ── documents ─────────────────────────────────────────────────────
+    def check(self, path: str, text: str | None = None, timeout: float = DIAGNOSTICS_TIMEOUT) -> dict[str, Any]:
+        """Sync a file to the server and return its diagnostics.
+
+        Returns ``{"success": bool, "diagnostics": [...]}`` (success means no
+        error-severity diagnostic) or ``{"error": message}``.
+        """
+        if text is None:
+            text = Path(path).read_text(encoding="utf-8")
+        uri = Path(path).resolve().as_uri()
+        previous = self.documents.get(uri)
+        with self._cond:
+            if previous and previous[1] == text and uri in self._published:
+                return _result(self._published[uri][2])  # unchanged since last check
+            start_seq = self._seq
+
+        if previous is None:
+            version = 1
+            self.notify(
+                "textDocument/didOpen",
+                {"textDocument": {"uri": uri, "languageId": "javascript", "version": version, "text": text}},
+            )
+        else:
+            version = previous[0] + 1
+            change = text_change(previous[1], text) if self.sync_kind == SYNC_INCREMENTAL else {"text": text}
+            self.notify(
+                "textDocument/didChange",
+                {"textDocument": {"uri": uri, "version": version}, "contentChanges": [change]},
+            )
+        self.documents[uri] = (version, text)
+
+        def published(after: int) -> bool:
+            seq, published_version, _ = self._published.get(uri, (0, None, []))
+            return seq > after and (published_version is None or published_version >= version)
+
+        with self._cond:
+            if not self._cond.wait_for(lambda: published(start_seq) or not self.alive(), timeout):
+                return {"error": f"No diagnostics from the language server within {timeout:g}s"}
+            if not self.alive():
+                return {"error": "Language server exited"}
+            seen = self._seq
+            self._cond.wait_for(lambda: published(seen), SETTLE_SECONDS)
+            return _result(self._published[uri][2])
+
+    def close(self, timeout: float = 5.0):
+        """shutdown + exit, then make sure the process is gone."""
+        try:
+            if self.alive():
+                self.request("shutdown", None, timeout)
+                self.notify("exit", None)
+                self.proc.wait(timeout)
+        except (LSPError, subprocess.TimeoutExpired):
+            pass
+        if self.alive():
+            self.proc.kill()
+            self.proc.wait()
+
+
+def _result(diagnostics: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "success": not any(d.get("severity", 1) == 1 for d in diagnostics),
+        "diagnostics": diagnostics,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Pool daemon
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def find_workspace(file_path: str) -> str:
+    """Nearest ancestor with sfdx-project.json, else the folder holding lwc/."""
+    path = Path(file_path).resolve()
+    for parent in path.parents:
+        if (parent / "sfdx-project.json").is_file():
+            return str(parent)
+    for parent in path.parents:
+        if parent.name == "lwc":
+            return str(parent.parent)
+    return str(path.parent)
+
+
+def socket_path(workspace: str, command: list[str]) -> str:
+    """Per-(workspace, server command) socket, short enough for AF_UNIX."""
+    key = json.dumps([os.path.realpath(workspace), command])
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    runtime_dir = os.path.join(tempfile.gettempdir(), "sf-lwc-lsp")
+    os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+    return os.path.join(runtime_dir, f"{digest}.sock")
+
+
+def serve(workspace: str, command: list[str], idle_timeout: float = IDLE_TIMEOUT) -> int:
+    """Run the pool daemon for one workspace until idle or told to stop."""
+    import fcntl
+
+    sock_path = socket_path(workspace, command)
+    lock = open(sock_path + ".lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return EXIT_ALREADY_RUNNING
+
+    try:
+        session = LSPSession(command, workspace)
+    except LSPError as e:
+        print(f"lwc_lsp_pool: {e}", file=sys.stderr)
+        lock.close()
+        return 1
+
+    if os.path.exists(sock_path):
+        os.unlink(sock_path)  # left behind by a daemon that died; we hold the lock
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(sock_path)
+    server.listen(8)
+    last_request = time.monotonic()
+    try:
+        while session.alive():
+            remaining = idle_timeout - (time.monotonic() - last_request)
+            if remaining <= 0:
+                break
+            server.settimeout(min(remaining, 1.0))
+            try:
+                conn, _ = server.accept()
+            except TimeoutError:
+                continue
+            with conn:
+                request = _handle(conn, session)
+            last_request = time.monotonic()
+            if request.get("op") == "stop":
+                break
+    finally:
+        server.close()
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+        session.close()
+        lock.close()
+    return 0
+
+
+def _handle(conn: socket.socket, session: LSPSession) -> dict[str, Any]:
+    conn.settimeout(5.0)
+    try:
+        request = json.loads(_read_line(conn) or "{}")
+    except (OSError, ValueError):
+        return {}
+    op = request.get("op")
+    if op == "check":
+        try:
+            response = session.check(request["path"], timeout=request.get("timeout", DIAGNOSTICS_TIMEOUT))
+        except (OSError, LSPError) as e:
+            response = {"error": str(e)}
+    else:
+        response = {"ok": op in ("ping", "stop")}
+    try:
+        conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+    except OSError:
+        pass
+    return request
+
+
+def _read_line(conn: socket.socket) -> str:
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode("utf-8")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Client
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def server_command() -> list[str] | None:
+    """Language server command line, or None when none is available."""
+    if os.environ.get(COMMAND_ENV):
+        return shlex.split(os.environ[COMMAND_ENV])
+    wrapper = LSP_ENGINE_PATH / "lwc_wrapper.sh"
+    if wrapper.exists():
+        return [str(wrapper)]
+    if shutil.which("lwc-language-server"):
+        return ["lwc-language-server", "--stdio"]
+    return None
+
+
+def pool_enabled() -> bool:
+    return os.environ.get(POOL_ENV, "1") != "0" and hasattr(socket, "AF_UNIX")
+
+
+def _request(sock_path: str, payload: dict[str, Any], timeout: float) -> dict[str, Any] | None:
+    """Send one request to a daemon; None when no daemon is listening."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(sock_path)
+    except OSError:
+        client.close()
+        return None
+    try:
+        client.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        line = _read_line(client)
+    except OSError as e:
+        return {"error": f"LSP pool request failed: {e}"}
+    finally:
+        client.close()
+    try:
+        return json.loads(line)
+    except ValueError:
+        return {"error": "LSP pool closed the connection"}
+
+
+def _spawn(workspace: str, command: list[str]) -> subprocess.Popen:
+    idle = os.environ.get(IDLE_ENV, str(IDLE_TIMEOUT))
+    return subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "serve", "--workspace", workspace, "--idle", idle, "--", *command],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def validate(
+    file_path: str,
+    command: list[str] | None = None,
+    workspace: str | None = None,
+    timeout: float = DIAGNOSTICS_TIMEOUT,
+    startup_timeout: float = STARTUP_TIMEOUT,
+) -> dict[str, Any] | None:
+    """Diagnostics for ``file_path`` from the workspace's warm language server.
+
+    Starts the daemon if none is running. Returns the LSPSession.check()
+    result, or None when the pool is disabled or cannot be started (the
+    caller should fall back to a one-shot client).
+    """
+    if not pool_enabled():
+        return None
+    command = command or server_command()
+    if not command:
+        return None
+    workspace = workspace or find_workspace(file_path)
+    sock_path = socket_path(workspace, command)
+    payload = {"op": "check", "path": str(Path(file_path).resolve()), "timeout": timeout}
+
+    response = _request(sock_path, payload, timeout + 5)
+    if response is not None:
+        return response
+
+    proc = _spawn(workspace, command)
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(sock_path):
+            response = _request(sock_path, payload, timeout + 5)
+            if response is not None:
+                return response
+        code = proc.poll()
+        if code is not None and code != EXIT_ALREADY_RUNNING:
+            return None  # daemon failed to start the server
+        time.sleep(0.05)
+    return None
+
+
+def stop(path: str, command: list[str] | None = None) -> bool:
+    """Ask the daemon serving ``path``'s workspace to shut down."""
+    command = command or server_command()
+    if not command or not pool_enabled():
+        return False
+    workspace = path if os.path.isdir(path) else find_workspace(path)
+    return _request(socket_path(workspace, command), {"op": "stop"}, 5.0) is not None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Warm LWC language server pool")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    check_p = sub.add_parser("check", help="Print diagnostics for a file as JSON")
+    check_p.add_argument("file")
+    stop_p = sub.add_parser("stop", help="Stop the daemon for a file's workspace")
+    stop_p.add_argument("path")
+    serve_p = sub.add_parser("serve", help="Run the daemon (started automatically)")
+    serve_p.add_argument("--workspace", required=True)
+    serve_p.add_argument("--idle", type=float, default=IDLE_TIMEOUT)
+    serve_p.add_argument("server", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        command = args.server[1:] if args.server[:1] == ["--"] else args.server
+        return serve(args.workspace, command, args.idle)
+    if args.cmd == "stop":
+        return 0 if stop(args.path) else 1
+    result = validate(args.file)
+    print(json.dumps(result if result is not None else {"error": "LSP pool unavailable"}, indent=2))
+    return 0 if result and result.get("success") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+LWC Template Parser.
+
+Event-style parser for LWC HTML templates built on the standard library's
+html.parser. One pass over the source yields the template's elements and
+text runs in document order:
+
+    Element   tag, attributes (original spelling, value, line), parent,
+              iteration directive (for:each / iterator:*)
+    Text      text with its {expression}s
+
+Every node, attribute and expression carries the 1-based line it starts on,
+including multi-line tags and expressions. Comments produce no nodes.
+
+LWC expressions may contain characters that end a tag or an attribute value
+in plain HTML (``if:true={a > b}``, ``title={'x'}``), so ``<``, ``>`` and
+quotes inside ``{...}`` are masked before the text reaches HTMLParser; the
+original text is recovered by offset.
+
+Usage:
+    from lwc_template_parser import parse_template, Element, Text
+    for node in parse_template(source):
+        ...
+"""
+
+import re
+from bisect import bisect_right
+from html.parser import HTMLParser
+
+# {expr}, allowing one level of nested braces ({{a: 1}} object literals)
+EXPRESSION_RE = re.compile(r"\{(?:[^{}]|\{[^{}]*\})*\}")
+_MASK_RE = re.compile(r"""[<>"'`]""")
+_ATTR_RE = re.compile(
+    r"""([^\s"'>/=]+)(?:\s*=\s*("[^"]*"|'[^']*'|\{(?:[^{}]|\{[^{}]*\})*\}|[^\s"'>]+))?"""
+)
+_PATH_RE = re.compile(r"\s*([A-Za-z_$][\w$]*)(?:\.[\w$.]*)?\s*")
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr",
+}
+
+
+class Expression:
+    """A ``{...}`` expression; ``text`` excludes the braces."""
+
+    __slots__ = ("text", "line")
+
+    def __init__(self, text: str, line: int):
+        self.text = text
+        self.line = line
+
+    @property
+    def path_root(self) -> str | None:
+        """First identifier of a plain property path (``record`` for ``{record.Name}``)."""
+        match = _PATH_RE.fullmatch(self.text)
+        return match.group(1) if match else None
+
+
+class Attribute:
+    """One attribute as written: ``name`` keeps its case, ``value`` drops the quotes
+    (None for bare attributes), ``source`` is the ``name=value`` text."""
+
+    __slots__ = ("name", "value", "line", "source", "expression")
+
+    def __init__(self, name: str, value: str | None, line: int, source: str, expression: Expression | None):
+        self.name = name
+        self.value = value
+        self.line = line
+        self.source = source
+        self.expression = expression
+
+
+class Element:
+    __slots__ = ("tag", "attrs", "line", "parent", "children")
+
+    def __init__(self, tag: str, attrs: list[Attribute], line: int, parent: "Element | None"):
+        self.tag = tag
+        self.attrs = attrs
+        self.line = line
+        self.parent = parent
+        self.children: list[Element] = []
+
+    def get(self, name: str) -> Attribute | None:
+        lowered = name.lower()
+        for attr in self.attrs:
+            if attr.name.lower() == lowered:
+                return attr
+        return None
+
+    @property
+    def iteration(self) -> Attribute | None:
+        """The for:each or iterator:* directive on this element, if any."""
+        for attr in self.attrs:
+            name = attr.name.lower()
+            if name == "for:each" or name.startswith("iterator:"):
+                return attr
+        return None
+
+
+class Text:
+    __slots__ = ("text", "line", "parent", "expressions")
+
+    def __init__(self, text: str, line: int, parent: Element | None, expressions: list[Expression]):
+        self.text = text
+        self.line = line
+        self.parent = parent
+        self.expressions = expressions
+
+
+class _TemplateParser(HTMLParser):
+    def __init__(self, source: str):
+        super().__init__(convert_charrefs=False)
+        self.source = source
+        self.line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+        self.nodes: list[Element | Text] = []
+        self.stack: list[Element] = []
+
+    # ── positions ─────────────────────────────────────────────────────
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def _line(self, offset: int) -> int:
+        return bisect_right(self.line_starts, offset)
+
+    def _expressions(self, text: str, offset: int) -> list[Expression]:
+        return [
+            Expression(m.group()[1:-1], self._line(offset + m.start()))
+            for m in EXPRESSION_RE.finditer(text)
+        ]
+
+    # ── events ────────────────────────────────────────────────────────
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, closed=tag in VOID_ELEMENTS)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, closed=True)
+
+    def _start(self, tag: str, closed: bool):
+        offset = self._offset()
+        raw = self.source[offset : offset + len(self.get_starttag_text())]
+        parent = self.stack[-1] if self.stack else None
+        name_end = re.match(r"<\s*[^\s/>]+", raw).end()
+        attrs = []
+        for match in _ATTR_RE.finditer(raw, name_end, len(raw) - 1):
+            value = match.group(2)
+            attr_offset = offset + match.start()
+            expression = None
+            if value is not None:
+                value_offset = offset + match.start(2)
+                if value[:1] in ("'", '"'):
+                    value, value_offset = value[1:-1], value_offset + 1
+                if EXPRESSION_RE.fullmatch(value):
+                    expression = Expression(value[1:-1], self._line(value_offset))
+            attrs.append(
+                Attribute(match.group(1), value, self._line(attr_offset), match.group(), expression)
+            )
+        element = Element(tag, attrs, self._line(offset), parent)
+        if parent is not None:
+            parent.children.append(element)
+        self.nodes.append(element)
+        if not closed:
+            self.stack.append(element)
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        offset = self._offset()
+        text = self.source[offset : offset + len(data)]
+        self.nodes.append(
+            Text(text, self._line(offset), self.stack[-1] if self.stack else None, self._expressions(text, offset))
+        )
+
+
+def mask_expressions(source: str) -> str:
+    """Hide ``<``, ``>`` and quotes inside ``{...}`` from HTMLParser (same length)."""
+    return EXPRESSION_RE.sub(lambda m: _MASK_RE.sub("_", m.group()), source)
+
+
+def parse_template(source: str) -> list[Element | Text]:
+    """Parse an LWC template into Element and Text nodes in document order."""
+    parser = _TemplateParser(source)
+    parser.feed(mask_expressions(source))
+    parser.close()
+    return parser.nodes
+
+
+def elements(nodes: list[Element | Text]) -> list[Element]:
+    return [node for node in nodes if isinstance(node, Element)]
+
+
+def iteration_owner(element: Element) -> Element | None:
+    """The iterating element whose items ``element`` renders, if it is one.
+
+    Direct children of a for:each / iterator element need a ``key``; nested
+    ``<template>`` wrappers (``lwc:if`` inside the loop) are looked through.
+    """
+    if element.tag == "template":
+        return None
+    parent = element.parent
+    while parent is not None and parent.tag == "template" and parent.iteration is None:
+        parent = parent.parent
+    if parent is not None and parent.iteration is not None:
+        return parent
+    return None
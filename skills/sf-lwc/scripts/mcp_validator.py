@@ -3,11 +3,22 @@
 
 Validates LightningComponentBundle payloads sent through metadata MCP tools and
 returns a stable, machine-readable result for orchestration logic.
+
+Each lwcResource is validated on its own, under its own file path, so issues
+carry the right file and line. Sources are Base64-decoded lazily, and only
+for file types with rules (.html, .css, .js; the .js-meta.xml only when the
+apiVersion is not a top-level field). On metadata_update, resources whose
+source hash matches the last validated version of the same bundle reuse that
+result instead of being decoded and re-validated.
+
+Cache: one JSON file per bundle fullName under CACHE_DIR.
 """
 
 from __future__ import annotations
 
 import base64
+import hashlib
+import json
 import os
 import re
 import sys
@@ -20,6 +31,15 @@ _SCRIPT_DIR = str(Path(__file__).resolve().parent)
 SUPPORTED_TOOLS = ("metadata_create", "metadata_update", "tooling_api_dml")
 TARGET_METADATA_TYPE = "LightningComponentBundle"
 
+# Resource types with rules; everything else in a bundle is never decoded
+RULED_EXTENSIONS = (".html", ".css", ".js")
+
+CACHE_DIR = Path(tempfile.gettempdir()) / "sf_lwc_mcp_validator"
+CACHE_VERSION = 1
+# Hashed into every resource digest; bump whenever validate_slds, template_validator
+# or the version-floor rules change so results saved by an older rule set are not reused
+RULES_VERSION = 1
+
 
 def _parse_api_version(value: Any) -> float | None:
     """Parse an apiVersion value ('67.0', 67, 67.0) to float, None if absent/bad."""
@@ -47,19 +67,45 @@ def _maybe_b64decode(source: str) -> str:
     return decoded
 
 
-def _extract_payload(tool: str, params: dict[str, Any]) -> tuple[str, str, str, str, float | None]:
-    """Extract (metadata_type, content, full_name, js_content, api_version) from MCP params.
+class _Resource:
+    """One bundle file as sent in the payload; decoded on first access to text."""
+
+    __slots__ = ("file_path", "raw", "_text")
+
+    def __init__(self, file_path: str, raw: str):
+        self.file_path = file_path
+        self.raw = raw
+        self._text: str | None = None
+
+    @property
+    def extension(self) -> str:
+        if self.file_path.endswith(".js-meta.xml"):
+            return ".js-meta.xml"
+        return os.path.splitext(self.file_path)[1].lower()
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = _maybe_b64decode(self.raw)
+        return self._text
+
+    def digest(self, api_version: float | None) -> str:
+        """Hash of the payload source and the rules and version floors it is judged against."""
+        return hashlib.sha256(f"{RULES_VERSION}\0{api_version}\0{self.raw}".encode()).hexdigest()
+
+
+def _extract_payload(tool: str, params: dict[str, Any]) -> tuple[str, str, list[_Resource], float | None]:
+    """Extract (metadata_type, full_name, resources, api_version) from MCP params.
 
     api_version comes from the top-level metadata field (the MCP deploy format —
     the .js-meta.xml is generated server-side from it), falling back to a
     .js-meta.xml resource when one is included; None when neither is present.
-    js_content joins the bundle's .js sources. Sources are Base64-decoded when
-    encoded, per the MCP deploy format.
+    Inline content (content/body/html, or the Tooling API Body) becomes an
+    .html resource named after the bundle. No source is decoded here.
     """
     metadata_type = ""
-    content = ""
     full_name = ""
-    js_content = ""
+    resources: list[_Resource] = []
     api_version: float | None = None
 
     if tool in ("metadata_create", "metadata_update"):
@@ -72,38 +118,33 @@ def _extract_payload(tool: str, params: dict[str, Any]) -> tuple[str, str, str,
                 api_version = _parse_api_version(first.get("apiVersion", first.get("ApiVersion")))
                 # Most common representations for tests and integrations.
                 content = first.get("content", "") or first.get("body", "") or first.get("html", "")
+                if isinstance(content, str) and content:
+                    resources.append(_Resource(f"{full_name or 'component'}.html", content))
 
                 resources_raw = first.get("lwcResources", [])
                 # The MCP tool sends {"lwcResource": [...]} (dict), not a flat list.
                 # Handle both formats for forward compatibility.
                 if isinstance(resources_raw, dict):
-                    resources = resources_raw.get("lwcResource", [])
+                    entries = resources_raw.get("lwcResource", [])
                 elif isinstance(resources_raw, list):
-                    resources = resources_raw
+                    entries = resources_raw
                 else:
-                    resources = []
-                if isinstance(resources, list):
-                    html_sources = []
-                    js_sources = []
-                    for r in resources:
+                    entries = []
+                if isinstance(entries, list):
+                    for r in entries:
                         if not isinstance(r, dict):
                             continue
-                        file_path = str(r.get("filePath", ""))
                         source = r.get("source", "")
-                        if not source:
-                            continue
-                        source = _maybe_b64decode(source)
-                        if file_path.endswith(".html"):
-                            html_sources.append(source)
-                        elif file_path.endswith(".js") and not file_path.endswith(".js-meta.xml"):
-                            js_sources.append(source)
-                        elif file_path.endswith(".js-meta.xml") and api_version is None:
-                            m = re.search(r"<apiVersion>\s*([\d.]+)\s*</apiVersion>", source)
+                        if source and isinstance(source, str):
+                            resources.append(_Resource(str(r.get("filePath", "")), source))
+
+                if api_version is None:
+                    for resource in resources:
+                        if resource.extension == ".js-meta.xml":
+                            m = re.search(r"<apiVersion>\s*([\d.]+)\s*</apiVersion>", resource.text)
                             if m:
                                 api_version = _parse_api_version(m.group(1))
-                    if not content:
-                        content = "\n".join(html_sources)
-                    js_content = "\n".join(js_sources)
+                                break
 
     elif tool == "tooling_api_dml":
         sobject = params.get("sObject", "")
@@ -112,9 +153,10 @@ def _extract_payload(tool: str, params: dict[str, Any]) -> tuple[str, str, str,
         if isinstance(record, dict):
             full_name = record.get("FullName", "") or record.get("DeveloperName", "")
             raw = record.get("Body", "") or record.get("Metadata", "")
-            content = raw if isinstance(raw, str) else ""
+            if isinstance(raw, str) and raw:
+                resources.append(_Resource(f"{full_name or 'component'}.html", raw))
 
-    return metadata_type, content, full_name, js_content, api_version
+    return metadata_type, full_name, resources, api_version
 
 
 # Features gated on the bundle's declared apiVersion. Floors follow the skill's
@@ -128,16 +170,15 @@ _VERSION_GATED_FEATURES = (
 )
 
 
-def _check_version_floors(html: str, js: str, api_version: float | None) -> list[dict[str, Any]]:
+def _check_version_floors(text: str, extension: str, api_version: float | None) -> list[dict[str, Any]]:
     """Flag version-gated features used below their required apiVersion."""
-    if api_version is None:
+    if api_version is None or not text:
         return []
     issues = []
     for floor, where, pattern, label in _VERSION_GATED_FEATURES:
-        if api_version >= floor:
+        if api_version >= floor or extension != f".{where}":
             continue
-        haystack = html if where == "html" else js
-        if haystack and pattern.search(haystack):
+        if pattern.search(text):
             issues.append(
                 {
                     "severity": "CRITICAL",
@@ -152,6 +193,57 @@ def _check_version_floors(html: str, js: str, api_version: float | None) -> list
     return issues
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Per-bundle cache of the last validated version
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def _cache_path(full_name: str) -> Path:
+    key = hashlib.sha256(full_name.encode("utf-8")).hexdigest()[:24]
+    return CACHE_DIR / f"{key}.json"
+
+
+def _load_state(full_name: str) -> dict[str, dict[str, Any]]:
+    """Per-file results of the last validation of this bundle ({} when none)."""
+    try:
+        entry = json.loads(_cache_path(full_name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if entry.get("version") != CACHE_VERSION or entry.get("bundle") != full_name:
+        return {}
+    return entry.get("files", {})
+
+
+def _save_state(full_name: str, files: dict[str, dict[str, Any]]):
+    path = _cache_path(full_name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "bundle": full_name, "files": files}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # The cache is an optimisation; never fail validation over it
+
+
+def _validate_resource(resource: _Resource, api_version: float | None) -> dict[str, Any]:
+    """SLDS score plus template and version-floor issues for one resource."""
+    if _SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, _SCRIPT_DIR)
+    from template_validator import LWCTemplateValidator
+    from validate_slds import SLDSValidator
+
+    text = resource.text
+    slds = SLDSValidator(resource.file_path, content=text).validate()
+    issues = []
+    if resource.extension == ".html":
+        issues.extend(LWCTemplateValidator(resource.file_path, content=text).validate().get("issues", []))
+    issues.extend(_check_version_floors(text, resource.extension, api_version))
+    for issue in issues:
+        issue["file"] = resource.file_path
+    return {"score": slds.get("score", 0), "max_score": slds.get("max_score", 0), "issues": issues}
+
+
 class LWCMCPValidator:
     """Validate MCP deployment payloads for LightningComponentBundle."""
 
@@ -174,7 +266,7 @@ class LWCMCPValidator:
                 "message": f"Unsupported tool '{tool}'",
             }
 
-        metadata_type, content, full_name, js_content, api_version = _extract_payload(tool, params)
+        metadata_type, full_name, resources, api_version = _extract_payload(tool, params)
         base["metadata_type"] = metadata_type
         if full_name:
             base["full_name"] = full_name
@@ -186,7 +278,7 @@ class LWCMCPValidator:
                 "message": f"Metadata type '{metadata_type}' is not targeted by this validator",
             }
 
-        if not str(content).strip():
+        if not any(r.extension == ".html" and r.raw.strip() for r in resources):
             return {
                 **base,
                 "status": "error",
@@ -194,28 +286,25 @@ class LWCMCPValidator:
             }
 
         try:
-            if _SCRIPT_DIR not in sys.path:
-                sys.path.insert(0, _SCRIPT_DIR)
-            from template_validator import LWCTemplateValidator
-            from validate_slds import SLDSValidator
-
-            with tempfile.NamedTemporaryFile(suffix=".html", delete=False, mode="w", encoding="utf-8") as f:
-                f.write(content)
-                temp_path = f.name
-
-            try:
-                slds = SLDSValidator(temp_path).validate()
-                template = LWCTemplateValidator(temp_path).validate()
-            finally:
-                try:
-                    os.unlink(temp_path)
-                except OSError:
-                    pass
-
-            max_score = slds.get("max_score", 0) or 1
-            base_score = slds.get("score", 0)
-            all_issues = list(template.get("issues", []))
-            all_issues.extend(_check_version_floors(content, js_content, api_version))
+            previous = _load_state(full_name) if tool == "metadata_update" and full_name else {}
+            files: dict[str, dict[str, Any]] = {}
+            reused = []
+            for resource in resources:
+                if resource.extension not in RULED_EXTENSIONS:
+                    continue
+                digest = resource.digest(api_version)
+                cached = previous.get(resource.file_path)
+                if cached is not None and cached.get("hash") == digest:
+                    reused.append(resource.file_path)
+                    files[resource.file_path] = cached
+                else:
+                    files[resource.file_path] = {**_validate_resource(resource, api_version), "hash": digest}
+            if full_name:
+                _save_state(full_name, files)
+
+            max_score = max((f["max_score"] for f in files.values()), default=0) or 1
+            base_score = round(sum(f["score"] for f in files.values()) / len(files))
+            all_issues = [issue for f in files.values() for issue in f["issues"]]
             critical = [i for i in all_issues if i.get("severity") == "CRITICAL"]
             warnings = [i for i in all_issues if i.get("severity") == "WARNING"]
 
@@ -229,6 +318,11 @@ class LWCMCPValidator:
                 "critical_count": len(critical),
                 "warning_count": len(warnings),
                 "issues": all_issues,
+                "files": {
+                    path: {"score": f["score"], "issue_count": len(f["issues"])}
+                    for path, f in files.items()
+                },
+                "reused_files": reused,
             }
         except Exception as exc:  # pragma: no cover - safety fallback
             return {
@@ -10,15 +10,41 @@ Provides integration with SLDS Linter for:
 The SLDS Linter is optional - if not installed, validation gracefully
 degrades to custom Python-based validators.
 
+Each linter run pays a Node/npx start, so lint_files() and lint_directory()
+pass many files to one ``slds-linter lint`` invocation and map the
+violations back to their files; the availability probe is cached on disk.
+
 Installation:
     npm install -g @salesforce-ux/slds-linter
 """
 
-import subprocess
+import hashlib
 import json
 import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
 from typing import Any
 
+LINTER_PACKAGE = "@salesforce-ux/slds-linter"
+
+# Availability of the linter is remembered across processes for this long,
+# per PATH / npm prefix / npx / project root. A negative answer (including a
+# probe timeout) expires quickly, so `npm i -g` takes effect within minutes.
+CACHE_DIR = Path(tempfile.gettempdir()) / "sf_lwc_slds_linter"
+AVAILABILITY_TTL = 24 * 3600
+UNAVAILABLE_TTL = 5 * 60
+
+# Longest total length of file arguments passed to one linter invocation
+# (well under ARG_MAX on Linux and macOS).
+MAX_ARGS_CHARS = 100_000
+
+# Per-invocation timeout: a base plus a little per file
+LINT_TIMEOUT = 30
+LINT_TIMEOUT_PER_FILE = 0.5
+
 
 class SLDSLinterWrapper:
     """Wrapper for npm-based SLDS Linter."""
@@ -37,25 +63,53 @@ class SLDSLinterWrapper:
         """
         Check if slds-linter is installed and available.
 
+        The answer is cached on the instance and on disk (CACHE_DIR) for
+        AVAILABILITY_TTL seconds (UNAVAILABLE_TTL when the linter is missing
+        or the probe timed out), so new processes skip the ``npx --version``
+        probe. Without npx on PATH no probe is run at all.
+
         Returns:
             True if linter is available, False otherwise
         """
         if self._available is not None:
             return self._available
 
+        key = self._availability_key()
+        if key is None:
+            self._available = False
+            return self._available
+
+        cached = _read_availability(key)
+        if cached is not None:
+            self._available = cached
+            return self._available
+
         try:
             result = subprocess.run(
-                ["npx", "@salesforce-ux/slds-linter", "--version"],
+                ["npx", LINTER_PACKAGE, "--version"],
                 capture_output=True,
                 text=True,
                 timeout=10,
+                cwd=self.project_root,
             )
             self._available = result.returncode == 0
         except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
             self._available = False
 
+        _write_availability(key, self._available)
         return self._available
 
+    def _availability_key(self) -> str | None:
+        """Cache key for the availability probe, or None when npx is missing."""
+        npx = shutil.which("npx")
+        if npx is None:
+            return None
+        prefix = os.environ.get("npm_config_prefix") or os.environ.get("NPM_CONFIG_PREFIX") or ""
+        material = json.dumps(
+            [os.environ.get("PATH", ""), prefix, os.path.realpath(npx), os.path.realpath(self.project_root)]
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:24]
+
     def lint_file(self, file_path: str) -> dict[str, Any]:
         """
         Lint a single file using SLDS Linter.
@@ -66,45 +120,127 @@ class SLDSLinterWrapper:
         Returns:
             dict with success status, violations list, and any errors
         """
+        batch = self.lint_files([file_path])
+        if not batch["success"] and not batch["file_results"]:
+            return {"success": False, "error": batch["error"], "violations": []}
+        return batch["file_results"][file_path]
+
+    def lint_files(self, file_paths: list[str]) -> dict[str, Any]:
+        """
+        Lint many files with as few linter invocations as possible.
+
+        Files are passed to one ``slds-linter lint`` run per MAX_ARGS_CHARS of
+        arguments, and violations are mapped back to their files by path.
+
+        Args:
+            file_paths: Paths of HTML/CSS files to lint
+
+        Returns:
+            dict with success status, file_results ({path: lint_file()-style
+            result}), total_violations, invocations, and unmapped violations
+            that named no input file
+        """
         if not self.is_available():
             return {
                 "success": False,
                 "error": "slds-linter not installed. Install with: npm i -g @salesforce-ux/slds-linter",
-                "violations": [],
+                "file_results": {},
+                "total_violations": 0,
+                "invocations": 0,
+                "unmapped": [],
             }
 
+        file_results: dict[str, dict[str, Any]] = {}
+        unmapped: list[dict] = []
+        errors = []
+        batches = self._batches(file_paths)
+        for batch in batches:
+            result = self._lint_batch(batch)
+            if "error" in result:
+                errors.append(result["error"])
+                for path in batch:
+                    file_results[path] = {"success": False, "error": result["error"], "violations": []}
+                continue
+            per_file, extra = self._assign(batch, result["violations"])
+            for path in batch:
+                file_results[path] = {
+                    "success": True,
+                    "violations": per_file[path],
+                    "exit_code": result["exit_code"],
+                }
+            unmapped.extend(extra)
+
+        summary = {
+            "success": not errors,
+            "file_results": file_results,
+            "total_violations": sum(len(r["violations"]) for r in file_results.values()),
+            "invocations": len(batches),
+            "unmapped": unmapped,
+        }
+        if errors:
+            summary["error"] = errors[0]
+        return summary
+
+    def _batches(self, file_paths: list[str]) -> list[list[str]]:
+        batches: list[list[str]] = []
+        size = MAX_ARGS_CHARS
+        for path in file_paths:
+            length = len(self._argument(path)) + 1
+            if size + length > MAX_ARGS_CHARS:
+                batches.append([])
+                size = 0
+            batches[-1].append(path)
+            size += length
+        return batches
+
+    def _argument(self, path: str) -> str:
+        """Shortest spelling of a path for the linter command line (run from project_root)."""
+        absolute = os.path.abspath(path)
+        try:
+            relative = os.path.relpath(absolute, self.project_root)
+        except ValueError:
+            return absolute  # different drive on Windows
+        return relative if len(relative) < len(absolute) else absolute
+
+    def _lint_batch(self, batch: list[str]) -> dict[str, Any]:
+        timeout = LINT_TIMEOUT + LINT_TIMEOUT_PER_FILE * len(batch)
         try:
             # Run SLDS Linter with JSON output
             result = subprocess.run(
-                ["npx", "@salesforce-ux/slds-linter", "lint", file_path, "--format", "json"],
+                ["npx", LINTER_PACKAGE, "lint", *(self._argument(p) for p in batch), "--format", "json"],
                 capture_output=True,
                 text=True,
-                timeout=30,
+                timeout=timeout,
                 cwd=self.project_root,
             )
-
-            violations = self._parse_output(result.stdout, result.stderr)
-
-            return {"success": True, "violations": violations, "exit_code": result.returncode}
-
         except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                "error": "slds-linter timed out after 30 seconds",
-                "violations": [],
-            }
+            return {"error": f"slds-linter timed out after {timeout:g} seconds"}
         except FileNotFoundError:
-            return {
-                "success": False,
-                "error": "npx not found - ensure Node.js is installed",
-                "violations": [],
-            }
+            return {"error": "npx not found - ensure Node.js is installed"}
         except Exception as e:
-            return {"success": False, "error": str(e), "violations": []}
+            return {"error": str(e)}
+        return {"violations": self._parse_output(result.stdout, result.stderr), "exit_code": result.returncode}
+
+    def _assign(self, batch: list[str], violations: list[dict]) -> tuple[dict[str, list[dict]], list[dict]]:
+        """Group a batch's violations by input file (matched on resolved path)."""
+        per_file: dict[str, list[dict]] = {path: [] for path in batch}
+        lookup = {os.path.realpath(os.path.abspath(path)): path for path in batch}
+        unmapped = []
+        for violation in violations:
+            reported = violation.get("file")
+            if reported:
+                path = lookup.get(os.path.realpath(os.path.join(self.project_root, reported)))
+            else:
+                path = batch[0] if len(batch) == 1 else None
+            if path is None:
+                unmapped.append(violation)
+            else:
+                per_file[path].append(violation)
+        return per_file, unmapped
 
     def lint_directory(self, dir_path: str, extensions: list[str] = None) -> dict[str, Any]:
         """
-        Lint all matching files in a directory.
+        Lint all matching files in a directory (batched, see lint_files).
 
         Args:
             dir_path: Directory path to lint
@@ -116,26 +252,16 @@ class SLDSLinterWrapper:
         if extensions is None:
             extensions = [".html", ".css"]
 
-        if not self.is_available():
-            return {
-                "success": False,
-                "error": "slds-linter not installed",
-                "file_results": {},
-                "total_violations": 0,
-            }
-
-        file_results = {}
-        total_violations = 0
-
+        file_paths = []
         for root, _dirs, files in os.walk(dir_path):
-            for file in files:
+            for file in sorted(files):
                 if any(file.endswith(ext) for ext in extensions):
-                    file_path = os.path.join(root, file)
-                    result = self.lint_file(file_path)
-                    file_results[file_path] = result
-                    total_violations += len(result.get("violations", []))
+                    file_paths.append(os.path.join(root, file))
 
-        return {"success": True, "file_results": file_results, "total_violations": total_violations}
+        result = self.lint_files(file_paths)
+        if "error" in result and not result["file_results"]:
+            result["error"] = "slds-linter not installed"
+        return result
 
     def _parse_output(self, stdout: str, stderr: str) -> list[dict]:
         """
@@ -243,6 +369,41 @@ class SLDSLinterWrapper:
         return {0: "INFO", 1: "WARNING", 2: "HIGH"}.get(level, "INFO")
 
 
+def _expired(entry: dict, now: float) -> bool:
+    ttl = AVAILABILITY_TTL if entry.get("available") else UNAVAILABLE_TTL
+    return now - entry.get("checked", 0) > ttl
+
+
+def _read_availability(key: str) -> bool | None:
+    try:
+        with open(CACHE_DIR / "availability.json", encoding="utf-8") as f:
+            entry = json.load(f).get(key)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or _expired(entry, time.time()):
+        return None
+    return bool(entry.get("available"))
+
+
+def _write_availability(key: str, available: bool):
+    path = CACHE_DIR / "availability.json"
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        now = time.time()
+        entries = {k: v for k, v in entries.items() if isinstance(v, dict) and not _expired(v, now)}
+        entries[key] = {"available": available, "checked": now}
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entries), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache is an optimisation only
+
+
 def is_slds_linter_available() -> bool:
     """
     Convenience function to check if SLDS Linter is available.
@@ -272,10 +433,16 @@ if __name__ == "__main__":
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python slds_linter_wrapper.py <file.html|file.css>")
+        print("Usage: python slds_linter_wrapper.py <file.html|file.css|directory> [...]")
         print("\nChecking SLDS Linter availability...")
         print(f"Available: {is_slds_linter_available()}")
         sys.exit(0)
 
-    result = lint_lwc_file(sys.argv[1])
+    wrapper = SLDSLinterWrapper()
+    if len(sys.argv) == 2 and os.path.isdir(sys.argv[1]):
+        result = wrapper.lint_directory(sys.argv[1])
+    elif len(sys.argv) == 2:
+        result = wrapper.lint_file(sys.argv[1])
+    else:
+        result = wrapper.lint_files(sys.argv[1:])
     print(json.dumps(result, indent=2))
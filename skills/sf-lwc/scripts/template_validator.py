@@ -10,6 +10,11 @@ Detects common mistakes that LLMs make when generating LWC templates:
 5. Comparison operators in if:true
 6. Event handlers with inline arguments
 
+Templates are parsed once (lwc_template_parser.py) and each rule group runs
+over attributes and text {expressions}, so multi-line tags, comments and
+expressions containing ">" are handled; issues carry the line the attribute
+or expression starts on.
+
 This validator is ADVISORY - it provides warnings but does not block operations.
 
 Source: https://salesforcediaries.com/2026/01/16/llm-mistakes-in-apex-lwc-salesforce-code-generation-rules/
@@ -17,6 +22,12 @@ Source: https://salesforcediaries.com/2026/01/16/llm-mistakes-in-apex-lwc-salesf
 
 import re
 import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from lwc_template_parser import Element, iteration_owner, parse_template  # noqa: E402
 
 
 class LWCTemplateValidator:
@@ -161,27 +172,24 @@ class LWCTemplateValidator:
         (r"\(click\)\s*=", "Angular event binding", "LWC uses onclick={handler}"),
     ]
 
-    # Missing key in iteration
-    ITERATION_PATTERNS = [
-        (
-            r'for:each=\{[^}]+\}\s+for:item="[^"]+"\s*>',
-            "for:each without key",
-            "Add key={item.id} to the first child element",
-        ),
-    ]
-
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, content: str | None = None):
         """
         Initialize the validator with an LWC HTML file.
 
         Args:
             file_path: Path to .html file
+            content: File text, when the caller has already read it
         """
         self.file_path = file_path
         self.content = ""
         self.lines = []
         self.issues = []
 
+        if content is not None:
+            self.content = content
+            self.lines = content.split("\n")
+            return
+
         try:
             with open(file_path, encoding="utf-8") as f:
                 self.content = f.read()
@@ -210,14 +218,15 @@ class LWCTemplateValidator:
                 "issue_count": len(self.issues),
             }
 
-        # Run all checks
-        self._check_patterns(self.INLINE_EXPRESSION_PATTERNS, "inline_expression", "CRITICAL")
-        self._check_patterns(self.METHOD_CALL_PATTERNS, "method_call", "CRITICAL")
-        self._check_patterns(self.COMPARISON_PATTERNS, "comparison", "CRITICAL")
-        self._check_patterns(self.LITERAL_PATTERNS, "literal", "CRITICAL")
-        self._check_patterns(self.EVENT_HANDLER_PATTERNS, "event_handler", "WARNING")
-        self._check_patterns(self.FRAMEWORK_SYNTAX_PATTERNS, "framework_syntax", "CRITICAL")
-        self._check_iteration_keys()
+        self._seen = set()
+        for node in parse_template(self.content):
+            if isinstance(node, Element):
+                for attr in node.attrs:
+                    self._check_snippet(attr.source, attr.line)
+                self._check_iteration_key(node)
+            else:
+                for expression in node.expressions:
+                    self._check_snippet("{" + expression.text + "}", expression.line)
 
         return {
             "file": os.path.basename(self.file_path),
@@ -225,92 +234,68 @@ class LWCTemplateValidator:
             "issue_count": len(self.issues),
         }
 
-    def _check_patterns(self, patterns: list, category: str, severity: str):
-        """Check for pattern matches in the template."""
-        for i, line in enumerate(self.lines, 1):
-            # Skip HTML comments
-            if "<!--" in line and "-->" in line:
-                continue
-
-            for pattern, name, fix in patterns:
-                matches = re.finditer(pattern, line)
-                for _match in matches:
-                    # Avoid duplicate issues for same line/category
-                    existing = any(
-                        issue["line"] == i
-                        and issue["category"] == category
-                        and name in issue["message"]
-                        for issue in self.issues
-                    )
-                    if not existing:
-                        self.issues.append(
-                            {
-                                "severity": severity,
-                                "category": category,
-                                "message": f"{name} not supported in LWC templates",
-                                "line": i,
-                                "fix": fix,
-                                "source": "template-validator",
-                            }
-                        )
-
-    def _check_iteration_keys(self):
-        """Check for missing key attribute in for:each iterations."""
-        in_foreach = False
-        foreach_line = 0
-        foreach_item = ""
-
-        for i, line in enumerate(self.lines, 1):
-            # Detect for:each start
-            foreach_match = re.search(r'for:each=\{([^}]+)\}\s+for:item="([^"]+)"', line)
-            if foreach_match:
-                foreach_line = i
-                foreach_item = foreach_match.group(2)
-
-                # If key is present on the same line, no warning is needed.
-                if "key=" in line or "key =" in line:
-                    in_foreach = False
-                    continue
-
-                # Single-line iteration blocks can close on the same line.
-                if ">" in line and "</" in line:
-                    self.issues.append(
-                        {
-                            "severity": "WARNING",
-                            "category": "iteration",
-                            "message": f"for:each iteration (line {foreach_line}) may be missing key attribute",
-                            "line": i,
-                            "fix": f"Add key={{{foreach_item}.id}} to identify each item uniquely",
-                            "source": "template-validator",
-                        }
-                    )
-                    in_foreach = False
-                    continue
-
-                in_foreach = True
+    def _rules(self) -> list:
+        """Compiled (regex, name, fix, category, severity) rules, built once per class."""
+        cls = type(self)
+        if "_compiled" not in cls.__dict__:
+            groups = [
+                (cls.INLINE_EXPRESSION_PATTERNS, "inline_expression", "CRITICAL"),
+                (cls.METHOD_CALL_PATTERNS, "method_call", "CRITICAL"),
+                (cls.COMPARISON_PATTERNS, "comparison", "CRITICAL"),
+                (cls.LITERAL_PATTERNS, "literal", "CRITICAL"),
+                (cls.EVENT_HANDLER_PATTERNS, "event_handler", "WARNING"),
+                (cls.FRAMEWORK_SYNTAX_PATTERNS, "framework_syntax", "CRITICAL"),
+            ]
+            cls._compiled = [
+                (re.compile(pattern), name, fix, category, severity)
+                for patterns, category, severity in groups
+                for pattern, name, fix in patterns
+            ]
+        return cls._compiled
+
+    def _check_snippet(self, snippet: str, line: int):
+        """Check one attribute (name=value as written) or text expression."""
+        for regex, name, fix, category, severity in self._rules():
+            key = (line, category, name)
+            if key in self._seen or not regex.search(snippet):
                 continue
+            self._seen.add(key)
+            self.issues.append(
+                {
+                    "severity": severity,
+                    "category": category,
+                    "message": f"{name} not supported in LWC templates",
+                    "line": line,
+                    "fix": fix,
+                    "source": "template-validator",
+                }
+            )
 
-            if in_foreach:
-                # Look for key attribute in the next few lines
-                if "key=" in line or "key =" in line:
-                    in_foreach = False
-                    continue
-
-                # If we hit a closing tag or another element without key
-                if ">" in line and not line.strip().startswith("<!--"):
-                    # Check if it's a template tag (doesn't need key directly)
-                    if "<template" not in line:
-                        self.issues.append(
-                            {
-                                "severity": "WARNING",
-                                "category": "iteration",
-                                "message": f"for:each iteration (line {foreach_line}) may be missing key attribute",
-                                "line": i,
-                                "fix": f"Add key={{{foreach_item}.id}} to identify each item uniquely",
-                                "source": "template-validator",
-                            }
-                        )
-                    in_foreach = False
+    def _check_iteration_key(self, element: Element):
+        """Check that each element rendered by for:each / iterator carries a key."""
+        owner = iteration_owner(element)
+        if owner is None or element.get("key") is not None:
+            return
+        directive = owner.iteration
+        if directive.name.lower() == "for:each":
+            item_attr = owner.get("for:item")
+            item = item_attr.value if item_attr is not None and item_attr.value else "item"
+        else:
+            item = directive.name.split(":", 1)[1] + ".value"
+        key = (element.line, "iteration", directive.line)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self.issues.append(
+            {
+                "severity": "WARNING",
+                "category": "iteration",
+                "message": f"for:each iteration (line {directive.line}) may be missing key attribute",
+                "line": element.line,
+                "fix": f"Add key={{{item}.id}} to identify each item uniquely",
+                "source": "template-validator",
+            }
+        )
 
 
 def validate_lwc_template(file_path: str) -> dict:
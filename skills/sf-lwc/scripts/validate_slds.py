@@ -17,11 +17,117 @@ Provides a 165-point scoring system across 9 categories:
 import os
 import re
 import json
+import sys
 from pathlib import Path
 from typing import Any
 
 # Script directory for loading data files
 SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR / "slds_data"
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from lwc_css_tokenizer import Declaration, TokenMatcher, tokenize_css  # noqa: E402
+from lwc_template_parser import Element, parse_template  # noqa: E402
+
+# data dir -> loaded rule data; one read of the JSON files per process
+_DATA: dict[Path, dict[str, Any]] = {}
+
+# ═══════════════════════════════════════════════════════════════════════
+# SLDS CLASS FAMILIES
+# ═══════════════════════════════════════════════════════════════════════
+
+# Classes accepted even when missing from valid_slds_classes.json, keyed by
+# the text after "slds-". The value is the regex the rest of the name must
+# match: "" accepts any suffix, "(?:_|$)" the block itself or a modifier.
+_BLOCK = "(?:_|$)"
+_SIZE = r"\d+-of-\d+$"
+_SLDS_FAMILIES = {
+    **{f"{kind}-{side}_": "" for kind in ("p", "m") for side in (
+        "around", "horizontal", "vertical", "left", "right", "top", "bottom"
+    )},
+    "size_": _SIZE,
+    # Responsive sizing: slds-small-size_, slds-medium-size_, slds-large-size_
+    **{f"{bp}-size_": _SIZE for bp in ("small", "medium", "large", "max-small", "max-medium", "max-large")},
+    **{f"text-{kind}_": "" for kind in ("heading", "body", "color", "align")},
+    **{block: _BLOCK for block in (
+        "grid", "col", "button", "input", "form", "card", "modal", "notify", "illustration",
+        "table", "box", "badge", "spinner", "alert", "icon", "media", "list", "tile",
+        "popover", "dropdown", "path", "progress",
+    )},
+    # Utility patterns
+    "has-": "",
+    "no-": "",
+    "var-": "",
+    "is-": "",
+    "theme_": "",
+    "tabs_": "",
+}
+
+
+def _trie_regex(families: dict[str, str]) -> str:
+    """Compile prefix -> suffix-regex pairs into one regex shaped like a trie.
+
+    Sibling branches start with distinct characters, so matching a name walks
+    a single path and costs O(length of the name) however many families
+    there are.
+    """
+    trie: dict[str, Any] = {}
+    for prefix, suffix in families.items():
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[""] = suffix
+
+    def emit(node: dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            branches.append(node[""])
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return emit(trie)
+
+
+_SLDS_FAMILY_RE = re.compile("slds-" + _trie_regex(_SLDS_FAMILIES))
+
+
+def matches_slds_family(cls: str) -> bool:
+    """Whether a class follows an SLDS naming family (slds-grid_*, slds-p-*_, ...)."""
+    return _SLDS_FAMILY_RE.match(cls) is not None
+
+
+def load_slds_data(data_dir: Path = DATA_DIR) -> dict[str, Any]:
+    """Valid classes, deprecated patterns and styling hooks, read once per process.
+
+    Returns ``{"valid_slds_classes": frozenset, "deprecated_patterns": dict,
+    "deprecated_tokens": TokenMatcher, "valid_hooks": frozenset}``. A missing or unreadable file yields an empty
+    entry, which disables the checks that depend on it. Callers must treat
+    ``deprecated_patterns`` as read-only: it is shared by every validator.
+    """
+    if data_dir in _DATA:
+        return _DATA[data_dir]
+
+    def read(name: str):
+        try:
+            with open(data_dir / name, encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def flatten(data) -> frozenset[str]:
+        return frozenset(
+            item for values in data.values() if isinstance(values, list) for item in values
+        )
+
+    deprecated = read("deprecated_patterns.json")
+    _DATA[data_dir] = {
+        "valid_slds_classes": flatten(read("valid_slds_classes.json")),
+        "deprecated_patterns": deprecated,
+        "deprecated_tokens": TokenMatcher(deprecated.get("tokens", {})),
+        "valid_hooks": flatten(read("styling_hooks.json")),
+    }
+    return _DATA[data_dir]
 
 
 class SLDSValidator:
@@ -40,63 +146,46 @@ class SLDSValidator:
         "focus_management": 10,
     }
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, content: str | None = None, known_classes=()):
         """
         Initialize validator with file path.
 
         Args:
             file_path: Path to .html, .css, or .js file
+            content: File text, when the caller has already read it
+            known_classes: Extra slds-* classes to accept (e.g. defined in the bundle CSS)
         """
         self.file_path = file_path
         self.file_name = os.path.basename(file_path)
         self.ext = Path(file_path).suffix.lower()
         self.content = ""
         self.lines = []
+        self.elements = []
 
         # Load file content
-        try:
-            with open(file_path, encoding="utf-8") as f:
-                self.content = f.read()
-                self.lines = self.content.splitlines()
-        except Exception:
-            pass
+        if content is not None:
+            self.content = content
+            self.lines = content.splitlines()
+        else:
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    self.content = f.read()
+                    self.lines = self.content.splitlines()
+            except Exception:
+                pass
 
         # Load validation data
         self._load_data()
+        if known_classes and self.valid_slds_classes:
+            self.valid_slds_classes = self.valid_slds_classes | frozenset(known_classes)
 
     def _load_data(self):
-        """Load JSON data files for validation rules."""
-        data_dir = SCRIPT_DIR / "slds_data"
-
-        # Valid SLDS classes
-        self.valid_slds_classes = set()
-        try:
-            with open(data_dir / "valid_slds_classes.json") as f:
-                data = json.load(f)
-                for category_classes in data.values():
-                    if isinstance(category_classes, list):
-                        self.valid_slds_classes.update(category_classes)
-        except Exception:
-            pass
-
-        # Deprecated patterns
-        self.deprecated_patterns = {}
-        try:
-            with open(data_dir / "deprecated_patterns.json") as f:
-                self.deprecated_patterns = json.load(f)
-        except Exception:
-            pass
-
-        # Valid styling hooks
-        self.valid_hooks = set()
-        try:
-            with open(data_dir / "styling_hooks.json") as f:
-                data = json.load(f)
-                for category_hooks in data.values():
-                    if isinstance(category_hooks, list):
-                        self.valid_hooks.update(category_hooks)
-        except Exception:
-            pass
+        """Attach the process-wide SLDS rule data (see load_slds_data)."""
+        data = load_slds_data()
+        self.valid_slds_classes = data["valid_slds_classes"]
+        self.deprecated_patterns = data["deprecated_patterns"]
+        self.deprecated_tokens = data["deprecated_tokens"]
+        self.valid_hooks = data["valid_hooks"]
 
     def validate(self) -> dict[str, Any]:
         """
@@ -157,114 +246,74 @@ class SLDSValidator:
 
     def _validate_html(self, scores: dict[str, int], issues: list[dict]):
         """Validate HTML template file."""
+        self.elements = [node for node in parse_template(self.content) if isinstance(node, Element)]
         self._check_slds_classes(scores, issues)
         self._check_accessibility(scores, issues)
         self._check_component_structure(scores, issues)
 
     def _check_slds_classes(self, scores: dict[str, int], issues: list[dict]):
-        """Check SLDS class usage in HTML."""
-        # Find all class attributes
-        class_pattern = r'class\s*=\s*["\']([^"\']+)["\']'
-
-        for i, line in enumerate(self.lines, 1):
-            matches = re.findall(class_pattern, line)
-            for class_attr in matches:
-                classes = class_attr.split()
-                for cls in classes:
-                    if cls.startswith("slds-"):
-                        # Check if it's a valid SLDS class
-                        if self.valid_slds_classes and cls not in self.valid_slds_classes:
-                            # Allow pattern-based classes we might not have in our list
-                            if not self._is_valid_slds_pattern(cls):
-                                scores["slds_class_usage"] = max(0, scores["slds_class_usage"] - 2)
-                                issues.append(
-                                    {
-                                        "severity": "WARNING",
-                                        "category": "slds_class_usage",
-                                        "message": f"Unknown SLDS class: {cls}",
-                                        "line": i,
-                                        "fix": f"Verify '{cls}' is a valid SLDS 2 class",
-                                    }
-                                )
+        """Check SLDS class usage in static class attributes (which may span lines)."""
+        for element in self.elements:
+            attr = element.get("class")
+            if attr is None or not attr.value or attr.expression is not None:
+                continue
+            value_start = attr.source.rindex(attr.value)
+            for match in re.finditer(r"\S+", attr.value):
+                cls = match.group()
+                if cls.startswith("slds-"):
+                    # Check if it's a valid SLDS class
+                    if self.valid_slds_classes and cls not in self.valid_slds_classes:
+                        # Allow pattern-based classes we might not have in our list
+                        if not self._is_valid_slds_pattern(cls):
+                            scores["slds_class_usage"] = max(0, scores["slds_class_usage"] - 2)
+                            issues.append(
+                                {
+                                    "severity": "WARNING",
+                                    "category": "slds_class_usage",
+                                    "message": f"Unknown SLDS class: {cls}",
+                                    "line": attr.line + attr.source.count("\n", 0, value_start + match.start()),
+                                    "fix": f"Verify '{cls}' is a valid SLDS 2 class",
+                                }
+                            )
 
     def _is_valid_slds_pattern(self, cls: str) -> bool:
         """Check if class matches valid SLDS naming patterns."""
-        patterns = [
-            r"^slds-p-(around|horizontal|vertical|left|right|top|bottom)_",
-            r"^slds-m-(around|horizontal|vertical|left|right|top|bottom)_",
-            r"^slds-size_\d+-of-\d+$",
-            # Responsive sizing: slds-small-size_, slds-medium-size_, slds-large-size_
-            r"^slds-(small|medium|large|max-small|max-medium|max-large)-size_\d+-of-\d+$",
-            r"^slds-text-(heading|body|color|align)_",
-            r"^slds-grid(_|$)",
-            r"^slds-col(_|$)",
-            r"^slds-button(_|$)",
-            r"^slds-input(_|$)",
-            r"^slds-form(_|$)",
-            r"^slds-card(_|$)",
-            r"^slds-modal(_|$)",
-            r"^slds-notify(_|$)",
-            r"^slds-illustration(_|$)",
-            r"^slds-table(_|$)",
-            r"^slds-box(_|$)",
-            r"^slds-badge(_|$)",
-            r"^slds-spinner(_|$)",
-            r"^slds-alert(_|$)",
-            # Utility patterns
-            r"^slds-has-",
-            r"^slds-no-",
-            r"^slds-var-",
-            r"^slds-is-",
-            r"^slds-theme_",
-            r"^slds-icon(_|$)",
-            r"^slds-media(_|$)",
-            r"^slds-list(_|$)",
-            r"^slds-tile(_|$)",
-            r"^slds-popover(_|$)",
-            r"^slds-dropdown(_|$)",
-            r"^slds-tabs_",
-            r"^slds-path(_|$)",
-            r"^slds-progress(_|$)",
-        ]
-        return any(re.match(p, cls) for p in patterns)
+        return matches_slds_family(cls)
 
     def _check_accessibility(self, scores: dict[str, int], issues: list[dict]):
         """Check accessibility requirements in HTML."""
         content = self.content
 
-        # Check lightning-icon without alternative-text
-        icon_pattern = r"<lightning-icon[^>]*>"
-        for i, line in enumerate(self.lines, 1):
-            for match in re.finditer(icon_pattern, line):
-                icon_tag = match.group(0)
-                if "alternative-text" not in icon_tag:
-                    scores["accessibility"] = max(0, scores["accessibility"] - 3)
-                    issues.append(
-                        {
-                            "severity": "WARNING",
-                            "category": "accessibility",
-                            "message": "lightning-icon missing alternative-text attribute",
-                            "line": i,
-                            "fix": 'Add alternative-text="description" for screen readers',
-                        }
-                    )
+        for element in self.elements:
+            # Check lightning-icon without alternative-text
+            if element.tag == "lightning-icon" and element.get("alternative-text") is None:
+                scores["accessibility"] = max(0, scores["accessibility"] - 3)
+                issues.append(
+                    {
+                        "severity": "WARNING",
+                        "category": "accessibility",
+                        "message": "lightning-icon missing alternative-text attribute",
+                        "line": element.line,
+                        "fix": 'Add alternative-text="description" for screen readers',
+                    }
+                )
 
-        # Check lightning-button-icon without label
-        button_icon_pattern = r"<lightning-button-icon[^>]*>"
-        for i, line in enumerate(self.lines, 1):
-            for match in re.finditer(button_icon_pattern, line):
-                tag = match.group(0)
-                if "aria-label" not in tag and "alternative-text" not in tag:
-                    scores["accessibility"] = max(0, scores["accessibility"] - 3)
-                    issues.append(
-                        {
-                            "severity": "WARNING",
-                            "category": "accessibility",
-                            "message": "lightning-button-icon missing aria-label or alternative-text",
-                            "line": i,
-                            "fix": 'Add aria-label="action description" for accessibility',
-                        }
-                    )
+            # Check lightning-button-icon without label
+            if (
+                element.tag == "lightning-button-icon"
+                and element.get("aria-label") is None
+                and element.get("alternative-text") is None
+            ):
+                scores["accessibility"] = max(0, scores["accessibility"] - 3)
+                issues.append(
+                    {
+                        "severity": "WARNING",
+                        "category": "accessibility",
+                        "message": "lightning-button-icon missing aria-label or alternative-text",
+                        "line": element.line,
+                        "fix": 'Add aria-label="action description" for accessibility',
+                    }
+                )
 
         # Check for slds-assistive-text usage (good practice)
         if "slds-assistive-text" not in content and "aria-live" not in content:
@@ -284,8 +333,7 @@ class SLDSValidator:
     def _check_component_structure(self, scores: dict[str, int], issues: list[dict]):
         """Check component structure for SLDS compliance."""
         # Check for lightning-* base components (good)
-        lightning_components = re.findall(r"<lightning-[a-z-]+", self.content)
-        if not lightning_components:
+        if not any(element.tag.startswith("lightning-") for element in self.elements):
             scores["component_structure"] = max(0, scores["component_structure"] - 5)
             issues.append(
                 {
@@ -301,159 +349,147 @@ class SLDSValidator:
     # CSS VALIDATION
     # ═══════════════════════════════════════════════════════════════════════
 
-    def _validate_css(self, scores: dict[str, int], issues: list[dict]):
-        """Validate CSS file."""
-        self._check_dark_mode(scores, issues)
-        self._check_styling_hooks(scores, issues)
-        self._check_slds_migration(scores, issues)
-        self._check_css_performance(scores, issues)
+    # Patterns for hardcoded colors
+    COLOR_PATTERNS = [
+        (re.compile(r"#[0-9A-Fa-f]{3,8}(?![0-9A-Fa-f])"), "hex color"),
+        (re.compile(r"rgb\s*\([^)]+\)"), "RGB color"),
+        (re.compile(r"rgba\s*\([^)]+\)"), "RGBA color"),
+        (re.compile(r"hsl\s*\([^)]+\)"), "HSL color"),
+        (re.compile(r"hsla\s*\([^)]+\)"), "HSLA color"),
+    ]
+    VAR_CALL_RE = re.compile(r"var\s*\([^)]+\)")
+    VAR_NAME_RE = re.compile(r"var\s*\(\s*(--[a-zA-Z0-9-]+)")
 
-    def _check_dark_mode(self, scores: dict[str, int], issues: list[dict]):
+    def _validate_css(self, scores: dict[str, int], issues: list[dict]):
+        """Validate CSS file in one pass over its rules and declarations."""
+        for token in tokenize_css(self.content):
+            if isinstance(token, Declaration):
+                self._check_dark_mode(token, scores, issues)
+                self._check_styling_hooks(token, scores, issues)
+                self._check_slds_migration(token, scores, issues)
+                self._check_css_performance(token, scores, issues)
+            elif not token.is_at_rule:
+                self._check_selector_depth(token, scores, issues)
+
+    def _check_dark_mode(self, decl: Declaration, scores: dict[str, int], issues: list[dict]):
         """Check for dark mode compatibility (no hardcoded colors)."""
-        # Patterns for hardcoded colors
-        color_patterns = [
-            (r"#[0-9A-Fa-f]{3,8}(?![0-9A-Fa-f])", "hex color"),
-            (r"rgb\s*\([^)]+\)", "RGB color"),
-            (r"rgba\s*\([^)]+\)", "RGBA color"),
-            (r"hsl\s*\([^)]+\)", "HSL color"),
-            (r"hsla\s*\([^)]+\)", "HSLA color"),
-        ]
-
-        for i, line in enumerate(self.lines, 1):
-            # Skip comments
-            if line.strip().startswith("/*") or line.strip().startswith("//"):
-                continue
-
-            # Skip if it's inside a var() - that's allowed
-            line_without_vars = re.sub(r"var\s*\([^)]+\)", "", line)
-
-            for pattern, color_type in color_patterns:
-                matches = re.findall(pattern, line_without_vars)
-                for match in matches:
-                    # Skip transparent and common exceptions
-                    if match.lower() in ["#fff", "#ffffff", "#000", "#000000"]:
-                        scores["dark_mode"] = max(0, scores["dark_mode"] - 5)
-                        issues.append(
-                            {
-                                "severity": "HIGH",
-                                "category": "dark_mode",
-                                "message": f"Hardcoded {color_type} ({match}) breaks dark mode",
-                                "line": i,
-                                "fix": f"Use var(--slds-g-color-*) instead of {match}",
-                            }
-                        )
-                    elif match.lower() not in ["transparent", "inherit", "currentcolor"]:
-                        scores["dark_mode"] = max(0, scores["dark_mode"] - 3)
-                        issues.append(
-                            {
-                                "severity": "MODERATE",
-                                "category": "dark_mode",
-                                "message": f"Hardcoded {color_type} ({match}) may break dark mode",
-                                "line": i,
-                                "fix": "Consider using var(--slds-g-color-*) instead",
-                            }
-                        )
-
-    def _check_styling_hooks(self, scores: dict[str, int], issues: list[dict]):
-        """Check for proper SLDS 2 styling hooks usage."""
-        # Find all CSS variable references
-        var_pattern = r"var\s*\(\s*(--[a-zA-Z0-9-]+)"
-
-        for i, line in enumerate(self.lines, 1):
-            matches = re.findall(var_pattern, line)
-            for var_name in matches:
-                # Check if it's an SLDS variable
-                if var_name.startswith("--slds-"):
-                    # SLDS 2 global hooks use --slds-g-
-                    if var_name.startswith("--slds-c-"):
-                        scores["styling_hooks"] = max(0, scores["styling_hooks"] - 3)
-                        issues.append(
-                            {
-                                "severity": "WARNING",
-                                "category": "styling_hooks",
-                                "message": f"Component hooks ({var_name}) not yet supported in SLDS 2",
-                                "line": i,
-                                "fix": "Use --slds-g-* global hooks or wait for SLDS 2 component hook support",
-                            }
-                        )
-                    elif not var_name.startswith("--slds-g-"):
-                        scores["styling_hooks"] = max(0, scores["styling_hooks"] - 2)
-                        issues.append(
-                            {
-                                "severity": "INFO",
-                                "category": "styling_hooks",
-                                "message": f"Non-standard SLDS variable: {var_name}",
-                                "line": i,
-                                "fix": "Use --slds-g-* for SLDS 2 compatibility",
-                            }
-                        )
-
-    def _check_slds_migration(self, scores: dict[str, int], issues: list[dict]):
-        """Check for deprecated SLDS 1 patterns."""
-        deprecated_tokens = self.deprecated_patterns.get("tokens", {})
+        # Skip if it's inside a var() - that's allowed
+        value_without_vars = self.VAR_CALL_RE.sub("", decl.value)
 
-        for i, line in enumerate(self.lines, 1):
-            # Check deprecated Sass tokens
-            for old_token, replacement in deprecated_tokens.items():
-                if old_token in line:
-                    scores["slds_migration"] = max(0, scores["slds_migration"] - 5)
+        for pattern, color_type in self.COLOR_PATTERNS:
+            for match in pattern.findall(value_without_vars):
+                # Skip transparent and common exceptions
+                if match.lower() in ["#fff", "#ffffff", "#000", "#000000"]:
+                    scores["dark_mode"] = max(0, scores["dark_mode"] - 5)
                     issues.append(
                         {
                             "severity": "HIGH",
-                            "category": "slds_migration",
-                            "message": f"Deprecated SLDS 1 token: {old_token}",
-                            "line": i,
-                            "fix": f"Replace with {replacement}",
+                            "category": "dark_mode",
+                            "message": f"Hardcoded {color_type} ({match}) breaks dark mode",
+                            "line": decl.line,
+                            "fix": f"Use var(--slds-g-color-*) instead of {match}",
+                        }
+                    )
+                elif match.lower() not in ["transparent", "inherit", "currentcolor"]:
+                    scores["dark_mode"] = max(0, scores["dark_mode"] - 3)
+                    issues.append(
+                        {
+                            "severity": "MODERATE",
+                            "category": "dark_mode",
+                            "message": f"Hardcoded {color_type} ({match}) may break dark mode",
+                            "line": decl.line,
+                            "fix": "Consider using var(--slds-g-color-*) instead",
                         }
                     )
 
-            # Check --lwc- prefix (old format)
-            if "--lwc-" in line:
-                scores["slds_migration"] = max(0, scores["slds_migration"] - 3)
-                issues.append(
-                    {
-                        "severity": "MODERATE",
-                        "category": "slds_migration",
-                        "message": "Old --lwc-* token format detected",
-                        "line": i,
-                        "fix": "Migrate to --slds-g-* styling hooks",
-                    }
-                )
-
-    def _check_css_performance(self, scores: dict[str, int], issues: list[dict]):
-        """Check for CSS performance issues."""
-        for i, line in enumerate(self.lines, 1):
-            # Check for !important
-            if "!important" in line:
-                scores["performance"] = max(0, scores["performance"] - 3)
-                issues.append(
-                    {
-                        "severity": "WARNING",
-                        "category": "performance",
-                        "message": "!important override detected",
-                        "line": i,
-                        "fix": "Avoid !important; use more specific selectors or SLDS utilities",
-                    }
-                )
-
-        # Check for overly deep selectors (> 3 levels)
-        for i, line in enumerate(self.lines, 1):
-            if "{" in line:
-                # Count selector depth
-                selector = line.split("{")[0]
-                depth = len(re.findall(r"\s+", selector.strip()))
-                if depth > 3:
-                    scores["performance"] = max(0, scores["performance"] - 2)
+    def _check_styling_hooks(self, decl: Declaration, scores: dict[str, int], issues: list[dict]):
+        """Check for proper SLDS 2 styling hooks usage."""
+        for var_name in self.VAR_NAME_RE.findall(decl.value):
+            # Check if it's an SLDS variable
+            if var_name.startswith("--slds-"):
+                # SLDS 2 global hooks use --slds-g-
+                if var_name.startswith("--slds-c-"):
+                    scores["styling_hooks"] = max(0, scores["styling_hooks"] - 3)
+                    issues.append(
+                        {
+                            "severity": "WARNING",
+                            "category": "styling_hooks",
+                            "message": f"Component hooks ({var_name}) not yet supported in SLDS 2",
+                            "line": decl.line,
+                            "fix": "Use --slds-g-* global hooks or wait for SLDS 2 component hook support",
+                        }
+                    )
+                elif not var_name.startswith("--slds-g-"):
+                    scores["styling_hooks"] = max(0, scores["styling_hooks"] - 2)
                     issues.append(
                         {
                             "severity": "INFO",
-                            "category": "performance",
-                            "message": "Deep CSS selector detected (>3 levels)",
-                            "line": i,
-                            "fix": "Simplify selector for better performance",
+                            "category": "styling_hooks",
+                            "message": f"Non-standard SLDS variable: {var_name}",
+                            "line": decl.line,
+                            "fix": "Use --slds-g-* for SLDS 2 compatibility",
                         }
                     )
 
+    def _check_slds_migration(self, decl: Declaration, scores: dict[str, int], issues: list[dict]):
+        """Check for deprecated SLDS 1 patterns."""
+        text = decl.text
+        deprecated_tokens = self.deprecated_patterns.get("tokens", {})
+
+        # Check deprecated Sass tokens (one automaton scan for all of them)
+        for old_token in self.deprecated_tokens.find(text):
+            scores["slds_migration"] = max(0, scores["slds_migration"] - 5)
+            issues.append(
+                {
+                    "severity": "HIGH",
+                    "category": "slds_migration",
+                    "message": f"Deprecated SLDS 1 token: {old_token}",
+                    "line": decl.line,
+                    "fix": f"Replace with {deprecated_tokens[old_token]}",
+                }
+            )
+
+        # Check --lwc- prefix (old format)
+        if "--lwc-" in text:
+            scores["slds_migration"] = max(0, scores["slds_migration"] - 3)
+            issues.append(
+                {
+                    "severity": "MODERATE",
+                    "category": "slds_migration",
+                    "message": "Old --lwc-* token format detected",
+                    "line": decl.line,
+                    "fix": "Migrate to --slds-g-* styling hooks",
+                }
+            )
+
+    def _check_css_performance(self, decl: Declaration, scores: dict[str, int], issues: list[dict]):
+        """Check for CSS performance issues."""
+        if "!important" in decl.value:
+            scores["performance"] = max(0, scores["performance"] - 3)
+            issues.append(
+                {
+                    "severity": "WARNING",
+                    "category": "performance",
+                    "message": "!important override detected",
+                    "line": decl.line,
+                    "fix": "Avoid !important; use more specific selectors or SLDS utilities",
+                }
+            )
+
+    def _check_selector_depth(self, rule, scores: dict[str, int], issues: list[dict]):
+        """Check for overly deep selectors (> 3 levels)."""
+        if rule.selector.count(" ") > 3:
+            scores["performance"] = max(0, scores["performance"] - 2)
+            issues.append(
+                {
+                    "severity": "INFO",
+                    "category": "performance",
+                    "message": "Deep CSS selector detected (>3 levels)",
+                    "line": rule.line,
+                    "fix": "Simplify selector for better performance",
+                }
+            )
+
     # ═══════════════════════════════════════════════════════════════════════
     # JAVASCRIPT VALIDATION
     # ═══════════════════════════════════════════════════════════════════════
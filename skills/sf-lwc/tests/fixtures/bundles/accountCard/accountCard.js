@@ -0,0 +1,22 @@
+import { LightningElement, api, wire } from 'lwc';
+import getAccounts from '@salesforce/apex/AccountController.getAccounts';
+
+export default class AccountCard extends LightningElement {
+    @api recordId;
+    @wire(getAccounts, { recordId: '$recordId' })
+    accounts;
+    selected = false;
+
+    get cardTitle() {
+        return 'Accounts';
+    }
+
+    get wrapperClass() {
+        return this.selected ? 'highlight slds-box slds-made-up' : 'slds-custom-tag';
+    }
+
+    handleSave(event) {
+        // handleDelete is not implemented
+        this.selected = true;
+    }
+}
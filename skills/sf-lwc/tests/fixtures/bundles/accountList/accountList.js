@@ -0,0 +1,53 @@
+import { LightningElement, api, wire } from 'lwc';
+import { getRecord } from 'lightning/uiRecordApi';
+import { gql, graphql } from 'lightning/uiGraphQLApi';
+import NAME_FIELD from '@salesforce/schema/Account.Name';
+import getContacts from '@salesforce/apex/ContactController.getContacts';
+import saveRow, { other } from '@salesforce/apex/RowController.saveRow';
+
+export default class AccountList extends LightningElement {
+    @api recordId;
+    rows = [];
+
+    @wire(getRecord, { recordId: '$recordId', fields: [NAME_FIELD, 'Account.Industry'] })
+    account;
+
+    @wire(graphql, {
+        query: gql`
+            query accounts($pageSize: Int = 500) {
+                uiapi {
+                    query {
+                        Account(first: $pageSize) {
+                            edges { node { Id Name { value } Owner { Name { value } } } }
+                            pageInfo { hasNextPage endCursor }
+                        }
+                    }
+                }
+            }
+        `,
+    })
+    results;
+
+    connectedCallback() {
+        this.load();
+    }
+
+    renderedCallback() {
+        this.refresh();
+    }
+
+    load() {
+        getContacts({ accountId: this.recordId }).then((r) => { this.rows = r; });
+    }
+
+    refresh() {
+        if (this.rows.length) getContacts({ accountId: this.recordId });
+    }
+
+    handleSave() {
+        this.rows.forEach((row) => {
+            saveRow({ row });
+        });
+        for (const row of this.rows) saveRow({ row });
+    }
+}
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Minimal stdio language server standing in for lwc-language-server in tests.
+
+Applies didOpen/didChange (incremental ranges in UTF-16 units) and publishes
+one diagnostic per line containing ERROR (severity 1) or WARN (severity 2).
+
+Environment:
+    STUB_LSP_LOG     file to append received method names to
+    STUB_LSP_SILENT  "1" to never publish diagnostics
+"""
+
+import json
+import os
+import sys
+
+documents: dict[str, str] = {}
+
+
+def log(method: str):
+    if os.environ.get("STUB_LSP_LOG"):
+        with open(os.environ["STUB_LSP_LOG"], "a") as f:
+            f.write(method + "\n")
+
+
+def read():
+    length = None
+    while True:
+        line = sys.stdin.buffer.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return json.loads(sys.stdin.buffer.read(length))
+
+
+def send(message):
+    body = json.dumps({"jsonrpc": "2.0", **message}).encode()
+    sys.stdout.buffer.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    sys.stdout.buffer.flush()
+
+
+def offset(text: str, position: dict) -> int:
+    lines = text.split("\n")
+    start = sum(len(line) + 1 for line in lines[: position["line"]])
+    line = lines[position["line"]] if position["line"] < len(lines) else ""
+    units = 0
+    for i, char in enumerate(line):
+        if units >= position["character"]:
+            return start + i
+        units += len(char.encode("utf-16-le")) // 2
+    return start + len(line)
+
+
+def publish(uri: str, version: int):
+    if os.environ.get("STUB_LSP_SILENT") == "1":
+        return
+    diagnostics = []
+    for number, line in enumerate(documents[uri].split("\n")):
+        for marker, severity in (("ERROR", 1), ("WARN", 2)):
+            if marker in line:
+                diagnostics.append(
+                    {
+                        "range": {"start": {"line": number, "character": 0}, "end": {"line": number, "character": len(line)}},
+                        "severity": severity,
+                        "message": f"stub {marker.lower()}: {line.strip()}",
+                        "source": "stub-lsp",
+                    }
+                )
+    send(
+        {
+            "method": "textDocument/publishDiagnostics",
+            "params": {"uri": uri, "version": version, "diagnostics": diagnostics},
+        }
+    )
+
+
+def main():
+    while True:
+        message = read()
+        if message is None:
+            return
+        method = message.get("method")
+        log(method or "<response>")
+        params = message.get("params") or {}
+        if method == "initialize":
+            send({"id": message["id"], "result": {"capabilities": {"textDocumentSync": {"openClose": True, "change": 2}}}})
+            # Exercise the client's handling of server-to-client requests
+            send({"id": "cfg-1", "method": "workspace/configuration", "params": {"items": [{"section": "lwc"}]}})
+        elif method == "textDocument/didOpen":
+            doc = params["textDocument"]
+            documents[doc["uri"]] = doc["text"]
+            publish(doc["uri"], doc["version"])
+        elif method == "textDocument/didChange":
+            uri = params["textDocument"]["uri"]
+            for change in params["contentChanges"]:
+                text = documents[uri]
+                if "range" in change:
+                    start = offset(text, change["range"]["start"])
+                    end = offset(text, change["range"]["end"])
+                    documents[uri] = text[:start] + change["text"] + text[end:]
+                else:
+                    documents[uri] = change["text"]
+            publish(uri, params["textDocument"]["version"])
+        elif method == "shutdown":
+            send({"id": message["id"], "result": None})
+        elif method == "exit":
+            return
+
+
+if __name__ == "__main__":
+    main()
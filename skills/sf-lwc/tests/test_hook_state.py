@@ -0,0 +1,74 @@
+"""Skill-local tests for the hook counter store."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import load_script
+
+mod = load_script("skills/sf-lwc/scripts/hook_state.py")
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+
+
+def test_increment_get_reset(tmp_path):
+    store = mod.CounterStore("attempts", path=tmp_path / "s.sqlite3")
+    assert store.get("a.js") == 0
+    assert [store.increment("a.js") for _ in range(3)] == [1, 2, 3]
+    assert store.increment("b.js", 5) == 5
+    assert store.get("a.js") == 3
+    store.reset("a.js")
+    assert store.get("a.js") == 0
+    assert store.get("b.js") == 5
+
+
+def test_counters_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(mod.time, "time", lambda: now[0])
+    store = mod.CounterStore("attempts", ttl=60, path=tmp_path / "s.sqlite3")
+    store.increment("a.js")
+    store.increment("a.js")
+    now[0] += 61
+    assert store.get("a.js") == 0
+    assert store.increment("a.js") == 1  # restarts instead of resuming at 3
+    store.close()
+
+    now[0] += 61
+    reopened = mod.CounterStore("attempts", ttl=60, path=tmp_path / "s.sqlite3")
+    assert reopened._db().execute("SELECT COUNT(*) FROM counters").fetchone() == (0,)
+
+
+def test_parallel_increments_are_not_lost(tmp_path):
+    db = tmp_path / "s.sqlite3"
+    worker = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from hook_state import CounterStore;"
+        "s = CounterStore('attempts', path=sys.argv[2]);"
+        "[s.increment('shared.js') for _ in range(50)]"
+    )
+    procs = [subprocess.Popen([sys.executable, "-c", worker, str(SCRIPTS), str(db)]) for _ in range(6)]
+    assert all(p.wait(timeout=60) == 0 for p in procs)
+    assert mod.CounterStore("attempts", path=db).get("shared.js") == 300
+
+
+def test_corrupt_database_falls_back_to_json_counters(tmp_path):
+    db = tmp_path / "s.sqlite3"
+    db.write_bytes(b"not a database" * 100)
+    store = mod.CounterStore("attempts", path=db)
+    assert [store.increment("a.js") for _ in range(4)] == [1, 2, 3, 4]
+    reopened = mod.CounterStore("attempts", path=db)
+    assert reopened.get("a.js") == 4
+    assert reopened.increment("a.js") == 5  # counts carry across processes
+    reopened.reset("a.js")
+    assert reopened.get("a.js") == 0
+
+
+def test_unwritable_location_reports_limit_reached(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    store = mod.CounterStore("attempts", path=blocker / "s.sqlite3")
+    assert store.increment("a.js") == mod.LIMIT_REACHED
+    assert store.get("a.js") == 0
+    store.reset("a.js")
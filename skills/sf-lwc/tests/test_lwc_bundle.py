@@ -0,0 +1,85 @@
+"""Skill-local tests for the LWC bundle analyzer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from conftest import load_script
+
+mod = load_script("skills/sf-lwc/scripts/lwc_bundle.py")
+
+BUNDLE = Path(__file__).parent / "fixtures" / "bundles" / "accountCard"
+
+
+def _cross(result: dict) -> dict[str, list[str]]:
+    out: dict[str, list[str]] = {}
+    for issue in result["cross_file_issues"]:
+        out.setdefault(issue["category"], []).append(issue["message"])
+    return out
+
+
+def test_index_links_template_js_and_css():
+    bundle = mod.LWCBundle(str(BUNDLE))
+    assert set(bundle.files) == {"accountCard.html", "accountCard.css", "accountCard.js"}
+    assert bundle.members["recordId"] == "api"
+    assert bundle.members["accounts"] == "wire"
+    assert {"cardTitle", "wrapperClass", "handleSave", "selected"} <= set(bundle.members)
+    assert "handleSave" in bundle.handlers
+    assert "commentedHandler" not in bundle.handlers  # inside <!-- -->
+    assert bundle.template_locals == {"acc"}
+    # :host(.compact) is set by the parent, not a selector on template nodes
+    assert "compact" not in bundle.selectors
+    assert bundle.selectors["orphan"] == [("accountCard.css", 6)]
+
+
+def test_cross_file_findings():
+    result = mod.analyze_bundle(str(BUNDLE))
+    cross = _cross(result)
+    assert cross["bundle_handlers"] == [
+        "Handler handleDelete used in accountCard.html is not defined in accountCard.js"
+    ]
+    assert cross["bundle_bindings"] == [
+        "Template binding {missingValue} has no matching property or getter in accountCard.js"
+    ]
+    assert cross["bundle_classes"] == [
+        "SLDS class slds-made-up built in accountCard.js is not an SLDS 2 class or defined in the bundle CSS"
+    ]
+    assert sorted(cross["bundle_css"]) == [
+        "CSS class .orphan matches nothing in the template or JS",
+        "CSS class .selected-row matches nothing in the template or JS",
+    ]
+    assert all(issue["file"] for issue in result["issues"])
+
+
+def test_score_averages_files_and_deducts_cross_file_findings():
+    result = mod.analyze_bundle(str(BUNDLE))
+    file_scores = [r["score"] for r in result["files"].values()]
+    penalty = sum(mod.CROSS_FILE_PENALTIES[i["severity"]] for i in result["cross_file_issues"])
+    assert result["score"] == round(sum(file_scores) / len(file_scores)) - penalty
+    assert result["max_score"] == 165
+
+
+def test_bundle_css_class_is_not_unknown_slds(tmp_path):
+    bundle = tmp_path / "tagList"
+    bundle.mkdir()
+    (bundle / "tagList.html").write_text('<template><span class="slds-tag-pill"></span></template>\n')
+    (bundle / "tagList.css").write_text(".slds-tag-pill { color: var(--slds-g-color-accent-1); }\n")
+    (bundle / "tagList.js").write_text(
+        "import { LightningElement } from 'lwc';\nexport default class TagList extends LightningElement {}\n"
+    )
+    result = mod.analyze_bundle(str(bundle))
+    assert not any("slds-tag-pill" in issue["message"] for issue in result["issues"])
+
+    (bundle / "tagList.css").write_text("")
+    result = mod.analyze_bundle(str(bundle))
+    assert any(issue["message"] == "Unknown SLDS class: slds-tag-pill" for issue in result["issues"])
+
+
+def test_custom_base_class_skips_member_checks(tmp_path):
+    bundle = tmp_path / "child"
+    bundle.mkdir()
+    (bundle / "child.html").write_text("<template><button onclick={inherited}>{label}</button></template>\n")
+    (bundle / "child.js").write_text(
+        "import Base from 'c/base';\nexport default class Child extends Base {}\n"
+    )
+    assert mod.analyze_bundle(str(bundle))["cross_file_issues"] == []
@@ -0,0 +1,95 @@
+"""Skill-local tests for the LWC data access analyzer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from conftest import load_script
+
+mod = load_script("skills/sf-lwc/scripts/lwc_data_access.py")
+
+BUNDLES = Path(__file__).parent / "fixtures" / "bundles"
+ACCOUNT_LIST = BUNDLES / "accountList" / "accountList.js"
+
+
+def test_wires_and_graphql_queries_are_extracted():
+    result = mod.analyze_file(str(ACCOUNT_LIST))
+    assert [(w["adapter"], w["kind"], w["member"], w["reactive"], w["fields"]) for w in result["wires"]] == [
+        ("getRecord", "ui-api", "account", ["recordId"], 2),
+        ("graphql", "graphql", "results", [], 0),
+    ]
+    [query] = result["graphql"]
+    # Id, Name { value }, Owner { Name { value } }; pageInfo is not payload
+    assert query["objects"] == [{"name": "Account", "page_size": 500, "fields": 3}]
+    assert result["payload_width"] == 5
+    assert result["page_rows"] == 500
+
+
+def test_apex_calls_get_phase_and_loop_context():
+    result = mod.analyze_file(str(ACCOUNT_LIST))
+    assert result["apex_imports"] == {
+        "getContacts": "ContactController.getContacts",
+        "saveRow": "RowController.saveRow",
+        "other": "RowController.saveRow",
+    }
+    calls = [(c["line"], c["caller"], c["phase"], c["in_loop"]) for c in result["apex_calls"]]
+    assert calls == [
+        (40, "load", "initial", False),
+        (44, "refresh", "every_render", False),
+        (49, "handleSave", "on_demand", True),  # forEach callback
+        (51, "handleSave", "on_demand", True),  # brace-less for body
+    ]
+    assert result["round_trips"] == {
+        "first_render": 2 + 1 + 1,
+        "each_rerender": 1,
+        "on_demand": 2 * mod.LOOP_FANOUT,
+    }
+    assert [(i["severity"], i["line"]) for i in result["issues"]] == [
+        ("WARNING", 16),
+        ("CRITICAL", 44),
+        ("CRITICAL", 49),
+        ("CRITICAL", 51),
+    ]
+
+
+def test_comments_and_strings_do_not_create_calls():
+    source = """\
+import getContacts from '@salesforce/apex/ContactController.getContacts';
+export default class C extends LightningElement {
+    connectedCallback() {
+        // getContacts({}) in a comment
+        const label = 'getContacts()';
+    }
+}
+"""
+    assert mod.analyze_file("c.js", source)["apex_calls"] == []
+
+
+def test_graphql_variables_defaults_and_child_relationships():
+    query = """
+        query q($n: Int) {
+            uiapi { query { Account(first: $n) {
+                edges { node {
+                    Name { value }
+                    Contacts(first: 300) { edges { node { Email { value } Phone { value } } } }
+                } }
+            } } }
+        }
+    """
+    parsed = mod.parse_graphql(query)
+    assert parsed["objects"] == [
+        {"name": "Account", "page_size": None, "fields": 1},
+        {"name": "Contacts", "page_size": 300, "fields": 2},
+    ]
+
+
+def test_directory_ranking_puts_costliest_component_first(tmp_path):
+    quiet = tmp_path / "lwc" / "quiet"
+    quiet.mkdir(parents=True)
+    (quiet / "quiet.js").write_text("export default class Quiet extends LightningElement {}\n")
+    busy = tmp_path / "lwc" / "accountList"
+    busy.mkdir()
+    (busy / "accountList.js").write_text(ACCOUNT_LIST.read_text())
+    (busy / "helper.js").write_text("export const x = 1;\n")  # not a bundle entry point
+    ranked = mod.analyze_directory(str(tmp_path))
+    assert [r["component"] for r in ranked] == ["accountList", "quiet"]
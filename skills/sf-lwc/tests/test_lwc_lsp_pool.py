@@ -0,0 +1,168 @@
+"""Tests for lwc_lsp_pool.py — warm language server sessions, against a stub LSP."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-lwc/scripts/lwc_lsp_pool.py")
+
+STUB = Path(__file__).parent / "fixtures" / "stub_lsp.py"
+HOOK = Path(__file__).resolve().parents[1] / "scripts" / "lwc-lsp-validate.py"
+
+pytestmark = pytest.mark.skipif(not mod.pool_enabled(), reason="needs unix domain sockets")
+
+SOURCE = """\
+import { LightningElement, api } from 'lwc';
+
+export default class Greeting extends LightningElement {
+    @api name;
+}
+"""
+
+
+@pytest.fixture(autouse=True)
+def runtime_dir(tmp_path_factory, monkeypatch):
+    # Keep sockets out of the shared temp dir; short path for AF_UNIX limits
+    short = tmp_path_factory.mktemp("s")
+    monkeypatch.setenv("TMPDIR", str(short))
+    monkeypatch.setattr(tempfile, "tempdir", str(short))
+    return short
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    root = tmp_path / "project"
+    component = root / "force-app" / "main" / "default" / "lwc" / "greeting"
+    component.mkdir(parents=True)
+    (root / "sfdx-project.json").write_text("{}")
+    (component / "greeting.js").write_text(SOURCE)
+    log = tmp_path / "stub.log"
+    monkeypatch.setenv("STUB_LSP_LOG", str(log))
+    monkeypatch.setenv(mod.IDLE_ENV, "30")
+    return root, component / "greeting.js", log
+
+
+def _command():
+    return [sys.executable, str(STUB)]
+
+
+def _messages(diagnostics):
+    return [(d["range"]["start"]["line"], d["message"]) for d in diagnostics]
+
+
+class TestTextChange:
+    def test_single_range_covers_the_edit(self):
+        old = "line one\nline two\nline three\n"
+        new = "line one\nline 2 (ERROR)\nline three\n"
+        change = mod.text_change(old, new)
+        assert change["range"] == {"start": {"line": 1, "character": 5}, "end": {"line": 1, "character": 8}}
+        assert change["text"] == "2 (ERROR)"
+
+    def test_positions_count_utf16_units(self):
+        change = mod.text_change("const s = '😀a';", "const s = '😀b';")
+        assert change["range"]["start"] == {"line": 0, "character": 13}
+
+
+class TestSession:
+    def test_open_then_incremental_changes(self, workspace):
+        root, js, _log = workspace
+        session = mod.LSPSession(_command(), str(root))
+        try:
+            assert session.sync_kind == mod.SYNC_INCREMENTAL
+            assert session.check(str(js)) == {"success": True, "diagnostics": []}
+
+            js.write_text(SOURCE.replace("@api name;", "@api name; // ERROR here\n    // WARN there"))
+            result = session.check(str(js))
+            assert result["success"] is False
+            assert _messages(result["diagnostics"]) == [
+                (3, "stub error: @api name; // ERROR here"),
+                (4, "stub warn: // WARN there"),
+            ]
+
+            js.write_text(SOURCE.replace("@api name;", "@api name;\n    // WARN there"))
+            result = session.check(str(js))
+            assert result["success"] is True
+            assert _messages(result["diagnostics"]) == [(4, "stub warn: // WARN there")]
+        finally:
+            session.close()
+        assert not session.alive()
+
+    def test_diagnostics_timeout(self, workspace, monkeypatch):
+        root, js, _log = workspace
+        monkeypatch.setenv("STUB_LSP_SILENT", "1")
+        session = mod.LSPSession(_command(), str(root))
+        try:
+            result = session.check(str(js), timeout=0.3)
+        finally:
+            session.close()
+        assert result == {"error": "No diagnostics from the language server within 0.3s"}
+
+
+class TestPool:
+    def test_daemon_is_started_once_and_reused(self, workspace):
+        root, js, log = workspace
+        command = _command()
+        try:
+            first = mod.validate(str(js), command=command)
+            assert first == {"success": True, "diagnostics": []}
+            js.write_text(SOURCE + "// ERROR at end\n")
+            second = mod.validate(str(js), command=command)
+            assert _messages(second["diagnostics"]) == [(5, "stub error: // ERROR at end")]
+        finally:
+            assert mod.stop(str(js), command=command)
+
+        methods = log.read_text().split()
+        assert methods.count("initialize") == 1
+        assert methods.count("textDocument/didOpen") == 1
+        assert methods.count("textDocument/didChange") == 1
+        assert mod.find_workspace(str(js)) == str(root.resolve())
+
+    def test_daemon_exits_when_idle(self, workspace, monkeypatch):
+        _root, js, log = workspace
+        monkeypatch.setenv(mod.IDLE_ENV, "0.5")
+        command = _command()
+        assert mod.validate(str(js), command=command)["success"] is True
+        sock = mod.socket_path(mod.find_workspace(str(js)), command)
+        deadline = time.monotonic() + 10
+        while os.path.exists(sock) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert not os.path.exists(sock)
+        assert "shutdown" in log.read_text().split()
+
+    def test_disabled_pool_returns_none(self, workspace, monkeypatch):
+        _root, js, _log = workspace
+        monkeypatch.setenv(mod.POOL_ENV, "0")
+        assert mod.validate(str(js), command=_command()) is None
+
+
+def test_hook_reports_pool_diagnostics(workspace):
+    _root, js, _log = workspace
+    js.write_text(SOURCE + "// ERROR in hook\n")
+    command = " ".join([sys.executable, str(STUB)])
+    env = {**os.environ, mod.COMMAND_ENV: command}
+    try:
+        proc = subprocess.run(
+            [sys.executable, str(HOOK)],
+            input=json.dumps({"tool_name": "Write", "tool_input": {"file_path": str(js)}}),
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=60,
+        )
+    finally:
+        subprocess.run(
+            [sys.executable, str(HOOK.parent / "lwc_lsp_pool.py"), "stop", str(js)],
+            env=env,
+            timeout=30,
+        )
+    assert "LWC LSP VALIDATION RESULTS" in proc.stdout
+    assert "line 6: stub error: // ERROR in hook (source: stub-lsp)" in proc.stdout
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import base64
 
+import pytest
 from conftest import load_script
 
 mod = load_script("skills/sf-lwc/scripts/mcp_validator.py")
@@ -272,3 +273,78 @@ def test_meta_resource_fallback_still_works():
     """A payload shipping a .js-meta.xml (no top-level field) still resolves the version."""
     r = LWCMCPValidator().validate(_bundle_payload("65.0", LWC_ON_HTML))
     assert any("lwc:on" in i["message"] for i in _version_issues(r))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PER-RESOURCE VALIDATION — file attribution, lazy decoding, unchanged-file reuse
+# ═══════════════════════════════════════════════════════════════════════════════
+
+HTML_PATH = "lwc/myComponent/myComponent.html"
+JS_PATH = "lwc/myComponent/myComponent.js"
+SVG_PATH = "lwc/myComponent/myComponent.svg"
+TERNARY_HTML = "<template>\n  <p>{greeting}</p>\n  <p>{isOpen ? 'a' : 'b'}</p>\n</template>"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(mod, "CACHE_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def decoded(monkeypatch):
+    seen = []
+    real = mod._maybe_b64decode
+
+    def record(source):
+        text = real(source)
+        seen.append(text)
+        return text
+
+    monkeypatch.setattr(mod, "_maybe_b64decode", record)
+    return seen
+
+
+def _resources_payload(tool, html, js, api_version="65.0"):
+    payload = _mcp_deploy_payload(api_version, html, js=js, b64=True)
+    payload["tool"] = tool
+    payload["params"]["metadata"][0]["lwcResources"]["lwcResource"].append(
+        {"filePath": SVG_PATH, "source": base64.b64encode(b"<svg/>").decode("ascii")}
+    )
+    return payload
+
+
+def test_issues_are_attributed_to_their_resource_and_line(decoded):
+    r = LWCMCPValidator().validate(_resources_payload("metadata_create", TERNARY_HTML, MUTATION_JS))
+    ternary = [i for i in r["issues"] if "Ternary" in i["message"]]
+    assert [(i["file"], i["line"]) for i in ternary] == [(HTML_PATH, 3)]
+    floors = _version_issues(r)
+    assert [i["file"] for i in floors] == [JS_PATH]
+    assert set(r["files"]) == {HTML_PATH, JS_PATH}
+    assert "<svg/>" not in decoded  # no rules for static files, never decoded
+
+
+def test_update_reuses_unchanged_resources(decoded):
+    first = LWCMCPValidator().validate(_resources_payload("metadata_create", TERNARY_HTML, MUTATION_JS))
+    decoded.clear()
+
+    update = _resources_payload("metadata_update", TERNARY_HTML, MUTATION_JS + "\n// edited")
+    second = LWCMCPValidator().validate(update)
+    assert second["reused_files"] == [HTML_PATH]
+    assert decoded == [MUTATION_JS + "\n// edited"]
+    assert second["issues"] == first["issues"]
+    assert second["score"] == first["score"]
+
+
+def test_update_revalidates_when_api_version_changes():
+    LWCMCPValidator().validate(_resources_payload("metadata_create", LWC_ON_HTML, ""))
+    r = LWCMCPValidator().validate(_resources_payload("metadata_update", LWC_ON_HTML, "", api_version="67.0"))
+    assert r["reused_files"] == []
+    assert not _version_issues(r)
+
+
+def test_update_revalidates_when_rules_version_changes(monkeypatch):
+    LWCMCPValidator().validate(_resources_payload("metadata_create", TERNARY_HTML, MUTATION_JS))
+    monkeypatch.setattr(mod, "RULES_VERSION", mod.RULES_VERSION + 1)
+    r = LWCMCPValidator().validate(_resources_payload("metadata_update", TERNARY_HTML, MUTATION_JS))
+    assert r["reused_files"] == []
@@ -0,0 +1,119 @@
+"""Skill-local tests for the LWC template parser and the checks built on it."""
+
+from __future__ import annotations
+
+import time
+
+from conftest import load_script
+
+mod = load_script("skills/sf-lwc/scripts/lwc_template_parser.py")
+validator = load_script("skills/sf-lwc/scripts/template_validator.py")
+slds = load_script("skills/sf-lwc/scripts/validate_slds.py")
+
+TEMPLATE = """\
+<template>
+    <!-- <p onclick={commented}>{hidden}</p> -->
+    <lightning-button
+        label="Save"
+        onclick={handleSave}
+        lwc:if={isReady}></lightning-button>
+    <p title={label}>Total: {total} &amp; more</p>
+    <input disabled value={val}>
+    <br/>
+</template>
+"""
+
+
+def _elements(source: str):
+    return mod.elements(mod.parse_template(source))
+
+
+def test_multiline_tag_attributes_keep_their_lines():
+    button = next(e for e in _elements(TEMPLATE) if e.tag == "lightning-button")
+    assert button.line == 3
+    assert [(a.name, a.line) for a in button.attrs] == [("label", 4), ("onclick", 5), ("lwc:if", 6)]
+    assert button.get("label").value == "Save"
+    assert button.get("onclick").expression.text == "handleSave"
+
+
+def test_comments_are_skipped_and_text_expressions_found():
+    nodes = mod.parse_template(TEMPLATE)
+    expressions = [(x.text, x.line) for n in nodes if isinstance(n, mod.Text) for x in n.expressions]
+    assert expressions == [("total", 7)]
+    assert "commented" not in {a.source for e in _elements(TEMPLATE) for a in e.attrs}
+
+
+def test_void_and_self_closing_elements_do_not_nest():
+    template = _elements(TEMPLATE)[0]
+    assert [child.tag for child in template.children] == ["lightning-button", "p", "input", "br"]
+    assert template.children[2].get("disabled").value is None
+
+
+def test_angle_brackets_and_quotes_inside_expressions():
+    source = "<template>\n<div if:true={a > b} title={'x\"y'}><span>{c}</span></div>\n</template>"
+    div = _elements(source)[1]
+    assert [a.source for a in div.attrs] == ["if:true={a > b}", "title={'x\"y'}"]
+    assert [e.tag for e in div.children] == ["span"]
+
+
+def test_case_sensitive_framework_attributes_are_preserved():
+    div = _elements('<div className="a" [(ngModel)]="b" (click)="c()"></div>')[0]
+    assert [a.name for a in div.attrs] == ["className", "[(ngModel)]", "(click)"]
+
+
+def test_iteration_key_through_nested_templates():
+    source = """\
+<template>
+    <template for:each={rows} for:item="row">
+        <template lwc:if={row.visible}>
+            <li>{row.Name}</li>
+        </template>
+    </template>
+    <ul iterator:it={rows}>
+        <li key={it.value.Id}>{it.value.Name}</li>
+    </ul>
+</template>
+"""
+    issues = validator.LWCTemplateValidator("x.html", content=source).validate()["issues"]
+    assert [(i["line"], i["message"], i["fix"]) for i in issues] == [
+        (
+            4,
+            "for:each iteration (line 2) may be missing key attribute",
+            "Add key={row.id} to identify each item uniquely",
+        )
+    ]
+
+
+def test_multiline_expression_issue_reports_attribute_line():
+    source = '<template>\n  <lightning-input\n      label="Name"\n      value={first + last}>\n  </lightning-input>\n</template>'
+    issues = validator.LWCTemplateValidator("x.html", content=source).validate()["issues"]
+    assert [(i["line"], i["category"]) for i in issues] == [(4, "inline_expression")]
+
+
+def test_slds_checks_see_multiline_tags():
+    source = """\
+<template>
+    <lightning-icon
+        icon-name="utility:info"
+        size="small"></lightning-icon>
+    <div class="slds-box
+                slds-not-a-class"></div>
+</template>
+"""
+    issues = slds.SLDSValidator("x.html", content=source).validate()["issues"]
+    found = {(i["category"], i["line"]) for i in issues if i["severity"] == "WARNING"}
+    assert found == {("accessibility", 2), ("slds_class_usage", 6)}
+
+
+def test_large_template_parses_in_linear_time():
+    row = '<div class="slds-box" onclick={handle} data-id={row.Id}>{row.Name} {row.Value}</div>\n'
+
+    def timed(count: int) -> float:
+        source = "<template>\n" + row * count + "</template>\n"
+        start = time.perf_counter()
+        validator.LWCTemplateValidator("x.html", content=source).validate()
+        return time.perf_counter() - start
+
+    timed(200)  # warm up
+    small, large = timed(1000), timed(8000)
+    assert large < small * 8 * 3
@@ -0,0 +1,138 @@
+"""Tests for slds_linter_wrapper.py — batched linter runs and the availability cache."""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-lwc/scripts/slds_linter_wrapper.py")
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="fake npx is a shebang script")
+
+# Stand-in for `npx @salesforce-ux/slds-linter`: logs each call and reports one
+# ESLint-style violation per line containing "#fff" in each file it is given.
+FAKE_NPX = """\
+#!{python}
+import json, os, sys
+with open(os.environ["FAKE_NPX_LOG"], "a") as f:
+    f.write(json.dumps(sys.argv[1:]) + "\\n")
+args = sys.argv[2:]
+if args == ["--version"]:
+    print("1.0.0")
+    sys.exit(0)
+files = [a for a in args[1:] if not a.startswith("--") and a != "json"]
+out = []
+for path in files:
+    messages = [
+        {{"ruleId": "slds/no-hardcoded-values", "message": "Hardcoded color", "line": n, "column": 1, "severity": 2}}
+        for n, line in enumerate(open(path), 1) if "#fff" in line
+    ]
+    out.append({{"filePath": os.path.abspath(path), "messages": messages}})
+print(json.dumps(out))
+sys.exit(1 if any(o["messages"] for o in out) else 0)
+"""
+
+
+@pytest.fixture
+def fake_npx(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    npx = bin_dir / "npx"
+    npx.write_text(FAKE_NPX.format(python=sys.executable))
+    npx.chmod(npx.stat().st_mode | stat.S_IEXEC)
+    log = tmp_path / "npx.log"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_NPX_LOG", str(log))
+    monkeypatch.setattr(mod, "CACHE_DIR", tmp_path / "cache")
+    return log
+
+
+def _calls(log) -> list[list[str]]:
+    return [json.loads(line) for line in log.read_text().splitlines()] if log.exists() else []
+
+
+def _bundles(root, count):
+    for n in range(count):
+        bundle = root / "lwc" / f"cmp{n}"
+        bundle.mkdir(parents=True)
+        (bundle / f"cmp{n}.html").write_text('<template><div class="slds-box"></div></template>\n')
+        (bundle / f"cmp{n}.css").write_text(".a { color: #fff; }\n" if n % 2 else ".a { color: var(--x); }\n")
+    return root / "lwc"
+
+
+def test_directory_is_linted_in_one_invocation(tmp_path, fake_npx):
+    lwc = _bundles(tmp_path / "project", 50)
+    wrapper = mod.SLDSLinterWrapper(project_root=str(tmp_path / "project"))
+
+    result = wrapper.lint_directory(str(lwc))
+
+    lint_calls = [c for c in _calls(fake_npx) if c[1] == "lint"]
+    assert len(lint_calls) == 1
+    assert result["invocations"] == 1
+    assert len(result["file_results"]) == 100
+    assert result["total_violations"] == 25
+    flagged = sorted(os.path.basename(p) for p, r in result["file_results"].items() if r["violations"])
+    assert flagged == sorted(f"cmp{n}.css" for n in range(1, 50, 2))
+    assert result["unmapped"] == []
+
+
+def test_batches_split_on_argument_length(tmp_path, fake_npx, monkeypatch):
+    lwc = _bundles(tmp_path / "project", 10)
+    monkeypatch.setattr(mod, "MAX_ARGS_CHARS", 200)
+    wrapper = mod.SLDSLinterWrapper(project_root=str(tmp_path / "project"))
+
+    result = wrapper.lint_directory(str(lwc))
+
+    assert result["invocations"] == len([c for c in _calls(fake_npx) if c[1] == "lint"]) > 1
+    assert len(result["file_results"]) == 20
+    assert result["total_violations"] == 5
+
+
+def test_lint_file_keeps_single_file_shape(tmp_path, fake_npx):
+    css = tmp_path / "x.css"
+    css.write_text(".a {}\n.b { color: #fff; }\n")
+    result = mod.SLDSLinterWrapper(project_root=str(tmp_path)).lint_file(str(css))
+    assert result["success"] is True
+    assert result["exit_code"] == 1
+    assert [(v["line"], v["severity"]) for v in result["violations"]] == [(2, "HIGH")]
+
+
+def test_availability_is_cached_across_instances(tmp_path, fake_npx):
+    assert mod.SLDSLinterWrapper(project_root=str(tmp_path)).is_available()
+    assert mod.SLDSLinterWrapper(project_root=str(tmp_path)).is_available()
+    assert [c for c in _calls(fake_npx) if c[-1] == "--version"] == [
+        ["@salesforce-ux/slds-linter", "--version"]
+    ]
+
+
+def test_availability_cache_expires(tmp_path, fake_npx, monkeypatch):
+    assert mod.SLDSLinterWrapper(project_root=str(tmp_path)).is_available()
+    monkeypatch.setattr(mod, "AVAILABILITY_TTL", -1)
+    assert mod.SLDSLinterWrapper(project_root=str(tmp_path)).is_available()
+    assert len([c for c in _calls(fake_npx) if c[-1] == "--version"]) == 2
+
+
+def test_negative_availability_expires_quickly(tmp_path, fake_npx, monkeypatch):
+    failing = tmp_path / "bin" / "npx"
+    working = failing.read_text()
+    failing.write_text("#!/bin/sh\nexit 1\n")
+    assert mod.SLDSLinterWrapper(project_root=str(tmp_path)).is_available() is False
+    # Installing the linter is picked up once the short negative TTL lapses,
+    # without waiting for AVAILABILITY_TTL
+    failing.write_text(working)
+    assert mod.SLDSLinterWrapper(project_root=str(tmp_path)).is_available() is False
+    monkeypatch.setattr(mod, "UNAVAILABLE_TTL", -1)
+    assert mod.SLDSLinterWrapper(project_root=str(tmp_path)).is_available() is True
+
+
+def test_missing_npx_skips_probe(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.setattr(mod, "CACHE_DIR", tmp_path / "cache")
+    wrapper = mod.SLDSLinterWrapper(project_root=str(tmp_path))
+    assert wrapper.is_available() is False
+    assert wrapper.lint_files(["a.css"])["success"] is False
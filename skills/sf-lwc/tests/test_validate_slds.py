@@ -0,0 +1,139 @@
+"""Skill-local tests for the SLDS 2 validator."""
+
+from __future__ import annotations
+
+import pytest
+from conftest import load_script
+
+mod = load_script("skills/sf-lwc/scripts/validate_slds.py")
+SLDSValidator = mod.SLDSValidator
+
+
+def _validate(tmp_path, name: str, content: str) -> dict:
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return SLDSValidator(str(path)).validate()
+
+
+def _write(tmp_path, name: str):
+    path = tmp_path / name
+    path.write_text("<template></template>\n", encoding="utf-8")
+    return path
+
+
+def test_rule_data_is_loaded_once_per_process(tmp_path, monkeypatch):
+    first = _write(tmp_path, "a.html")
+    second = _write(tmp_path, "b.css")
+    monkeypatch.setattr(mod, "_DATA", {})
+    opened = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(str(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    validators = [SLDSValidator(str(first)), SLDSValidator(str(second)), SLDSValidator(str(first))]
+
+    assert sum(p.endswith(".json") for p in opened) == 3
+    assert isinstance(validators[0].valid_slds_classes, frozenset)
+    assert validators[0].valid_slds_classes is validators[2].valid_slds_classes
+    assert validators[1].valid_hooks is validators[2].valid_hooks
+
+
+@pytest.mark.parametrize(
+    "cls,expected",
+    [
+        ("slds-grid", True),
+        ("slds-grid_vertical-align-center", True),
+        ("slds-gridlock", False),
+        ("slds-p-around_medium", True),
+        ("slds-m-top_anything", True),
+        ("slds-size_1-of-2", True),
+        ("slds-size_1-of-2x", False),
+        ("slds-max-medium-size_3-of-12", True),
+        ("slds-small-size_full", False),
+        ("slds-text-heading_large", True),
+        ("slds-text-title", False),
+        ("slds-is-active", True),
+        ("slds-notify_toast", True),
+        ("slds-no-flex", True),
+        ("slds-tabs_default", True),
+        ("slds-tabs", False),
+        ("slds-unknown", False),
+    ],
+)
+def test_class_families(cls, expected):
+    validator = SLDSValidator.__new__(SLDSValidator)
+    assert validator._is_valid_slds_pattern(cls) is expected
+
+
+def test_unknown_class_is_reported(tmp_path):
+    result = _validate(
+        tmp_path,
+        "c.html",
+        '<template>\n  <div class="slds-grid slds-size_1-of-2 slds-made-up"></div>\n</template>\n',
+    )
+    messages = [i["message"] for i in result["issues"] if i["category"] == "slds_class_usage"]
+    assert messages == ["Unknown SLDS class: slds-made-up"]
+
+
+CSS = """\
+/* header: color: #ff0000; $color-border */
+:host {
+    display: block;
+}
+.card .body .row .cell span {
+    background: url("data:image/svg+xml;utf8,<svg fill='%23fff'/>");
+    border-color: var(--slds-c-card-color-border, #ccc);
+}
+@media (max-width: 600px) {
+    .card {
+        color:
+            #123456 !important;
+        padding: $spacing-small;
+        margin: var(--lwc-spacingSmall);
+    }
+}
+"""
+
+
+def _found(result: dict) -> list[tuple[str, int, str]]:
+    return [(i["category"], i["line"], i["message"]) for i in result["issues"]]
+
+
+def test_css_checks_run_over_declarations(tmp_path):
+    found = _found(_validate(tmp_path, "card.css", CSS))
+    assert found == [
+        ("performance", 5, "Deep CSS selector detected (>3 levels)"),
+        ("styling_hooks", 7, "Component hooks (--slds-c-card-color-border) not yet supported in SLDS 2"),
+        ("dark_mode", 11, "Hardcoded hex color (#123456) may break dark mode"),
+        ("performance", 11, "!important override detected"),
+        ("slds_migration", 13, "Deprecated SLDS 1 token: $spacing-small"),
+        ("slds_migration", 14, "Deprecated SLDS 1 token: --lwc-spacingSmall"),
+        ("slds_migration", 14, "Old --lwc-* token format detected"),
+    ]
+
+
+def test_tokenizer_keeps_strings_and_nesting():
+    tokenizer = load_script("skills/sf-lwc/scripts/lwc_css_tokenizer.py")
+    tokens = list(tokenizer.tokenize_css(CSS))
+    rules = [(t.selector, t.line) for t in tokens if isinstance(t, tokenizer.Rule)]
+    assert rules == [
+        (":host", 2),
+        (".card .body .row .cell span", 5),
+        ("@media (max-width: 600px)", 9),
+        (".card", 10),
+    ]
+    background = next(t for t in tokens if getattr(t, "property", "") == "background")
+    assert background.value.endswith("<svg fill='%23fff'/>\")")
+    color = next(t for t in tokens if getattr(t, "property", "") == "color")
+    assert (color.selector, color.line, color.value) == (".card", 11, "#123456 !important")
+
+
+def test_deprecated_token_matcher_matches_substring_scan():
+    tokens = mod.load_slds_data()["deprecated_patterns"]["tokens"]
+    matcher = mod.load_slds_data()["deprecated_tokens"]
+    text = "padding: $spacing-x-small $color-background-alt; color: var(--lwc-colorBackground)"
+    assert sorted(matcher.find(text)) == sorted(t for t in tokens if t in text)
+    assert matcher.find("nothing here") == []